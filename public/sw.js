@@ -0,0 +1,357 @@
+/**
+ * Offline-first cache for exam data.
+ *
+ * Files derived from an exam bank (`/data/{examId}.json`, language variants,
+ * search indexes, prompt contexts and shards) are cached per exam under its
+ * `publishedHash` in `/data/index.json`, which `scripts/publish-data.py` sets
+ * to a hash of all of the exam's published files. Cached files are served
+ * straight away; index.json is re-checked in the background at most every
+ * few minutes, and only when an exam's hash changes are its cached files
+ * fetched again, into a cache for the new hash, after which the old one is
+ * dropped. Images under `/data/images/` keep their names when they are
+ * recompressed, so a cached image is served and then revalidated in the
+ * background; the image cache keeps only the most recently shown images,
+ * within a count and a byte budget. The app shell (index.html and the hashed
+ * `/assets/`) is cached too, so a study session can run without a
+ * connection; assets the current index.html no longer reaches are dropped
+ * when a new worker activates.
+ *
+ * Only responses of the type a request asks for are cached: a missing file
+ * comes back as index.html from the SPA fallback with a 200 status.
+ */
+
+const SHELL_CACHE = 'shell-v1'
+const IMAGE_CACHE = 'exam-images-v1'
+const META_CACHE = 'exam-meta-v1'
+const DATA_PREFIX = 'exam-data-v1:'
+const INDEX_URL = '/data/index.json'
+const INDEX_CHECK_MS = 5 * 60 * 1000
+const IMAGE_MAX_ENTRIES = 400
+const IMAGE_MAX_BYTES = 40 * 1024 * 1024
+
+/** examId -> publishedHash, from the last index.json seen. */
+let hashes = null
+let lastIndexCheck = 0
+let indexCheck = Promise.resolve()
+let imagePrune = Promise.resolve()
+
+self.addEventListener('install', () => {
+  self.skipWaiting()
+})
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    (async () => {
+      const keep = [SHELL_CACHE, IMAGE_CACHE, META_CACHE]
+      const names = await caches.keys()
+      await Promise.all(
+        names
+          .filter(
+            (name) => !keep.includes(name) && !name.startsWith(DATA_PREFIX)
+          )
+          .map((name) => caches.delete(name))
+      )
+      await pruneShell()
+      await pruneImages()
+      await self.clients.claim()
+    })()
+  )
+})
+
+function dataCacheName(examId, hash) {
+  return `${DATA_PREFIX}${examId}:${hash}`
+}
+
+/** The exam a data URL belongs to, or null for anything else. */
+function examIdOf(pathname) {
+  const parts = pathname.slice('/data/'.length).split('/')
+  let file = null
+  if (parts.length === 1) file = parts[0]
+  else if (['search', 'shards', 'prompts'].includes(parts[0])) file = parts[1]
+  if (!file || file === 'index.json') return null
+  return file.split('.')[0]
+}
+
+/** Content type each file extension must be served with to be cached. */
+const EXPECTED_TYPES = {
+  js: 'javascript',
+  css: 'css',
+  json: 'json',
+  png: 'image/',
+  jpg: 'image/',
+  jpeg: 'image/',
+  gif: 'image/',
+  webp: 'image/',
+  avif: 'image/',
+  svg: 'image/svg',
+  woff: 'woff',
+  woff2: 'woff',
+}
+
+/** Whether `response` is the kind of file `request` asked for. */
+function hasExpectedType(request, response) {
+  const type = response.headers.get('content-type') || ''
+  if (request.mode === 'navigate') return type.includes('html')
+  const extension = new URL(request.url).pathname.split('.').pop()
+  const expected = EXPECTED_TYPES[extension]
+  return expected ? type.includes(expected) : !type.includes('html')
+}
+
+/**
+ * Drop cached assets that the cached index.html no longer reaches, directly
+ * or through the scripts and styles it loads. Hashed asset names change on
+ * every build, so without this the shell cache only ever grows.
+ */
+async function pruneShell() {
+  const cache = await caches.open(SHELL_CACHE)
+  const page = await cache.match('/index.html')
+  if (!page) return
+  const assets = new Map()
+  for (const request of await cache.keys()) {
+    const { pathname } = new URL(request.url)
+    if (pathname.startsWith('/assets/')) {
+      assets.set(pathname.slice('/assets/'.length), request)
+    }
+  }
+  const live = new Set()
+  const pending = [await page.text()]
+  while (pending.length > 0) {
+    const text = pending.pop()
+    for (const [name, request] of assets) {
+      if (live.has(name) || !text.includes(name)) continue
+      live.add(name)
+      if (/\.(js|css)$/.test(name)) {
+        const response = await cache.match(request)
+        if (response) pending.push(await response.text())
+      }
+    }
+  }
+  await Promise.all(
+    Array.from(assets)
+      .filter(([name]) => !live.has(name))
+      .map(([, request]) => cache.delete(request))
+  )
+}
+
+/** Size of a cached response, from its headers when they have it. */
+async function responseBytes(response) {
+  const length = Number(response.headers.get('content-length'))
+  return length > 0 ? length : (await response.blob()).size
+}
+
+/**
+ * Drop the oldest images until the image cache is within IMAGE_MAX_ENTRIES
+ * and IMAGE_MAX_BYTES. A cache lists its entries in the order they were put,
+ * and every revalidation puts an image again, so the images dropped are the
+ * ones shown least recently. Runs one at a time.
+ */
+function pruneImages() {
+  imagePrune = imagePrune
+    .then(async () => {
+      const cache = await caches.open(IMAGE_CACHE)
+      const requests = await cache.keys()
+      const sizes = await Promise.all(
+        requests.map(async (request) => {
+          const response = await cache.match(request)
+          return response ? responseBytes(response) : 0
+        })
+      )
+      let count = requests.length
+      let bytes = sizes.reduce((total, size) => total + size, 0)
+      const stale = []
+      for (const [i, request] of requests.entries()) {
+        if (count <= IMAGE_MAX_ENTRIES && bytes <= IMAGE_MAX_BYTES) break
+        stale.push(request)
+        count -= 1
+        bytes -= sizes[i]
+      }
+      await Promise.all(stale.map((request) => cache.delete(request)))
+    })
+    .catch(() => undefined)
+  return imagePrune
+}
+
+/**
+ * Move each exam's cached files to the cache for its current hash. An old
+ * cache is only dropped once every file in it was fetched again, so an
+ * interrupted refresh still leaves something to study offline.
+ */
+async function refreshChangedExams() {
+  const names = await caches.keys()
+  await Promise.all(
+    names
+      .filter((name) => name.startsWith(DATA_PREFIX))
+      .map(async (name) => {
+        const [examId, hash] = name.slice(DATA_PREFIX.length).split(':')
+        const current = hashes.get(examId)
+        if (current === hash) return
+        if (current) {
+          const old = await caches.open(name)
+          const fresh = await caches.open(dataCacheName(examId, current))
+          const requests = await old.keys()
+          const results = await Promise.all(
+            requests.map(async (request) => {
+              try {
+                const response = await fetch(request.url, {
+                  cache: 'no-cache',
+                })
+                if (!response.ok || !hasExpectedType(request, response)) {
+                  return false
+                }
+                await fresh.put(request, response)
+                return true
+              } catch {
+                return false
+              }
+            })
+          )
+          if (results.includes(false)) return
+        }
+        await caches.delete(name)
+      })
+  )
+}
+
+async function applyIndex(response) {
+  const index = await response.clone().json()
+  const next = new Map()
+  for (const exam of index.exams || []) {
+    if (exam.id && exam.publishedHash) next.set(exam.id, exam.publishedHash)
+  }
+  hashes = next
+  lastIndexCheck = Date.now()
+  const meta = await caches.open(META_CACHE)
+  await meta.put(INDEX_URL, response)
+  await refreshChangedExams()
+}
+
+/** Fetch index.json again unless it was checked recently. */
+function checkIndex(force) {
+  if (!force && Date.now() - lastIndexCheck < INDEX_CHECK_MS) return indexCheck
+  lastIndexCheck = Date.now()
+  indexCheck = fetch(INDEX_URL, { cache: 'no-cache' })
+    .then((response) => (response.ok ? applyIndex(response) : undefined))
+    .catch(() => undefined)
+  return indexCheck
+}
+
+async function ensureHashes() {
+  if (hashes) return
+  const cached = await caches.match(INDEX_URL, { cacheName: META_CACHE })
+  if (cached) {
+    const index = await cached.json()
+    hashes = new Map(
+      (index.exams || [])
+        .filter((exam) => exam.id && exam.publishedHash)
+        .map((exam) => [exam.id, exam.publishedHash])
+    )
+    return
+  }
+  // Stays null when offline, so the next request tries again.
+  await checkIndex(true)
+}
+
+async function serveIndex(event) {
+  try {
+    const response = await fetch(event.request)
+    if (response.ok) event.waitUntil(applyIndex(response.clone()))
+    return response
+  } catch (error) {
+    const cached = await caches.match(INDEX_URL, { cacheName: META_CACHE })
+    if (cached) return cached
+    throw error
+  }
+}
+
+async function serveExamData(event, examId) {
+  await ensureHashes()
+  const hash = hashes?.get(examId)
+  if (!hash) return fetch(event.request)
+
+  const cache = await caches.open(dataCacheName(examId, hash))
+  const cached = await cache.match(event.request)
+  if (cached) {
+    event.waitUntil(checkIndex(false))
+    return cached
+  }
+  try {
+    const response = await fetch(event.request)
+    // Missing variants come back as index.html from the SPA redirect.
+    if (response.ok && hasExpectedType(event.request, response)) {
+      event.waitUntil(cache.put(event.request, response.clone()))
+    }
+    return response
+  } catch (error) {
+    // Offline: a copy cached under an earlier hash is better than nothing.
+    const stale = await caches.match(event.request)
+    if (stale) return stale
+    throw error
+  }
+}
+
+async function cacheFirst(event, cacheName) {
+  const cache = await caches.open(cacheName)
+  const cached = await cache.match(event.request)
+  if (cached) return cached
+  const response = await fetch(event.request)
+  if (response.ok && hasExpectedType(event.request, response)) {
+    event.waitUntil(cache.put(event.request, response.clone()))
+  }
+  return response
+}
+
+/**
+ * Serve a cached copy at once and fetch a fresh one for next time, then run
+ * `prune` to keep the cache within its budget.
+ */
+async function staleWhileRevalidate(event, cacheName, prune) {
+  const cache = await caches.open(cacheName)
+  const cached = await cache.match(event.request)
+  const refresh = fetch(event.request, { cache: 'no-cache' }).then(
+    async (response) => {
+      if (response.ok && hasExpectedType(event.request, response)) {
+        await cache.put(event.request, response.clone())
+        event.waitUntil(prune())
+      }
+      return response
+    }
+  )
+  if (!cached) return refresh
+  event.waitUntil(refresh.catch(() => undefined))
+  return cached
+}
+
+async function serveNavigation(event) {
+  const cache = await caches.open(SHELL_CACHE)
+  try {
+    const response = await fetch(event.request)
+    if (response.ok && hasExpectedType(event.request, response)) {
+      event.waitUntil(cache.put('/index.html', response.clone()))
+    }
+    return response
+  } catch (error) {
+    const cached = await cache.match('/index.html')
+    if (cached) return cached
+    throw error
+  }
+}
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event
+  if (request.method !== 'GET') return
+  const url = new URL(request.url)
+  if (url.origin !== self.location.origin) return
+
+  if (request.mode === 'navigate') {
+    event.respondWith(serveNavigation(event))
+  } else if (url.pathname.startsWith('/assets/')) {
+    event.respondWith(cacheFirst(event, SHELL_CACHE))
+  } else if (url.pathname.startsWith('/data/images/')) {
+    event.respondWith(staleWhileRevalidate(event, IMAGE_CACHE, pruneImages))
+  } else if (url.pathname === INDEX_URL) {
+    event.respondWith(serveIndex(event))
+  } else if (url.pathname.startsWith('/data/')) {
+    const examId = examIdOf(url.pathname)
+    if (examId) event.respondWith(serveExamData(event, examId))
+  }
+})
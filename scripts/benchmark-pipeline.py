@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data pipeline on synthetic banks of growing size.
+
+For each size a synthetic exam (four languages, images, case studies; see
+qbank/synthetic.py) is generated into <work-dir>/<size>/data, laid out like
+public/data, and every pipeline stage is run against it in a fresh process
+(see qbank/benchmark.py), recording wall time and peak memory. The data
+directories are kept afterwards as fixtures for loader benchmarks: banks,
+variants, shards, search indexes and prompt contexts, published like dist/data.
+
+Results are written as JSON, by default to .cache/qbank/benchmarks/<commit>.json,
+and --compare prints the change against an earlier run, given as a results file
+or a commit whose results are in the default location.
+
+Usage:
+    python3 scripts/benchmark-pipeline.py                          # 1k, 10k and 100k questions
+    python3 scripts/benchmark-pipeline.py --sizes 1000 5000 --compare 1a2b3c4
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from qbank.bank import ROOT
+from qbank.benchmark import PIPELINE, measure
+from qbank.manifest import CACHE_DIR
+
+RESULTS_DIR = CACHE_DIR / 'benchmarks'
+DEFAULT_SIZES = (1000, 10000, 100000)
+RESULTS_VERSION = 1
+
+
+def _commit():
+    """Short HEAD commit, suffixed with -dirty for uncommitted changes; None outside git."""
+    try:
+        head = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{head}-dirty' if status.strip() else head
+
+
+def _load_results(spec):
+    path = Path(spec)
+    if not path.exists():
+        path = RESULTS_DIR / f'{spec}.json'
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _change(now, before):
+    if now is None or not before:
+        return ''
+    return f' ({100 * (now - before) / before:+.0f}%)'
+
+
+def _compare(results, previous):
+    print(f'compared with {previous.get("commit") or "unknown commit"}:')
+    before_runs = {run['questions']: run for run in previous.get('runs', [])}
+    for run in results['runs']:
+        before = before_runs.get(run['questions'])
+        if not before:
+            continue
+        for stage, now in run['stages'].items():
+            old = before['stages'].get(stage)
+            if not old:
+                continue
+            print(f'  {run["questions"]:>7} {stage:<13} {now["ms"]:>10.0f} ms{_change(now["ms"], old["ms"]):<8}'
+                  f' {now["peakRssMb"] or 0:>8.0f} MB{_change(now["peakRssMb"], old.get("peakRssMb"))}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='question counts to benchmark (default: 1000 10000 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', type=Path, default=CACHE_DIR / 'bench',
+                        help='where synthetic data is generated and kept')
+    parser.add_argument('--out', type=Path, default=None,
+                        help='results file (default: .cache/qbank/benchmarks/<commit>.json)')
+    parser.add_argument('--compare', help='earlier results file, or commit with default results')
+    args = parser.parse_args()
+
+    commit = _commit()
+    results = {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'baselineRssMb': measure('baseline')['peakRssMb'],
+        'runs': [],
+    }
+
+    print(f'{"questions":>9} {"stage":<13} {"ms":>10} {"peak MB":>8}')
+    for size in args.sizes:
+        exam_id = f'BENCH-{size}'
+        data_dir = args.work_dir / str(size) / 'data'
+        shutil.rmtree(data_dir, ignore_errors=True)
+        data_dir.mkdir(parents=True)
+
+        stages = {}
+        for stage in PIPELINE:
+            extra = (size, args.seed) if stage == 'generate' else ()
+            stages[stage] = measure(stage, data_dir, exam_id, *extra)
+            print(f'{size:>9} {stage:<13} {stages[stage]["ms"]:>10.0f} '
+                  f'{stages[stage]["peakRssMb"] or 0:>8.0f}')
+        errors = stages['validate']['detail']['errors']
+        if errors:
+            print(f'warning: {errors} validation errors in {exam_id}', file=sys.stderr)
+        results['runs'].append({
+            'questions': size,
+            'examId': exam_id,
+            'dataDir': str(data_dir),
+            'totalMs': round(sum(s['ms'] for s in stages.values()), 1),
+            'stages': stages,
+        })
+
+    out = args.out or RESULTS_DIR / f'{commit or "results"}.json'
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    print(f'results written to {out}; fixtures kept in {args.work_dir}')
+
+    if args.compare:
+        previous = _load_results(args.compare)
+        if previous is None:
+            print(f'no results found for {args.compare}', file=sys.stderr)
+            return 1
+        _compare(results, previous)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Regenerate public/data/index.json from the banks on disk.
+
+Each bank is streamed once for its question count and stats (see
+qbank/catalog.py). Titles and descriptions are kept from the existing index;
+updatedAt moves to today only when an exam's content hash changes. Exams
+listed without a bank file are dropped unless --keep-missing is given; new
+banks are appended with their id as title.
+
+Usage:
+    python3 scripts/build-index.py
+    python3 scripts/build-index.py --keep-missing --check
+"""
+
+import argparse
+import datetime
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from qbank.bank import DATA_DIR, exam_id_for, list_banks
+from qbank.catalog import exam_stats
+
+INDEX_PATH = DATA_DIR / 'index.json'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--keep-missing', action='store_true',
+                        help='keep index entries whose bank file does not exist')
+    parser.add_argument('--check', action='store_true',
+                        help='only report whether index.json is up to date (exit 1 if not)')
+    args = parser.parse_args()
+
+    try:
+        previous = json.loads(INDEX_PATH.read_text(encoding='utf-8')).get('exams', [])
+    except FileNotFoundError:
+        previous = []
+    previous_by_id = {e['id']: e for e in previous if e.get('id')}
+
+    banks = {exam_id_for(p): p for p in list_banks()}
+    with ProcessPoolExecutor() as pool:
+        stats = dict(zip(banks, pool.map(exam_stats, banks.values())))
+
+    today = datetime.date.today().isoformat()
+    order = [e['id'] for e in previous if e.get('id')] + [i for i in banks if i not in previous_by_id]
+    exams = []
+    for exam_id in order:
+        old = previous_by_id.get(exam_id, {})
+        if exam_id not in stats:
+            if args.keep_missing:
+                exams.append(old)
+            else:
+                print(f'{exam_id}: no bank file, dropped')
+            continue
+        fresh = stats[exam_id]
+        # Entries written before hashes existed keep their hand-maintained date.
+        unchanged = old.get('contentHash') in (None, fresh['contentHash'])
+        exams.append({
+            'id': exam_id,
+            'title': old.get('title', exam_id),
+            'description': old.get('description', ''),
+            'questionCount': fresh['questionCount'],
+            'updatedAt': old.get('updatedAt', today) if unchanged else today,
+            **fresh,
+        })
+
+    data = json.dumps({'exams': exams}, indent=2, ensure_ascii=False) + '\n'
+    current = INDEX_PATH.read_text(encoding='utf-8') if INDEX_PATH.exists() else None
+    if args.check:
+        print('index.json is up to date' if data == current else 'index.json is out of date')
+        return 0 if data == current else 1
+    if data != current:
+        INDEX_PATH.write_text(data, encoding='utf-8')
+    for entry in exams:
+        if 'contentHash' in entry:
+            print(f'{entry["id"]}: {entry["questionCount"]} questions, '
+                  f'{entry["bytes"] / 1024:.0f} KB, {entry["contentHash"]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
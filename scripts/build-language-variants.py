@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Write per-language variants of exam banks.
+
+For each bank and language this writes public/data/<exam>.<lang>.json with
+only the strings that language displays (see qbank/variants.py). HTML fields
+are stored pre-parsed as sanitized node trees that the pages render without
+parsing (see qbank/html_nodes.py). Variants are written without whitespace,
+since only the browser reads them. The exam pages request the variant matching
+the UI language and fall back to the full bank when it is missing; `pnpm build`
+generates them for every bank (see the `build:data` script).
+
+Usage:
+    python3 scripts/build-language-variants.py                  # every bank, every language
+    python3 scripts/build-language-variants.py SAA-C03 --lang en --lang ja
+"""
+
+import argparse
+import sys
+
+from qbank.bank import bank_path, exam_id_for, iter_questions, list_banks, write_bank
+from qbank.html_nodes import preparse_question
+from qbank.variants import LANGUAGES, localize_question
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--lang', action='append', choices=LANGUAGES,
+                        help='language to emit (repeatable, default: all)')
+    args = parser.parse_args()
+
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    for bank in banks:
+        exam_id = exam_id_for(bank)
+        source_size = bank.stat().st_size
+        for language in args.lang or LANGUAGES:
+            out = bank.with_name(f'{exam_id}.{language}.json')
+            meta = {}
+            count = write_bank(
+                out,
+                (preparse_question(localize_question(q, language)) for q in iter_questions(bank, meta)),
+                meta,
+                compact=True,
+            )
+            size = out.stat().st_size
+            print(f'{out.name}: {count} questions, {size / 1024:.0f} KB '
+                  f'({100 * size / source_size:.0f}% of {exam_id}.json)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Build per-exam, per-language compact prompt contexts for the AI tutor.
+
+Writes public/data/prompts/<exam>/, a manifest plus per-language pages of
+contexts (see qbank/prompt_context.py). The chat panel loads the page holding
+the current question when a chat opens and, once it has arrived, sends the
+question's precomputed context instead of building one from the bank.
+
+Usage:
+    python3 scripts/build-prompt-context.py                 # every bank, every language
+    python3 scripts/build-prompt-context.py SAA-C03 --lang ja --shard-size 25
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from qbank.bank import DATA_DIR, bank_path, exam_id_for, iter_questions, list_banks
+from qbank.prompt_context import build_contexts, full_tokens, write_shards
+from qbank.shards import DEFAULT_SHARD_SIZE
+from qbank.variants import LANGUAGES
+
+PROMPTS_DIR = DATA_DIR / 'prompts'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--lang', action='append', choices=LANGUAGES,
+                        help='language to build (repeatable, default: all)')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--out-dir', default=PROMPTS_DIR)
+    args = parser.parse_args()
+
+    if args.shard_size < 1:
+        parser.error('--shard-size must be positive')
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    for bank in banks:
+        exam_id = exam_id_for(bank)
+        questions = list(iter_questions(bank))
+        contexts = {language: build_contexts(questions, exam_id, language)
+                    for language in args.lang or LANGUAGES}
+        sizes, _ = write_shards(questions, contexts, out_dir, args.shard_size)
+        # Files from before contexts were split into pages.
+        for legacy in out_dir.glob(f'{exam_id}.*.json'):
+            legacy.unlink()
+        for language, built in contexts.items():
+            count = max(len(built['questions']), 1)
+            compact = sum(c['tokens'] for c in built['questions'].values()) / count
+            full = sum(full_tokens(q, language) for q in questions if q.get('id')) / count
+            print(f'{exam_id}.{language}: {len(built["questions"])} questions, '
+                  f'~{compact:.0f} tokens each (was ~{full:.0f}), '
+                  f'{sizes[language] / 1024:.0f} KB in pages of {args.shard_size}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Build per-exam, per-language full-text search indexes.
+
+Writes public/data/search/<exam>.<lang>.json (see qbank/search_index.py). The
+command menu loads the index for the UI language on first search and answers
+queries without fetching the bank.
+
+Usage:
+    python3 scripts/build-search-index.py                 # every bank, every language
+    python3 scripts/build-search-index.py SAA-C03 --lang ja
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from qbank.bank import DATA_DIR, bank_path, exam_id_for, iter_questions, list_banks
+from qbank.search_index import build_index, encode
+from qbank.variants import LANGUAGES
+
+SEARCH_DIR = DATA_DIR / 'search'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--lang', action='append', choices=LANGUAGES,
+                        help='language to index (repeatable, default: all)')
+    parser.add_argument('--out-dir', default=SEARCH_DIR)
+    args = parser.parse_args()
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    for bank in banks:
+        exam_id = exam_id_for(bank)
+        questions = list(iter_questions(bank))
+        for language in args.lang or LANGUAGES:
+            index = build_index(questions, exam_id, language)
+            data = encode(index)
+            (out_dir / f'{exam_id}.{language}.json').write_bytes(data)
+            print(f'{exam_id}.{language}: {len(index["docs"]["questionNumber"])} questions, '
+                  f'{len(index["terms"])} terms, {len(data) / 1024:.0f} KB')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
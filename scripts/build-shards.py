@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Split exam banks into fixed-size shards plus a lightweight manifest.
+
+Output goes to public/data/shards/<exam>/ (see qbank/shards.py). The exam
+pages use it when built with VITE_EXAM_SHARDS=1 and fall back to the full
+bank otherwise.
+
+Usage:
+    python3 scripts/build-shards.py                 # every bank in public/data
+    python3 scripts/build-shards.py SAA-C03 --shard-size 25
+    python3 scripts/build-shards.py --variants      # also shard <exam>.<lang>.json
+"""
+
+import argparse
+import sys
+
+from qbank.bank import bank_path, exam_id_for, list_banks
+from qbank.shards import DEFAULT_SHARD_SIZE, SHARDS_DIR, build_shards
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--out-dir', default=SHARDS_DIR)
+    parser.add_argument('--variants', action='store_true',
+                        help='also shard the language variants published next to each bank')
+    args = parser.parse_args()
+
+    if args.shard_size < 1:
+        parser.error('--shard-size must be positive')
+
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    if args.variants:
+        banks = [variant for bank in banks
+                 for variant in [bank, *sorted(bank.parent.glob(f'{exam_id_for(bank)}.*.json'))]]
+    for bank in banks:
+        exam_id = exam_id_for(bank)
+        count, written = build_shards(bank, exam_id, args.out_dir, args.shard_size)
+        print(f'{exam_id}: {count} shards of {args.shard_size}, {written} files written.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
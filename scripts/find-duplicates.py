@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Report near-duplicate questions within and across exam banks.
+
+Questions are compared on their stem and options with HTML stripped, using a
+MinHash/LSH index (see qbank/dedupe.py). Each cluster is printed with its
+weakest similarity. --mapping writes {exam: {duplicate id: canonical id}} for
+clusters inside one exam, which can be used to merge progress records.
+
+Usage:
+    python3 scripts/find-duplicates.py                      # every bank
+    python3 scripts/find-duplicates.py SAA-C03 --threshold 0.9 --mapping dupes.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from qbank.bank import bank_path, exam_id_for, list_banks
+from qbank.dedupe import DEFAULT_THRESHOLD, canonical_ids, find_duplicates, load_entries, plain_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'minimum Jaccard similarity of word shingles (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--mapping', help='write a canonical-id mapping to this JSON file')
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+
+    start = time.perf_counter()
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    entries = load_entries([(exam_id_for(p), p) for p in banks])
+    clusters = find_duplicates(entries, args.threshold)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for members, score in clusters:
+        exams = {entries[i][0] for i in members}
+        scope = 'across exams' if len(exams) > 1 else 'within exam'
+        print(f'{len(members)} questions, similarity >= {score:.2f} ({scope}):')
+        for i in members:
+            exam_id, question, _ = entries[i]
+            stem = ' '.join(plain_text(question.get('content')).split())
+            print(f'  {exam_id}#{question.get("questionNumber")} {question.get("id")}  {stem[:70]}')
+
+    duplicates = sum(len(m) - 1 for m, _ in clusters)
+    print(f'{len(entries)} questions: {len(clusters)} clusters, '
+          f'{duplicates} redundant questions ({elapsed:.0f} ms)')
+
+    if args.mapping:
+        mapping = canonical_ids(entries, clusters)
+        with open(args.mapping, 'w', encoding='utf-8') as f:
+            json.dump(mapping, f, indent=2)
+            f.write('\n')
+        print(f'Wrote {sum(len(m) for m in mapping.values())} id mappings to {args.mapping}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Deduplicate, recompress and annotate the images referenced by exam banks.
+
+For every image a bank references under public/data/images/:
+  - byte-identical copies are merged into one file and references repointed
+    (a copy that a bank not being processed still references stays on disk);
+  - PNGs are recompressed losslessly in place (see qbank/images.py);
+  - WebP/AVIF siblings are written when cwebp/avifenc are installed;
+  - <img> tags get width/height, loading="lazy" and data-formats listing the
+    modern siblings, so the exam pages can reserve space and serve <picture>.
+Banks are only rewritten when a tag changes. A per-exam savings report is
+printed at the end.
+
+Usage:
+    python3 scripts/optimize-images.py                # every bank
+    python3 scripts/optimize-images.py DOP-C02 --no-variants
+"""
+
+import argparse
+import hashlib
+import sys
+from collections import defaultdict
+
+from qbank.bank import DATA_DIR, bank_path, exam_id_for, iter_questions, list_banks, write_bank
+from qbank.images import (IMAGE_SRC, available_encoders, encode_variant, html_fields, image_path,
+                          image_size, recompress_png, rewrite_img_tags)
+
+
+def referenced_images(banks):
+    srcs = set()
+    for bank in banks:
+        for question in iter_questions(bank):
+            for container, key in html_fields(question):
+                srcs.update(IMAGE_SRC.findall(container[key]))
+    return sorted(src for src in srcs if image_path(src, DATA_DIR).is_file())
+
+
+def rewrite_bank(bank, describe):
+    """Rewrite <img> tags in bank; return the number of questions changed."""
+    def rewrite(question):
+        changed = False
+        for container, key in html_fields(question):
+            if 'images/' in container[key]:
+                updated = rewrite_img_tags(container[key], describe)
+                changed |= updated != container[key]
+                container[key] = updated
+        return changed
+
+    changed = sum(1 for question in iter_questions(bank) if rewrite(question))
+    if changed:
+        meta = {}
+
+        def rewritten():
+            for question in iter_questions(bank, meta):
+                rewrite(question)
+                yield question
+
+        write_bank(bank, rewritten(), meta)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--no-variants', action='store_true', help='skip WebP/AVIF encoding')
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help='repoint references but leave duplicate files on disk (duplicates '
+                             'that banks not selected still reference are always kept)')
+    args = parser.parse_args()
+
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    srcs = referenced_images(banks)
+    encoders = [] if args.no_variants else available_encoders()
+    if not args.no_variants and not encoders:
+        print('note: cwebp/avifenc not found; skipping WebP/AVIF variants', file=sys.stderr)
+
+    report = defaultdict(lambda: defaultdict(int))
+    canonical_by_digest = {}
+    canonical = {}  # image path -> path of the identical file that is kept
+    attributes = {}  # kept path -> <img> attributes besides src
+    for path in dict.fromkeys(image_path(src, DATA_DIR) for src in srcs):
+        data = path.read_bytes()
+        stats = report[path.parent.name]
+        stats['files'] += 1
+        stats['before'] += len(data)
+        canonical[path] = canonical_by_digest.setdefault(hashlib.sha256(data).hexdigest(), path)
+        if canonical[path] != path:
+            stats['duplicates'] += 1
+            continue
+        packed = recompress_png(data)
+        if packed != data:
+            path.write_bytes(packed)
+        stats['after'] += len(packed)
+        formats = []
+        for fmt in encoders:
+            size = encode_variant(path, fmt)
+            if size is not None:
+                stats[fmt] += size
+                formats.append(fmt)
+
+        attrs = {}
+        size = image_size(packed)
+        if size:
+            attrs['width'], attrs['height'] = size
+        attrs['loading'] = 'lazy'
+        if formats:
+            attrs['data-formats'] = ' '.join(formats)
+        attributes[path] = attrs
+
+    def describe(src):
+        path = image_path(src, DATA_DIR)
+        if path not in canonical:
+            return None
+        target = canonical[path].relative_to(DATA_DIR).as_posix()
+        # Keep the relative or /data/-absolute spelling the bank already uses.
+        prefix = '/data/' if src.startswith('/data/') else ''
+        return {'src': prefix + target, **attributes[canonical[path]]}
+
+    for bank in banks:
+        changed = rewrite_bank(bank, describe)
+        print(f'{exam_id_for(bank)}: {changed} questions with rewritten <img> tags')
+
+    if not args.keep_duplicates:
+        # Banks that were not selected still point at their own copies.
+        selected = {bank.resolve() for bank in banks}
+        others = [bank for bank in list_banks() if bank.resolve() not in selected]
+        still_used = {image_path(src, DATA_DIR) for src in referenced_images(others)}
+        for path, target in canonical.items():
+            if path != target and path not in still_used:
+                path.unlink()
+
+    for folder, stats in sorted(report.items()):
+        saved = stats['before'] - stats['after']
+        line = (f'images/{folder}: {stats["files"]} files, {stats["duplicates"]} duplicates, '
+                f'{stats["before"] / 1024:.0f} KB -> {stats["after"] / 1024:.0f} KB '
+                f'(-{saved / 1024:.0f} KB, {100 * saved / max(stats["before"], 1):.1f}%)')
+        for fmt in encoders:
+            line += f', {fmt} {stats[fmt] / 1024:.0f} KB'
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
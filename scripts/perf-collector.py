@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Collect client performance measurements and report percentiles per exam and phase.
+
+Serves the endpoint the app reports to when built with VITE_PERF_ENDPOINT (see
+src/lib/perf.ts): every POST body, {"version": 1, "measurements": [...]}, is
+appended one measurement per line to a JSONL file. --report reads that file and
+prints the count, p50 and p95 (nearest rank) of each phase per exam and mode,
+and of the size for phases that report one (bytes written by sync-remote,
+received by sync-receive).
+
+Usage:
+    python3 scripts/perf-collector.py                  # listen on localhost:8787
+    python3 scripts/perf-collector.py --port 9000 --out /tmp/perf.jsonl
+    python3 scripts/perf-collector.py --report         # or --report --json
+"""
+
+import argparse
+import json
+import math
+import sys
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from qbank.bank import ROOT
+
+DEFAULT_OUT = ROOT / '.cache' / 'perf' / 'measurements.jsonl'
+PHASES = ('fetch', 'parse', 'map', 'paint', 'save-local', 'sync-remote', 'sync-receive')
+MAX_BODY = 1 << 20
+
+
+def _valid(measurement):
+    return (isinstance(measurement, dict)
+            and isinstance(measurement.get('examId'), str)
+            and measurement.get('phase') in PHASES
+            and isinstance(measurement.get('ms'), (int, float))
+            and measurement['ms'] >= 0
+            and (measurement.get('size') is None
+                 or isinstance(measurement['size'], (int, float)) and measurement['size'] >= 0))
+
+
+def _handler(out):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status):
+            self.send_response(status)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_OPTIONS(self):
+            self._reply(204)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY:
+                return self._reply(413)
+            try:
+                batch = json.loads(self.rfile.read(length))
+                measurements = [m for m in batch['measurements'] if _valid(m)]
+            except (ValueError, KeyError, TypeError):
+                return self._reply(400)
+            with lock, open(out, 'a', encoding='utf-8') as f:
+                for m in measurements:
+                    f.write(json.dumps(m, ensure_ascii=False) + '\n')
+            self._reply(204)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of sorted `values`."""
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summarize(path):
+    """{(examId, mode, phase): {'count', 'p50', 'p95', 'sizeP50', 'sizeP95'}} from a
+    measurements file; the size percentiles are None for phases without a size."""
+    samples = defaultdict(list)
+    sizes = defaultdict(list)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                m = json.loads(line)
+            except ValueError:
+                continue
+            if _valid(m):
+                key = (m['examId'], m.get('mode') or '', m['phase'])
+                samples[key].append(m['ms'])
+                if m.get('size') is not None:
+                    sizes[key].append(m['size'])
+    summary = {}
+    for key in sorted(samples, key=lambda k: (k[0], k[1], PHASES.index(k[2]))):
+        values = sorted(samples[key])
+        size_values = sorted(sizes.get(key, []))
+        summary[key] = {'count': len(values), 'p50': round(percentile(values, 50), 1),
+                        'p95': round(percentile(values, 95), 1),
+                        'sizeP50': percentile(size_values, 50) if size_values else None,
+                        'sizeP95': percentile(size_values, 95) if size_values else None}
+    return summary
+
+
+def report(path, as_json):
+    if not Path(path).exists():
+        print(f'no measurements in {path}', file=sys.stderr)
+        return 1
+    summary = summarize(path)
+    if as_json:
+        rows = [{'examId': exam_id, 'mode': mode or None, 'phase': phase, **stats}
+                for (exam_id, mode, phase), stats in summary.items()]
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+    print(f'{"exam":<24} {"mode":<9} {"phase":<12} {"count":>7} {"p50 ms":>9} {"p95 ms":>9} '
+          f'{"p50 size":>10} {"p95 size":>10}')
+    for (exam_id, mode, phase), stats in summary.items():
+        size_p50, size_p95 = (
+            '-' if stats[k] is None else f'{stats[k]:.0f}' for k in ('sizeP50', 'sizeP95'))
+        print(f'{exam_id:<24} {mode or "-":<9} {phase:<12} {stats["count"]:>7} '
+              f'{stats["p50"]:>9.1f} {stats["p95"]:>9.1f} {size_p50:>10} {size_p95:>10}')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT,
+                        help='measurements file (default: .cache/perf/measurements.jsonl)')
+    parser.add_argument('--report', action='store_true',
+                        help='print percentiles from --out instead of collecting')
+    parser.add_argument('--json', action='store_true', help='with --report, print JSON')
+    args = parser.parse_args()
+
+    if args.report:
+        return report(args.out, args.json)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    server = ThreadingHTTPServer((args.host, args.port), _handler(args.out))
+    print(f'collecting on http://{args.host}:{args.port} into {args.out}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Minify and precompress the data files of a build.
+
+Runs after `pnpm build` (as `postbuild`): every JSON file under dist/data,
+including shards, search indexes and prompt contexts, is rewritten minified
+with .gz and .br siblings (see qbank/publish.py), then each exam in index.json
+gets a publishedHash over all its published files, which the service worker
+uses to version its cache, and the sizes of its language variants. A size
+and parse-time report is printed and saved, together with the change against
+the previous report.
+
+Usage:
+    python3 scripts/publish-data.py                         # dist/data
+    python3 scripts/publish-data.py --data-dir build/data --report sizes.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from qbank.bank import ROOT
+from qbank.manifest import CACHE_DIR
+from qbank.publish import brotli, data_files, publish_file, stamp_index
+
+DEFAULT_REPORT = CACHE_DIR / 'publish-report.json'
+
+
+def _kb(size):
+    return '-' if size is None else f'{size / 1024:.0f}'
+
+
+def _load_report(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', type=Path, default=ROOT / 'dist' / 'data')
+    parser.add_argument('--report', type=Path, default=DEFAULT_REPORT)
+    args = parser.parse_args()
+
+    if not args.data_dir.is_dir():
+        parser.error(f'{args.data_dir} does not exist; run `pnpm build` first')
+    if brotli is None:
+        print('warning: brotli is not installed; writing .gz siblings only', file=sys.stderr)
+
+    files = {}
+    print(f'{"file":<40} {"raw KB":>8} {"min KB":>8} {"gz KB":>8} {"br KB":>8} {"parse ms":>9}')
+    for path in data_files(args.data_dir):
+        name = path.relative_to(args.data_dir).as_posix()
+        sizes = files[name] = publish_file(path)
+        if '/' not in name:
+            print(f'{name:<40} {_kb(sizes["raw"]):>8} {_kb(sizes["min"]):>8} '
+                  f'{_kb(sizes["gz"]):>8} {_kb(sizes["br"]):>8} {sizes["parseMs"]:>9}')
+
+    # Hashed after minifying so re-running on the same build gives the same hashes.
+    if (args.data_dir / 'index.json').exists():
+        stamped = stamp_index(args.data_dir)
+        files['index.json'] = publish_file(args.data_dir / 'index.json')
+        print(f'index.json: content hashes stamped for {len(stamped)} exams')
+
+    totals = {key: sum(f[key] or 0 for f in files.values()) for key in ('raw', 'min', 'gz', 'br')}
+    if brotli is None:
+        totals['br'] = None
+    print(f'{len(files)} files: {_kb(totals["raw"])} KB raw, {_kb(totals["min"])} KB minified, '
+          f'{_kb(totals["gz"])} KB gzip, {_kb(totals["br"])} KB brotli')
+
+    previous = _load_report(args.report)
+    if previous:
+        for key in ('min', 'gz', 'br'):
+            before = previous['totals'].get(key)
+            if totals[key] is None or before is None:
+                continue
+            delta = totals[key] - before
+            if delta:
+                print(f'  {key}: {delta / 1024:+.1f} KB since last report')
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps({'totals': totals, 'files': files}, indent=2) + '\n',
+                           encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
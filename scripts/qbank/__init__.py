@@ -0,0 +1,6 @@
+"""
+Shared helpers for the question bank data pipeline (public/data/<exam>.json).
+
+Entry points live next to this package in scripts/ and import it directly,
+e.g. `python3 scripts/add-explanations.py SAA-C03`.
+"""
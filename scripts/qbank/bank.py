@@ -0,0 +1,212 @@
+"""
+Streaming read/write of question bank files.
+
+A bank is a JSON object with a "questions" array. Banks grow to several MB of
+multi-language HTML, so questions are decoded one at a time from a buffered
+reader and written one at a time into a temporary file that atomically
+replaces the original. Output matches `json.dump(data, indent=2,
+ensure_ascii=False)` plus a trailing newline, so rewriting an unchanged bank is
+a byte-for-byte no-op; derived files that are shipped as-is are written compact.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / 'public' / 'data'
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+_CHUNK_SIZE = 1 << 16
+
+
+def bank_path(exam, data_dir=DATA_DIR):
+    """Resolve an exam id (`SAA-C03`) or a path to a bank file."""
+    if exam.endswith('.json') or os.sep in exam or '/' in exam:
+        return Path(exam)
+    return Path(data_dir) / f'{exam}.json'
+
+
+def exam_id_for(path):
+    return Path(path).name[: -len('.json')]
+
+
+def correct_labels(answer):
+    """Distinct option labels in a correctAnswer string such as `A,C` or `BD`."""
+    labels = []
+    for ch in (answer or '').upper():
+        if 'A' <= ch <= 'Z' and ch not in labels:
+            labels.append(ch)
+    return labels
+
+
+def list_banks(data_dir=DATA_DIR):
+    """All exam bank files in data_dir, excluding index.json and derived files."""
+    return sorted(
+        p for p in Path(data_dir).glob('*.json')
+        if p.name != 'index.json' and p.stem.count('.') == 0
+    )
+
+
+class _Reader:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f'expected {ch!r} at offset {self.pos}, got {self.peek()!r}')
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal may be cut at the buffer boundary (`12` of
+            # `123`, `-1` of `-1.5e10`); only accept it once a delimiter
+            # follows or the file has ended.
+            if (self.buf[self.pos] in '{["' or self.eof
+                    or (end < len(self.buf) and self.buf[end] in _DELIMITERS)):
+                self.pos = end
+                return value
+            if not self._fill():
+                self.pos = end
+                return value
+
+
+def iter_questions(path, meta=None, chunk_size=_CHUNK_SIZE):
+    """
+    Yield questions from a bank file without loading the whole document.
+
+    Top-level keys other than "questions" are decoded into `meta` (if given)
+    as they are reached, so callers that need them should pass a dict and read
+    it after iteration finishes.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == 'questions':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.peek() == ',':
+                            reader.pos += 1
+                            continue
+                        reader.expect(']')
+                        break
+            else:
+                value = reader.value()
+                if meta is not None:
+                    meta[key] = value
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+def _indent(text, prefix):
+    return '\n'.join(prefix + line for line in text.split('\n'))
+
+
+def _write_indented(out, questions, meta):
+    count = 0
+    out.write('{\n  "questions": [')
+    for question in questions:
+        out.write(',\n' if count else '\n')
+        out.write(_indent(json.dumps(question, ensure_ascii=False, indent=2), '    '))
+        count += 1
+    out.write('\n  ]' if count else ']')
+    for key, value in (meta or {}).items():
+        encoded = json.dumps(value, ensure_ascii=False, indent=2)
+        out.write(f',\n  {json.dumps(key, ensure_ascii=False)}: ')
+        out.write(_indent(encoded, '  ')[2:])
+    out.write('\n}\n')
+    return count
+
+
+def _write_compact(out, questions, meta):
+    count = 0
+    out.write('{"questions":[')
+    for question in questions:
+        if count:
+            out.write(',')
+        out.write(json.dumps(question, ensure_ascii=False, separators=(',', ':')))
+        count += 1
+    out.write(']')
+    for key, value in (meta or {}).items():
+        out.write(f',{json.dumps(key, ensure_ascii=False)}:')
+        out.write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+    out.write('}')
+    return count
+
+
+def write_bank(path, questions, meta=None, compact=False):
+    """
+    Atomically write `questions` (any iterable) to path and return the count.
+
+    The iterable may read from the same path: output goes to a temporary file
+    in the same directory and only replaces the original once complete. `meta`
+    keys are written after the questions array, so a dict being filled by
+    iter_questions() is complete by the time it is needed. `compact` drops all
+    whitespace, as for files served to the browser.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            count = (_write_compact if compact else _write_indented)(out, questions, meta)
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp creates 0600 files; keep the original's mode (or the umask default).
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return count
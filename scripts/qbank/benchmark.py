@@ -0,0 +1,178 @@
+"""
+Pipeline stages run one at a time against a synthetic bank, for benchmarking.
+
+Each stage does what the corresponding script does, but inside a given data
+directory rather than public/data:
+
+    generate      synthetic bank, images and explanation source (qbank/synthetic.py)
+    explanations  merge the explanation source into the bank (add-explanations.py)
+    manifest      per-question content hashes and bank digest (qbank/manifest.py)
+    validate      check the bank and its images (validate-banks.py)
+    index         question count, stats and content hash into index.json (build-index.py)
+    variants      per-language banks with pre-parsed HTML (build-language-variants.py)
+    shards        manifest and 50-question shards (build-shards.py)
+    search        per-language search indexes (build-search-index.py)
+    prompts       per-language AI prompt contexts (build-prompt-context.py)
+    publish       minify, precompress and stamp content hashes (publish-data.py)
+
+`measure` runs a stage in a freshly spawned interpreter so its peak resident
+memory is its own rather than the high-water mark of everything before it.
+The interpreter's own footprint is included; `measure('baseline')` reports it.
+"""
+
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .bank import iter_questions, write_bank
+from .catalog import exam_stats
+from .explanations import apply_incremental, load_explanations
+from .html_nodes import preparse_question
+from .manifest import file_digest, question_hash, save_manifest
+from .prompt_context import build_contexts, write_shards as write_prompt_shards
+from .publish import data_files, publish_file, stamp_index
+from .search_index import build_index, encode as encode_index
+from .shards import build_shards
+from .synthetic import generate
+from .validate import ERROR, validate_bank
+from .variants import LANGUAGES, localize_question
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def _bank(data_dir, exam_id):
+    return Path(data_dir) / f'{exam_id}.json'
+
+
+def _generate(data_dir, exam_id, count, seed):
+    result = generate(data_dir, exam_id, count, seed)
+    return {'bankBytes': result['bank'].stat().st_size, 'images': result['images']}
+
+
+def _explanations(data_dir, exam_id):
+    bank = _bank(data_dir, exam_id)
+    explanations = load_explanations([Path(data_dir) / f'{exam_id}.explanations.jsonl'])
+    # A first run, as after `generate`: no manifest, so every record is applied.
+    result = apply_incremental(bank, explanations, {})
+    touched = len(result[1]) if result else 0
+    return {'records': len(explanations), 'touched': touched, 'bankBytes': bank.stat().st_size}
+
+
+def _manifest(data_dir, exam_id):
+    bank = _bank(data_dir, exam_id)
+    hashes = {q['id']: question_hash(q) for q in iter_questions(bank)}
+    save_manifest(exam_id, {'bank': file_digest(bank), 'questions': hashes},
+                  cache_dir=Path(data_dir).parent / 'cache')
+    return {'questions': len(hashes)}
+
+
+def _validate(data_dir, exam_id):
+    _, count, problems = validate_bank(_bank(data_dir, exam_id), data_dir)
+    errors = sum(1 for severity, _, _ in problems if severity == ERROR)
+    return {'questions': count, 'errors': errors, 'warnings': len(problems) - errors}
+
+
+def _index(data_dir, exam_id):
+    stats = exam_stats(_bank(data_dir, exam_id))
+    entry = {'id': exam_id, 'title': exam_id, 'description': '', **stats}
+    (Path(data_dir) / 'index.json').write_text(
+        json.dumps({'exams': [entry]}, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    return {'contentHash': stats['contentHash']}
+
+
+def _variants(data_dir, exam_id):
+    bank = _bank(data_dir, exam_id)
+    sizes = {}
+    for language in LANGUAGES:
+        out = bank.with_name(f'{exam_id}.{language}.json')
+        meta = {}
+        write_bank(out, (preparse_question(localize_question(q, language))
+                         for q in iter_questions(bank, meta)), meta, compact=True)
+        sizes[language] = out.stat().st_size
+    return {'bytes': sizes}
+
+
+def _shards(data_dir, exam_id):
+    count, _ = build_shards(_bank(data_dir, exam_id), exam_id, Path(data_dir) / 'shards')
+    return {'shards': count}
+
+
+def _per_language(data_dir, exam_id, folder, build, encode):
+    out_dir = Path(data_dir) / folder
+    out_dir.mkdir(parents=True, exist_ok=True)
+    questions = list(iter_questions(_bank(data_dir, exam_id)))
+    sizes = {}
+    for language in LANGUAGES:
+        data = encode(build(questions, exam_id, language))
+        (out_dir / f'{exam_id}.{language}.json').write_bytes(data)
+        sizes[language] = len(data)
+    return {'bytes': sizes}
+
+
+def _search(data_dir, exam_id):
+    return _per_language(data_dir, exam_id, 'search', build_index, encode_index)
+
+
+def _prompts(data_dir, exam_id):
+    questions = list(iter_questions(_bank(data_dir, exam_id)))
+    contexts = {language: build_contexts(questions, exam_id, language) for language in LANGUAGES}
+    sizes, _ = write_prompt_shards(questions, contexts, Path(data_dir) / 'prompts')
+    return {'bytes': sizes}
+
+
+def _publish(data_dir, exam_id):
+    totals = {'raw': 0, 'min': 0, 'gz': 0}
+    for path in data_files(data_dir):
+        sizes = publish_file(path)
+        for key in totals:
+            totals[key] += sizes[key]
+    stamp_index(data_dir)
+    return {'bytes': totals}
+
+
+STAGES = {
+    'baseline': lambda *args: None,
+    'generate': _generate,
+    'explanations': _explanations,
+    'manifest': _manifest,
+    'validate': _validate,
+    'index': _index,
+    'variants': _variants,
+    'shards': _shards,
+    'search': _search,
+    'prompts': _prompts,
+    'publish': _publish,
+}
+
+PIPELINE = tuple(name for name in STAGES if name != 'baseline')
+
+
+def _run(name, args):
+    started = time.perf_counter()
+    detail = STAGES[name](*args)
+    result = {'ms': round((time.perf_counter() - started) * 1000, 1), 'peakRssMb': peak_rss_mb()}
+    if detail:
+        result['detail'] = detail
+    return result
+
+
+def measure(name, *args):
+    """Run stage `name` with args in a new interpreter; returns its time, peak memory and details."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run, name, args).result()
@@ -0,0 +1,55 @@
+"""
+Per-exam statistics for public/data/index.json.
+
+`exam_stats` streams a bank once and returns its question count, type
+breakdown, case-study count, languages covered, content hash and byte size.
+The content hash covers every question's canonical JSON, so it changes with
+the content and not with formatting.
+"""
+
+import hashlib
+import json
+from collections import Counter
+from pathlib import Path
+
+from .bank import iter_questions
+from .variants import LANGUAGES
+
+
+def _languages(question):
+    found = set()
+    if (question.get('content') or '').strip():
+        found.add('en')
+    for key in ('contents', 'explanations'):
+        value = question.get(key)
+        if isinstance(value, dict):
+            found.update(lang for lang, text in value.items() if isinstance(text, str) and text.strip())
+    return found
+
+
+def exam_stats(path):
+    path = Path(path)
+    digest = hashlib.sha256()
+    types = Counter()
+    languages = set()
+    count = 0
+    case_studies = 0
+    for question in iter_questions(path):
+        count += 1
+        types[question.get('type') or 'single'] += 1
+        if question.get('caseId'):
+            case_studies += 1
+        languages |= _languages(question)
+        digest.update(json.dumps(question, sort_keys=True, ensure_ascii=False,
+                                 separators=(',', ':')).encode('utf-8'))
+    return {
+        'questionCount': count,
+        'bytes': path.stat().st_size,
+        'contentHash': digest.hexdigest()[:16],
+        'stats': {
+            'types': dict(sorted(types.items())),
+            'caseStudies': case_studies,
+            'languages': [lang for lang in LANGUAGES if lang in languages]
+            + sorted(languages - set(LANGUAGES)),
+        },
+    }
@@ -0,0 +1,135 @@
+"""
+Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+A question's text is its stem plus its options with the HTML stripped,
+lowercased and split into word shingles. Each shingle set is reduced to a
+MinHash signature, and the signature is cut into bands. Questions sharing any
+band become candidate pairs. Candidates are confirmed with the exact Jaccard
+similarity of their shingle sets, so the work stays close to linear in the
+number of questions instead of comparing every pair.
+"""
+
+import hashlib
+import html
+import re
+from array import array
+from collections import defaultdict
+
+from .bank import iter_questions
+
+# 16 bands of 4 rows make pairs above ~0.5 similarity likely candidates and
+# catch 0.8-similar pairs with probability > 0.999.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+
+def plain_text(markup):
+    return html.unescape(_TAG.sub(' ', markup or ''))
+
+
+def question_text(question):
+    options = sorted(question.get('options') or [], key=lambda o: o.get('label') or '')
+    return ' '.join([plain_text(question.get('content'))]
+                    + [plain_text(o.get('content')) for o in options])
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(shingle_set, num_perm=NUM_PERM):
+    """MinHash signature: per slot, the minimum of an independent 32-bit hash."""
+    if not shingle_set:
+        return ()
+    # One SHAKE digest yields num_perm independent 32-bit hashes per shingle;
+    # zip/min then runs the per-slot minimum in C.
+    hashes = [array('I', hashlib.shake_128(s.encode('utf-8')).digest(4 * num_perm))
+              for s in shingle_set]
+    return tuple(map(min, zip(*hashes)))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def load_entries(banks):
+    """[(exam id, question, shingle set)] for every question of every bank."""
+    entries = []
+    for exam_id, path in banks:
+        for question in iter_questions(path):
+            entries.append((exam_id, question, shingles(question_text(question))))
+    return entries
+
+
+def find_duplicates(entries, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+    """Return (entry indexes, weakest confirmed similarity) for each duplicate cluster."""
+    rows = NUM_PERM // bands
+    buckets = defaultdict(list)
+    for i, (_, _, shingle_set) in enumerate(entries):
+        sig = signature(shingle_set)
+        if not sig:
+            continue
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(i)
+
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    similarity = {}
+    for bucket in buckets.values():
+        for x in range(len(bucket)):
+            for y in range(x + 1, len(bucket)):
+                pair = (bucket[x], bucket[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                score = jaccard(entries[pair[0]][2], entries[pair[1]][2])
+                if score >= threshold:
+                    similarity[pair] = score
+                    parent[find(pair[1])] = find(pair[0])
+
+    members = defaultdict(list)
+    for i in range(len(entries)):
+        members[find(i)].append(i)
+    weakest = {}
+    for (a, _), score in similarity.items():
+        root = find(a)
+        weakest[root] = min(score, weakest.get(root, 1.0))
+    return sorted((members[root], score) for root, score in weakest.items())
+
+
+def canonical_ids(entries, clusters):
+    """{exam id: {duplicate id: canonical id}} for clusters within one exam.
+
+    The canonical question is the lowest-numbered one. Members from other
+    exams are left out because progress is stored per exam.
+    """
+    mapping = defaultdict(dict)
+    for cluster, _ in clusters:
+        by_exam = defaultdict(list)
+        for i in cluster:
+            exam_id, question, _ = entries[i]
+            by_exam[exam_id].append(question)
+        for exam_id, questions in by_exam.items():
+            if len(questions) < 2:
+                continue
+            questions.sort(key=lambda q: q.get('questionNumber') or 0)
+            for question in questions[1:]:
+                mapping[exam_id][question['id']] = questions[0]['id']
+    return dict(mapping)
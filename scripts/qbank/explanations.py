@@ -0,0 +1,126 @@
+"""
+Explanation sources: JSONL files with one record per question.
+
+Each line looks like
+
+    {"questionNumber": 1, "explanation": "<p>...</p>", "explanations": {"en": "...", "ja": "..."}}
+
+`explanation` sets the legacy single-language field and `explanations` is
+merged into the question's per-language map. When several sources mention the
+same question, later sources win per field and per language.
+
+`apply_incremental` applies merged records to a bank against the build
+manifest of the previous run (see qbank/manifest.py): an unchanged bank with
+unchanged sources is skipped without parsing it, questions whose record is
+unchanged keep their recorded content hash instead of being re-applied, and
+the bank is only rewritten when a question's content hash actually changes.
+"""
+
+import json
+from pathlib import Path
+
+from .bank import iter_questions, write_bank
+from .manifest import file_digest, question_hash, record_hash
+
+SOURCES_DIR = Path(__file__).resolve().parents[1] / 'explanations'
+
+
+def default_sources(exam_id):
+    path = SOURCES_DIR / f'{exam_id}.jsonl'
+    return [path] if path.exists() else []
+
+
+def iter_records(path):
+    """Yield records from a JSONL file, skipping blank lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'{path}:{line_no}: {e.msg}') from None
+            if not isinstance(record.get('questionNumber'), int):
+                raise ValueError(f'{path}:{line_no}: missing integer questionNumber')
+            yield record
+
+
+def load_explanations(paths):
+    """Merge records from all sources into {questionNumber: record}."""
+    merged = {}
+    for path in paths:
+        for record in iter_records(path):
+            current = merged.setdefault(record['questionNumber'], {})
+            if 'explanation' in record:
+                current['explanation'] = record['explanation']
+            if isinstance(record.get('explanations'), dict):
+                current.setdefault('explanations', {}).update(record['explanations'])
+    return merged
+
+
+def apply_explanation(question, record):
+    """Apply one merged record to a question in place."""
+    if 'explanation' in record:
+        question['explanation'] = record['explanation']
+    if 'explanations' in record:
+        question['explanations'] = {**(question.get('explanations') or {}), **record['explanations']}
+
+
+def apply_incremental(path, explanations, manifest):
+    """Apply `explanations` to the bank at `path`, skipping what `manifest`
+    shows was already applied ({} to apply everything).
+
+    Returns None when the bank and sources are as recorded, and otherwise
+    (new manifest, ids of the questions changed, question count, numbers of
+    the records that matched a question).
+    """
+    source_hashes = {str(n): record_hash(r) for n, r in explanations.items()}
+    digest = file_digest(path)
+    if manifest.get('bank') == digest and manifest.get('sources') == source_hashes:
+        return None
+
+    # If the bank is as last written, questions whose source record is also
+    # unchanged still match their recorded hash and need not be re-applied.
+    known = manifest.get('questions', {}) if manifest.get('bank') == digest else {}
+    previous_sources = manifest.get('sources', {})
+    changed = {int(n) for n, h in source_hashes.items() if previous_sources.get(n) != h}
+
+    # First pass: apply in memory one question at a time and hash, to find out
+    # whether anything changes before committing to a rewrite.
+    hashes = {}
+    touched = set()
+    seen = set()
+    total = 0
+    for question in iter_questions(path):
+        total += 1
+        if question['id'] in known and question['questionNumber'] not in changed:
+            if question['questionNumber'] in explanations:
+                seen.add(question['questionNumber'])
+            hashes[question['id']] = known[question['id']]
+            continue
+        record = explanations.get(question['questionNumber'])
+        if record is not None:
+            seen.add(question['questionNumber'])
+            before = question_hash(question)
+            apply_explanation(question, record)
+            after = question_hash(question)
+            if after != before:
+                touched.add(question['id'])
+        else:
+            after = question_hash(question)
+        hashes[question['id']] = after
+
+    if touched:
+        meta = {}
+
+        def updated():
+            for question in iter_questions(path, meta):
+                if question['id'] in touched:
+                    apply_explanation(question, explanations[question['questionNumber']])
+                yield question
+
+        write_bank(path, updated(), meta)
+        digest = file_digest(path)
+
+    return {'bank': digest, 'sources': source_hashes, 'questions': hashes}, touched, total, seen
@@ -0,0 +1,130 @@
+"""
+Sanitized, pre-parsed question HTML.
+
+The exam pages render question HTML as React elements. Instead of parsing
+every string with DOMParser each time a question is shown, language variants
+carry the parse result as a compact JSON tree that the pages render directly
+(src/features/exams/components/exam-html.tsx, which also applies the same
+rules when it has to parse raw HTML from an older file):
+
+    node := "text" | [tag, [node, ...]] | [tag, [node, ...], {attribute: value}]
+
+Only the tags the renderer styles keep their name; any other element becomes
+a span around its children. Script-like elements are dropped with their
+content, whitespace-only text is dropped (the renderer ignores it) and only
+images keep attributes.
+"""
+
+import re
+from html.parser import HTMLParser
+
+TAGS = frozenset(('p', 'br', 'strong', 'em', 'code', 'ul', 'ol', 'li', 'img'))
+DROPPED = frozenset(('script', 'style', 'template', 'iframe', 'object', 'embed', 'noscript'))
+IMG_ATTRIBUTES = ('src', 'alt', 'width', 'height', 'data-formats')
+
+_VOID = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                   'source', 'track', 'wbr'))
+# Start tags that implicitly close an open <p>, as in the HTML parsing algorithm.
+_CLOSES_P = frozenset(('address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl',
+                       'fieldset', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                       'header', 'hr', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul'))
+_SCHEME = re.compile(r'^\s*([a-z][a-z0-9+.-]*):', re.IGNORECASE)
+
+
+def _safe_src(src):
+    scheme = _SCHEME.match(src)
+    return scheme is None or scheme.group(1).lower() in ('http', 'https')
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = []
+        # (source tag, children list) of open elements
+        self.stack = []
+        self.dropped = 0
+
+    def _children(self):
+        return self.stack[-1][1] if self.stack else self.root
+
+    def _close(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                return
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropped or tag in DROPPED:
+            if tag in DROPPED and tag not in _VOID:
+                self.dropped += 1
+            return
+        open_tags = [t for t, _ in self.stack]
+        if tag in _CLOSES_P and 'p' in open_tags:
+            self._close('p')
+        elif tag == 'li' and 'li' in open_tags:
+            last_list = max((i for i, t in enumerate(open_tags) if t in ('ul', 'ol')), default=-1)
+            if open_tags[::-1].index('li') < len(open_tags) - 1 - last_list:
+                self._close('li')
+
+        name = tag if tag in TAGS else 'span'
+        if name == 'img':
+            values = dict(attrs)
+            kept = {k: values[k] for k in IMG_ATTRIBUTES if values.get(k) is not None}
+            if not _safe_src(kept.get('src', '')):
+                return
+            self._children().append(['img', [], kept])
+            return
+        node = [name, []]
+        self._children().append(node)
+        if tag not in _VOID:
+            self.stack.append((tag, node[1]))
+
+    def handle_startendtag(self, tag, attrs):
+        # HTML ignores the self-closing slash: `<p/>` opens a paragraph.
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if self.dropped:
+            if tag in DROPPED and tag not in _VOID:
+                self.dropped -= 1
+            return
+        if tag == 'p' and all(t != 'p' for t, _ in self.stack):
+            # A stray </p> (e.g. after a <div> closed the paragraph) makes an
+            # empty paragraph, as it does in the browser's DOM.
+            self._children().append(['p', []])
+            return
+        self._close(tag)
+
+    def handle_data(self, data):
+        if self.dropped:
+            return
+        if data.strip():
+            self._children().append(data)
+
+
+def parse_html(markup):
+    """Sanitized node list of an HTML string."""
+    builder = _TreeBuilder()
+    builder.feed(markup or '')
+    builder.close()
+    return builder.root
+
+
+def preparse_question(question):
+    """Replace the HTML strings of a localized question with node trees.
+
+    Expects the single-language shape written by qbank/variants.py. A field
+    containing markup (`content`, `explanation`, option `content`) is replaced
+    by its tree under `contentNodes` / `explanationNodes`; plain strings are
+    left as they are.
+    """
+    def convert(container, field):
+        value = container.get(field)
+        if isinstance(value, str) and '<' in value:
+            container[f'{field}Nodes'] = parse_html(container.pop(field))
+
+    convert(question, 'content')
+    convert(question, 'explanation')
+    for option in question.get('options') or []:
+        convert(option, 'content')
+    return question
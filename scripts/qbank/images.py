@@ -0,0 +1,154 @@
+"""
+Question image assets under public/data/images/<exam>/.
+
+Helpers to read intrinsic dimensions, recompress PNGs losslessly, encode
+WebP/AVIF siblings and rewrite the `<img>` tags in question HTML. PNG
+recompression only needs zlib: ancillary metadata chunks are dropped and the
+image data is re-deflated at the highest level, leaving every pixel intact.
+WebP and AVIF use the `cwebp` and `avifenc` command-line encoders when they
+are installed and are skipped otherwise.
+"""
+
+import re
+import shutil
+import struct
+import subprocess
+import zlib
+from pathlib import Path
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Chunks that affect how pixels are decoded or displayed; everything else
+# (text, timestamps, editor metadata) is dropped.
+_KEEP_CHUNKS = {b'IHDR', b'PLTE', b'tRNS', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'sBIT', b'pHYs'}
+
+# format -> (sibling suffix, encoder binary, lossless encoder arguments)
+ENCODERS = {
+    'avif': ('.avif', 'avifenc', lambda src, dst: ['--lossless', '--speed', '4', str(src), str(dst)]),
+    'webp': ('.webp', 'cwebp', lambda src, dst: ['-quiet', '-lossless', '-z', '9', str(src), '-o', str(dst)]),
+}
+
+# Banks reference images relative to /data (`images/...`) or absolutely
+# (`/data/images/...`).
+IMAGE_SRC = re.compile(r'''src=["']((?:/data/)?images/[^"']+)["']''')
+_IMG_TAG = re.compile(r'<img\b([^>]*?)\s*/?>', re.IGNORECASE)
+_ATTR = re.compile(r'''([\w:-]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?''')
+
+
+def image_path(src, data_dir):
+    """Path of an image src on disk."""
+    return Path(data_dir) / src.removeprefix('/data/')
+
+
+def _chunks(data):
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IEND':
+            return
+
+
+def png_chunk(kind, body):
+    """A PNG chunk: length, type, body and CRC."""
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def image_size(data):
+    """(width, height) of PNG, GIF or JPEG data, or None when unrecognized."""
+    if data.startswith(PNG_SIGNATURE) and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', data[6:10])
+    if data[:2] == b'\xff\xd8':
+        pos = 2
+        while pos + 9 < len(data):
+            if data[pos] != 0xFF:
+                pos += 1
+                continue
+            marker = data[pos + 1]
+            length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                return width, height
+            pos += 2 + length
+    return None
+
+
+def recompress_png(data):
+    """Return a lossless, smaller re-encoding of PNG data, or the data unchanged."""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    kept = []
+    idat = []
+    for kind, body in _chunks(data):
+        if kind == b'IDAT':
+            idat.append(body)
+        elif kind in _KEEP_CHUNKS:
+            kept.append((kind, body))
+    try:
+        raw = zlib.decompress(b''.join(idat))
+    except zlib.error:
+        return data
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9)
+    packed = compressor.compress(raw) + compressor.flush()
+    out = bytearray(PNG_SIGNATURE)
+    # Every kept chunk type is only valid before the image data, so writing
+    # them in their original order followed by a single IDAT stays valid.
+    for kind, body in kept:
+        out += png_chunk(kind, body)
+    out += png_chunk(b'IDAT', packed) + png_chunk(b'IEND', b'')
+    return bytes(out) if len(out) < len(data) else data
+
+
+def available_encoders():
+    return [fmt for fmt, (_, binary, _) in ENCODERS.items() if shutil.which(binary)]
+
+
+def encode_variant(path, fmt):
+    """Write the `fmt` sibling of path if missing or stale; return its size or None."""
+    suffix, binary, arguments = ENCODERS[fmt]
+    target = path.with_suffix(suffix)
+    if not target.exists() or target.stat().st_mtime < path.stat().st_mtime:
+        result = subprocess.run([binary, *arguments(path, target)], capture_output=True)
+        if result.returncode != 0 or not target.exists():
+            return None
+    return target.stat().st_size
+
+
+def parse_attrs(attr_text):
+    attrs = {}
+    for name, value in _ATTR.findall(attr_text):
+        if value[:1] in ('"', "'"):
+            value = value[1:-1]
+        attrs[name.lower()] = value
+    return attrs
+
+
+def rewrite_img_tags(markup, describe):
+    """Rewrite every <img> in markup using describe(src) -> attribute updates or None."""
+    def replace(match):
+        attrs = parse_attrs(match.group(1))
+        updates = describe(attrs.get('src', ''))
+        if not updates:
+            return match.group(0)
+        attrs.update(updates)
+        parts = [f"{name}='{value}'" if '"' in str(value) else f'{name}="{value}"'
+                 for name, value in attrs.items()]
+        return '<img ' + ' '.join(parts) + '>'
+
+    return _IMG_TAG.sub(replace, markup)
+
+
+def html_fields(question):
+    """(container, key) of every HTML string in a question, including translations."""
+    fields = [(question, 'content'), (question, 'explanation')]
+    for key in ('contents', 'explanations'):
+        if isinstance(question.get(key), dict):
+            fields.extend((question[key], lang) for lang in question[key])
+    for option in question.get('options') or []:
+        fields.append((option, 'content'))
+        if isinstance(option.get('contents'), dict):
+            fields.extend((option['contents'], lang) for lang in option['contents'])
+    return [(c, k) for c, k in fields if isinstance(c.get(k), str)]
@@ -0,0 +1,63 @@
+"""
+Build manifests for incremental rebuilds.
+
+A manifest records, per exam, the digest of the bank file as last written, a
+hash of every explanation source record that was applied, and a content hash
+per question id. Re-runs compare against it to skip unchanged banks without
+parsing them and to touch only questions whose inputs changed.
+
+Manifests are a local build cache (.cache/qbank/), not shipped data.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .bank import ROOT
+
+CACHE_DIR = ROOT / '.cache' / 'qbank'
+
+# Fields that determine what a question renders; bookkeeping fields such as
+# `bookmarked` or `hasNote` are deliberately excluded.
+HASHED_FIELDS = ('content', 'contents', 'options', 'explanation', 'explanations')
+
+
+def _digest(value):
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def question_hash(question):
+    return _digest({field: question.get(field) for field in HASHED_FIELDS})
+
+
+def record_hash(record):
+    return _digest(record)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def manifest_path(exam_id, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f'{exam_id}.manifest.json'
+
+
+def load_manifest(exam_id, cache_dir=CACHE_DIR):
+    try:
+        with open(manifest_path(exam_id, cache_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(exam_id, manifest, cache_dir=CACHE_DIR):
+    path = manifest_path(exam_id, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,139 @@
+"""
+Compact plain-text context for the AI tutor, per question and language.
+
+The chat panel sends the current question to the model with every request
+(see src/features/exams/components/ai-chat-prompt.ts). Built in the browser,
+that context carries whatever the bank holds; built here it is the text shown
+in one language (see qbank/variants.py) with markup stripped: the stem, the
+options labelled A, B, ... in display order, the correct letters, and the
+leading sentences of the explanation up to SUMMARY_TOKENS.
+
+Token counts are estimates, not a tokenizer: one token per CJK character and
+one per four other characters, which is close enough to compare contexts and
+keep the summary short.
+
+Contexts are published in pages, like the bank shards (see qbank/shards.py),
+so the chat panel fetches a few kilobytes for the question it is on instead
+of every question in the exam. For each exam, public/data/prompts/<exam>/
+holds (compact JSON):
+
+    manifest.json               {"version": 1, "examId": ..., "shardSize": 50,
+                                 "ids": [<question ids by questionNumber>]}
+    <lang>/shard-000.json       {"version": 1, "examId": ..., "language": ...,
+                                 "questions": {"<question id>":
+                                               {"text": ..., "tokens": ...}}}
+
+Shard n holds the questions at ids[n * shardSize:(n + 1) * shardSize].
+"""
+
+import json
+import math
+import re
+from pathlib import Path
+
+from .bank import correct_labels
+from .search_index import plain_text
+from .shards import DEFAULT_SHARD_SIZE, write_if_changed
+from .variants import localize_question
+
+VERSION = 1
+SUMMARY_TOKENS = 120
+
+_CJK = re.compile('[぀-ヿ㐀-䶿一-鿿豈-﫿]')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])')
+
+
+def estimate_tokens(text):
+    cjk = len(_CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def summarize(text, budget=SUMMARY_TOKENS):
+    """Leading sentences of text within budget tokens; the first is cut if it alone is over."""
+    summary = ''
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f'{summary} {sentence}'.strip() if summary else sentence
+        if estimate_tokens(candidate) > budget:
+            break
+        summary = candidate
+    if summary or not text:
+        return summary
+    cut = text
+    while estimate_tokens(cut) > budget:
+        cut = cut[: max(len(cut) * budget // estimate_tokens(cut), 1) - 1]
+    return cut.rstrip() + '…'
+
+
+def _render(localized, question, explanation):
+    options = sorted(localized['options'], key=lambda o: o.get('label') or '')
+    labels = [o.get('label') for o in options]
+    correct = [chr(65 + labels.index(label))
+               for label in correct_labels(question.get('correctAnswer')) if label in labels]
+
+    lines = ['Question:', plain_text(localized['content']), '', 'Options:']
+    lines.extend(f'{chr(65 + i)}. {plain_text(o["content"])}' for i, o in enumerate(options))
+    lines.extend(['', f'Correct answer: {", ".join(correct)}'])
+    if explanation:
+        lines.extend(['', explanation])
+    return '\n'.join(lines)
+
+
+def build_context(question, language):
+    """The prompt text for one bank question as shown in `language`."""
+    localized = localize_question(question, language)
+    summary = summarize(plain_text(localized['explanation']))
+    return _render(localized, question, summary and f'Explanation summary: {summary}')
+
+
+def build_contexts(questions, exam_id, language):
+    """Build the serializable prompt contexts for an iterable of bank questions."""
+    contexts = {}
+    for question in questions:
+        if not question.get('id'):
+            continue
+        text = build_context(question, language)
+        contexts[question['id']] = {'text': text, 'tokens': estimate_tokens(text)}
+    return {'version': VERSION, 'examId': exam_id, 'language': language, 'questions': contexts}
+
+
+def full_tokens(question, language):
+    """Estimated tokens of the context as the browser builds it, for comparison:
+    the same layout with the whole explanation, markup included."""
+    localized = localize_question(question, language)
+    explanation = localized['explanation']
+    return estimate_tokens(_render(
+        localized, question, explanation and f'Existing explanation (for reference): {explanation}'))
+
+
+def encode(contexts):
+    return json.dumps(contexts, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_shards(questions, contexts, out_dir, shard_size=DEFAULT_SHARD_SIZE):
+    """Write one exam's manifest and, for each {language: build_contexts(...)}
+    in contexts, its shards under out_dir/<exam>/. Returns ({language: bytes},
+    files written)."""
+    ids = [q['id'] for q in sorted(questions, key=lambda q: q['questionNumber']) if q.get('id')]
+    exam_id = next(iter(contexts.values()))['examId']
+    exam_dir = Path(out_dir) / exam_id
+    exam_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'version': VERSION, 'examId': exam_id, 'shardSize': shard_size, 'ids': ids}
+    written = write_if_changed(exam_dir / 'manifest.json', encode(manifest))
+
+    sizes = {}
+    for language, built in contexts.items():
+        lang_dir = exam_dir / language
+        lang_dir.mkdir(exist_ok=True)
+        names = set()
+        sizes[language] = 0
+        for start in range(0, len(ids), shard_size):
+            name = f'shard-{len(names):03d}.json'
+            page = {i: built['questions'][i] for i in ids[start:start + shard_size]}
+            data = encode({**built, 'questions': page})
+            written += write_if_changed(lang_dir / name, data)
+            names.add(name)
+            sizes[language] += len(data)
+        for stale in lang_dir.glob('shard-*.json'):
+            if stale.name not in names:
+                stale.unlink()
+    return sizes, written
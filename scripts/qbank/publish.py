@@ -0,0 +1,121 @@
+"""
+Publish-time compaction of data files.
+
+Each JSON file is rewritten without whitespace and gets `.gz` and `.br`
+siblings so a host that serves precompressed assets can send them as-is.
+Compression is deterministic (no timestamps), so unchanged content produces
+byte-identical artifacts. Brotli output needs the optional `brotli` package;
+without it only gzip siblings are written.
+
+`stamp_index` adds each exam's `publishedHash` to the published index.json:
+a hash of every file published for it (bank, language variants, search
+indexes, prompt contexts, shards), so a change to any generated file gives
+the exam a new hash and the service worker (public/sw.js) fetches its files
+again. The bank's own `contentHash` from build-index.py is left as is. It
+also records `variantBytes`, the size of each published language variant,
+which is what the pages download for that language.
+"""
+
+import gzip
+import hashlib
+import json
+import statistics
+import time
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+PARSE_RUNS = 5
+
+
+def minify(data):
+    value = json.loads(data)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def parse_ms(data, runs=PARSE_RUNS):
+    """Median wall time of json.loads over `runs` parses, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        json.loads(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def publish_file(path):
+    """Minify path in place, write its compressed siblings and return its sizes."""
+    path = Path(path)
+    raw = path.read_bytes()
+    minified = minify(raw)
+    path.write_bytes(minified)
+
+    gz = gzip.compress(minified, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(gz)
+    sizes = {'raw': len(raw), 'min': len(minified), 'gz': len(gz), 'br': None}
+    if brotli is not None:
+        br = brotli.compress(minified, quality=11)
+        path.with_name(path.name + '.br').write_bytes(br)
+        sizes['br'] = len(br)
+    sizes['parseMs'] = parse_ms(minified)
+    return sizes
+
+
+def data_files(data_dir):
+    """Every JSON file under data_dir, in every generated directory."""
+    return sorted(Path(data_dir).rglob('*.json'))
+
+
+def exam_of(name):
+    """The exam a data file (path relative to the data dir) belongs to, or None."""
+    parts = name.split('/')
+    if len(parts) == 1:
+        file = parts[0]
+    elif parts[0] in ('search', 'shards', 'prompts'):
+        file = parts[1]
+    else:
+        return None
+    return None if file == 'index.json' else file.split('.')[0]
+
+
+def published_hashes(data_dir):
+    """Per exam, a hash over the names and bytes of all its JSON files."""
+    data_dir = Path(data_dir)
+    digests = {}
+    for path in sorted(data_dir.rglob('*.json')):
+        name = path.relative_to(data_dir).as_posix()
+        exam = exam_of(name)
+        if exam is None:
+            continue
+        digest = digests.setdefault(exam, hashlib.sha256())
+        digest.update(name.encode('utf-8') + b'\0')
+        digest.update(path.read_bytes())
+    return {exam: digest.hexdigest()[:16] for exam, digest in digests.items()}
+
+
+def variant_bytes(data_dir, exam_id):
+    """Size of each published `{exam_id}.{lang}.json` variant, by language."""
+    sizes = {}
+    for path in sorted(Path(data_dir).glob(f'{exam_id}.*.json')):
+        lang = path.name[len(exam_id) + 1:-len('.json')]
+        if '.' not in lang:
+            sizes[lang] = path.stat().st_size
+    return sizes
+
+
+def stamp_index(data_dir):
+    """Write published_hashes and variant sizes into index.json; returns the exams stamped."""
+    index_path = Path(data_dir) / 'index.json'
+    index = json.loads(index_path.read_bytes())
+    hashes = published_hashes(data_dir)
+    stamped = []
+    for entry in index.get('exams', []):
+        if entry.get('id') in hashes:
+            entry['publishedHash'] = hashes[entry['id']]
+            entry['variantBytes'] = variant_bytes(data_dir, entry['id'])
+            stamped.append(entry['id'])
+    index_path.write_bytes(json.dumps(index, ensure_ascii=False).encode('utf-8'))
+    return stamped
@@ -0,0 +1,95 @@
+"""
+Reproducible exam paper sampling.
+
+Port of src/features/exams/paper-sampler.ts; both must produce the same paper
+for the same questions, count and seed. The seed string is hashed with
+MurmurHash3 (x86, 32-bit) over its UTF-8 bytes and drives a mulberry32
+generator (32-bit integer arithmetic emulated with masks); questions are
+drawn with a sparse partial Fisher-Yates shuffle and returned in bank order.
+With a stratum function the count is split across strata in proportion to
+their sizes by largest remainder, strata taken in order of first appearance.
+"""
+
+_MASK = 0xFFFFFFFF
+
+
+def _imul(a, b):
+    return (a * b) & _MASK
+
+
+def _rotl(x, r):
+    return ((x << r) | (x >> (32 - r))) & _MASK
+
+
+def hash_seed(seed):
+    data = seed.encode('utf-8')
+    c1, c2 = 0xCC9E2D51, 0x1B873593
+    tail = len(data) & ~3
+    h = 0
+    for i in range(0, tail, 4):
+        k = int.from_bytes(data[i:i + 4], 'little')
+        k = _imul(_rotl(_imul(k, c1), 15), c2)
+        h = _rotl(h ^ k, 13)
+        h = (_imul(h, 5) + 0xE6546B64) & _MASK
+    if len(data) & 3:
+        k = int.from_bytes(data[tail:], 'little')
+        h ^= _imul(_rotl(_imul(k, c1), 15), c2)
+    h ^= len(data)
+    h ^= h >> 16
+    h = _imul(h, 0x85EBCA6B)
+    h ^= h >> 13
+    h = _imul(h, 0xC2B2AE35)
+    return h ^ (h >> 16)
+
+
+def create_random(seed):
+    """mulberry32: a function returning uniform floats in [0, 1)."""
+    t = seed & _MASK
+
+    def random():
+        nonlocal t
+        t = (t + 0x6D2B79F5) & _MASK
+        r = _imul(t ^ (t >> 15), 1 | t)
+        r = ((r + _imul(r ^ (r >> 7), 61 | r)) & _MASK) ^ r
+        return (r ^ (r >> 14)) / 4294967296
+
+    return random
+
+
+def sample_indices(n, k, random):
+    """k distinct positions out of n, ascending."""
+    swapped = {}
+    picked = []
+    for i in range(k):
+        j = i + int(random() * (n - i))
+        picked.append(swapped.get(j, j))
+        swapped[j] = swapped.get(i, i)
+    return sorted(picked)
+
+
+def _allocate(sizes, count, total):
+    quotas = [size * count // total for size in sizes]
+    left = count - sum(quotas)
+    order = sorted(range(len(sizes)), key=lambda i: (-(sizes[i] * count % total), i))
+    for i in order[:left]:
+        quotas[i] += 1
+    return quotas
+
+
+def sample_paper(items, count, seed, stratum_of=None):
+    """Pick count of items for the paper seeded by seed, keeping their order."""
+    if not isinstance(count, int) or count <= 0 or count >= len(items):
+        return list(items)
+    random = create_random(hash_seed(seed))
+    if stratum_of is None:
+        return [items[i] for i in sample_indices(len(items), count, random)]
+
+    strata = {}
+    for i, item in enumerate(items):
+        strata.setdefault(stratum_of(item), []).append(i)
+    groups = list(strata.values())
+    quotas = _allocate([len(g) for g in groups], count, len(items))
+    picked = []
+    for members, quota in zip(groups, quotas):
+        picked.extend(members[i] for i in sample_indices(len(members), quota, random))
+    return [items[i] for i in sorted(picked)]
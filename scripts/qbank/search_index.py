@@ -0,0 +1,91 @@
+"""
+Inverted full-text index of an exam in one language.
+
+Documents are the questions in display order (by questionNumber). Each one is
+indexed over its stem, options and explanation as shown in that language (see
+qbank/variants.py). Latin text is split into lowercase words; runs of CJK
+characters are split into overlapping character bigrams, so Chinese and
+Japanese text can be searched without a dictionary. The client tokenizer in
+src/features/search/question-search.ts must match.
+
+Serialized shape (compact JSON):
+
+    {"version": 1, "examId": ..., "language": ...,
+     "docs": {"questionNumber": [...], "snippet": [...]},
+     "terms": {"term": [doc, gap, gap, ...], ...}}
+
+Postings are sorted document positions stored as first value plus gaps.
+"""
+
+import html
+import json
+import re
+
+from .variants import localize_question
+
+VERSION = 1
+SNIPPET_LENGTH = 120
+
+_TAG = re.compile(r'<[^>]+>')
+_CJK = '぀-ヿ㐀-䶿一-鿿豈-﫿'
+_TOKEN = re.compile(f'[{_CJK}]+|[a-z0-9]+')
+_CJK_RUN = re.compile(f'^[{_CJK}]')
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from how in is it of on or that the this to '
+    'which with will'.split()
+)
+
+
+def plain_text(markup):
+    return ' '.join(html.unescape(_TAG.sub(' ', markup or '')).split())
+
+
+def tokenize(text):
+    """Lowercase words and CJK bigrams of text, in order, with stop words removed."""
+    tokens = []
+    for run in _TOKEN.findall(text.lower()):
+        if _CJK_RUN.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif run not in STOP_WORDS:
+            tokens.append(run)
+    return tokens
+
+
+def _document_text(question):
+    parts = [question.get('content'), question.get('explanation')]
+    parts.extend(o.get('content') for o in question.get('options') or [])
+    return ' '.join(plain_text(p) for p in parts if p)
+
+
+def build_index(questions, exam_id, language):
+    """Build the serializable index for an iterable of bank questions."""
+    questions = sorted(questions, key=lambda q: q.get('questionNumber') or 0)
+    postings = {}
+    numbers = []
+    snippets = []
+    for doc, question in enumerate(questions):
+        localized = localize_question(question, language)
+        numbers.append(question.get('questionNumber'))
+        snippets.append(plain_text(localized.get('content'))[:SNIPPET_LENGTH])
+        for term in set(tokenize(_document_text(localized))):
+            postings.setdefault(term, []).append(doc)
+
+    terms = {}
+    for term in sorted(postings):
+        docs = postings[term]
+        terms[term] = [docs[0]] + [b - a for a, b in zip(docs, docs[1:])]
+    return {
+        'version': VERSION,
+        'examId': exam_id,
+        'language': language,
+        'docs': {'questionNumber': numbers, 'snippet': snippets},
+        'terms': terms,
+    }
+
+
+def encode(index):
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,81 @@
+"""
+Paged shards of a bank for lazy loading.
+
+For each exam this writes public/data/shards/<exam>/:
+
+    manifest.json    question ids, numbers, types and answer counts (columnar),
+                     plus the offset, size and content hash of every shard
+    shard-000.json   {"questions": [...]} for questions [0, shardSize)
+    shard-001.json   ...
+
+Questions are ordered by questionNumber, matching the order the exam pages
+display them in. Files are written compactly and only when their bytes change.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .bank import DATA_DIR, correct_labels, iter_questions
+
+SHARDS_DIR = DATA_DIR / 'shards'
+DEFAULT_SHARD_SIZE = 50
+MANIFEST_VERSION = 1
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_if_changed(path, data):
+    """Write data to path atomically unless it already holds it; return whether it wrote."""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def build_shards(bank, exam_id, out_dir=SHARDS_DIR, shard_size=DEFAULT_SHARD_SIZE):
+    """Write manifest and shards for one bank; return (shard count, files written)."""
+    questions = sorted(iter_questions(bank), key=lambda q: q['questionNumber'])
+    exam_dir = Path(out_dir) / exam_id
+    exam_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = []
+    written = 0
+    for start in range(0, len(questions), shard_size):
+        page = questions[start:start + shard_size]
+        name = f'shard-{len(shards):03d}.json'
+        data = _encode({'questions': page})
+        written += write_if_changed(exam_dir / name, data)
+        shards.append({
+            'file': name,
+            'start': start,
+            'count': len(page),
+            'hash': hashlib.sha256(data).hexdigest()[:12],
+        })
+
+    for stale in exam_dir.glob('shard-*.json'):
+        if stale.name not in {s['file'] for s in shards}:
+            stale.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'examId': exam_id,
+        'questionCount': len(questions),
+        'shardSize': shard_size,
+        'shards': shards,
+        'questions': {
+            'id': [q['id'] for q in questions],
+            'questionNumber': [q['questionNumber'] for q in questions],
+            'type': [q.get('type') or 'single' for q in questions],
+            'answerCount': [max(len(correct_labels(q.get('correctAnswer'))), 1) for q in questions],
+        },
+    }
+    written += write_if_changed(exam_dir / 'manifest.json', _encode(manifest))
+    return len(shards), written
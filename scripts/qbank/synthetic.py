@@ -0,0 +1,162 @@
+"""
+Synthetic exam banks for benchmarking the pipeline at sizes we do not host yet.
+
+`generate` writes, into a data directory laid out like public/data:
+
+    <exam>.json                  the bank, in the same schema as the real ones
+    images/<exam>/img-NNN.png    a small pool of valid PNGs the questions use
+    <exam>.explanations.jsonl    one explanation record per question
+
+Questions carry stems and options in all four languages (`contents`), a mix of
+single- and multiple-answer types, an `<img>` in about one in IMAGE_EVERY
+stems, and case-study groups of CASE_SIZE consecutive questions that share a
+`caseId` and scenario. `subQuestions` stays null as in the hosted banks, which
+do not use it yet. Explanations are left out of the bank and written as a
+JSONL source (see qbank/explanations.py) so merging them can be measured.
+Output depends only on the count and seed.
+"""
+
+import json
+import random
+import struct
+import uuid
+import zlib
+from pathlib import Path
+
+from .bank import write_bank
+from .images import PNG_SIGNATURE, png_chunk
+from .variants import LANGUAGES
+
+IMAGE_POOL = 64
+IMAGE_EVERY = 15
+CASE_EVERY = 40
+CASE_SIZE = 4
+MULTIPLE_EVERY = 5
+
+_WORDS = (
+    'account application availability bucket cache capacity cluster company compliance '
+    'configure cost data database deploy design durable encrypt endpoint event function '
+    'gateway global instance latency load log manage migrate monitor network object '
+    'operational policy private queue region replicate requirement resilient role route '
+    'scale secure service snapshot solution storage stream subnet throughput traffic '
+    'upload user volume workload'
+).split()
+# Common characters, enough for text that tokenizes and measures like CJK prose.
+_HAN = '的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经'
+_KANA = 'あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんアイウエオカキクケコサシスセソ'
+_CHARSETS = {'zh': _HAN, 'zh-TC': _HAN, 'ja': _HAN + _KANA}
+
+
+def _png(width, height):
+    """A valid grayscale PNG of the given size."""
+    ramp = bytes(range(256)) * (width // 256 + 2)
+    rows = b''.join(b'\x00' + ramp[y % 256:y % 256 + width] for y in range(height))
+    return (PNG_SIGNATURE
+            + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0))
+            + png_chunk(b'IDAT', zlib.compress(rows, 9))
+            + png_chunk(b'IEND', b''))
+
+
+def _image_sizes(rng):
+    return [(rng.randrange(200, 960, 8), rng.randrange(120, 540, 8)) for _ in range(IMAGE_POOL)]
+
+
+class _Text:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def sentence(self, language, words):
+        if language == 'en':
+            text = ' '.join(self.rng.choices(_WORDS, k=words))
+            return text[0].upper() + text[1:] + '.'
+        return ''.join(self.rng.choices(_CHARSETS[language], k=words * 2)) + '。'
+
+    def paragraph(self, language, sentences, words=14):
+        return ' '.join(self.sentence(language, words) for _ in range(sentences))
+
+
+def _localized(build):
+    return {lang: build(lang) for lang in LANGUAGES}
+
+
+def _question(number, rng, text, exam_id, image_sizes, case, order):
+    multiple = number % MULTIPLE_EVERY == 0
+    option_count = 5 if multiple else 4
+    labels = [chr(65 + i) for i in range(option_count)]
+    answer = sorted(rng.sample(labels, 2)) if multiple else [rng.choice(labels)]
+
+    image = ''
+    if number % IMAGE_EVERY == 0:
+        index = rng.randrange(IMAGE_POOL)
+        width, height = image_sizes[index]
+        image = (f'<p><img src="/data/images/{exam_id}/img-{index:03d}.png" '
+                 f'width="{width}" height="{height}" loading="lazy"></p>')
+    contents = _localized(lambda lang: f'<p>{text.paragraph(lang, 4)}</p>{image}'
+                                       f'<p>{text.sentence(lang, 10)}</p>')
+    options = []
+    for label in labels:
+        option_contents = _localized(lambda lang: text.paragraph(lang, 2, 12))
+        options.append({'label': label, 'content': option_contents['en'], 'contents': option_contents})
+
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        'questionNumber': number,
+        'type': 'multiple' if multiple else 'single',
+        'content': contents['en'],
+        'contents': contents,
+        'options': options,
+        'correctAnswer': ''.join(answer),
+        'explanation': '',
+        'subQuestions': None,
+        'caseId': case['id'] if case else None,
+        'caseOrder': order if case else None,
+        'case': case['title'] if case else None,
+        'caseContent': case['content'] if case else None,
+        'bookmarked': False,
+        'hasNote': False,
+    }
+
+
+def _explanation(number, rng, text, answer):
+    explanations = {}
+    for lang in ('en', 'zh', 'ja'):
+        items = ''.join(f'<li><strong>{label}</strong> {text.sentence(lang, 12)}</li>' for label in 'ABCD')
+        explanations[lang] = (f'<p><strong>{answer}</strong></p><p>{text.paragraph(lang, 3)}</p>'
+                              f'<ul>{items}</ul>')
+    return {'questionNumber': number, 'explanations': explanations}
+
+
+def generate(data_dir, exam_id, count, seed=0):
+    """Write a bank of `count` questions with its images and explanation source.
+
+    Returns {'bank': path, 'explanations': path, 'images': image count}.
+    """
+    data_dir = Path(data_dir)
+    image_dir = data_dir / 'images' / exam_id
+    image_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(f'{exam_id}:{seed}')
+    image_sizes = _image_sizes(rng)
+    for index, (width, height) in enumerate(image_sizes):
+        (image_dir / f'img-{index:03d}.png').write_bytes(_png(width, height))
+
+    text = _Text(rng)
+    bank = data_dir / f'{exam_id}.json'
+    source = data_dir / f'{exam_id}.explanations.jsonl'
+    with open(source, 'w', encoding='utf-8') as records:
+        def questions():
+            case = None
+            for number in range(1, count + 1):
+                # Each run of CASE_EVERY questions opens with a case study.
+                offset = (number - 1) % CASE_EVERY
+                if offset == 0 and number + CASE_SIZE - 1 <= count:
+                    case = {'id': f'case-{number}', 'title': text.sentence('en', 6),
+                            'content': f'<p>{text.paragraph("en", 12, 18)}</p>'}
+                elif offset == CASE_SIZE:
+                    case = None
+                question = _question(number, rng, text, exam_id, image_sizes, case, offset + 1)
+                record = _explanation(number, rng, text, question['correctAnswer'])
+                records.write(json.dumps(record, ensure_ascii=False) + '\n')
+                yield question
+
+        write_bank(bank, questions())
+    return {'bank': bank, 'explanations': source, 'images': len(image_sizes)}
@@ -0,0 +1,270 @@
+"""
+Resumable, chunked machine translation of question stems and options.
+
+A job runs in three steps, each safe to interrupt:
+
+1. extract: stream the bank and collect the strings whose target-language
+   translation is missing or was made from a different source text. The
+   source hash of every merged translation is kept in the job state, so an
+   edited English stem is re-translated while untouched ones are skipped.
+   Pending strings are grouped by question into chunk files.
+2. translate: chunks are fanned out to a worker pool. Each worker calls the
+   translator backend and writes the chunk's result file atomically, which is
+   the checkpoint; a restarted job only runs chunks without a result.
+3. merge: finished results are applied to the bank in one streaming rewrite.
+   Strings a backend failed on are reported and left pending for the next
+   run instead of aborting the merge.
+
+Backends are functions `translate(texts, source, target) -> list[str]`
+registered in BACKENDS or given as `module:function`, so they can be
+imported by name inside worker processes.
+
+Job files live in the local build cache (.cache/qbank/translate/), or next
+to a bank outside public/data, so translating a copy never marks strings of
+the published bank as done.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from .bank import DATA_DIR, iter_questions, write_bank
+from .manifest import CACHE_DIR
+
+TRANSLATE_DIR = CACHE_DIR / 'translate'
+DEFAULT_CHUNK_SIZE = 15
+DEFAULT_RETRIES = 3
+
+
+def stub_backend(texts, source, target):
+    """Offline backend for testing: tags each string with the target language."""
+    return [f'[{target}] {text}' for text in texts]
+
+
+BACKENDS = {
+    'stub': stub_backend,
+}
+
+
+def load_backend(spec):
+    """Resolve a registered backend name or a `module:function` path."""
+    if spec in BACKENDS:
+        return BACKENDS[spec]
+    module, sep, name = spec.partition(':')
+    if not sep:
+        raise ValueError(f'unknown translation backend {spec!r}')
+    return getattr(importlib.import_module(module), name)
+
+
+def source_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _source_text(fallback, contents, source):
+    contents = contents if isinstance(contents, dict) else {}
+    text = contents.get(source)
+    if not (isinstance(text, str) and text.strip()) and source == 'en':
+        text = fallback
+    return text.strip() if isinstance(text, str) else ''
+
+
+def question_units(question, source):
+    """[(key, source text)] for the stem and each option of a question."""
+    qid = question['id']
+    units = [(f'{qid}:content', _source_text(question.get('content'), question.get('contents'), source))]
+    for option in question.get('options') or []:
+        units.append((f'{qid}:option:{option.get("label")}',
+                      _source_text(option.get('content'), option.get('contents'), source)))
+    return [(key, text) for key, text in units if text]
+
+
+def _target_present(question, key, target):
+    _, kind, *rest = key.split(':', 2)
+    if kind == 'content':
+        container = question
+    else:
+        container = next((o for o in question.get('options') or [] if o.get('label') == rest[0]), {})
+    value = (container.get('contents') or {}).get(target)
+    return isinstance(value, str) and value.strip() != ''
+
+
+def job_root(bank):
+    """Directory for the job files of `bank` (see the module docstring)."""
+    bank = Path(bank).resolve()
+    if bank.parent == Path(DATA_DIR).resolve():
+        return TRANSLATE_DIR
+    return bank.parent / '.translate'
+
+
+class Job:
+    """Paths and state of one exam/target-language translation job."""
+
+    def __init__(self, exam_id, target, root=TRANSLATE_DIR):
+        self.exam_id = exam_id
+        self.target = target
+        self.dir = Path(root) / f'{exam_id}.{target}'
+        self.state_path = Path(root) / f'{exam_id}.{target}.state.json'
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_state(self, state):
+        _write_json(self.state_path, state)
+
+    def chunks(self):
+        return sorted(self.dir.glob('chunk-[0-9]*[0-9].json'))
+
+    def result_path(self, chunk):
+        return chunk.with_name(chunk.stem + '.out.json')
+
+    def pending(self):
+        return [c for c in self.chunks() if not self.result_path(c).exists()]
+
+    def finished(self):
+        return [c for c in self.chunks() if self.result_path(c).exists()]
+
+
+def _write_json(path, value):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def extract(job, bank, source, chunk_size=DEFAULT_CHUNK_SIZE, force=False, dry_run=False):
+    """Write chunk files for every new or changed string; return the string count.
+
+    An existing translation with no recorded hash (merged by hand or by an
+    older tool) is adopted as up to date unless `force` is set. With
+    `dry_run` only the count is returned: no chunk or state is written.
+    """
+    state = job.load_state()
+    adopted = False
+    groups = []
+    for question in iter_questions(bank):
+        units = []
+        for key, text in question_units(question, source):
+            digest = source_hash(text)
+            recorded = state.get(key)
+            if not force and recorded == digest:
+                continue
+            if not force and recorded is None and _target_present(question, key, job.target):
+                state[key] = digest
+                adopted = True
+                continue
+            units.append({'key': key, 'text': text, 'hash': digest})
+        if units:
+            groups.append(units)
+
+    if dry_run:
+        return sum(len(g) for g in groups)
+    if adopted:
+        job.save_state(state)
+    job.dir.mkdir(parents=True, exist_ok=True)
+    for n, start in enumerate(range(0, len(groups), chunk_size)):
+        units = [u for group in groups[start:start + chunk_size] for u in group]
+        _write_json(job.dir / f'chunk-{n:04d}.json', {'units': units})
+    return sum(len(g) for g in groups)
+
+
+def run_chunk(chunk, backend_spec, source, target, retries=DEFAULT_RETRIES):
+    """Translate one chunk file and checkpoint its result; return (done, failed).
+
+    The whole chunk goes to the backend in one call. If that keeps failing,
+    strings are retried one at a time so a single bad string does not block
+    its neighbours.
+    """
+    chunk = Path(chunk)
+    backend = load_backend(backend_spec)
+    with open(chunk, 'r', encoding='utf-8') as f:
+        units = json.load(f)['units']
+    texts = [u['text'] for u in units]
+
+    def attempt(batch):
+        for n in range(retries):
+            try:
+                out = backend(batch, source, target)
+                if len(out) == len(batch) and all(isinstance(t, str) and t.strip() for t in out):
+                    return out
+            except Exception:
+                pass
+            if n + 1 < retries:
+                time.sleep(0.5 * 2 ** n)
+        return None
+
+    translated = attempt(texts)
+    if translated is None:
+        translated = [(attempt([t]) or [None])[0] for t in texts]
+    result = {
+        'translations': {u['key']: {'text': t.strip(), 'hash': u['hash']}
+                         for u, t in zip(units, translated) if t is not None},
+        'failed': [u['key'] for u, t in zip(units, translated) if t is None],
+    }
+    _write_json(chunk.with_name(chunk.stem + '.out.json'), result)
+    return len(result['translations']), len(result['failed'])
+
+
+def _apply(question, translations, target):
+    applied = 0
+    qid = question['id']
+    entry = translations.get(f'{qid}:content')
+    if entry:
+        question['contents'] = {**(question.get('contents') or {}), target: entry['text']}
+        applied += 1
+    for option in question.get('options') or []:
+        entry = translations.get(f'{qid}:option:{option.get("label")}')
+        if entry:
+            option['contents'] = {**(option.get('contents') or {}), target: entry['text']}
+            applied += 1
+    return applied
+
+
+def merge(job, bank):
+    """Apply finished chunk results to the bank; return (applied, failed keys).
+
+    Merged chunks are removed. Failed strings are not recorded in the job
+    state, so the next extract picks them up again.
+    """
+    finished = job.finished()
+    translations = {}
+    failed = []
+    for chunk in finished:
+        with open(job.result_path(chunk), 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        translations.update(result['translations'])
+        failed.extend(result['failed'])
+
+    applied = 0
+    if translations:
+        meta = {}
+
+        def updated():
+            nonlocal applied
+            for question in iter_questions(bank, meta):
+                applied += _apply(question, translations, job.target)
+                yield question
+
+        write_bank(bank, updated(), meta)
+        state = job.load_state()
+        state.update({key: entry['hash'] for key, entry in translations.items()})
+        job.save_state(state)
+
+    for chunk in finished:
+        job.result_path(chunk).unlink()
+        chunk.unlink()
+    return applied, failed
@@ -0,0 +1,213 @@
+"""
+Integrity checks for exam banks.
+
+`validate_bank` streams one bank and returns every problem it finds instead of
+stopping at the first; `validate_index` cross-checks index.json against the
+banks on disk. A problem is a `(severity, location, message)` tuple where
+severity is 'error' (the app would misbehave) or 'warning' (suspicious but
+renderable).
+
+Errors already in the committed data that cannot be fixed without the original
+source (lost option text, ambiguous duplicate labels) are listed in
+scripts/known-errors.json; `apply_known_errors` reports those as warnings so
+that only new errors fail the pre-commit hook.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from .bank import DATA_DIR, bank_path, correct_labels, exam_id_for, iter_questions
+from .explanations import default_sources, iter_records
+from .images import IMAGE_SRC, image_path
+
+ERROR = 'error'
+WARNING = 'warning'
+
+KNOWN_ERRORS = Path(__file__).resolve().parents[1] / 'known-errors.json'
+
+TYPES = ('single', 'multiple')
+LANGUAGES = ('en', 'zh', 'zh-TC', 'ja')
+
+_LABEL = re.compile('^[A-Z]$')
+
+
+def _text_fields(question):
+    """Every HTML string of a question, including per-language copies."""
+    yield question.get('content')
+    yield question.get('explanation')
+    for key in ('contents', 'explanations'):
+        if isinstance(question.get(key), dict):
+            yield from question[key].values()
+    for option in question.get('options') or []:
+        if isinstance(option, dict):
+            yield option.get('content')
+            if isinstance(option.get('contents'), dict):
+                yield from option['contents'].values()
+
+
+def _check_language_map(value, field, report):
+    if value is None:
+        return
+    if not isinstance(value, dict):
+        report(ERROR, f'{field} must be an object keyed by language')
+        return
+    for lang, text in value.items():
+        if lang not in LANGUAGES:
+            report(WARNING, f'{field} has unknown language {lang!r}')
+        if not isinstance(text, str):
+            report(ERROR, f'{field}.{lang} must be a string')
+
+
+def check_question(question, data_dir, report):
+    """Report problems with a single question through report(severity, message)."""
+    qid = question.get('id')
+    if not isinstance(qid, str) or not qid:
+        report(ERROR, 'missing id')
+    if not isinstance(question.get('questionNumber'), int) or question['questionNumber'] < 1:
+        report(ERROR, 'questionNumber must be a positive integer')
+    qtype = question.get('type')
+    if qtype not in TYPES:
+        report(ERROR, f'type must be one of {", ".join(TYPES)}, got {qtype!r}')
+    if not isinstance(question.get('content'), str) or not question['content'].strip():
+        report(ERROR, 'empty content')
+    _check_language_map(question.get('contents'), 'contents', report)
+    _check_language_map(question.get('explanations'), 'explanations', report)
+
+    options = question.get('options')
+    labels = []
+    if not isinstance(options, list) or not options:
+        report(ERROR, 'no options')
+        options = []
+    for i, option in enumerate(options):
+        if not isinstance(option, dict):
+            report(ERROR, f'option {i} is not an object')
+            continue
+        label = option.get('label')
+        if not isinstance(label, str) or not _LABEL.match(label):
+            report(ERROR, f'option {i} has invalid label {label!r}')
+        elif label in labels:
+            report(ERROR, f'duplicate option label {label}')
+        labels.append(label)
+        if not isinstance(option.get('content'), str) or not option['content'].strip():
+            report(ERROR, f'option {label} has empty content')
+        _check_language_map(option.get('contents'), f'option {label} contents', report)
+
+    answer = question.get('correctAnswer')
+    answers = correct_labels(answer) if isinstance(answer, str) else []
+    if not answers:
+        report(ERROR, f'invalid correctAnswer {answer!r}')
+    for label in answers:
+        if options and label not in labels:
+            report(ERROR, f'correctAnswer label {label} is not an option')
+    if qtype == 'single' and len(answers) > 1:
+        report(ERROR, f'single-answer question has {len(answers)} correct labels')
+    if qtype == 'multiple' and len(answers) == 1:
+        report(WARNING, 'multiple-answer question has one correct label')
+
+    explanations = question.get('explanations') if isinstance(question.get('explanations'), dict) else {}
+    if not (question.get('explanation') or '').strip() and not any(
+            isinstance(v, str) and v.strip() for v in explanations.values()):
+        report(WARNING, 'no explanation')
+
+    for text in _text_fields(question):
+        if isinstance(text, str):
+            for src in IMAGE_SRC.findall(text):
+                if not image_path(src, data_dir).is_file():
+                    report(ERROR, f'missing image {src}')
+
+
+def validate_bank(path, data_dir=DATA_DIR):
+    """Return (exam id, question count, problems) for one bank file."""
+    path = Path(path)
+    exam_id = exam_id_for(path)
+    problems = []
+    ids = {}
+    numbers = {}
+    count = 0
+
+    try:
+        for question in iter_questions(path):
+            count += 1
+            found = []
+            if isinstance(question, dict):
+                check_question(question, data_dir,
+                               lambda severity, message: found.append((severity, message)))
+                qid, number = question.get('id'), question.get('questionNumber')
+                if qid in ids:
+                    found.append((ERROR, f'duplicate id {qid} (also #{ids[qid]})'))
+                ids.setdefault(qid, number)
+                if number in numbers:
+                    found.append((ERROR, 'duplicate questionNumber'))
+                numbers.setdefault(number, qid)
+            else:
+                number = count
+                found.append((ERROR, 'question is not an object'))
+            # Per-language copies repeat the same images; report each problem once.
+            for severity, message in dict.fromkeys(found):
+                problems.append((severity, f'{path.name}#{number}', message))
+    except (OSError, ValueError) as e:
+        problems.append((ERROR, path.name, f'unreadable bank: {e}'))
+        return exam_id, count, problems
+
+    for source in default_sources(exam_id):
+        try:
+            for record in iter_records(source):
+                if record['questionNumber'] not in numbers:
+                    problems.append((ERROR, source.name,
+                                     f'explanation for question {record["questionNumber"]} '
+                                     f'which is not in {path.name}'))
+        except ValueError as e:
+            problems.append((ERROR, source.name, str(e)))
+
+    return exam_id, count, problems
+
+
+def validate_index(counts, data_dir=DATA_DIR):
+    """Cross-check index.json against {exam id: question count} of the banks validated."""
+    index_path = Path(data_dir) / 'index.json'
+    try:
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        return [(ERROR, 'index.json', f'unreadable: {e}')]
+
+    problems = []
+    listed = set()
+    for entry in index.get('exams', []):
+        exam_id = entry.get('id')
+        listed.add(exam_id)
+        where = f'index.json#{exam_id}'
+        if exam_id not in counts:
+            if not bank_path(exam_id, data_dir).exists():
+                problems.append((WARNING, where, f'no bank file {exam_id}.json'))
+            continue
+        if entry.get('questionCount') != counts[exam_id]:
+            problems.append((ERROR, where, f'questionCount is {entry.get("questionCount")} '
+                                           f'but the bank has {counts[exam_id]} questions'))
+    for exam_id in sorted(set(counts) - listed):
+        problems.append((WARNING, f'{exam_id}.json', 'bank is not listed in index.json'))
+    return problems
+
+
+def load_known_errors(path=KNOWN_ERRORS):
+    """{location: [message, ...]} of accepted errors; empty if there is no list."""
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+
+
+def apply_known_errors(problems, known):
+    """Downgrade the errors listed in `known` to warnings and flag entries that no longer occur."""
+    accepted = {(where, message) for where, messages in known.items() for message in messages}
+    seen = set()
+    result = []
+    for severity, where, message in problems:
+        if severity == ERROR and (where, message) in accepted:
+            seen.add((where, message))
+            severity, message = WARNING, f'{message} (known error)'
+        result.append((severity, where, message))
+    for where, message in sorted(accepted - seen):
+        result.append((WARNING, where, f'known error no longer occurs: {message}; '
+                                       f'remove it from {KNOWN_ERRORS.name}'))
+    return result
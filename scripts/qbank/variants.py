@@ -0,0 +1,81 @@
+"""
+Per-language variants of a bank.
+
+A variant (`public/data/<exam>.<lang>.json`) keeps every question's structure
+but resolves each localized field to the single string the app would show in
+that language, then drops the per-language maps. The fallback order mirrors
+getLocalizedText / getLocalizedExplanation in src/context/language-provider.tsx
+and the explanation mapping in the exam pages, so a page rendering a variant
+shows exactly what it would have shown from the full bank.
+"""
+
+import re
+
+LANGUAGES = ('en', 'zh', 'zh-TC', 'ja')
+
+_CJK = re.compile('[一-鿿]')
+_LEGACY_EXPLANATION_KEYS = (('explanation_en', 'en'), ('explanation_zh', 'zh'), ('explanation_ja', 'ja'))
+
+
+def _present(value):
+    return isinstance(value, str) and value.strip() != ''
+
+
+def resolve_text(fallback, contents, language):
+    """Mirror getLocalizedText: language, zh for zh-TC, then en, then fallback."""
+    contents = contents if isinstance(contents, dict) else {}
+    chain = [language]
+    if language == 'zh-TC':
+        chain.append('zh')
+    if language != 'en':
+        chain.append('en')
+    for key in chain:
+        if _present(contents.get(key)):
+            return contents[key].strip()
+    return (fallback or '').strip()
+
+
+def resolve_explanation(question, language):
+    """Mirror the pages' explanation mapping followed by getLocalizedExplanation."""
+    available = {}
+    raw = (question.get('explanation') or '').strip()
+    if _CJK.search(raw):
+        available['zh'] = raw
+    elif raw:
+        available['en'] = raw
+    for field, key in _LEGACY_EXPLANATION_KEYS:
+        if _present(question.get(field)):
+            available[key] = question[field].strip()
+    explanations = question.get('explanations')
+    if isinstance(explanations, dict):
+        # The pages only read these three keys from the explanations map.
+        for key in ('en', 'zh', 'ja'):
+            if explanations.get(key):
+                available[key] = explanations[key].strip()
+
+    chain = [language]
+    if language == 'zh-TC':
+        chain.append('zh')
+    if language != 'en':
+        chain.append('en')
+    chain.extend(('zh', 'zh-TC', 'ja'))
+    for key in chain:
+        if _present(available.get(key)):
+            return available[key].strip()
+    return ''
+
+
+def localize_question(question, language):
+    """Return a copy of question with only the strings shown in `language`."""
+    out = {key: value for key, value in question.items()
+           if key not in ('contents', 'explanations') and key not in dict(_LEGACY_EXPLANATION_KEYS)}
+    out['content'] = resolve_text(question.get('content'), question.get('contents'), language)
+    out['options'] = [
+        {
+            **{k: v for k, v in option.items() if k != 'contents'},
+            'content': resolve_text(option.get('content'), option.get('contents'), language),
+        }
+        for option in question.get('options') or []
+    ]
+    out['explanation'] = resolve_explanation(question, language)
+    return out
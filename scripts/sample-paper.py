@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Generate or verify exam-mode papers offline.
+
+Draws the same questions Exam mode shows for `?count=N&seed=S` (see
+qbank/sampler.py): questions in questionNumber order, stratified by question
+type. Papers can be written to a JSON file and later checked against the
+current bank, e.g. to confirm that shared seeds still produce the same paper
+after an edit.
+
+Usage:
+    python3 scripts/sample-paper.py SAA-C03 --count 65 --seed week-12
+    python3 scripts/sample-paper.py SAA-C03 --count 65 --seed a --seed b --out papers.json
+    python3 scripts/sample-paper.py --verify papers.json
+"""
+
+import argparse
+import json
+import sys
+
+from qbank.bank import bank_path, exam_id_for, iter_questions
+from qbank.sampler import sample_paper
+
+STRATA = {
+    'type': lambda q: 'multiple' if q.get('type') == 'multiple' else 'single',
+    'none': None,
+}
+
+
+def draw(exam, count, seed, stratify):
+    path = bank_path(exam)
+    questions = sorted(iter_questions(path), key=lambda q: q.get('questionNumber') or 0)
+    picked = sample_paper(questions, count, seed, STRATA[stratify])
+    return {
+        'examId': exam_id_for(path),
+        'count': count,
+        'seed': seed,
+        'stratify': stratify,
+        'questionNumbers': [q['questionNumber'] for q in picked],
+        'ids': [q['id'] for q in picked],
+    }
+
+
+def verify(paper_file):
+    with open(paper_file, 'r', encoding='utf-8') as f:
+        papers = json.load(f)
+    failures = 0
+    for paper in papers:
+        current = draw(paper['examId'], paper['count'], paper['seed'], paper.get('stratify', 'type'))
+        label = f'{paper["examId"]} count={paper["count"]} seed={paper["seed"]!r}'
+        if current['ids'] == paper['ids']:
+            print(f'{label}: ok')
+        else:
+            failures += 1
+            changed = len(set(current['ids']) ^ set(paper['ids'])) // 2
+            print(f'{label}: differs ({changed} questions changed)', file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exam', nargs='?', help='exam id (e.g. SAA-C03) or path to a bank JSON file')
+    parser.add_argument('--count', type=int, help='questions per paper')
+    parser.add_argument('--seed', action='append', help='paper seed (repeatable)')
+    parser.add_argument('--stratify', choices=STRATA, default='type')
+    parser.add_argument('--out', help='write the papers to this JSON file')
+    parser.add_argument('--verify', metavar='FILE', help='check papers written by --out')
+    args = parser.parse_args()
+
+    if args.verify:
+        return verify(args.verify)
+    if not args.exam or not args.count or not args.seed:
+        parser.error('exam, --count and --seed are required unless --verify is given')
+
+    papers = [draw(args.exam, args.count, seed, args.stratify) for seed in args.seed]
+    for paper in papers:
+        print(f'{paper["examId"]} seed={paper["seed"]!r}: '
+              + ' '.join(str(n) for n in paper['questionNumbers']))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(papers, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Streaming bank reader/writer: chunk boundaries and byte-for-byte round trips."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.bank import iter_questions, write_bank
+
+BANK = {
+    'questions': [
+        {'id': 'q1', 'questionNumber': 1, 'score': -1.5e10, 'weight': 0.25,
+         'flags': [True, False, None], 'content': '<p>Which "service"?</p>',
+         'contents': {'ja': '<p>どのサービス？</p>', 'zh': '<p>哪个服务？ \\u2028</p>'},
+         'options': [{'label': 'A', 'content': 'x' * 90}, {'label': 'B', 'content': ''}]},
+        {'id': 'q2', 'questionNumber': 12345678901234567890, 'nested': {'a': [[], {}, [1e-7]]},
+         'explanation': None, 'bookmarked': False},
+        {'id': 'q3', 'questionNumber': 3, 'tail': -0.0, 'big': 123456789},
+    ],
+    'version': 2,
+    'threshold': -1.5e10,
+    'total': 123456789,
+    'published': True,
+    'exam': {'title': 'Solutions Architect – Associate', 'codes': [-12, 3.5E+2]},
+    'ratio': 0.125,
+}
+
+
+def _canonical(data):
+    return json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+
+class StreamingBankTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / 'TEST.json'
+        self.path.write_text(_canonical(BANK), encoding='utf-8')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_any_chunk_size_decodes_the_same_questions(self):
+        for chunk_size in range(1, 97):
+            with self.subTest(chunk_size=chunk_size):
+                meta = {}
+                questions = list(iter_questions(self.path, meta, chunk_size=chunk_size))
+                self.assertEqual(questions, BANK['questions'])
+                self.assertEqual(meta, {k: v for k, v in BANK.items() if k != 'questions'})
+
+    def test_compact_input_splits_scalars_at_every_offset(self):
+        compact = json.dumps(BANK, ensure_ascii=False, separators=(',', ':'))
+        self.path.write_text(compact, encoding='utf-8')
+        for chunk_size in range(1, 41):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iter_questions(self.path, chunk_size=chunk_size)),
+                                 BANK['questions'])
+
+    def test_rewriting_is_a_byte_for_byte_no_op(self):
+        original = self.path.read_bytes()
+        for chunk_size in (1, 7, 64, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                meta = {}
+                count = write_bank(self.path, iter_questions(self.path, meta, chunk_size=chunk_size),
+                                   meta)
+                self.assertEqual(count, len(BANK['questions']))
+                self.assertEqual(self.path.read_bytes(), original)
+
+    def test_compact_output_matches_json_dumps(self):
+        meta = {}
+        out = self.path.with_name('TEST.en.json')
+        write_bank(out, iter_questions(self.path, meta, chunk_size=11), meta, compact=True)
+        expected = json.dumps(BANK, ensure_ascii=False, separators=(',', ':'))
+        self.assertEqual(out.read_text(encoding='utf-8'), expected)
+        self.assertEqual(list(iter_questions(out, chunk_size=9)), BANK['questions'])
+
+    def test_empty_bank_round_trips(self):
+        self.path.write_text(_canonical({'questions': []}), encoding='utf-8')
+        self.assertEqual(list(iter_questions(self.path, chunk_size=3)), [])
+        write_bank(self.path, [])
+        self.assertEqual(self.path.read_text(encoding='utf-8'), _canonical({'questions': []}))
+
+    def test_truncated_bank_raises(self):
+        self.path.write_text(_canonical(BANK)[:-40], encoding='utf-8')
+        with self.assertRaises(ValueError):
+            list(iter_questions(self.path, chunk_size=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
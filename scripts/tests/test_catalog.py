@@ -0,0 +1,54 @@
+"""index.json stats: counts, languages and a content hash that ignores formatting."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.bank import write_bank
+from qbank.catalog import exam_stats
+
+QUESTIONS = [
+    {'id': 'q1', 'questionNumber': 1, 'type': 'single', 'content': '<p>One</p>',
+     'contents': {'ja': '<p>一</p>', 'zh': '  '}},
+    {'id': 'q2', 'questionNumber': 2, 'type': 'multiple', 'content': '<p>Two</p>', 'caseId': 'c1',
+     'explanations': {'zh-TC': '二', 'ko': '둘'}},
+    {'id': 'q3', 'questionNumber': 3, 'content': '', 'caseId': 'c1'},
+]
+
+
+class ExamStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.bank = Path(self.dir.name) / 'TEST.json'
+        write_bank(self.bank, QUESTIONS, {'version': 1})
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_counts_types_case_studies_and_languages(self):
+        stats = exam_stats(self.bank)
+        self.assertEqual(stats['questionCount'], 3)
+        self.assertEqual(stats['bytes'], self.bank.stat().st_size)
+        self.assertEqual(stats['stats'], {
+            # Untyped questions are single-answer, as the pages treat them.
+            'types': {'multiple': 1, 'single': 2},
+            'caseStudies': 2,
+            # Known languages in their fixed order, then any others.
+            'languages': ['en', 'zh-TC', 'ja', 'ko'],
+        })
+
+    def test_content_hash_follows_content_not_formatting(self):
+        digest = exam_stats(self.bank)['contentHash']
+        self.assertRegex(digest, r'^[0-9a-f]{16}$')
+
+        write_bank(self.bank, QUESTIONS, {'version': 1}, compact=True)
+        self.assertEqual(exam_stats(self.bank)['contentHash'], digest)
+
+        edited = [dict(q) for q in QUESTIONS]
+        edited[2]['content'] = '<p>Three</p>'
+        write_bank(self.bank, edited, {'version': 1})
+        self.assertNotEqual(exam_stats(self.bank)['contentHash'], digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
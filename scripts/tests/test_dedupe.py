@@ -0,0 +1,62 @@
+"""Near-duplicate detection: MinHash/LSH clusters, exact confirmation and canonical ids."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.bank import write_bank
+from qbank.dedupe import canonical_ids, find_duplicates, jaccard, load_entries, question_text, shingles
+
+STEM = ('A company runs a web application on Amazon EC2 instances behind an Application Load '
+        'Balancer in a single Availability Zone and stores session data on the instances. The '
+        'company needs the application to remain available if an Availability Zone fails while '
+        'keeping user sessions intact. Which solution meets these requirements')
+OPTIONS = [{'label': 'A', 'content': 'Use an Auto Scaling group across two zones'},
+           {'label': 'B', 'content': 'Store sessions in Amazon ElastiCache'}]
+
+
+def _question(number, content, options=OPTIONS):
+    return {'id': f'id-{number}', 'questionNumber': number, 'content': content, 'options': options}
+
+
+class FindDuplicatesTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        root = Path(self.dir.name)
+        first = [
+            _question(1, f'<p>{STEM}?</p>'),
+            # Reformatted, with one word changed and the options reordered.
+            _question(7, f'<div><b>{STEM.upper().replace("SINGLE", "ONE")}</b>?</div>', OPTIONS[::-1]),
+            _question(3, '<p>Which service provides a managed relational database?</p>'),
+        ]
+        second = [_question(2, f'<p>{STEM}&nbsp;?</p>')]
+        write_bank(root / 'ONE.json', first, {'version': 1})
+        write_bank(root / 'TWO.json', second, {'version': 1})
+        self.entries = load_entries([('ONE', root / 'ONE.json'), ('TWO', root / 'TWO.json')])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_text_ignores_markup_case_and_option_order(self):
+        a, b = (shingles(question_text(q)) for _, q, _ in self.entries[:2])
+        self.assertGreater(jaccard(a, b), 0.8)
+        self.assertLess(jaccard(a, b), 1.0)
+        self.assertEqual(question_text({'content': '<p>a &amp; b</p>'}).split(), ['a', '&', 'b'])
+
+    def test_clusters_near_duplicates_within_and_across_banks(self):
+        clusters = find_duplicates(self.entries)
+        self.assertEqual(len(clusters), 1)
+        members, weakest = clusters[0]
+        self.assertEqual(members, [0, 1, 3])
+        self.assertGreater(weakest, 0.8)
+
+        self.assertEqual(find_duplicates(self.entries, threshold=1.0),
+                         [([0, 3], 1.0)])
+
+    def test_canonical_ids_stay_within_an_exam(self):
+        clusters = find_duplicates(self.entries)
+        self.assertEqual(canonical_ids(self.entries, clusters), {'ONE': {'id-7': 'id-1'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
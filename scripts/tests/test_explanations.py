@@ -0,0 +1,85 @@
+"""Incremental explanation merge: no-op reruns, per-record re-application, bank edits."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from qbank import explanations as explanations_module
+from qbank.bank import iter_questions, write_bank
+from qbank.explanations import apply_incremental, load_explanations
+from qbank.manifest import question_hash
+
+QUESTIONS = [
+    {'id': f'q{n}', 'questionNumber': n, 'content': f'<p>Question {n}</p>'} for n in (1, 2, 3)
+]
+
+
+class ApplyIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.bank = Path(self.dir.name) / 'TEST.json'
+        self.source = Path(self.dir.name) / 'TEST.jsonl'
+        write_bank(self.bank, QUESTIONS, {'version': 1})
+        self.write_source({1: 'one', 2: 'two', 3: 'three'})
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write_source(self, texts):
+        lines = [f'{{"questionNumber": {n}, "explanation": "{text}"}}' for n, text in texts.items()]
+        self.source.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    def apply(self, manifest):
+        """apply_incremental, with the question ids each call re-applied."""
+        applied = []
+        real = explanations_module.apply_explanation
+
+        def spy(question, record):
+            applied.append(question['id'])
+            real(question, record)
+
+        with mock.patch.object(explanations_module, 'apply_explanation', spy):
+            result = apply_incremental(self.bank, load_explanations([self.source]), manifest)
+        return result, applied
+
+    def explanations(self):
+        return {q['id']: q.get('explanation') for q in iter_questions(self.bank)}
+
+    def test_unchanged_rerun_is_a_no_op(self):
+        (manifest, touched, total, seen), _ = self.apply({})
+        self.assertEqual((touched, total, seen), ({'q1', 'q2', 'q3'}, 3, {1, 2, 3}))
+        before = self.bank.stat().st_mtime_ns, self.bank.read_bytes()
+
+        self.assertEqual(self.apply(manifest), (None, []))
+        self.assertEqual((self.bank.stat().st_mtime_ns, self.bank.read_bytes()), before)
+
+    def test_changed_record_re_applies_only_its_question(self):
+        (manifest, _, _, _), _ = self.apply({})
+        self.write_source({1: 'one', 2: 'two, revised', 3: 'three'})
+
+        (manifest, touched, _, seen), applied = self.apply(manifest)
+        self.assertEqual(touched, {'q2'})
+        # Once to hash it, once while rewriting the bank.
+        self.assertEqual(applied, ['q2', 'q2'])
+        self.assertEqual(seen, {1, 2, 3})
+        self.assertEqual(self.explanations(), {'q1': 'one', 'q2': 'two, revised', 'q3': 'three'})
+        self.assertEqual(manifest['questions'],
+                         {q['id']: question_hash(q) for q in iter_questions(self.bank)})
+
+    def test_changed_bank_invalidates_the_manifest(self):
+        (manifest, _, _, _), _ = self.apply({})
+        questions = list(iter_questions(self.bank))
+        questions[0]['content'] = '<p>Question 1, edited</p>'
+        questions[2]['explanation'] = 'stale'
+        write_bank(self.bank, questions, {'version': 1})
+
+        (manifest, touched, _, _), applied = self.apply(manifest)
+        self.assertEqual(touched, {'q3'})
+        self.assertEqual(sorted(set(applied)), ['q1', 'q2', 'q3'])
+        self.assertEqual(self.explanations(), {'q1': 'one', 'q2': 'two', 'q3': 'three'})
+        self.assertEqual(manifest['questions']['q1'], question_hash(next(iter_questions(self.bank))))
+
+
+if __name__ == '__main__':
+    unittest.main()
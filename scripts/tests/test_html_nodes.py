@@ -0,0 +1,49 @@
+"""Pre-parsed question HTML: sanitize vectors shared with html-nodes.ts."""
+
+import unittest
+
+from qbank.html_nodes import parse_html, preparse_question
+
+# Shared with src/features/exams/__tests__/html-nodes.test.ts, where the
+# browser's DOMParser must produce the same trees.
+VECTORS = [
+    ('<p>Use <strong>S3</strong> &amp; <code>cp</code></p>',
+     [['p', ['Use ', ['strong', ['S3']], ' & ', ['code', ['cp']]]]]),
+    ('<div>a</div><script>alert(1)</script>\n<b>b</b>', [['span', ['a']], ['span', ['b']]]),
+    ('<img src="images/EX/q1.png" width="406" onerror="x()" data-formats="webp">',
+     [['img', [], {'src': 'images/EX/q1.png', 'width': '406', 'data-formats': 'webp'}]]),
+    ('<img src="javascript:x()">', []),
+    ('<IMG SRC="https://x/y.png" ALT="d">', [['img', [], {'src': 'https://x/y.png', 'alt': 'd'}]]),
+    ('<p>one<p>two', [['p', ['one']], ['p', ['two']]]),
+    ('<p>a<div>b</div></p>', [['p', ['a']], ['span', ['b']], ['p', []]]),
+    ('<p/>x', [['p', ['x']]]),
+    ('<ol><li>x<ul><li>y</ul><li>z</ol>',
+     [['ol', [['li', ['x', ['ul', [['li', ['y']]]]]], ['li', ['z']]]]]),
+    ('<em>a <style>p{}</style>b</em>', [['em', ['a ', 'b']]]),
+    ('<p>a<br/>b</p><p> </p>', [['p', ['a', ['br', []], 'b']], ['p', []]]),
+    ('<p>1 &lt; 2</p>', [['p', ['1 < 2']]]),
+]
+
+
+class ParseHtmlTest(unittest.TestCase):
+    def test_shared_vectors(self):
+        for markup, nodes in VECTORS:
+            with self.subTest(markup=markup):
+                self.assertEqual(parse_html(markup), nodes)
+
+
+class PreparseQuestionTest(unittest.TestCase):
+    def test_replaces_only_fields_with_markup(self):
+        question = preparse_question({
+            'content': '<p>Which?</p>', 'explanation': 'Because.',
+            'options': [{'label': 'A', 'content': '<code>cp</code>'}, {'label': 'B', 'content': 'mv'}],
+        })
+        self.assertEqual(question, {
+            'contentNodes': [['p', ['Which?']]], 'explanation': 'Because.',
+            'options': [{'label': 'A', 'contentNodes': [['code', ['cp']]]},
+                        {'label': 'B', 'content': 'mv'}],
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Image helpers: lossless PNG recompression and <img> tag rewriting."""
+
+import struct
+import unittest
+import zlib
+
+from qbank.images import PNG_SIGNATURE, image_size, png_chunk, recompress_png, rewrite_img_tags
+
+
+def _png(width, height, extra=()):
+    """An 8-bit RGB PNG with a gradient, its data split over two weakly compressed IDATs."""
+    rows = b''.join(b'\x00' + bytes((x * 7 + y * 3) % 256 for x in range(width * 3))
+                    for y in range(height))
+    data = zlib.compress(rows, 1)
+    half = len(data) // 2
+    return (PNG_SIGNATURE
+            + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + b''.join(png_chunk(kind, body) for kind, body in extra)
+            + png_chunk(b'IDAT', data[:half]) + png_chunk(b'IDAT', data[half:])
+            + png_chunk(b'IEND', b''))
+
+
+def _decode(png):
+    """(chunk types, IHDR, raw scanlines) of a PNG."""
+    pos, kinds, header, idat = len(PNG_SIGNATURE), [], None, b''
+    while pos < len(png):
+        length, kind = struct.unpack('>I4s', png[pos:pos + 8])
+        body = png[pos + 8:pos + 8 + length]
+        crc = struct.unpack('>I', png[pos + 8 + length:pos + 12 + length])[0]
+        assert crc == zlib.crc32(kind + body), kind
+        kinds.append(kind)
+        if kind == b'IHDR':
+            header = body
+        elif kind == b'IDAT':
+            idat += body
+        pos += 12 + length
+    return kinds, header, zlib.decompress(idat)
+
+
+class RecompressPngTest(unittest.TestCase):
+    def test_round_trip_keeps_every_pixel(self):
+        original = _png(64, 48, extra=[(b'tEXt', b'Software\x00editor'), (b'gAMA', b'\x00\x00\xb1\x8f')])
+        packed = recompress_png(original)
+
+        self.assertLess(len(packed), len(original))
+        kinds, header, pixels = _decode(packed)
+        _, original_header, original_pixels = _decode(original)
+        self.assertEqual(header, original_header)
+        self.assertEqual(pixels, original_pixels)
+        self.assertEqual(kinds, [b'IHDR', b'gAMA', b'IDAT', b'IEND'])
+        self.assertEqual(image_size(packed), (64, 48))
+
+    def test_leaves_other_data_alone(self):
+        self.assertEqual(recompress_png(b'GIF89a\x01\x00\x01\x00'), b'GIF89a\x01\x00\x01\x00')
+        broken = PNG_SIGNATURE + png_chunk(b'IDAT', b'not zlib') + png_chunk(b'IEND', b'')
+        self.assertEqual(recompress_png(broken), broken)
+
+    def test_already_optimal_data_is_returned_as_is(self):
+        packed = recompress_png(_png(16, 16))
+        self.assertIs(recompress_png(packed), packed)
+
+
+class RewriteImgTagsTest(unittest.TestCase):
+    def describe(self, src):
+        if src == 'images/A/dup.png':
+            return {'src': 'images/A/orig.png', 'width': 10, 'height': 20, 'loading': 'lazy'}
+        return None
+
+    def test_updates_described_tags_and_keeps_other_attributes(self):
+        markup = '<p>See <img alt="a diagram" src="images/A/dup.png"/> and <IMG src=\'x.png\'></p>'
+        self.assertEqual(
+            rewrite_img_tags(markup, self.describe),
+            '<p>See <img alt="a diagram" src="images/A/orig.png" width="10" height="20" '
+            'loading="lazy"> and <IMG src=\'x.png\'></p>')
+
+    def test_quotes_values_containing_double_quotes(self):
+        markup = '<img src="images/A/dup.png" title=\'say "hi"\'>'
+        self.assertEqual(
+            rewrite_img_tags(markup, self.describe),
+            '<img src="images/A/orig.png" title=\'say "hi"\' width="10" height="20" loading="lazy">')
+
+    def test_rewriting_twice_is_stable(self):
+        once = rewrite_img_tags('<img src="images/A/dup.png">', self.describe)
+        self.assertEqual(rewrite_img_tags(once, lambda src: {'loading': 'lazy'}), once)
+
+
+if __name__ == '__main__':
+    unittest.main()
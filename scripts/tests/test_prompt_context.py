@@ -0,0 +1,65 @@
+"""Paging prompt contexts: the manifest, page contents and stale pages."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.prompt_context import build_contexts, write_shards
+
+
+def _question(number):
+    return {
+        'id': f'q{number}',
+        'questionNumber': number,
+        'content': f'<p>Question {number}?</p>',
+        'options': [{'label': 'A', 'content': 'Yes'}, {'label': 'B', 'content': 'No'}],
+        'correctAnswer': 'A',
+        'explanation': 'Because.',
+    }
+
+
+class WriteShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.out = Path(self.dir.name)
+        # Out of order on purpose: pages follow questionNumber.
+        self.questions = [_question(n) for n in (3, 1, 5, 2, 4)]
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, questions, shard_size):
+        contexts = {'en': build_contexts(questions, 'EX', 'en')}
+        return write_shards(questions, contexts, self.out, shard_size)
+
+    def _read(self, name):
+        return json.loads((self.out / 'EX' / name).read_bytes())
+
+    def test_pages_follow_the_manifest(self):
+        sizes, written = self._write(self.questions, 2)
+
+        manifest = self._read('manifest.json')
+        self.assertEqual(manifest['ids'], ['q1', 'q2', 'q3', 'q4', 'q5'])
+        self.assertEqual(manifest['shardSize'], 2)
+        self.assertEqual(written, 4)
+        pages = [self._read(f'en/shard-{n:03d}.json') for n in range(3)]
+        self.assertEqual([list(p['questions']) for p in pages],
+                         [['q1', 'q2'], ['q3', 'q4'], ['q5']])
+        self.assertEqual(pages[0]['language'], 'en')
+        self.assertIn('Correct answer: A', pages[2]['questions']['q5']['text'])
+        self.assertEqual(sizes['en'], sum(
+            (self.out / 'EX' / 'en' / f'shard-{n:03d}.json').stat().st_size for n in range(3)))
+
+    def test_rewrites_only_changed_pages_and_drops_stale_ones(self):
+        self._write(self.questions, 2)
+        self.assertEqual(self._write(self.questions, 2)[1], 0)
+
+        _, written = self._write(self.questions[:2], 2)
+        self.assertEqual(written, 2)
+        self.assertEqual([p.name for p in (self.out / 'EX' / 'en').iterdir()],
+                         ['shard-000.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Publishing dist/data: which files are minified, and deterministic artifacts."""
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.publish import data_files, publish_file, stamp_index
+
+
+class PublishTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.data = Path(self.dir.name)
+        files = {
+            'index.json': {'exams': [{'id': 'SAA-C03', 'contentHash': 'bank'}]},
+            'SAA-C03.json': {'questions': [{'id': 'q1'}]},
+            'SAA-C03.ja.json': {'questions': [{'id': 'q1'}]},
+            'shards/SAA-C03/manifest.json': {'shards': []},
+            'search/SAA-C03.en.json': {'version': 1},
+            'prompts/SAA-C03/en/shard-000.json': {'version': 1},
+        }
+        for name, value in files.items():
+            path = self.data / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(value, indent=2), encoding='utf-8')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_every_generated_directory_is_published(self):
+        names = {p.relative_to(self.data).as_posix() for p in data_files(self.data)}
+        self.assertEqual(names, {
+            'index.json', 'SAA-C03.json', 'SAA-C03.ja.json', 'shards/SAA-C03/manifest.json',
+            'search/SAA-C03.en.json', 'prompts/SAA-C03/en/shard-000.json',
+        })
+
+    def test_publishing_is_deterministic(self):
+        path = self.data / 'prompts' / 'SAA-C03' / 'en' / 'shard-000.json'
+        first = publish_file(path)
+        gz = path.with_name(path.name + '.gz').read_bytes()
+        second = publish_file(path)
+        self.assertEqual(path.read_bytes(), b'{"version":1}')
+        self.assertEqual(gzip.decompress(gz), path.read_bytes())
+        self.assertEqual(path.with_name(path.name + '.gz').read_bytes(), gz)
+        self.assertLess(first['min'], first['raw'])
+        self.assertEqual(second['raw'], second['min'])
+
+    def entry(self):
+        return json.loads((self.data / 'index.json').read_text())['exams'][0]
+
+    def test_stamp_covers_files_in_subdirectories(self):
+        stamp_index(self.data)
+        before = self.entry()['publishedHash']
+        page = self.data / 'prompts' / 'SAA-C03' / 'en' / 'shard-000.json'
+        page.write_text('{"version":2}', encoding='utf-8')
+        stamp_index(self.data)
+        self.assertNotEqual(self.entry()['publishedHash'], before)
+
+    def test_stamp_keeps_the_bank_hash_and_records_variant_sizes(self):
+        stamp_index(self.data)
+        entry = self.entry()
+        self.assertEqual(entry['contentHash'], 'bank')
+        self.assertRegex(entry['publishedHash'], r'^[0-9a-f]{16}$')
+        # The search index is not a variant the pages download.
+        self.assertEqual(entry['variantBytes'], {'ja': (self.data / 'SAA-C03.ja.json').stat().st_size})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Paper sampling: the vectors shared with src/features/exams/__tests__/paper-sampler.test.ts."""
+
+import unittest
+
+from qbank.sampler import create_random, hash_seed, sample_indices, sample_paper
+
+
+class HashSeedTest(unittest.TestCase):
+    def test_matches_murmurhash3_x86_32_reference_values(self):
+        self.assertEqual(hash_seed(''), 0)
+        self.assertEqual(hash_seed('hello'), 0x248bfa47)
+        self.assertEqual(hash_seed('The quick brown fox jumps over the lazy dog'), 0x2e4ff723)
+
+    def test_hashes_utf8_bytes(self):
+        self.assertEqual(hash_seed('week-12'), 2799941619)
+        self.assertEqual(hash_seed('考试'), 1518586009)
+
+
+class SamplePaperTest(unittest.TestCase):
+    def test_random_is_mulberry32(self):
+        random = create_random(1)
+        self.assertAlmostEqual(random(), 0.6270739405881613, places=15)
+        self.assertAlmostEqual(random(), 0.002735721180215478, places=15)
+
+    def test_indices_are_distinct_and_sorted(self):
+        picked = sample_indices(1000, 999, create_random(7))
+        self.assertEqual(len(set(picked)), 999)
+        self.assertEqual(picked, sorted(picked))
+        self.assertLess(max(picked), 1000)
+
+    def test_is_reproducible_from_the_seed(self):
+        self.assertEqual(sample_paper(list(range(20)), 5, 'seed-1'), [3, 5, 6, 16, 18])
+
+    def test_returns_every_item_when_count_is_missing_or_too_large(self):
+        items = list(range(5))
+        self.assertEqual(sample_paper(items, None, 'x'), items)
+        self.assertEqual(sample_paper(items, 5, 'x'), items)
+
+    def test_splits_the_count_across_strata_by_size(self):
+        def stratum(i):
+            return 'm' if i % 4 == 0 else 's'
+
+        paper = sample_paper(list(range(20)), 7, 'seed-1', stratum)
+        self.assertEqual(paper, [2, 4, 7, 8, 9, 15, 18])
+        self.assertEqual(len([i for i in paper if stratum(i) == 'm']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
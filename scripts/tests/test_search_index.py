@@ -0,0 +1,45 @@
+"""Search index: tokenizer parity with question-search.ts and the posting encoding."""
+
+import unittest
+
+from qbank.search_index import build_index, tokenize
+
+# Shared with src/features/search/__tests__/question-search.test.ts; both
+# tokenizers must produce exactly these terms.
+VECTORS = [
+    ('The S3 Object-Lock question', ['s3', 'object', 'lock', 'question']),
+    ('对象锁定 S3', ['对象', '象锁', '锁定', 's3']),
+    ('锁', ['锁']),
+    ('S3バケットのACL', ['s3', 'バケ', 'ケッ', 'ット', 'トの', 'acl']),
+    ('EC2インスタンス（東京）', ['ec2', 'イン', 'ンス', 'スタ', 'タン', 'ンス', '東京']),
+    ('Amazon RDS for MySQL 8.0', ['amazon', 'rds', 'mysql', '8', '0']),
+    ('Ünïcode café', ['n', 'code', 'caf']),
+]
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_shared_vectors(self):
+        for text, tokens in VECTORS:
+            with self.subTest(text=text):
+                self.assertEqual(tokenize(text), tokens)
+
+
+class BuildIndexTest(unittest.TestCase):
+    def test_postings_are_gaps_over_documents_in_question_order(self):
+        questions = [
+            {'id': 'c', 'questionNumber': 5, 'content': '<p>对象锁定</p>'},
+            {'id': 'a', 'questionNumber': 1, 'content': '<p>S3 Object Lock</p>'},
+            {'id': 'b', 'questionNumber': 2, 'content': 'S3 lifecycle',
+             'options': [{'label': 'A', 'content': 'Object expiry'}]},
+        ]
+        index = build_index(questions, 'EX', 'en')
+        self.assertEqual(index['docs'], {'questionNumber': [1, 2, 5],
+                                         'snippet': ['S3 Object Lock', 'S3 lifecycle', '对象锁定']})
+        self.assertEqual(index['terms']['s3'], [0, 1])
+        self.assertEqual(index['terms']['object'], [0, 1])
+        self.assertEqual(index['terms']['象锁'], [2])
+        self.assertEqual(list(index['terms']), sorted(index['terms']))
+
+
+if __name__ == '__main__':
+    unittest.main()
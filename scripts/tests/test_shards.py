@@ -0,0 +1,76 @@
+"""Bank shards: round trip through the manifest, stale pages and unchanged rewrites."""
+
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.bank import write_bank
+from qbank.shards import build_shards
+
+
+def _question(number):
+    return {'id': f'id-{number}', 'questionNumber': number, 'content': f'<p>Q{number} – ü</p>',
+            'correctAnswer': 'AC' if number % 3 == 0 else 'B',
+            **({'type': 'multiple'} if number % 3 == 0 else {})}
+
+
+class BuildShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        root = Path(self.dir.name)
+        self.bank = root / 'TEST.json'
+        self.out = root / 'shards'
+        # Out of order on purpose: shards follow questionNumber.
+        self.questions = [_question(n) for n in (5, 1, 4, 2, 3)]
+        write_bank(self.bank, self.questions, {'version': 1})
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def read(self, name):
+        return json.loads((self.out / 'TEST' / name).read_text(encoding='utf-8'))
+
+    def test_shards_round_trip_the_bank_in_question_order(self):
+        self.assertEqual(build_shards(self.bank, 'TEST', self.out, shard_size=2), (3, 4))
+        manifest = self.read('manifest.json')
+
+        questions = []
+        for shard in manifest['shards']:
+            data = (self.out / 'TEST' / shard['file']).read_bytes()
+            self.assertEqual(shard['hash'], hashlib.sha256(data).hexdigest()[:12])
+            page = json.loads(data)['questions']
+            self.assertEqual((shard['start'], shard['count']), (len(questions), len(page)))
+            questions.extend(page)
+        self.assertEqual(questions, sorted(self.questions, key=lambda q: q['questionNumber']))
+
+        self.assertEqual(manifest['version'], 1)
+        self.assertEqual((manifest['questionCount'], manifest['shardSize']), (5, 2))
+        self.assertEqual([s['file'] for s in manifest['shards']],
+                         ['shard-000.json', 'shard-001.json', 'shard-002.json'])
+        self.assertEqual(manifest['questions'], {
+            'id': ['id-1', 'id-2', 'id-3', 'id-4', 'id-5'],
+            'questionNumber': [1, 2, 3, 4, 5],
+            'type': ['single', 'single', 'multiple', 'single', 'single'],
+            'answerCount': [1, 1, 2, 1, 1],
+        })
+
+    def test_rebuilding_writes_only_what_changed(self):
+        build_shards(self.bank, 'TEST', self.out, shard_size=2)
+        self.assertEqual(build_shards(self.bank, 'TEST', self.out, shard_size=2), (3, 0))
+
+        self.questions[0]['content'] = '<p>Q5, edited</p>'
+        write_bank(self.bank, self.questions, {'version': 1})
+        # The last shard and the manifest holding its hash.
+        self.assertEqual(build_shards(self.bank, 'TEST', self.out, shard_size=2), (3, 2))
+
+    def test_removes_shards_beyond_the_new_count(self):
+        build_shards(self.bank, 'TEST', self.out, shard_size=2)
+        self.assertEqual(build_shards(self.bank, 'TEST', self.out, shard_size=5)[0], 1)
+        self.assertEqual(sorted(p.name for p in (self.out / 'TEST').iterdir()),
+                         ['manifest.json', 'shard-000.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
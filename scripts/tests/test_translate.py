@@ -0,0 +1,95 @@
+"""Translation jobs: resuming after an interruption, source hashes and --force."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from qbank.bank import iter_questions, write_bank
+from qbank.translate import Job, extract, job_root, merge, run_chunk
+
+QUESTIONS = [
+    {'id': 'q1', 'content': 'Which service?',
+     'options': [{'label': 'A', 'content': 'S3'}, {'label': 'B', 'content': 'EC2'}]},
+    {'id': 'q2', 'content': 'Which region?', 'options': [{'label': 'A', 'content': 'us-east-1'}]},
+    {'id': 'q3', 'content': 'Which zone?', 'options': []},
+]
+
+
+class TranslateJobTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.bank = Path(self.dir.name) / 'TEST.json'
+        write_bank(self.bank, QUESTIONS, {'version': 1})
+        self.job = Job('TEST', 'ja', job_root(self.bank))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def run_job(self, force=False):
+        """Extract, translate every chunk and merge; return (strings, applied)."""
+        count = extract(self.job, self.bank, 'en', chunk_size=1, force=force)
+        for chunk in self.job.pending():
+            run_chunk(chunk, 'stub', 'en', 'ja')
+        applied, failed = merge(self.job, self.bank)
+        self.assertEqual(failed, [])
+        return count, applied
+
+    def stems(self):
+        return {q['id']: (q.get('contents') or {}).get('ja') for q in iter_questions(self.bank)}
+
+    def test_job_files_of_a_copy_stay_next_to_it(self):
+        self.assertEqual(self.job.dir.parent, Path(self.dir.name).resolve() / '.translate')
+
+    def test_resumes_the_chunks_an_interrupted_run_left(self):
+        self.assertEqual(extract(self.job, self.bank, 'en', chunk_size=1), 6)
+        first, *rest = self.job.pending()
+        run_chunk(first, 'stub', 'en', 'ja')
+        # Interrupted here: one chunk has a result, two have none.
+        self.assertEqual(self.job.pending(), rest)
+
+        applied, _ = merge(self.job, self.bank)
+        self.assertEqual(applied, 3)
+        self.assertEqual(self.job.pending(), rest)
+        for chunk in rest:
+            run_chunk(chunk, 'stub', 'en', 'ja')
+        applied, _ = merge(self.job, self.bank)
+        self.assertEqual(applied, 3)
+        self.assertEqual(self.job.chunks(), [])
+        self.assertEqual(self.stems(), {'q1': '[ja] Which service?', 'q2': '[ja] Which region?',
+                                        'q3': '[ja] Which zone?'})
+
+    def test_skips_strings_whose_source_is_unchanged(self):
+        self.run_job()
+        before = self.bank.read_bytes()
+        self.assertEqual(self.run_job(), (0, 0))
+        self.assertEqual(self.bank.read_bytes(), before)
+
+        questions = list(iter_questions(self.bank))
+        questions[1]['content'] = 'Which AWS region?'
+        write_bank(self.bank, questions, {'version': 1})
+        self.assertEqual(self.run_job(), (1, 1))
+        self.assertEqual(self.stems()['q2'], '[ja] Which AWS region?')
+
+    def test_adopts_existing_translations_unless_forced(self):
+        questions = [dict(q) for q in QUESTIONS]
+        questions[2] = {**questions[2], 'contents': {'ja': 'どのゾーン？'}}
+        write_bank(self.bank, questions, {'version': 1})
+        self.assertEqual(self.run_job(), (5, 5))
+        self.assertEqual(self.stems()['q3'], 'どのゾーン？')
+
+        self.assertEqual(self.run_job(force=True), (6, 6))
+        self.assertEqual(self.stems()['q3'], '[ja] Which zone?')
+        state = json.loads(self.job.state_path.read_text(encoding='utf-8'))
+        self.assertEqual(len(state), 6)
+
+    def test_dry_run_writes_nothing(self):
+        before = self.bank.read_bytes()
+        self.assertEqual(extract(self.job, self.bank, 'en', dry_run=True), 6)
+        self.assertFalse(self.job.dir.exists())
+        self.assertFalse(self.job.state_path.exists())
+        self.assertEqual(self.bank.read_bytes(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
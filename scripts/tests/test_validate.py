@@ -0,0 +1,27 @@
+"""Known-error allowlist applied to validation problems."""
+
+import unittest
+
+from qbank.validate import ERROR, WARNING, apply_known_errors
+
+
+class KnownErrorsTest(unittest.TestCase):
+    def test_listed_errors_become_warnings(self):
+        problems = [(ERROR, 'SAA-C03.json#868', 'no options'),
+                    (ERROR, 'SAA-C03.json#869', 'no options'),
+                    (WARNING, 'SAA-C03.json#868', 'no explanation')]
+        result = apply_known_errors(problems, {'SAA-C03.json#868': ['no options']})
+        self.assertEqual(result, [(WARNING, 'SAA-C03.json#868', 'no options (known error)'),
+                                  (ERROR, 'SAA-C03.json#869', 'no options'),
+                                  (WARNING, 'SAA-C03.json#868', 'no explanation')])
+
+    def test_fixed_errors_are_flagged_for_removal(self):
+        result = apply_known_errors([], {'SAA-C03.json#125': ['duplicate option label D']})
+        self.assertEqual(len(result), 1)
+        severity, where, message = result[0]
+        self.assertEqual((severity, where), (WARNING, 'SAA-C03.json#125'))
+        self.assertIn('no longer occurs', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Machine-translate question stems and options into contents.<lang>.
+
+Only strings that are new, or whose source text changed since they were last
+translated, are sent to the backend. Work is split into chunks translated in
+parallel; each finished chunk is checkpointed, so an interrupted run resumes
+where it stopped when started again. Results are merged into the bank in one
+streaming rewrite, and strings the backend failed on are listed and retried
+on the next run (see qbank/translate.py). --dry-run only counts the strings
+a run would send.
+
+Usage:
+    python3 scripts/translate-bank.py SAA-C03 --lang zh-TC --backend stub --dry-run
+    python3 scripts/translate-bank.py DOP-C02 --lang zh-TC --from zh --backend mybackend:translate
+    python3 scripts/translate-bank.py SAP-C02 --lang ja --backend mybackend:translate --jobs 16
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from qbank.bank import bank_path, exam_id_for
+from qbank.translate import (
+    BACKENDS, DEFAULT_CHUNK_SIZE, DEFAULT_RETRIES, Job, extract, job_root, load_backend, merge,
+    run_chunk,
+)
+from qbank.variants import LANGUAGES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exam', help='exam id (e.g. SAA-C03) or path to a bank JSON file')
+    parser.add_argument('--lang', required=True, choices=[l for l in LANGUAGES if l != 'en'],
+                        help='target language')
+    parser.add_argument('--from', dest='source', default='en', choices=LANGUAGES,
+                        help='source language (default: en)')
+    parser.add_argument('--backend', required=True,
+                        help=f'translator: {", ".join(BACKENDS)} or module:function')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='questions per chunk')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help='backend attempts per chunk and per string')
+    parser.add_argument('--force', action='store_true',
+                        help='re-translate every string, including existing translations')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='count the strings to translate without translating or writing anything')
+    args = parser.parse_args()
+
+    if args.source == args.lang:
+        parser.error('--from and --lang must differ')
+    try:
+        load_backend(args.backend)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(f'cannot load backend {args.backend!r}: {e}')
+
+    started = time.perf_counter()
+    path = bank_path(args.exam)
+    exam_id = exam_id_for(path)
+    job = Job(exam_id, args.lang, job_root(path))
+    if args.dry_run:
+        count = extract(job, path, args.source, args.chunk_size, args.force, dry_run=True)
+        print(f'{exam_id}.{args.lang}: {count} strings to translate')
+        return 0
+
+    # Results checkpointed by an interrupted run are merged first; its
+    # remaining chunks are resumed instead of extracting a new job.
+    applied, failed = merge(job, path)
+    pending = job.pending()
+    if pending:
+        print(f'{exam_id}.{args.lang}: resuming {len(pending)} chunks')
+    else:
+        count = extract(job, path, args.source, args.chunk_size, args.force)
+        pending = job.pending()
+        print(f'{exam_id}.{args.lang}: {count} strings to translate in {len(pending)} chunks')
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(run_chunk, chunk, args.backend, args.source, args.lang, args.retries): chunk
+                   for chunk in pending}
+        for n, future in enumerate(as_completed(futures), 1):
+            ok, bad = future.result()
+            print(f'  [{n}/{len(futures)}] {futures[future].name}: {ok} translated'
+                  + (f', {bad} failed' if bad else ''))
+
+    merged, newly_failed = merge(job, path)
+    applied += merged
+    failed += newly_failed
+    elapsed = time.perf_counter() - started
+    print(f'{exam_id}.{args.lang}: merged {applied} strings into {path} ({elapsed:.1f} s).')
+    if failed:
+        print(f'{len(failed)} strings failed and will be retried on the next run:', file=sys.stderr)
+        for key in failed:
+            print(f'  {key}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Check exam banks, explanation sources and index.json for integrity problems.
+
+Banks are validated in parallel, one process per exam, and every problem is
+reported in a single run (see qbank/validate.py). Exits non-zero when any
+error is found; warnings only fail the run with --strict. Errors listed in
+scripts/known-errors.json are reported as warnings instead.
+
+Usage:
+    python3 scripts/validate-banks.py                 # every bank in public/data
+    python3 scripts/validate-banks.py SAA-C03 --strict
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from qbank.bank import DATA_DIR, bank_path, list_banks
+from qbank.validate import (ERROR, apply_known_errors, load_known_errors, validate_bank,
+                            validate_index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exams', nargs='*', help='exam ids or bank paths (default: all banks)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--strict', action='store_true', help='fail on warnings too')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    banks = [bank_path(e) for e in args.exams] or list_banks()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(validate_bank, banks))
+
+    counts = {exam_id: count for exam_id, count, _ in results}
+    problems = [p for _, _, found in results for p in found]
+    if not args.exams:
+        problems += validate_index(counts, DATA_DIR)
+    known = load_known_errors()
+    if args.exams:
+        # Only the banks checked can confirm their entries.
+        names = {bank.name for bank in banks}
+        known = {where: m for where, m in known.items() if where.split('#')[0] in names}
+    problems = apply_known_errors(problems, known)
+
+    for severity, where, message in problems:
+        print(f'{where}: {severity}: {message}')
+    errors = sum(1 for severity, _, _ in problems if severity == ERROR)
+    warnings = len(problems) - errors
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f'{len(banks)} banks, {sum(counts.values())} questions: '
+          f'{errors} errors, {warnings} warnings ({elapsed:.0f} ms)')
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
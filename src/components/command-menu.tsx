@@ -1,8 +1,16 @@
 import React from 'react'
 import { useNavigate } from '@tanstack/react-router'
-import { ArrowRight, ChevronRight, Laptop, Moon, Sun } from 'lucide-react'
+import {
+  ArrowRight,
+  ChevronRight,
+  FileText,
+  Laptop,
+  Moon,
+  Sun,
+} from 'lucide-react'
 import { useSearch } from '@/context/search-provider'
 import { useTheme } from '@/context/theme-provider'
+import { useQuestionSearch } from '@/features/search/use-question-search'
 import {
   CommandDialog,
   CommandEmpty,
@@ -19,6 +27,8 @@ export function CommandMenu() {
   const navigate = useNavigate()
   const { setTheme } = useTheme()
   const { open, setOpen } = useSearch()
+  const [query, setQuery] = React.useState('')
+  const questionHits = useQuestionSearch(open ? query : '')
 
   const runCommand = React.useCallback(
     (command: () => unknown) => {
@@ -30,10 +40,43 @@ export function CommandMenu() {
 
   return (
     <CommandDialog modal open={open} onOpenChange={setOpen}>
-      <CommandInput placeholder='Type a command or search...' />
+      <CommandInput
+        placeholder='Type a command or search...'
+        value={query}
+        onValueChange={setQuery}
+      />
       <CommandList>
         <ScrollArea type='hover' className='h-72 pe-1'>
           <CommandEmpty>No results found.</CommandEmpty>
+          {questionHits.length > 0 && (
+            <CommandGroup heading='Questions'>
+              {questionHits.map((hit) => (
+                <CommandItem
+                  key={`${hit.examId}-${hit.index}`}
+                  value={`${hit.examId} #${hit.questionNumber}`}
+                  // Hits are already matched by the search index.
+                  keywords={[query]}
+                  onSelect={() => {
+                    runCommand(() =>
+                      navigate({
+                        to: '/exams/$examId/practice',
+                        params: { examId: hit.examId },
+                        search: { q: hit.index + 1 },
+                      })
+                    )
+                  }}
+                >
+                  <FileText className='text-muted-foreground/80' />
+                  <span className='shrink-0 font-medium'>
+                    {hit.examId} #{hit.questionNumber}
+                  </span>
+                  <span className='truncate text-muted-foreground'>
+                    {hit.snippet}
+                  </span>
+                </CommandItem>
+              ))}
+            </CommandGroup>
+          )}
           {sidebarData.navGroups.map((group) => (
             <CommandGroup key={group.title} heading={group.title}>
               {group.items.map((navItem, i) => {
@@ -32,6 +32,7 @@ vi.mock('@/services/progress-service', () => ({
     getUserSettings: vi.fn().mockReturnValue({}),
     saveUserSettings: vi.fn(),
   },
+  flushProgress: vi.fn().mockResolvedValue(undefined),
 }))
 
 // Mock firebase progress
@@ -39,6 +40,8 @@ vi.mock('@/services/firebase-progress', () => ({
   mergeLocalIntoRemote: vi.fn().mockResolvedValue(undefined),
   mergeLocalSettingsIntoRemote: vi.fn().mockResolvedValue(undefined),
   getUserSettings: vi.fn().mockResolvedValue({}),
+  setSyncUser: vi.fn(),
+  flushSync: vi.fn().mockResolvedValue(true),
 }))
 
 function TestComponent() {
@@ -139,7 +142,38 @@ describe('AuthProvider', () => {
 
     await user.click(screen.getByRole('button', { name: 'Logout' }))
 
-    expect(mockSignOut).toHaveBeenCalled()
+    await waitFor(() => {
+      expect(mockSignOut).toHaveBeenCalled()
+    })
+  })
+
+  it('should write pending progress before signing out', async () => {
+    const { flushProgress } = await import('@/services/progress-service')
+    const { flushSync } = await import('@/services/firebase-progress')
+    const order: string[] = []
+    vi.mocked(flushProgress).mockImplementationOnce(async () => {
+      order.push('flush')
+    })
+    vi.mocked(flushSync).mockImplementationOnce(async () => {
+      order.push('sync')
+      return true
+    })
+    mockSignOut.mockImplementationOnce(async () => {
+      order.push('signOut')
+    })
+    const user = userEvent.setup()
+
+    render(
+      <AuthProvider>
+        <TestComponent />
+      </AuthProvider>
+    )
+
+    await user.click(screen.getByRole('button', { name: 'Logout' }))
+
+    await waitFor(() => {
+      expect(order).toEqual(['flush', 'sync', 'signOut'])
+    })
   })
 
   it('should update user state when auth changes', async () => {
@@ -159,6 +193,8 @@ describe('AuthProvider', () => {
     await waitFor(() => {
       expect(screen.getByTestId('user')).toHaveTextContent('logged-in')
     })
+    const { setSyncUser } = await import('@/services/firebase-progress')
+    expect(setSyncUser).toHaveBeenCalledWith('test-user-123')
   })
 
   it('should clean up subscription on unmount', () => {
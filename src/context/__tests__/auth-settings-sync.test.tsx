@@ -40,6 +40,8 @@ vi.mock('@/services/firebase-progress', () => {
     mergeLocalIntoRemote: vi.fn(async () => {}),
     mergeLocalSettingsIntoRemote: vi.fn(async () => {}),
     getUserSettings: vi.fn(async () => ({ 'SOA-C03': { owned: true } })),
+    setSyncUser: vi.fn(),
+    flushSync: vi.fn(async () => true),
   }
 })
 
@@ -65,6 +67,7 @@ describe('Auth settings sync on login', () => {
 
     expect(Local.ProgressService.mergeSettings).toHaveBeenCalledWith('guest-uuid', 'u1')
     expect(Remote.mergeLocalSettingsIntoRemote).toHaveBeenCalledWith('u1', { 'SOA-C03': { owned: true } })
+    expect(Remote.setSyncUser).toHaveBeenCalledWith('u1')
     expect(Remote.getUserSettings).toHaveBeenCalledWith('u1')
     expect(Local.ProgressService.saveUserSettings).toHaveBeenCalledWith('u1', { 'SOA-C03': { owned: true } })
   })
@@ -1,10 +1,12 @@
 import { useEffect, useState, type ReactNode } from 'react'
 import {
+  flushSync,
   mergeLocalIntoRemote,
   mergeLocalSettingsIntoRemote,
   getUserSettings as getRemoteUserSettings,
+  setSyncUser,
 } from '@/services/firebase-progress'
-import { ProgressService } from '@/services/progress-service'
+import { ProgressService, flushProgress } from '@/services/progress-service'
 import {
   onAuthStateChanged,
   signOut as firebaseSignOut,
@@ -31,6 +33,8 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   useEffect(() => {
     const unsubscribe = onAuthStateChanged(auth, (currentUser) => {
+      // Only the signed-in user's queued cloud writes may be sent.
+      setSyncUser(currentUser?.uid ?? null)
       if (currentUser) {
         /* istanbul ignore if -- guestId always exists in browser */
         if (guestId) {
@@ -53,6 +57,8 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   }, [guestId])
 
   const logout = async () => {
+    // Write pending answers locally and, while still allowed, to the cloud.
+    await Promise.all([flushProgress(), flushSync()])
     await firebaseSignOut(auth)
   }
 
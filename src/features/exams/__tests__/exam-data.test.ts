@@ -0,0 +1,46 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+import { fetchExamData } from '../exam-data'
+
+const mockFetch = vi.fn()
+vi.stubGlobal('fetch', mockFetch)
+
+const bank = { questions: [{ id: 'q1' }] }
+const variant = { questions: [{ id: 'q1', variant: true }] }
+
+beforeEach(() => {
+  mockFetch.mockReset()
+})
+
+describe('fetchExamData', () => {
+  it('loads the variant for the requested language', async () => {
+    mockFetch.mockResolvedValueOnce({ ok: true, json: async () => variant })
+    expect(await fetchExamData('EX', 'zh-TC')).toEqual(variant)
+    expect(mockFetch).toHaveBeenCalledTimes(1)
+    expect(mockFetch).toHaveBeenCalledWith('/data/EX.zh-TC.json')
+  })
+
+  it('falls back to the full bank when the variant is missing', async () => {
+    mockFetch
+      .mockResolvedValueOnce({ ok: false, status: 404 })
+      .mockResolvedValueOnce({ ok: true, json: async () => bank })
+    expect(await fetchExamData('EX', 'ja')).toEqual(bank)
+    expect(mockFetch).toHaveBeenLastCalledWith('/data/EX.json')
+  })
+
+  it('treats a non-bank response as a missing variant', async () => {
+    mockFetch
+      .mockResolvedValueOnce({
+        ok: true,
+        json: async () => {
+          throw new SyntaxError('Unexpected token <')
+        },
+      })
+      .mockResolvedValueOnce({ ok: true, json: async () => bank })
+    expect(await fetchExamData('EX', 'en')).toEqual(bank)
+  })
+
+  it('rejects when the full bank is missing too', async () => {
+    mockFetch.mockResolvedValue({ ok: false, status: 404 })
+    await expect(fetchExamData('EX', 'en')).rejects.toThrow('HTTP 404')
+  })
+})
@@ -37,11 +37,11 @@ vi.mock('sonner', () => ({
 }))
 
 // Mock firebase progress
-const mockSubscribeExamProgress = vi.fn()
+const mockSubscribeExamProgressChanges = vi.fn()
 vi.mock('@/services/firebase-progress', () => ({
   saveExamSettings: vi.fn(async () => {}),
-  subscribeExamProgress: (userId: string, examId: string, callback: (p: Record<string, unknown> | null) => void) => {
-    mockSubscribeExamProgress(userId, examId, callback)
+  subscribeExamProgressChanges: (userId: string, examId: string, handlers: unknown) => {
+    mockSubscribeExamProgressChanges(userId, examId, handlers)
     return () => {}
   },
 }))
@@ -201,10 +201,10 @@ describe('ExamDetails', () => {
     })
 
     await waitFor(() => {
-      expect(mockSubscribeExamProgress).toHaveBeenCalledWith(
+      expect(mockSubscribeExamProgressChanges).toHaveBeenCalledWith(
         'user-1',
         'test-exam',
-        expect.any(Function)
+        expect.objectContaining({ onHydrate: expect.any(Function) })
       )
     })
   })
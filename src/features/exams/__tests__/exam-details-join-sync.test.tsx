@@ -27,7 +27,7 @@ vi.mock('@/components/theme-switch', () => {
 vi.mock('@/services/firebase-progress', () => {
   return {
     saveExamSettings: vi.fn(async () => {}),
-    subscribeExamProgress: vi.fn(() => () => {}),
+    subscribeExamProgressChanges: vi.fn(() => () => {}),
   }
 })
 
@@ -0,0 +1,154 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+
+vi.stubEnv('VITE_EXAM_SHARDS', '1')
+const { openExamShards } = await import('../exam-shards')
+
+type Raw = { id: string; content: string }
+type Mapped = { id: string; text: string; pending?: boolean }
+
+const manifest = {
+  version: 1,
+  examId: 'EX',
+  questionCount: 5,
+  shardSize: 2,
+  shards: [
+    { file: 'shard-000.json', start: 0, count: 2, hash: 'a' },
+    { file: 'shard-001.json', start: 2, count: 2, hash: 'b' },
+    { file: 'shard-002.json', start: 4, count: 1, hash: 'c' },
+  ],
+  questions: {
+    id: ['q1', 'q2', 'q3', 'q4', 'q5'],
+    questionNumber: [1, 2, 3, 4, 5],
+    type: ['single', 'multiple', 'single', 'single', 'single'],
+    answerCount: [1, 2, 1, 1, 1],
+  },
+}
+
+const shardFiles: Record<string, Raw[]> = {
+  'shard-000.json': [
+    { id: 'q1', content: 'one' },
+    { id: 'q2', content: 'two' },
+  ],
+  'shard-001.json': [
+    { id: 'q3', content: 'three' },
+    { id: 'q4', content: 'four' },
+  ],
+  'shard-002.json': [{ id: 'q5', content: 'five' }],
+}
+
+const mockFetch = vi.fn()
+vi.stubGlobal('fetch', mockFetch)
+
+const map = (q: Raw): Mapped => ({ id: q.id, text: q.content })
+const placeholder = (e: { id: string }): Mapped => ({
+  id: e.id,
+  text: '',
+  pending: true,
+})
+
+function requestedFiles() {
+  return mockFetch.mock.calls.map(([url]) => String(url))
+}
+
+beforeEach(() => {
+  mockFetch.mockReset()
+  mockFetch.mockImplementation(async (url: string) => {
+    if (url.endsWith('/manifest.json')) {
+      return { ok: true, json: async () => manifest }
+    }
+    const file = url.split('/').pop()!.split('?')[0]
+    return { ok: true, json: async () => ({ questions: shardFiles[file] }) }
+  })
+})
+
+describe('openExamShards', () => {
+  it('returns null when no manifest is published', async () => {
+    mockFetch.mockResolvedValueOnce({ ok: false, status: 404 })
+    expect(await openExamShards('EX', map, placeholder)).toBeNull()
+  })
+
+  it('returns null for a response that is not a shard manifest', async () => {
+    mockFetch.mockResolvedValueOnce({
+      ok: true,
+      json: async () => ({ questions: [] }),
+    })
+    expect(await openExamShards('EX', map, placeholder)).toBeNull()
+  })
+
+  it('exposes the full question list from the manifest alone', async () => {
+    const shards = (await openExamShards('EX', map, placeholder))!
+    expect(shards.size).toBe(5)
+    expect(shards.indexOf('q4')).toBe(3)
+    expect(shards.indexOf('missing')).toBe(-1)
+    expect(shards.snapshot().every((q) => q.pending)).toBe(true)
+  })
+
+  it('loads the shard around a question and prefetches the next one', async () => {
+    const shards = (await openExamShards('EX', map, placeholder))!
+    expect(await shards.ensure(0)).toBe(true)
+
+    expect(requestedFiles()).toEqual([
+      '/data/shards/EX/manifest.json',
+      '/data/shards/EX/shard-000.json?v=a',
+      '/data/shards/EX/shard-001.json?v=b',
+    ])
+    expect(shards.snapshot().slice(0, 2).map((q) => q.text)).toEqual([
+      'one',
+      'two',
+    ])
+
+    // The prefetched shard is reused rather than fetched again.
+    await shards.ensure(2)
+    const snapshot = shards.snapshot()
+    expect(snapshot.slice(2, 4).map((q) => q.text)).toEqual(['three', 'four'])
+    expect(requestedFiles().slice(3)).toEqual([
+      '/data/shards/EX/shard-002.json?v=c',
+    ])
+  })
+
+  it('fetches each shard once and reports when nothing new arrived', async () => {
+    const shards = (await openExamShards('EX', map, placeholder))!
+    await shards.ensure(0)
+    shards.snapshot()
+
+    expect(await shards.ensure(1)).toBe(false)
+    expect(requestedFiles()).toHaveLength(3)
+  })
+
+  it('prefetches the shard of an explicit next index', async () => {
+    const shards = (await openExamShards('EX', map, placeholder))!
+    await shards.ensure(0, 4)
+    expect(requestedFiles()).toContain('/data/shards/EX/shard-002.json?v=c')
+    expect(requestedFiles()).not.toContain('/data/shards/EX/shard-001.json?v=b')
+  })
+
+  it('prefers the shards of the language variant', async () => {
+    const shards = (await openExamShards('EX', map, placeholder, 'ja'))!
+    await shards.ensure(0)
+    expect(requestedFiles().slice(0, 2)).toEqual([
+      '/data/shards/EX.ja/manifest.json',
+      '/data/shards/EX.ja/shard-000.json?v=a',
+    ])
+  })
+
+  it('falls back to the full bank shards without a variant', async () => {
+    mockFetch.mockResolvedValueOnce({ ok: false, status: 404 })
+    const shards = (await openExamShards('EX', map, placeholder, 'ja'))!
+    await shards.ensure(0)
+    expect(requestedFiles().slice(0, 3)).toEqual([
+      '/data/shards/EX.ja/manifest.json',
+      '/data/shards/EX/manifest.json',
+      '/data/shards/EX/shard-000.json?v=a',
+    ])
+  })
+
+  it('retries a shard that failed to load', async () => {
+    const shards = (await openExamShards('EX', map, placeholder))!
+    mockFetch.mockResolvedValueOnce({ ok: false, status: 500 })
+    mockFetch.mockResolvedValueOnce({ ok: false, status: 500 })
+    await expect(shards.ensure(0)).rejects.toThrow('HTTP 500')
+
+    expect(await shards.ensure(0)).toBe(true)
+    expect(shards.isLoaded(0)).toBe(true)
+  })
+})
@@ -0,0 +1,112 @@
+import { describe, it, expect } from 'vitest'
+import {
+  htmlNodesToText,
+  parseHtmlNodes,
+  type HtmlNode,
+} from '../html-nodes'
+
+describe('parseHtmlNodes', () => {
+  it('converts styled tags and keeps text', () => {
+    expect(
+      parseHtmlNodes('<p>Use <strong>S3</strong> &amp; <code>cp</code></p>')
+    ).toEqual([['p', ['Use ', ['strong', ['S3']], ' & ', ['code', ['cp']]]]])
+  })
+
+  it('turns unknown elements into spans and drops scripts', () => {
+    expect(
+      parseHtmlNodes('<div>a</div><script>alert(1)</script>\n<b>b</b>')
+    ).toEqual([
+      ['span', ['a']],
+      ['span', ['b']],
+    ])
+  })
+
+  it('keeps only image attributes the renderer reads', () => {
+    expect(
+      parseHtmlNodes(
+        '<img src="images/EX/q1.png" width="406" onerror="x()" data-formats="webp">'
+      )
+    ).toEqual([
+      ['img', [], { src: 'images/EX/q1.png', width: '406', 'data-formats': 'webp' }],
+    ])
+    expect(parseHtmlNodes('<img src="javascript:x()">')).toEqual([])
+  })
+
+  it('skips the parser for plain text', () => {
+    expect(parseHtmlNodes('Plain option')).toEqual(['Plain option'])
+    expect(parseHtmlNodes('  ')).toEqual([])
+  })
+
+  // Shared with scripts/tests/test_html_nodes.py; the pre-parsed trees and
+  // the browser's parse must agree.
+  it.each<[string, HtmlNode[]]>([
+    [
+      '<p>Use <strong>S3</strong> &amp; <code>cp</code></p>',
+      [['p', ['Use ', ['strong', ['S3']], ' & ', ['code', ['cp']]]]],
+    ],
+    [
+      '<div>a</div><script>alert(1)</script>\n<b>b</b>',
+      [
+        ['span', ['a']],
+        ['span', ['b']],
+      ],
+    ],
+    [
+      '<img src="images/EX/q1.png" width="406" onerror="x()" data-formats="webp">',
+      [
+        [
+          'img',
+          [],
+          { src: 'images/EX/q1.png', width: '406', 'data-formats': 'webp' },
+        ],
+      ],
+    ],
+    ['<img src="javascript:x()">', []],
+    [
+      '<IMG SRC="https://x/y.png" ALT="d">',
+      [['img', [], { src: 'https://x/y.png', alt: 'd' }]],
+    ],
+    [
+      '<p>one<p>two',
+      [
+        ['p', ['one']],
+        ['p', ['two']],
+      ],
+    ],
+    [
+      '<p>a<div>b</div></p>',
+      [
+        ['p', ['a']],
+        ['span', ['b']],
+        ['p', []],
+      ],
+    ],
+    ['<p/>x', [['p', ['x']]]],
+    [
+      '<ol><li>x<ul><li>y</ul><li>z</ol>',
+      [['ol', [['li', ['x', ['ul', [['li', ['y']]]]]], ['li', ['z']]]]],
+    ],
+    ['<em>a <style>p{}</style>b</em>', [['em', ['a ', 'b']]]],
+    [
+      '<p>a<br/>b</p><p> </p>',
+      [
+        ['p', ['a', ['br', []], 'b']],
+        ['p', []],
+      ],
+    ],
+    ['<p>1 &lt; 2</p>', [['p', ['1 < 2']]]],
+  ])('parses %s like the Python sanitizer', (html, nodes) => {
+    expect(parseHtmlNodes(html)).toEqual(nodes)
+  })
+})
+
+describe('htmlNodesToText', () => {
+  it('puts block elements on separate lines', () => {
+    expect(
+      htmlNodesToText([
+        ['p', ['Which ', ['strong', ['two']], '?']],
+        ['ul', [['li', ['A']], ['li', ['B']]]],
+      ])
+    ).toBe('Which two?\nA\nB')
+  })
+})
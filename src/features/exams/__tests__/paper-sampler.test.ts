@@ -0,0 +1,64 @@
+import { describe, it, expect } from 'vitest'
+import {
+  createRandom,
+  hashSeed,
+  sampleIndices,
+  samplePaper,
+} from '../paper-sampler'
+
+// Expected values are shared with scripts/qbank/sampler.py.
+const range = (n: number) => Array.from({ length: n }, (_, i) => i)
+
+describe('hashSeed', () => {
+  it('matches MurmurHash3 x86_32 reference values', () => {
+    expect(hashSeed('')).toBe(0)
+    expect(hashSeed('hello')).toBe(0x248bfa47)
+    expect(hashSeed('The quick brown fox jumps over the lazy dog')).toBe(
+      0x2e4ff723
+    )
+  })
+
+  it('hashes UTF-8 bytes', () => {
+    expect(hashSeed('week-12')).toBe(2799941619)
+    expect(hashSeed('考试')).toBe(1518586009)
+  })
+})
+
+describe('createRandom', () => {
+  it('is mulberry32', () => {
+    const random = createRandom(1)
+    expect(random()).toBeCloseTo(0.6270739405881613, 15)
+    expect(random()).toBeCloseTo(0.002735721180215478, 15)
+  })
+})
+
+describe('sampleIndices', () => {
+  it('returns distinct sorted positions', () => {
+    const picked = sampleIndices(1000, 999, createRandom(7))
+    expect(new Set(picked).size).toBe(999)
+    expect(picked).toEqual([...picked].sort((a, b) => a - b))
+    expect(Math.max(...picked)).toBeLessThan(1000)
+  })
+})
+
+describe('samplePaper', () => {
+  it('is reproducible from the seed', () => {
+    expect(samplePaper(range(20), 5, 'seed-1')).toEqual([3, 5, 6, 16, 18])
+    expect(samplePaper(range(20), 5, 'seed-1')).toEqual(
+      samplePaper(range(20), 5, 'seed-1')
+    )
+  })
+
+  it('returns every item when count is missing or too large', () => {
+    const items = range(5)
+    expect(samplePaper(items, undefined, 'x')).toBe(items)
+    expect(samplePaper(items, 5, 'x')).toBe(items)
+  })
+
+  it('splits the count across strata by size', () => {
+    const stratum = (i: number) => (i % 4 === 0 ? 'm' : 's')
+    const paper = samplePaper(range(20), 7, 'seed-1', stratum)
+    expect(paper).toEqual([2, 4, 7, 8, 9, 15, 18])
+    expect(paper.filter((i) => stratum(i) === 'm')).toHaveLength(2)
+  })
+})
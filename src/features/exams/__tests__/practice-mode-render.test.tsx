@@ -38,7 +38,7 @@ vi.mock('firebase/database', () => ({
 }))
 
 vi.mock('@/services/firebase-progress', () => ({
-  subscribeExamProgress: vi.fn(() => () => {}),
+  subscribeExamProgressChanges: vi.fn(() => () => {}),
   saveAnswer: vi.fn(),
   toggleBookmark: vi.fn(),
   clearExamProgress: vi.fn(),
@@ -0,0 +1,120 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+import {
+  clearPromptContextCache,
+  getLoadedPromptContext,
+  loadPromptContext,
+} from '../prompt-context'
+
+const mockFetch = vi.fn()
+vi.stubGlobal('fetch', mockFetch)
+
+const manifest = (ids: string[], shardSize = 2) => ({
+  version: 1,
+  examId: 'EX',
+  shardSize,
+  ids,
+})
+
+const shard = (language: string, questions: Record<string, string>) => ({
+  version: 1,
+  examId: 'EX',
+  language,
+  questions: Object.fromEntries(
+    Object.entries(questions).map(([id, text]) => [id, { text, tokens: 3 }])
+  ),
+})
+
+const respond = (files: Record<string, unknown>) =>
+  mockFetch.mockImplementation(async (url: string) => {
+    const body = files[url]
+    return { ok: !!body, json: async () => body }
+  })
+
+const MANIFEST = '/data/prompts/EX/manifest.json'
+
+beforeEach(() => {
+  clearPromptContextCache()
+  mockFetch.mockReset()
+})
+
+describe('loadPromptContext', () => {
+  it('returns the question context in the requested language', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1']),
+      '/data/prompts/EX/ja/shard-000.json': shard('ja', { q1: 'ja text' }),
+    })
+    expect(await loadPromptContext('EX', 'q1', 'ja')).toEqual({
+      text: 'ja text',
+      tokens: 3,
+    })
+  })
+
+  it('fetches only the page holding the question, once', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1', 'q2', 'q3']),
+      '/data/prompts/EX/en/shard-000.json': shard('en', { q1: 'a', q2: 'b' }),
+      '/data/prompts/EX/en/shard-001.json': shard('en', { q3: 'c' }),
+    })
+    await loadPromptContext('EX', 'q1', 'en')
+    await loadPromptContext('EX', 'q2', 'en')
+    expect(mockFetch.mock.calls.map(([url]) => url)).toEqual([
+      MANIFEST,
+      '/data/prompts/EX/en/shard-000.json',
+    ])
+    expect((await loadPromptContext('EX', 'q3', 'en'))?.text).toBe('c')
+    expect(mockFetch).toHaveBeenCalledTimes(3)
+  })
+
+  it('falls back to English', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1']),
+      '/data/prompts/EX/en/shard-000.json': shard('en', { q1: 'en text' }),
+    })
+    expect((await loadPromptContext('EX', 'q1', 'zh'))?.text).toBe('en text')
+  })
+
+  it('returns null when nothing is published', async () => {
+    respond({})
+    expect(await loadPromptContext('EX', 'q1', 'en')).toBeNull()
+    clearPromptContextCache()
+    mockFetch.mockRejectedValue(new Error('offline'))
+    expect(await loadPromptContext('EX', 'q1', 'ja')).toBeNull()
+  })
+
+  it('ignores files of another version', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1']),
+      '/data/prompts/EX/en/shard-000.json': { version: 2, questions: {} },
+    })
+    expect(await loadPromptContext('EX', 'q1', 'en')).toBeNull()
+    clearPromptContextCache()
+    respond({ [MANIFEST]: { ...manifest(['q1']), version: 2 } })
+    expect(await loadPromptContext('EX', 'q1', 'en')).toBeNull()
+    expect(mockFetch).toHaveBeenCalledTimes(2)
+  })
+})
+
+describe('getLoadedPromptContext', () => {
+  it('returns null until the page has arrived, without fetching', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1']),
+      '/data/prompts/EX/en/shard-000.json': shard('en', { q1: 'en text' }),
+    })
+    expect(getLoadedPromptContext('EX', 'q1', 'en')).toBeNull()
+    expect(mockFetch).not.toHaveBeenCalled()
+
+    const pending = loadPromptContext('EX', 'q1', 'en')
+    expect(getLoadedPromptContext('EX', 'q1', 'en')).toBeNull()
+    await pending
+    expect(getLoadedPromptContext('EX', 'q1', 'en')?.text).toBe('en text')
+  })
+
+  it('falls back to a loaded English context', async () => {
+    respond({
+      [MANIFEST]: manifest(['q1']),
+      '/data/prompts/EX/en/shard-000.json': shard('en', { q1: 'en text' }),
+    })
+    await loadPromptContext('EX', 'q1', 'ja')
+    expect(getLoadedPromptContext('EX', 'q1', 'ja')?.text).toBe('en text')
+  })
+})
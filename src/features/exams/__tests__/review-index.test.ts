@@ -0,0 +1,107 @@
+import { describe, it, expect } from 'vitest'
+import { createReviewIndex } from '../review-index'
+
+describe('createReviewIndex', () => {
+  const progress = {
+    q1: { status: 'incorrect' as const, timesWrong: 1, lastAnswered: 30 },
+    q2: { status: 'incorrect' as const, timesWrong: 3, lastAnswered: 20 },
+    q3: { status: 'correct' as const, lastAnswered: 10 },
+    q4: {
+      status: 'correct' as const,
+      timesWrong: 1,
+      consecutiveCorrect: 1,
+      lastAnswered: 5,
+    },
+    q5: {
+      status: 'correct' as const,
+      timesWrong: 2,
+      consecutiveCorrect: 3,
+      lastAnswered: 1,
+    },
+  }
+
+  it('orders due mistakes by urgency and counts answers', () => {
+    const index = createReviewIndex(progress, 3)
+
+    expect(index.ordered()).toEqual(['q2', 'q1', 'q4'])
+    expect(index.peek()).toBe('q2')
+    expect(index.graduates()).toEqual(['q5'])
+    expect(index.counts()).toEqual({ correct: 3, incorrect: 2, due: 3 })
+  })
+
+  it('updates a single question in place', () => {
+    const index = createReviewIndex(progress, 3)
+
+    index.set({
+      q2: {
+        status: 'correct',
+        timesWrong: 3,
+        consecutiveCorrect: 3,
+        lastAnswered: 40,
+      },
+    })
+    expect(index.isDue('q2')).toBe(false)
+    expect(index.graduates().sort()).toEqual(['q2', 'q5'])
+
+    index.set({ q3: { status: 'incorrect', timesWrong: 5, lastAnswered: 50 } })
+    expect(index.peek()).toBe('q3')
+    expect(index.counts()).toEqual({ correct: 3, incorrect: 2, due: 3 })
+  })
+
+  it('merges only remote entries answered later', () => {
+    const index = createReviewIndex(progress, 3)
+
+    index.merge({
+      q1: { status: 'correct', lastAnswered: 31 },
+      q2: { status: 'correct', lastAnswered: 1 },
+    })
+    expect(index.isDue('q1')).toBe(false)
+    expect(index.isDue('q2')).toBe(true)
+  })
+
+  it('counts and reviews only the exam questions it is restricted to', () => {
+    const index = createReviewIndex(progress, 3, ['q1', 'q3', 'q5'])
+
+    expect(index.counts()).toEqual({ correct: 2, incorrect: 1, due: 1 })
+    expect(index.ordered()).toEqual(['q1'])
+    expect(index.graduates()).toEqual(['q5'])
+
+    // Progress outside the list is kept for when the list changes.
+    index.set({ q9: { status: 'incorrect', timesWrong: 9, lastAnswered: 1 } })
+    expect(index.peek()).toBe('q1')
+    index.restrict(['q2', 'q9'])
+    expect(index.ordered()).toEqual(['q9', 'q2'])
+    expect(index.counts()).toEqual({ correct: 0, incorrect: 2, due: 2 })
+  })
+
+  it('ranks again for a new threshold and replaces progress on reset', () => {
+    const index = createReviewIndex(progress, 3)
+
+    index.setThreshold(1)
+    expect(index.threshold).toBe(1)
+    expect(index.ordered()).toEqual(['q2', 'q1'])
+    expect(index.graduates().sort()).toEqual(['q4', 'q5'])
+
+    index.reset({ q3: { status: 'incorrect', lastAnswered: 1 } })
+    expect(index.ordered()).toEqual(['q3'])
+    expect(index.graduates()).toEqual([])
+    expect(index.counts()).toEqual({ correct: 0, incorrect: 1, due: 1 })
+  })
+
+  it('keeps the heap consistent across many updates', () => {
+    const index = createReviewIndex({}, 2)
+    for (let i = 0; i < 200; i++) {
+      index.set({
+        [`q${i % 37}`]: {
+          status: i % 3 === 0 ? 'correct' : 'incorrect',
+          timesWrong: (i * 7) % 5,
+          consecutiveCorrect: i % 3,
+          lastAnswered: i,
+        },
+      })
+      const ordered = index.ordered()
+      expect(index.peek()).toBe(ordered[0])
+      expect(index.counts().due).toBe(ordered.length)
+    }
+  })
+})
@@ -56,6 +56,17 @@ describe('buildQuestionContext', () => {
     )
   })
 
+  it('uses a precomputed context in place of the question fields', () => {
+    const out = buildQuestionContext(
+      makeCtx({
+        precomputed: 'Question:\nCompact stem',
+        userSelectedLetters: ['B'],
+        builtinExplanation: 'S3 is object storage.',
+      })
+    )
+    expect(out).toBe('Question:\nCompact stem\nMy answer: B')
+  })
+
   it('carries no instruction of its own', () => {
     expect(buildQuestionContext(makeCtx())).not.toContain('Please explain')
   })
@@ -0,0 +1,35 @@
+import { describe, it, expect } from 'vitest'
+import { render } from '@testing-library/react'
+import { ExamHtml } from '../exam-html'
+
+describe('ExamHtml', () => {
+  it('renders pre-parsed nodes', () => {
+    const { container } = render(
+      <ExamHtml
+        nodes={[
+          ['p', ['Pick ', ['strong', ['one']]]],
+          ['img', [], { src: 'images/EX/q1.png', width: '10', height: '5' }],
+        ]}
+      />
+    )
+    expect(container.querySelector('p.leading-relaxed')).not.toBeNull()
+    expect(container.querySelector('p strong')?.textContent).toBe('one')
+    expect(container.querySelector('img')?.getAttribute('src')).toBe(
+      '/data/images/EX/q1.png'
+    )
+  })
+
+  it('falls back to parsing raw HTML', () => {
+    const { container } = render(
+      <ExamHtml html='<ul><li>A</li><li>B</li></ul>' />
+    )
+    expect(container.querySelectorAll('ul.list-disc li')).toHaveLength(2)
+  })
+
+  it('prefers nodes over raw HTML', () => {
+    const { container } = render(
+      <ExamHtml nodes={[['em', ['from nodes']]]} html='<p>from html</p>' />
+    )
+    expect(container.textContent).toBe('from nodes')
+  })
+})
@@ -0,0 +1,47 @@
+import { describe, it, expect } from 'vitest'
+import { render } from '@testing-library/react'
+import { ExamImage } from '../exam-image'
+
+describe('ExamImage', () => {
+  it('renders intrinsic dimensions and lazy loading', () => {
+    const { container } = render(
+      <ExamImage
+        src='/data/images/EX/q1.png'
+        attributes={{ alt: 'Diagram', width: '406', height: '196' }}
+      />
+    )
+    const img = container.querySelector('img')!
+    expect(img.getAttribute('width')).toBe('406')
+    expect(img.getAttribute('height')).toBe('196')
+    expect(img.getAttribute('loading')).toBe('lazy')
+    expect(img.getAttribute('alt')).toBe('Diagram')
+    expect(container.querySelector('picture')).toBeNull()
+  })
+
+  it('offers the published modern formats through <picture>', () => {
+    const { container } = render(
+      <ExamImage
+        src='/data/images/EX/q1.png'
+        attributes={{ 'data-formats': 'avif webp' }}
+      />
+    )
+    const sources = Array.from(container.querySelectorAll('picture source'))
+    expect(sources.map((s) => s.getAttribute('srcset'))).toEqual([
+      '/data/images/EX/q1.avif',
+      '/data/images/EX/q1.webp',
+    ])
+    expect(sources.map((s) => s.getAttribute('type'))).toEqual([
+      'image/avif',
+      'image/webp',
+    ])
+  })
+
+  it('ignores missing or invalid sizes', () => {
+    const { container } = render(
+      <ExamImage src='/data/q.png' attributes={{ width: 'auto' }} />
+    )
+    const img = container.querySelector('img')!
+    expect(img.hasAttribute('width')).toBe(false)
+    expect(img.hasAttribute('height')).toBe(false)
+  })
+})
@@ -26,6 +26,7 @@ import {
   buildSystemPrompt,
   type QuestionContext,
 } from './ai-chat-prompt'
+import { getLoadedPromptContext, loadPromptContext } from '../prompt-context'
 import { MarkdownMessage } from './markdown-message'
 
 interface AiChatPanelProps {
@@ -66,28 +67,35 @@ export function AiChatPanel({ context }: AiChatPanelProps) {
     setStreamingId(null)
     setInput('')
     setError(null)
-    const saved = userId
-      ? AiChatHistoryService.get(userId, context.examId, context.questionId)
-      : []
-    setMessages(
-      saved.map((m) => ({ id: m.id, role: m.role, content: m.content }))
-    )
-  }, [context.examId, context.questionId, userId])
+    setMessages([])
+    // Fetch the question's precomputed context ahead of the first request.
+    void loadPromptContext(context.examId, context.questionId, context.language)
+    if (!userId) return
+    let cancelled = false
+    void AiChatHistoryService.get(
+      userId,
+      context.examId,
+      context.questionId
+    ).then((saved) => {
+      if (!cancelled) setMessages(saved)
+    })
+    return () => {
+      cancelled = true
+    }
+  }, [context.examId, context.questionId, context.language, userId])
 
-  // Persist a completed thread so it can be restored on return to this question.
-  const wasStreamingRef = useRef(false)
-  useEffect(() => {
-    const justFinished = wasStreamingRef.current && !streaming
-    wasStreamingRef.current = streaming
-    if (!justFinished || !userId || messages.length === 0) return
-    AiChatHistoryService.save(
+  // Persist each message as it is added, and the reply as it streams in, so
+  // the thread can be restored on return to this question.
+  const persist = ({ id, role, content }: UiMessage) => {
+    if (!userId) return
+    AiChatHistoryService.append(
       userId,
       context.examId,
       context.questionId,
-      messages.map((m) => ({ id: m.id, role: m.role, content: m.content })),
+      { id, role, content },
       Date.now()
     )
-  }, [streaming, messages, userId, context.examId, context.questionId])
+  }
 
   useEffect(() => {
     if (scrollRef.current) {
@@ -110,15 +118,26 @@ export function AiChatPanel({ context }: AiChatPanelProps) {
     setStreamingId(assistantId)
     setMessages((m) => [...m, { id: assistantId, role: 'assistant', content: '' }])
 
+    let content = ''
     const controller = new AbortController()
     abortRef.current = controller
+    // Use the precomputed context only if it has arrived; a request never
+    // waits for it.
+    const precomputed = getLoadedPromptContext(
+      context.examId,
+      context.questionId,
+      context.language
+    )
     // The current question is injected into the system message on every request
     // so the model always has it — whether the user clicked Explain or typed a
     // free-form message. Reasoning is internal; never send it back as history.
     const apiMessages: ChatMessage[] = [
       {
         role: 'system',
-        content: buildSystemPrompt(settings.systemPrompt, context),
+        content: buildSystemPrompt(settings.systemPrompt, {
+          ...context,
+          precomputed: precomputed?.text,
+        }),
       },
       ...history.map((m) => ({ role: m.role, content: m.content })),
     ]
@@ -131,6 +150,10 @@ export function AiChatPanel({ context }: AiChatPanelProps) {
         messages: apiMessages,
         signal: controller.signal,
       })) {
+        if (delta.content) {
+          content += delta.content
+          persist({ id: assistantId, role: 'assistant', content })
+        }
         setMessages((m) =>
           m.map((msg) =>
             msg.id === assistantId
@@ -177,6 +200,7 @@ export function AiChatPanel({ context }: AiChatPanelProps) {
     const sendableContent = buildExplainInstruction(context)
     const history = [...messages, { ...userMsg, content: sendableContent }]
     setMessages((m) => [...m, userMsg])
+    persist(userMsg)
     void runChat(history)
   }
 
@@ -191,6 +215,7 @@ export function AiChatPanel({ context }: AiChatPanelProps) {
     }
     const history = [...messages, userMsg]
     setMessages((m) => [...m, userMsg])
+    persist(userMsg)
     setInput('')
     void runChat(history)
   }
@@ -7,6 +7,11 @@ export interface QuestionContext {
   userSelectedLetters: string[]
   language: string
   builtinExplanation?: string
+  /**
+   * Compact plain-text context published for this question (see
+   * features/exams/prompt-context.ts); used instead of the fields above.
+   */
+  precomputed?: string
 }
 
 function languageName(language: string): string {
@@ -24,7 +29,8 @@ function languageName(language: string): string {
 
 /**
  * Render the current question as reference context (stem, options, correct
- * answer, the user's answer, and any built-in explanation).
+ * answer, the user's answer, and any built-in explanation). A precomputed
+ * context replaces everything but the user's answer.
  *
  * This is injected into the system message on *every* request so the model
  * always knows which question is being discussed — whether the user clicks
@@ -33,6 +39,13 @@ function languageName(language: string): string {
  */
 export function buildQuestionContext(ctx: QuestionContext): string {
   const lines: string[] = []
+  if (ctx.precomputed) {
+    lines.push(ctx.precomputed)
+    if (ctx.userSelectedLetters.length > 0) {
+      lines.push(`My answer: ${ctx.userSelectedLetters.join(', ')}`)
+    }
+    return lines.join('\n')
+  }
   lines.push('Question:')
   lines.push(ctx.questionText)
   lines.push('')
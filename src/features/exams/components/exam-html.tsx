@@ -0,0 +1,104 @@
+import { useMemo, type ReactNode } from 'react'
+import { type HtmlNode, parseHtmlNodes } from '../html-nodes'
+import { ExamImage } from './exam-image'
+
+type ExamHtmlProps = {
+  /** Pre-parsed nodes from a language variant. */
+  nodes?: HtmlNode[]
+  /** Raw HTML, parsed on render when no nodes are available. */
+  html?: string
+}
+
+function resolveAssetUrl(src: string) {
+  const trimmed = (src ?? '').trim()
+  if (!trimmed) return trimmed
+  if (/^https?:\/\//i.test(trimmed)) return trimmed
+  if (trimmed.startsWith('/')) return trimmed
+  return `/data/${trimmed}`
+}
+
+function renderNode(
+  node: HtmlNode,
+  key: string | number,
+  parentTag?: string
+): ReactNode {
+  if (typeof node === 'string') {
+    const text = node.trim()
+    if (!text) return null
+    if (parentTag === 'p' || parentTag === 'li') {
+      return text
+    }
+    return (
+      <span key={key} className='leading-relaxed'>
+        {text}
+      </span>
+    )
+  }
+
+  const [tag, childNodes, attributes] = node
+
+  /* istanbul ignore if -- image rendering with error handler */
+  if (tag === 'img') {
+    return (
+      <ExamImage
+        key={key}
+        src={resolveAssetUrl(attributes?.src ?? '')}
+        attributes={attributes ?? {}}
+      />
+    )
+  }
+
+  if (tag === 'br') return <br key={key} />
+
+  const children = childNodes.map((child, index) =>
+    renderNode(child, `${key}-${index}`, tag)
+  )
+
+  if (tag === 'p') {
+    return (
+      <p key={key} className='leading-relaxed'>
+        {children}
+      </p>
+    )
+  }
+
+  if (tag === 'strong') return <strong key={key}>{children}</strong>
+  if (tag === 'em') return <em key={key}>{children}</em>
+  if (tag === 'code') return <code key={key}>{children}</code>
+
+  if (tag === 'ul')
+    return (
+      <ul key={key} className='list-disc pl-6'>
+        {children}
+      </ul>
+    )
+  if (tag === 'ol')
+    return (
+      <ol key={key} className='list-decimal pl-6'>
+        {children}
+      </ol>
+    )
+  if (tag === 'li') return <li key={key}>{children}</li>
+
+  /* istanbul ignore next -- fallback span rendering */
+  return (
+    <span key={key} className='whitespace-pre-wrap'>
+      {children}
+    </span>
+  )
+}
+
+/**
+ * Question, option or explanation HTML. Variants carry the node tree
+ * pre-parsed at build time; raw HTML from full banks is parsed once per
+ * string and memoized.
+ */
+export function ExamHtml({ nodes, html = '' }: ExamHtmlProps) {
+  const tree = useMemo(() => nodes ?? parseHtmlNodes(html), [nodes, html])
+  if (!tree) return <span>{html}</span>
+  return (
+    <div className='space-y-3'>
+      {tree.map((node, i) => renderNode(node, i, 'body'))}
+    </div>
+  )
+}
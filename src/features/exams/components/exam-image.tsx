@@ -0,0 +1,52 @@
+type ExamImageProps = {
+  /** Resolved URL of the image. */
+  src: string
+  /** Attributes of the `<img>` in question HTML. */
+  attributes: Record<string, string>
+}
+
+function siblingUrl(src: string, format: string) {
+  return src.replace(/\.[^./]+$/, `.${format}`)
+}
+
+function readSize(attributes: Record<string, string>, name: string) {
+  const value = Number(attributes[name])
+  return Number.isFinite(value) && value > 0 ? value : undefined
+}
+
+/**
+ * An image from question HTML. `scripts/optimize-images.py` writes the
+ * intrinsic width/height (so the layout does not shift while it loads) and
+ * `data-formats` listing the AVIF/WebP siblings published next to the file.
+ */
+export function ExamImage({ src, attributes }: ExamImageProps) {
+  const formats = (attributes['data-formats'] ?? '')
+    .split(/\s+/)
+    .filter(Boolean)
+  const img = (
+    <img
+      src={src}
+      alt={attributes.alt ?? ''}
+      width={readSize(attributes, 'width')}
+      height={readSize(attributes, 'height')}
+      loading='lazy'
+      className='h-auto max-w-full rounded-md border'
+      onError={(e) => {
+        e.currentTarget.style.display = 'none'
+      }}
+    />
+  )
+  if (formats.length === 0) return img
+  return (
+    <picture>
+      {formats.map((format) => (
+        <source
+          key={format}
+          type={`image/${format}`}
+          srcSet={siblingUrl(src, format)}
+        />
+      ))}
+      {img}
+    </picture>
+  )
+}
@@ -22,6 +22,8 @@ interface PracticeMobileBarProps {
   onToggleBookmark: () => void
   mistakesMode: boolean
   mistakesSessionStatus: Record<string, 'correct' | 'incorrect' | undefined>
+  /** Precomputed answer counts for `questions`, skipping the recount. */
+  counts?: { correct: number; incorrect: number }
   settings: PracticeSettings
   onSettingsChange: (settings: PracticeSettings) => void
 }
@@ -37,6 +39,7 @@ export function PracticeMobileBar({
   mistakesSessionStatus,
   settings,
   onSettingsChange,
+  counts,
 }: PracticeMobileBarProps) {
   let correct = 0
   let incorrect = 0
@@ -95,6 +98,9 @@ export function PracticeMobileBar({
       .filter((s): s is 'correct' | 'incorrect' => !!s)
     correct = statuses.filter((s) => s === 'correct').length
     incorrect = statuses.filter((s) => s === 'incorrect').length
+  } else if (counts) {
+    correct = counts.correct
+    incorrect = counts.incorrect
   } else {
     const relevant = questions
       .map((q) => progress[q.id])
@@ -23,6 +23,8 @@ interface PracticeSidebarProps {
   settings: PracticeSettings
   onSettingsChange: (settings: PracticeSettings) => void
   mistakesSessionStatus: Record<string, 'correct' | 'incorrect' | undefined>
+  /** Precomputed answer counts for `questions`, skipping the recount. */
+  counts?: { correct: number; incorrect: number }
 }
 
 export function PracticeSidebar({
@@ -34,6 +36,7 @@ export function PracticeSidebar({
   settings,
   onSettingsChange,
   mistakesSessionStatus,
+  counts,
 }: PracticeSidebarProps) {
   let correct = 0
   let incorrect = 0
@@ -44,6 +47,9 @@ export function PracticeSidebar({
       .filter((s): s is 'correct' | 'incorrect' => !!s)
     correct = statuses.filter((s) => s === 'correct').length
     incorrect = statuses.filter((s) => s === 'incorrect').length
+  } else if (counts) {
+    correct = counts.correct
+    incorrect = counts.incorrect
   } else {
     const relevantProgress = questions
       .map((q) => progress[q.id])
@@ -0,0 +1,50 @@
+/**
+ * Fetching exam banks.
+ *
+ * `scripts/build-language-variants.py` writes `public/data/{examId}.{language}.json`
+ * next to each bank with only the strings shown in that language; `pnpm build`
+ * runs it for every bank. Pages ask for the variant matching the UI language
+ * and fall back to the full bank when none is published (e.g. in development
+ * before the script has run). Unknown paths are answered with index.html by the
+ * SPA redirect, so a body that is not a bank also counts as missing.
+ * Each request is recorded as `fetch` and `parse` phases (see lib/perf.ts).
+ */
+import type { Language } from '@/context/language-provider'
+import { perfNow, recordPhase } from '@/lib/perf'
+
+/** Fetch and parse a data file of `examId`, rejecting on an HTTP error. */
+export async function fetchJson(
+  url: string,
+  examId: string
+): Promise<unknown> {
+  const start = perfNow()
+  const res = await fetch(url)
+  recordPhase('fetch', examId, start)
+  if (!res.ok) throw new Error(`HTTP ${res.status}`)
+  const parsing = perfNow()
+  const data: unknown = await res.json()
+  recordPhase('parse', examId, parsing)
+  return data
+}
+
+export function examVariantId(examId: string, language: Language) {
+  return `${examId}.${language}`
+}
+
+export async function fetchExamData<T extends { questions?: unknown[] }>(
+  examId: string,
+  language: Language
+): Promise<T> {
+  try {
+    const variant = await fetchJson(
+      `/data/${examVariantId(examId, language)}.json`,
+      examId
+    )
+    if (variant && Array.isArray((variant as T).questions)) {
+      return variant as T
+    }
+  } catch {
+    // No variant for this language; use the full bank.
+  }
+  return (await fetchJson(`/data/${examId}.json`, examId)) as T
+}
@@ -90,12 +90,18 @@ export function ExamDetails({ examId }: ExamDetailsProps) {
 
   useEffect(() => {
     if (!user?.uid) return
-    const unsub = RemoteProgress.subscribeExamProgress(
+    const unsub = RemoteProgress.subscribeExamProgressChanges(
       user.uid,
       examId,
-      /* istanbul ignore next -- firebase subscription callback */
-      (p) => {
-        setProgress(p || {})
+      {
+        onHydrate: setProgress,
+        /* istanbul ignore next -- firebase subscription callback */
+        onChange: (changes, removed) =>
+          setProgress((prev) => {
+            const next = { ...prev, ...changes }
+            removed.forEach((qId) => delete next[qId])
+            return next
+          }),
       }
     )
     return () => unsub()
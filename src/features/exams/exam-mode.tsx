@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useRef, useState, type ReactNode } from 'react'
+import { useEffect, useMemo, useRef, useState } from 'react'
 import { Link, useNavigate } from '@tanstack/react-router'
 import * as RemoteProgress from '@/services/firebase-progress'
 import { ProgressService, type ExamProgress } from '@/services/progress-service'
@@ -11,7 +11,10 @@ import {
   Bookmark,
 } from 'lucide-react'
 import { toast } from 'sonner'
+import { timePhase } from '@/lib/perf'
 import { cn } from '@/lib/utils'
+import { usePaintPhase } from '@/hooks/use-paint-phase'
+import { useRemoteBookmarks } from '@/hooks/use-remote-bookmarks'
 import { useAuth } from '@/context/auth-ctx'
 import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
@@ -32,6 +35,7 @@ import {
   getLocalizedExplanation,
   getLocalizedText,
 } from '@/context/language-provider'
+import { htmlNodesToText, type HtmlNode } from './html-nodes'
 import {
   readLocalizedContent,
   type LocalizedContent,
@@ -41,7 +45,15 @@ import {
   PracticeSidebar,
   type PracticeSettings,
 } from './components/practice-sidebar'
+import { ExamHtml } from './components/exam-html'
 import { mockExams } from './data/mock-exams'
+import { fetchExamData } from './exam-data'
+import {
+  openExamShards,
+  type ExamShardLoader,
+  type ShardManifestEntry,
+} from './exam-shards'
+import { samplePaper } from './paper-sampler'
 
 interface ExamModeProps {
   examId: string
@@ -52,7 +64,8 @@ interface ExamModeProps {
 
 type ExamOption = {
   label: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
 }
 
@@ -60,11 +73,13 @@ type ExamQuestion = {
   id: string
   questionNumber: number
   type: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
   options: ExamOption[]
   correctAnswer: string
   explanation?: string
+  explanationNodes?: HtmlNode[]
 }
 
 type ExamFile = {
@@ -76,8 +91,14 @@ type PracticeQuestion = {
   type: 'single' | 'multiple'
   text: string
   contentHtml?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
-  options: { text: string; html?: string; contents?: LocalizedContent }[]
+  options: {
+    text: string
+    html?: string
+    nodes?: HtmlNode[]
+    contents?: LocalizedContent
+  }[]
   correctAnswers: number[]
   requiredSelections: number
   explanation?: string
@@ -86,6 +107,9 @@ type PracticeQuestion = {
     zh?: string
     ja?: string
   }
+  explanationNodes?: HtmlNode[]
+  // Set on shard placeholders whose content has not been fetched yet.
+  pending?: boolean
 }
 
 function htmlToText(html: string) {
@@ -94,123 +118,114 @@ function htmlToText(html: string) {
   return (doc.body.textContent ?? '').trim()
 }
 
-function resolveAssetUrl(src: string) {
-  const trimmed = (src ?? '').trim()
-  if (!trimmed) return trimmed
-  if (/^https?:\/\//i.test(trimmed)) return trimmed
-  if (trimmed.startsWith('/')) return trimmed
-  if (trimmed.startsWith('images/')) return `/data/${trimmed}`
-  return `/data/${trimmed}`
-}
-
 function parseCorrectLabels(input: string) {
   const matches = (input ?? '').toUpperCase().match(/[A-Z]/g) ?? []
   return Array.from(new Set(matches))
 }
 
-function renderExamHtml(html: string) {
-  if (typeof window === 'undefined') return <span>{html}</span>
-
-  const doc = new DOMParser().parseFromString(html, 'text/html')
-  const nodes = Array.from(doc.body.childNodes)
-
-  const renderNode = (
-    node: ChildNode,
-    key: string | number,
-    parentTag?: string
-  ): ReactNode => {
-    if (node.nodeType === Node.TEXT_NODE) {
-      const text = (node.textContent ?? '').trim()
-      if (!text) return null
-      if (parentTag === 'p' || parentTag === 'li') {
-        return text
-      }
-      return (
-        <span key={key} className='leading-relaxed'>
-          {text}
-        </span>
-      )
-    }
-
-    if (node.nodeType !== Node.ELEMENT_NODE) return null
-
-    const el = node as Element
-    const tag = el.tagName.toLowerCase()
-    const children = Array.from(el.childNodes).map((child, index) =>
-      renderNode(child, `${key}-${index}`, tag)
-    )
-
-    if (tag === 'p') {
-      return (
-        <p key={key} className='leading-relaxed'>
-          {children}
-        </p>
-      )
-    }
-
-    if (tag === 'br') return <br key={key} />
+function hasHtml(value: string) {
+  return value.includes('<')
+}
 
-    if (tag === 'strong') return <strong key={key}>{children}</strong>
-    if (tag === 'em') return <em key={key}>{children}</em>
-    if (tag === 'code') return <code key={key}>{children}</code>
+function mapExamQuestion(q: ExamQuestion): PracticeQuestion {
+  const options = (q.options ?? [])
+    .slice()
+    .sort((a, b) => a.label.localeCompare(b.label))
+  const correctLabels = parseCorrectLabels(q.correctAnswer)
+  const correctAnswers = correctLabels
+    .map((label) => options.findIndex((o) => o.label === label))
+    .filter((idx) => idx >= 0)
+  // Build explanations object for multi-language support
+  const explanations: { en?: string; zh?: string; ja?: string } = {}
+  const rawExplanation = (
+    q.explanationNodes
+      ? htmlNodesToText(q.explanationNodes)
+      : (q.explanation ?? '')
+  ).trim()
+
+  // Check if explanation contains Chinese characters - if so, it's the Chinese version
+  const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
+  if (hasChinese) {
+    explanations.zh = rawExplanation
+  } else if (rawExplanation) {
+    explanations.en = rawExplanation
+  }
 
-    if (tag === 'ul')
-      return (
-        <ul key={key} className='list-disc pl-6'>
-          {children}
-        </ul>
-      )
-    if (tag === 'ol')
-      return (
-        <ol key={key} className='list-decimal pl-6'>
-          {children}
-        </ol>
-      )
-    if (tag === 'li') return <li key={key}>{children}</li>
-
-    if (tag === 'img') {
-      const src = resolveAssetUrl(el.getAttribute('src') ?? '')
-      const alt = el.getAttribute('alt') ?? ''
-      return (
-        <img
-          key={key}
-          src={src}
-          alt={alt}
-          loading='lazy'
-          className='max-w-full rounded-md border'
-          onError={(e) => {
-            e.currentTarget.style.display = 'none'
-          }}
-        />
-      )
-    }
+  // Check for explicit language-specific explanations in the data
+  const qAny = q as Record<string, unknown>
+  if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
+    explanations.en = (qAny.explanation_en as string).trim()
+  }
+  if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
+    explanations.zh = (qAny.explanation_zh as string).trim()
+  }
+  if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
+    explanations.ja = (qAny.explanation_ja as string).trim()
+  }
+  // Also support explanations object format
+  if (qAny.explanations && typeof qAny.explanations === 'object') {
+    const explObj = qAny.explanations as Record<string, string>
+    if (explObj.en) explanations.en = explObj.en.trim()
+    if (explObj.zh) explanations.zh = explObj.zh.trim()
+    if (explObj.ja) explanations.ja = explObj.ja.trim()
+  }
 
-    return (
-      <span key={key} className='whitespace-pre-wrap'>
-        {children}
-      </span>
-    )
+  return {
+    id: q.id,
+    type: (q.type === 'multiple'
+      ? 'multiple'
+      : 'single') as PracticeQuestion['type'],
+    text: q.contentNodes
+      ? htmlNodesToText(q.contentNodes)
+      : htmlToText(q.content ?? ''),
+    contentHtml: q.contentNodes ? undefined : q.content,
+    contentNodes: q.contentNodes,
+    contents: readLocalizedContent((q as Record<string, unknown>).contents),
+    options: options.map((o) => ({
+      text: o.contentNodes
+        ? htmlNodesToText(o.contentNodes)
+        : htmlToText(o.content ?? ''),
+      html: o.contentNodes ? undefined : o.content,
+      nodes: o.contentNodes,
+      contents: readLocalizedContent(
+        (o as Record<string, unknown>).contents
+      ),
+    })),
+    correctAnswers: correctAnswers.length > 0 ? correctAnswers : [0],
+    requiredSelections: Math.max(correctAnswers.length, 1),
+    explanation: rawExplanation,
+    explanations,
+    explanationNodes: q.explanationNodes,
   }
+}
 
-  return (
-    <div className='space-y-3'>
-      {nodes.map((n, i) => renderNode(n, i, 'body'))}
-    </div>
-  )
+// Papers keep the bank's mix of single- and multiple-answer questions.
+function selectQuestions(
+  available: PracticeQuestion[],
+  count: number | undefined,
+  seed: string
+) {
+  return samplePaper(available, count, seed, (q) => q.type)
 }
 
-function hasHtml(value: string) {
-  return value.includes('<')
+// Swap placeholders in a sampled paper for loaded questions, keeping order.
+function refreshSelection(
+  selected: PracticeQuestion[],
+  all: PracticeQuestion[]
+) {
+  const byId = new Map(all.map((q) => [q.id, q]))
+  return selected.map((q) => byId.get(q.id) ?? q)
 }
 
-function mulberry32(seed: number) {
-  let t = seed
-  return function () {
-    t |= 0
-    t = (t + 0x6d2b79f5) | 0
-    let r = Math.imul(t ^ (t >>> 15), 1 | t)
-    r = (r + Math.imul(r ^ (r >>> 7), 61 | r)) ^ r
-    return ((r ^ (r >>> 14)) >>> 0) / 4294967296
+function placeholderQuestion(entry: ShardManifestEntry): PracticeQuestion {
+  return {
+    id: entry.id,
+    type: entry.type === 'multiple' ? 'multiple' : 'single',
+    text: '',
+    options: [],
+    correctAnswers: [],
+    requiredSelections: entry.answerCount,
+    pending: true,
   }
 }
 
@@ -268,6 +283,14 @@ export function ExamMode({
   })
   const userUidRef = useRef(user?.uid)
   const examIdRef = useRef(examId)
+  const [shardLoader, setShardLoader] =
+    useState<ExamShardLoader<PracticeQuestion> | null>(null)
+  const loadedExamIdRef = useRef<string | null>(null)
+  // Unseeded papers keep one seed per visit so reloading the bank in another
+  // language selects the same questions.
+  const [sessionSeed] = useState(() => `${Date.now()}`)
+  const paperSeed = seed ?? sessionSeed
+  const initialIndexRef = useRef(initialQuestionIndex ?? 0)
 
   useEffect(() => {
     if (initialQuestionIndex !== undefined) {
@@ -295,143 +318,69 @@ export function ExamMode({
     }
   }, [questions, currentQuestionIndex, userId, examId])
 
+  // Once cloud progress has arrived, its bookmarks win over local ones.
+  const remoteBookmarks = useRemoteBookmarks(user?.uid, examId)
   useEffect(() => {
-    if (!user?.uid) return
-    const unsub = RemoteProgress.subscribeExamProgress(
-      user.uid,
-      examId,
-      (exam) => {
-        const qId = questions?.[currentQuestionIndex]?.id
-        if (qId) {
-          setIsBookmarked(exam[qId]?.bookmarked || false)
-        }
-      }
-    )
-    return () => unsub()
-  }, [user?.uid, examId, questions, currentQuestionIndex])
+    const qId = questions?.[currentQuestionIndex]?.id
+    if (remoteBookmarks && qId) setIsBookmarked(remoteBookmarks.has(qId))
+  }, [remoteBookmarks, questions, currentQuestionIndex])
 
   useEffect(() => {
     let cancelled = false
     async function load() {
       setIsLoading(true)
-      setAllQuestions(fallbackQuestions)
-      setTitle(exam?.title ?? examId)
-      setQuestions(null)
+      if (loadedExamIdRef.current !== examId) {
+        loadedExamIdRef.current = examId
+        setAllQuestions(fallbackQuestions)
+        setTitle(exam?.title ?? examId)
+        setQuestions(null)
+      }
       try {
-        const response = await fetch(`/data/${examId}.json`)
-        if (!response.ok) {
-          throw new Error(`HTTP ${response.status}`)
+        const shards = await openExamShards(
+          examId,
+          mapExamQuestion,
+          placeholderQuestion,
+          language
+        )
+        if (!cancelled) setShardLoader(shards)
+        if (shards && shards.size > 0) {
+          // Sample from the manifest, then fetch content for the first pick.
+          const available = shards.snapshot()
+          const selected = selectQuestions(available, count, paperSeed)
+          const first = Math.min(
+            Math.max(initialIndexRef.current, 0),
+            selected.length - 1
+          )
+          await shards.ensure(shards.indexOf(selected[first].id))
+          if (!cancelled) {
+            const loaded = shards.snapshot()
+            setAllQuestions(loaded)
+            setQuestions(refreshSelection(selected, loaded))
+          }
+          return
         }
-        const data = (await response.json()) as ExamFile
-        const mappedAll = (data.questions ?? [])
-          .slice()
-          .sort((a, b) => a.questionNumber - b.questionNumber)
-          .map((q) => {
-            const options = (q.options ?? [])
+
+        const data = await fetchExamData<ExamFile>(examId, language)
+        const mappedAll = timePhase(
+          'map',
+          examId,
+          () =>
+            (data.questions ?? [])
               .slice()
-              .sort((a, b) => a.label.localeCompare(b.label))
-            const correctLabels = parseCorrectLabels(q.correctAnswer)
-            const correctAnswers = correctLabels
-              .map((label) => options.findIndex((o) => o.label === label))
-              .filter((idx) => idx >= 0)
-            // Build explanations object for multi-language support
-            const explanations: { en?: string; zh?: string; ja?: string } = {}
-            const rawExplanation = (q.explanation ?? '').trim()
-
-            // Check if explanation contains Chinese characters - if so, it's the Chinese version
-            const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
-            if (hasChinese) {
-              explanations.zh = rawExplanation
-            } else if (rawExplanation) {
-              explanations.en = rawExplanation
-            }
-
-            // Check for explicit language-specific explanations in the data
-            const qAny = q as Record<string, unknown>
-            if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
-              explanations.en = (qAny.explanation_en as string).trim()
-            }
-            if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
-              explanations.zh = (qAny.explanation_zh as string).trim()
-            }
-            if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
-              explanations.ja = (qAny.explanation_ja as string).trim()
-            }
-            // Also support explanations object format
-            if (qAny.explanations && typeof qAny.explanations === 'object') {
-              const explObj = qAny.explanations as Record<string, string>
-              if (explObj.en) explanations.en = explObj.en.trim()
-              if (explObj.zh) explanations.zh = explObj.zh.trim()
-              if (explObj.ja) explanations.ja = explObj.ja.trim()
-            }
-
-            return {
-              id: q.id,
-              type: (q.type === 'multiple'
-                ? 'multiple'
-                : 'single') as PracticeQuestion['type'],
-              text: htmlToText(q.content),
-              contentHtml: q.content,
-              contents: readLocalizedContent((q as Record<string, unknown>).contents),
-              options: options.map((o) => ({
-                text: htmlToText(o.content),
-                html: o.content,
-                contents: readLocalizedContent(
-                  (o as Record<string, unknown>).contents
-                ),
-              })),
-              correctAnswers: correctAnswers.length > 0 ? correctAnswers : [0],
-              requiredSelections: Math.max(correctAnswers.length, 1),
-              explanation: rawExplanation,
-              explanations,
-            }
-          })
+              .sort((a, b) => a.questionNumber - b.questionNumber)
+              .map(mapExamQuestion),
+          'exam'
+        )
         const available =
           mappedAll.length > 0 ? mappedAll : (fallbackQuestions ?? [])
-        let selected = available
-        if (
-          typeof count === 'number' &&
-          count > 0 &&
-          count < available.length
-        ) {
-          const s = (seed ?? `${Date.now()}`)
-            .split('')
-            .reduce((acc, ch) => acc + ch.charCodeAt(0), 0)
-          const rnd = mulberry32(s)
-          const indices = new Set<number>()
-          while (indices.size < count) {
-            indices.add(Math.floor(rnd() * available.length))
-          }
-          selected = Array.from(indices)
-            .map((i) => available[i])
-            .sort((a, b) => {
-              const na = available.findIndex((q) => q.id === a.id)
-              const nb = available.findIndex((q) => q.id === b.id)
-              return na - nb
-            })
-        }
+        const selected = selectQuestions(available, count, paperSeed)
         if (!cancelled) {
           setAllQuestions(available)
           setQuestions(selected)
         }
       } catch {
         const available = fallbackQuestions ?? []
-        let selected = available
-        if (
-          typeof count === 'number' &&
-          count > 0 &&
-          count < available.length
-        ) {
-          const s = (seed ?? `${Date.now()}`)
-            .split('')
-            .reduce((acc, ch) => acc + ch.charCodeAt(0), 0)
-          const rnd = mulberry32(s)
-          const indices = new Set<number>()
-          while (indices.size < count) {
-            indices.add(Math.floor(rnd() * available.length))
-          }
-          selected = Array.from(indices).map((i) => available[i])
-        }
+        const selected = selectQuestions(available, count, paperSeed)
         if (!cancelled) {
           setAllQuestions(available)
           setQuestions(selected)
@@ -444,16 +393,43 @@ export function ExamMode({
     return () => {
       cancelled = true
     }
-  }, [exam, examId, fallbackQuestions, count, seed])
+  }, [exam, examId, fallbackQuestions, count, paperSeed, language])
 
   const question = useMemo(
     () => (questions ? questions[currentQuestionIndex] : undefined),
     [questions, currentQuestionIndex]
   )
+  usePaintPhase(examId, 'exam', !isLoading && !!question && !question.pending)
   const isLastQuestion = questions
     ? currentQuestionIndex === questions.length - 1
     : true
 
+  // In sharded mode, fetch the shard holding the current question and
+  // prefetch the one holding the next question of the paper.
+  const questionId = question?.id
+  const nextQuestionId = questions?.[currentQuestionIndex + 1]?.id
+  useEffect(() => {
+    const shards = shardLoader
+    if (!shards || !questionId) return
+    let cancelled = false
+    shards
+      .ensure(
+        shards.indexOf(questionId),
+        nextQuestionId ? shards.indexOf(nextQuestionId) : undefined
+      )
+      .then((changed) => {
+        if (changed && !cancelled) {
+          const all = shards.snapshot()
+          setAllQuestions(all)
+          setQuestions((prev) => (prev ? refreshSelection(prev, all) : prev))
+        }
+      })
+      .catch(() => undefined)
+    return () => {
+      cancelled = true
+    }
+  }, [shardLoader, questionId, nextQuestionId])
+
   useEffect(() => {
     setSelectedAnswers([])
     setIsSubmitted(false)
@@ -570,7 +546,7 @@ export function ExamMode({
     }
   }
 
-  if (isLoading && !questions) {
+  if ((isLoading && !questions) || question?.pending) {
     return (
       <>
         <Header>
@@ -663,12 +639,15 @@ export function ExamMode({
                   <div className='mt-2'>
                     {question
                       ? (() => {
+                          if (question.contentNodes) {
+                            return <ExamHtml nodes={question.contentNodes} />
+                          }
                           const content = getLocalizedText(
                             question.contentHtml ?? question.text,
                             question.contents,
                             language
                           )
-                          return hasHtml(content) ? renderExamHtml(content) : <p>{content}</p>
+                          return hasHtml(content) ? <ExamHtml html={content} /> : <p>{content}</p>
                         })()
                       : null}
                   </div>
@@ -726,13 +705,14 @@ export function ExamMode({
                             className='flex-1 cursor-pointer text-xs leading-relaxed font-normal'
                           >
                             {(() => {
+                              if (option.nodes) return <ExamHtml nodes={option.nodes} />
                               const content = getLocalizedText(
                                 option.html ?? option.text,
                                 option.contents,
                                 language
                               )
                               return hasHtml(content)
-                                ? renderExamHtml(content)
+                                ? <ExamHtml html={content} />
                                 : content
                             })()}
                           </Label>
@@ -783,13 +763,14 @@ export function ExamMode({
                             className='flex-1 cursor-pointer text-xs leading-relaxed font-normal'
                           >
                             {(() => {
+                              if (option.nodes) return <ExamHtml nodes={option.nodes} />
                               const content = getLocalizedText(
                                 option.html ?? option.text,
                                 option.contents,
                                 language
                               )
                               return hasHtml(content)
-                                ? renderExamHtml(content)
+                                ? <ExamHtml html={content} />
                                 : content
                             })()}
                           </Label>
@@ -842,7 +823,10 @@ export function ExamMode({
                         <div className='mt-3 border-t border-current/20 pt-3'>
                           <p className='mb-2 font-semibold'>{t('practice.explanation')}:</p>
                           <div className='prose prose-sm max-w-none dark:prose-invert prose-p:my-1 prose-ul:my-1 prose-li:my-0.5'>
-                            {renderExamHtml(localizedExplanation)}
+                            <ExamHtml
+                              nodes={question.explanationNodes}
+                              html={localizedExplanation}
+                            />
                           </div>
                         </div>
                       )
@@ -0,0 +1,164 @@
+/**
+ * Lazy, shard-backed access to an exam bank.
+ *
+ * `scripts/build-shards.py` splits `public/data/{examId}.json` into
+ * `public/data/shards/{examId}/manifest.json` plus fixed-size shard files.
+ * The manifest is enough to build the full question list (ids, types, answer
+ * counts); question content is fetched one shard at a time around the
+ * question being shown, with the following shard prefetched.
+ *
+ * Only used when the app is built with `VITE_EXAM_SHARDS=1`; without a
+ * manifest the pages keep loading the full bank. Shards of a language variant
+ * (`shards/{examId}.{language}/`) are preferred over the full bank's shards.
+ */
+import type { Language } from '@/context/language-provider'
+import { perfNow, recordPhase } from '@/lib/perf'
+import { examVariantId, fetchJson } from './exam-data'
+
+export const EXAM_SHARDS_ENABLED = import.meta.env.VITE_EXAM_SHARDS === '1'
+
+export type ShardManifestEntry = {
+  id: string
+  questionNumber: number
+  type: string
+  answerCount: number
+}
+
+type ShardManifest = {
+  version: number
+  examId: string
+  questionCount: number
+  shardSize: number
+  shards: { file: string; start: number; count: number; hash: string }[]
+  questions: {
+    id: string[]
+    questionNumber: number[]
+    type: string[]
+    answerCount: number[]
+  }
+}
+
+type ShardFile<Q> = {
+  questions: Q[]
+}
+
+function isShardManifest(value: unknown): value is ShardManifest {
+  if (!value || typeof value !== 'object') return false
+  const m = value as Partial<ShardManifest>
+  return (
+    m.version === 1 &&
+    Array.isArray(m.shards) &&
+    !!m.questions &&
+    Array.isArray(m.questions.id)
+  )
+}
+
+export type ExamShardLoader<T> = {
+  size: number
+  indexOf: (questionId: string) => number
+  isLoaded: (index: number) => boolean
+  /**
+   * Make sure the shard holding `index` is loaded and start prefetching the
+   * shard holding `prefetchIndex` (default: the next shard). Resolves to true
+   * when questions (including prefetched ones) arrived since the last
+   * snapshot.
+   */
+  ensure: (index: number, prefetchIndex?: number) => Promise<boolean>
+  /** All questions in display order, with placeholders for unloaded shards. */
+  snapshot: () => T[]
+}
+
+function createShardLoader<Q, T>(
+  examId: string,
+  dir: string,
+  manifest: ShardManifest,
+  map: (question: Q) => T,
+  placeholder: (entry: ShardManifestEntry) => T
+): ExamShardLoader<T> {
+  const { id, questionNumber, type, answerCount } = manifest.questions
+  const entries: ShardManifestEntry[] = id.map((qid, i) => ({
+    id: qid,
+    questionNumber: questionNumber[i],
+    type: type[i],
+    answerCount: answerCount[i],
+  }))
+  const indexById = new Map(entries.map((e, i) => [e.id, i]))
+  const mapped: (T | undefined)[] = new Array(entries.length)
+  const pending = new Map<number, Promise<boolean>>()
+  let dirty = false
+
+  const loadShard = (shard: number): Promise<boolean> => {
+    const info = manifest.shards[shard]
+    if (!info) return Promise.resolve(false)
+    const existing = pending.get(shard)
+    if (existing) return existing
+
+    const promise = (async () => {
+      const data = (await fetchJson(
+        `/data/shards/${dir}/${info.file}?v=${info.hash}`,
+        examId
+      )) as ShardFile<Q>
+      const start = perfNow()
+      data.questions.forEach((q, i) => {
+        mapped[info.start + i] = map(q)
+      })
+      recordPhase('map', examId, start)
+      dirty = true
+      return true
+    })()
+    // Let a failed shard be retried on the next navigation.
+    promise.catch(() => pending.delete(shard))
+    pending.set(shard, promise)
+    return promise
+  }
+
+  return {
+    size: entries.length,
+    indexOf: (questionId) => indexById.get(questionId) ?? -1,
+    isLoaded: (index) => mapped[index] !== undefined,
+    async ensure(index, prefetchIndex) {
+      if (index < 0 || index >= entries.length) return false
+      const shard = Math.floor(index / manifest.shardSize)
+      const next =
+        prefetchIndex === undefined || prefetchIndex < 0
+          ? shard + 1
+          : Math.floor(prefetchIndex / manifest.shardSize)
+      const current = loadShard(shard)
+      void loadShard(next).catch(() => undefined)
+      await current
+      return dirty
+    },
+    snapshot() {
+      dirty = false
+      return entries.map((e, i) => mapped[i] ?? placeholder(e))
+    },
+  }
+}
+
+async function fetchManifest(dir: string): Promise<ShardManifest | null> {
+  try {
+    const res = await fetch(`/data/shards/${dir}/manifest.json`)
+    if (!res.ok) return null
+    const manifest: unknown = await res.json()
+    return isShardManifest(manifest) ? manifest : null
+  } catch {
+    return null
+  }
+}
+
+export async function openExamShards<Q, T>(
+  examId: string,
+  map: (question: Q) => T,
+  placeholder: (entry: ShardManifestEntry) => T,
+  language?: Language
+): Promise<ExamShardLoader<T> | null> {
+  if (!EXAM_SHARDS_ENABLED) return null
+  const dirs = language ? [examVariantId(examId, language), examId] : [examId]
+  for (const dir of dirs) {
+    const manifest = await fetchManifest(dir)
+    if (manifest) {
+      return createShardLoader(examId, dir, manifest, map, placeholder)
+    }
+  }
+  return null
+}
@@ -0,0 +1,96 @@
+/**
+ * Pre-parsed question HTML.
+ *
+ * Language variants store question, option and explanation HTML as sanitized
+ * node trees (`contentNodes`, `explanationNodes`) written by
+ * `scripts/qbank/html_nodes.py`, so rendering needs no DOM parsing. Raw HTML
+ * from older files is converted with `parseHtmlNodes`, which applies the same
+ * rules: only styled tags keep their name, other elements become spans,
+ * script-like elements are dropped and only images keep attributes.
+ */
+
+/** Text, or `[tag, children]` / `[tag, children, attributes]`. */
+export type HtmlNode =
+  | string
+  | [tag: string, children: HtmlNode[], attributes?: Record<string, string>]
+
+const TAGS = new Set(['p', 'br', 'strong', 'em', 'code', 'ul', 'ol', 'li', 'img'])
+const DROPPED = new Set([
+  'script',
+  'style',
+  'template',
+  'iframe',
+  'object',
+  'embed',
+  'noscript',
+])
+const IMG_ATTRIBUTES = ['src', 'alt', 'width', 'height', 'data-formats']
+const BLOCK_TAGS = new Set(['p', 'br', 'ul', 'ol', 'li'])
+
+function safeSrc(src: string) {
+  const scheme = /^\s*([a-z][a-z0-9+.-]*):/i.exec(src)
+  return !scheme || /^https?$/i.test(scheme[1])
+}
+
+/** Node trees stored in a bank field, or undefined for anything else. */
+export function readHtmlNodes(value: unknown): HtmlNode[] | undefined {
+  return Array.isArray(value) ? (value as HtmlNode[]) : undefined
+}
+
+function convert(node: ChildNode): HtmlNode | null {
+  if (node.nodeType === Node.TEXT_NODE) {
+    const text = node.textContent ?? ''
+    return text.trim() ? text : null
+  }
+  if (node.nodeType !== Node.ELEMENT_NODE) return null
+  const el = node as Element
+  const tag = el.tagName.toLowerCase()
+  if (DROPPED.has(tag)) return null
+  if (tag === 'img') {
+    const attributes: Record<string, string> = {}
+    for (const name of IMG_ATTRIBUTES) {
+      const value = el.getAttribute(name)
+      if (value !== null) attributes[name] = value
+    }
+    return safeSrc(attributes.src ?? '') ? ['img', [], attributes] : null
+  }
+  return [TAGS.has(tag) ? tag : 'span', convertAll(el.childNodes)]
+}
+
+function convertAll(nodes: NodeListOf<ChildNode>): HtmlNode[] {
+  const out: HtmlNode[] = []
+  nodes.forEach((child) => {
+    const converted = convert(child)
+    if (converted !== null) out.push(converted)
+  })
+  return out
+}
+
+/** Parse raw HTML into nodes; null outside the browser. */
+export function parseHtmlNodes(html: string): HtmlNode[] | null {
+  if (typeof window === 'undefined') return null
+  // Plain text needs no parser.
+  if (!/[<&]/.test(html)) return html.trim() ? [html] : []
+  const doc = new DOMParser().parseFromString(html, 'text/html')
+  return convertAll(doc.body.childNodes)
+}
+
+/** Plain text of a node tree, with block elements on separate lines. */
+export function htmlNodesToText(nodes: HtmlNode[]): string {
+  const parts: string[] = []
+  const walk = (list: HtmlNode[]) => {
+    for (const node of list) {
+      if (typeof node === 'string') {
+        parts.push(node)
+        continue
+      }
+      walk(node[1])
+      if (BLOCK_TAGS.has(node[0])) parts.push('\n')
+    }
+  }
+  walk(nodes)
+  return parts
+    .join('')
+    .replace(/[ \t]*\n\s*/g, '\n')
+    .trim()
+}
@@ -4,8 +4,9 @@ import { ProgressService } from '@/services/progress-service'
 import * as RemoteProgress from '@/services/firebase-progress'
 import { FileText, PlusCircle } from 'lucide-react'
 import { useAuth } from '@/context/auth-ctx'
-import { useLanguage } from '@/context/language-provider'
-import { useExams } from '@/hooks/use-exams'
+import { useLanguage, type Language } from '@/context/language-provider'
+import { useExams, type Exam } from '@/hooks/use-exams'
+import { formatBytes } from '@/lib/utils'
 import { Button } from '@/components/ui/button'
 import {
   Card,
@@ -24,7 +25,7 @@ import { Skeleton } from '@/components/ui/skeleton'
 
 export function ExamsList() {
   const { user, guestId, loading: authLoading } = useAuth()
-  const { t } = useLanguage()
+  const { t, language } = useLanguage()
   const userId = user?.uid || guestId
   const { exams: allExams, loading } = useExams()
   const [remoteOwned, setRemoteOwned] = useState<Record<string, boolean>>({})
@@ -146,6 +147,7 @@ export function ExamsList() {
                         {typeof exam.questionCount === 'number'
                           ? `${exam.questionCount} ${t('common.questions')}`
                           : `${t('common.questions')}: —`}
+                        {sizeLabel(exam, language)}
                       </span>
                       {exam.lastUpdated && (
                         <span className='text-right'>
@@ -163,3 +165,9 @@ export function ExamsList() {
     </>
   )
 }
+
+/** What the exam pages download: the language's variant, else the full bank. */
+function sizeLabel(exam: Exam, language: Language) {
+  const bytes = exam.variantBytes?.[language] ?? exam.sizeBytes
+  return typeof bytes === 'number' ? ` · ${formatBytes(bytes)}` : ''
+}
@@ -0,0 +1,138 @@
+/**
+ * Reproducible exam paper sampling.
+ *
+ * A paper is `count` questions drawn uniformly without replacement, in bank
+ * order. The seed string is hashed with MurmurHash3 (x86, 32-bit) over its
+ * UTF-8 bytes and drives a mulberry32 generator; questions are drawn with a
+ * partial Fisher–Yates shuffle over positions, so the cost is O(count) no
+ * matter how close `count` is to the bank size. With a stratum function the
+ * count is split across strata in proportion to their sizes (largest
+ * remainder) and each stratum is sampled in turn.
+ *
+ * `scripts/qbank/sampler.py` implements the same steps, so a paper can be
+ * generated or checked offline from its seed.
+ */
+
+export function hashSeed(seed: string): number {
+  const data = new TextEncoder().encode(seed)
+  const c1 = 0xcc9e2d51
+  const c2 = 0x1b873593
+  const tail = data.length & ~3
+  let h = 0
+  for (let i = 0; i < tail; i += 4) {
+    let k =
+      data[i] | (data[i + 1] << 8) | (data[i + 2] << 16) | (data[i + 3] << 24)
+    k = Math.imul(k, c1)
+    k = (k << 15) | (k >>> 17)
+    k = Math.imul(k, c2)
+    h ^= k
+    h = (h << 13) | (h >>> 19)
+    h = (Math.imul(h, 5) + 0xe6546b64) | 0
+  }
+  const rest = data.length & 3
+  if (rest > 0) {
+    let k = 0
+    if (rest === 3) k ^= data[tail + 2] << 16
+    if (rest >= 2) k ^= data[tail + 1] << 8
+    k ^= data[tail]
+    k = Math.imul(k, c1)
+    k = (k << 15) | (k >>> 17)
+    k = Math.imul(k, c2)
+    h ^= k
+  }
+  h ^= data.length
+  h ^= h >>> 16
+  h = Math.imul(h, 0x85ebca6b)
+  h ^= h >>> 13
+  h = Math.imul(h, 0xc2b2ae35)
+  h ^= h >>> 16
+  return h >>> 0
+}
+
+/** mulberry32: uniform floats in [0, 1) from a 32-bit seed. */
+export function createRandom(seed: number) {
+  let t = seed
+  return function () {
+    t |= 0
+    t = (t + 0x6d2b79f5) | 0
+    let r = Math.imul(t ^ (t >>> 15), 1 | t)
+    r = (r + Math.imul(r ^ (r >>> 7), 61 | r)) ^ r
+    return ((r ^ (r >>> 14)) >>> 0) / 4294967296
+  }
+}
+
+/**
+ * `k` distinct positions out of `n`, ascending. Only the swapped slots of
+ * the virtual 0..n-1 array are stored.
+ */
+export function sampleIndices(
+  n: number,
+  k: number,
+  random: () => number
+): number[] {
+  const swapped = new Map<number, number>()
+  const picked = new Array<number>(k)
+  for (let i = 0; i < k; i++) {
+    const j = i + Math.floor(random() * (n - i))
+    picked[i] = swapped.get(j) ?? j
+    swapped.set(j, swapped.get(i) ?? i)
+  }
+  return picked.sort((a, b) => a - b)
+}
+
+/** Split `count` over strata by size, handing leftovers to the largest remainders. */
+function allocate(sizes: number[], count: number, total: number) {
+  const quotas = sizes.map((size) => Math.floor((size * count) / total))
+  let left = count - quotas.reduce((a, b) => a + b, 0)
+  const order = sizes
+    .map((size, i) => ({ i, remainder: (size * count) % total }))
+    .sort((a, b) => b.remainder - a.remainder || a.i - b.i)
+  for (const { i } of order) {
+    if (left === 0) break
+    quotas[i]++
+    left--
+  }
+  return quotas
+}
+
+/**
+ * Pick `count` of `items` for the paper seeded by `seed`, keeping the input
+ * order. All items are returned when `count` is missing or not smaller than
+ * the number of items.
+ */
+export function samplePaper<T>(
+  items: T[],
+  count: number | undefined,
+  seed: string,
+  stratumOf?: (item: T) => string
+): T[] {
+  if (typeof count !== 'number' || count <= 0 || count >= items.length) {
+    return items
+  }
+  const random = createRandom(hashSeed(seed))
+  if (!stratumOf) {
+    return sampleIndices(items.length, count, random).map((i) => items[i])
+  }
+
+  // Strata in order of first appearance, each holding item positions.
+  const strata = new Map<string, number[]>()
+  items.forEach((item, i) => {
+    const key = stratumOf(item)
+    const members = strata.get(key)
+    if (members) members.push(i)
+    else strata.set(key, [i])
+  })
+  const groups = Array.from(strata.values())
+  const quotas = allocate(
+    groups.map((g) => g.length),
+    count,
+    items.length
+  )
+  const picked: number[] = []
+  groups.forEach((members, g) => {
+    for (const i of sampleIndices(members.length, quotas[g], random)) {
+      picked.push(members[i])
+    }
+  })
+  return picked.sort((a, b) => a - b).map((i) => items[i])
+}
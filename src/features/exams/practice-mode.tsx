@@ -1,7 +1,11 @@
-import { useEffect, useState, useRef, type ReactNode } from 'react'
+import { useCallback, useEffect, useMemo, useState, useRef } from 'react'
 import { Link, useNavigate } from '@tanstack/react-router'
 import * as RemoteProgress from '@/services/firebase-progress'
-import { ProgressService, type ExamProgress } from '@/services/progress-service'
+import {
+  ProgressService,
+  type ExamProgress,
+  type QuestionProgress,
+} from '@/services/progress-service'
 import {
   ArrowLeft,
   CheckCircle,
@@ -11,7 +15,9 @@ import {
   Bookmark,
 } from 'lucide-react'
 import { toast } from 'sonner'
+import { timePhase } from '@/lib/perf'
 import { cn } from '@/lib/utils'
+import { usePaintPhase } from '@/hooks/use-paint-phase'
 import { useAuth } from '@/context/auth-ctx'
 import {
   AlertDialog,
@@ -50,7 +56,16 @@ import {
   PracticeSidebar,
   type PracticeSettings,
 } from './components/practice-sidebar'
+import { ExamHtml } from './components/exam-html'
 import { mockExams } from './data/mock-exams'
+import { fetchExamData } from './exam-data'
+import {
+  openExamShards,
+  type ExamShardLoader,
+  type ShardManifestEntry,
+} from './exam-shards'
+import { htmlNodesToText, type HtmlNode } from './html-nodes'
+import { createReviewIndex, type ReviewIndex } from './review-index'
 import {
   readLocalizedContent,
   type LocalizedContent,
@@ -64,7 +79,8 @@ interface PracticeModeProps {
 
 type ExamOption = {
   label: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
 }
 
@@ -72,11 +88,13 @@ type ExamQuestion = {
   id: string
   questionNumber: number
   type: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
   options: ExamOption[]
   correctAnswer: string
   explanation?: string
+  explanationNodes?: HtmlNode[]
 }
 
 type ExamFile = {
@@ -86,6 +104,7 @@ type ExamFile = {
 type PracticeOption = {
   text: string
   html?: string
+  nodes?: HtmlNode[]
   contents?: LocalizedContent
 }
 
@@ -94,6 +113,7 @@ type PracticeQuestion = {
   type: 'single' | 'multiple'
   text: string
   contentHtml?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
   options: PracticeOption[]
   correctAnswers: number[]
@@ -104,6 +124,9 @@ type PracticeQuestion = {
     zh?: string
     ja?: string
   }
+  explanationNodes?: HtmlNode[]
+  // Set on shard placeholders whose content has not been fetched yet.
+  pending?: boolean
 }
 
 function htmlToText(html: string) {
@@ -112,15 +135,6 @@ function htmlToText(html: string) {
   return (doc.body.textContent ?? '').trim()
 }
 
-function resolveAssetUrl(src: string) {
-  const trimmed = (src ?? '').trim()
-  if (!trimmed) return trimmed
-  if (/^https?:\/\//i.test(trimmed)) return trimmed
-  if (trimmed.startsWith('/')) return trimmed
-  if (trimmed.startsWith('images/')) return `/data/${trimmed}`
-  return `/data/${trimmed}`
-}
-
 function parseCorrectLabels(input: string) {
   const matches = (input ?? '').toUpperCase().match(/[A-Z]/g) ?? []
   return Array.from(new Set(matches))
@@ -137,115 +151,126 @@ function sameSelections(a: number[], b: number[]) {
   return a.every((item) => setB.has(item))
 }
 
-function renderExamHtml(html: string) {
-  if (typeof window === 'undefined') return <span>{html}</span>
-
-  const doc = new DOMParser().parseFromString(html, 'text/html')
-  const nodes = Array.from(doc.body.childNodes)
-
-  const renderNode = (
-    node: ChildNode,
-    key: string | number,
-    parentTag?: string
-  ): ReactNode => {
-    if (node.nodeType === Node.TEXT_NODE) {
-      const text = (node.textContent ?? '').trim()
-      if (!text) return null
-      if (parentTag === 'p' || parentTag === 'li') {
-        return text
-      }
-      return (
-        <span key={key} className='leading-relaxed'>
-          {text}
-        </span>
-      )
-    }
-
-    if (node.nodeType !== Node.ELEMENT_NODE) return null
-
-    const el = node as Element
-    const tag = el.tagName.toLowerCase()
-    const children = Array.from(el.childNodes).map((child, index) =>
-      renderNode(child, `${key}-${index}`, tag)
-    )
-
-    if (tag === 'p') {
-      return (
-        <p key={key} className='leading-relaxed'>
-          {children}
-        </p>
-      )
-    }
-
-    if (tag === 'br') return <br key={key} />
-
-    if (tag === 'strong') return <strong key={key}>{children}</strong>
-    if (tag === 'em') return <em key={key}>{children}</em>
-    if (tag === 'code') return <code key={key}>{children}</code>
-
-    if (tag === 'ul')
-      return (
-        <ul key={key} className='list-disc pl-6'>
-          {children}
-        </ul>
-      )
-    if (tag === 'ol')
-      return (
-        <ol key={key} className='list-decimal pl-6'>
-          {children}
-        </ol>
-      )
-    if (tag === 'li') return <li key={key}>{children}</li>
-
-    /* istanbul ignore if -- image rendering with error handler */
-    if (tag === 'img') {
-      const src = resolveAssetUrl(el.getAttribute('src') ?? '')
-      const alt = el.getAttribute('alt') ?? ''
-      return (
-        <img
-          key={key}
-          src={src}
-          alt={alt}
-          loading='lazy'
-          className='max-w-full rounded-md border'
-          onError={(e) => {
-            e.currentTarget.style.display = 'none'
-          }}
-        />
-      )
-    }
-
-    /* istanbul ignore next -- fallback span rendering */
-    return (
-      <span key={key} className='whitespace-pre-wrap'>
-        {children}
-      </span>
-    )
-  }
-
-  return (
-    <div className='space-y-3'>
-      {nodes.map((n, i) => renderNode(n, i, 'body'))}
-    </div>
-  )
-}
-
 function hasHtml(value: string) {
   return value.includes('<')
 }
 
 /* istanbul ignore next -- progress merge utility for firebase sync */
 function mergeProgress(local: ExamProgress, remote: ExamProgress) {
-  const merged = { ...local }
+  let merged = local
   Object.entries(remote).forEach(([qId, rVal]) => {
     const lVal = merged[qId]
     if (!lVal || (rVal.lastAnswered || 0) > (lVal.lastAnswered || 0)) {
+      if (merged === local) merged = { ...local }
       merged[qId] = rVal
     }
   })
   return merged
 }
 
+function mapExamQuestion(q: ExamQuestion): PracticeQuestion {
+  const options = (q.options ?? []).slice().sort((a, b) => {
+    return a.label.localeCompare(b.label)
+  })
+  const correctIndex = options.findIndex(
+    (o) => o.label === q.correctAnswer
+  )
+  const correctLabels = parseCorrectLabels(q.correctAnswer)
+  const correctAnswers = correctLabels
+    .map((label) => options.findIndex((o) => o.label === label))
+    .filter((idx) => idx >= 0)
+  const requiredSelections =
+    q.type === 'multiple' ? Math.max(correctLabels.length, 1) : 1
+
+  // Build explanations object for multi-language support
+  const explanations: { en?: string; zh?: string; ja?: string } = {}
+  const rawExplanation = (
+    q.explanationNodes
+      ? htmlNodesToText(q.explanationNodes)
+      : (q.explanation ?? '')
+  ).trim()
+
+  // Check if explanation contains Chinese characters - if so, it's the Chinese version
+  const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
+  /* istanbul ignore if -- depends on test data content */
+  if (hasChinese) {
+    explanations.zh = rawExplanation
+  } else if (rawExplanation) {
+    explanations.en = rawExplanation
+  }
+
+  // Check for explicit language-specific explanations in the data
+  const qAny = q as Record<string, unknown>
+  /* istanbul ignore if -- explanation presence depends on test data */
+  if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
+    explanations.en = (qAny.explanation_en as string).trim()
+  }
+  /* istanbul ignore if -- explanation presence depends on test data */
+  if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
+    explanations.zh = (qAny.explanation_zh as string).trim()
+  }
+  /* istanbul ignore if -- explanation presence depends on test data */
+  if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
+    explanations.ja = (qAny.explanation_ja as string).trim()
+  }
+  // Also support explanations object format
+  /* istanbul ignore if -- alternative format not used in current test data */
+  if (qAny.explanations && typeof qAny.explanations === 'object') {
+    const explObj = qAny.explanations as Record<string, string>
+    if (explObj.en) explanations.en = explObj.en.trim()
+    if (explObj.zh) explanations.zh = explObj.zh.trim()
+    if (explObj.ja) explanations.ja = explObj.ja.trim()
+  }
+
+  return {
+    id: q.id,
+    type: (q.type === 'multiple'
+      ? 'multiple'
+      : 'single') as PracticeQuestion['type'],
+    text: q.contentNodes
+      ? htmlNodesToText(q.contentNodes)
+      : htmlToText(q.content ?? ''),
+    contentHtml: q.contentNodes ? undefined : q.content,
+    contentNodes: q.contentNodes,
+    contents: readLocalizedContent((q as Record<string, unknown>).contents),
+    options: options.map((o) => {
+      const raw = o.content ?? ''
+      const text = o.contentNodes
+        ? htmlNodesToText(o.contentNodes)
+        : htmlToText(raw)
+      const html = !o.contentNodes && raw.includes('<') ? raw : undefined
+      return {
+        text,
+        html,
+        nodes: o.contentNodes,
+        contents: readLocalizedContent(
+          (o as Record<string, unknown>).contents
+        ),
+      }
+    }),
+    correctAnswers:
+      correctAnswers.length > 0
+        ? correctAnswers
+        : [Math.max(correctIndex, 0)],
+    requiredSelections,
+    explanation: rawExplanation,
+    explanations,
+    explanationNodes: q.explanationNodes,
+  }
+}
+
+function placeholderQuestion(entry: ShardManifestEntry): PracticeQuestion {
+  return {
+    id: entry.id,
+    type: entry.type === 'multiple' ? 'multiple' : 'single',
+    text: '',
+    options: [],
+    correctAnswers: [],
+    requiredSelections: entry.answerCount,
+    pending: true,
+  }
+}
+
 export function PracticeMode({
   examId,
   initialMode,
@@ -301,6 +326,28 @@ export function PracticeMode({
     mistakesMode: initialMode === 'mistakes',
     bookmarksMode: initialMode === 'bookmarks',
   })
+  // Mistakes and answer counts for this exam. The index is one object for
+  // the component's lifetime, changed in place alongside each examProgress
+  // change; rendering reads only the counts it publishes. The revision goes
+  // up when the index is rebuilt, which refreshes the Mistakes list, while
+  // single answers leave the list as it is.
+  const [reviewIndex] = useState(() =>
+    createReviewIndex(examProgress, settings.consecutiveCorrect)
+  )
+  const [reviewCounts, setReviewCounts] = useState(() => reviewIndex.counts())
+  const [reviewRevision, setReviewRevision] = useState(0)
+  const updateReviewIndex = useCallback(
+    (apply: (index: ReviewIndex) => void, rebuilt = false) => {
+      apply(reviewIndex)
+      setReviewCounts(reviewIndex.counts())
+      if (rebuilt) setReviewRevision((revision) => revision + 1)
+    },
+    [reviewIndex]
+  )
+  const questionById = useMemo(
+    () => new Map((allQuestions ?? []).map((q) => [q.id, q])),
+    [allQuestions]
+  )
   const [showClearConfirm, setShowClearConfirm] = useState(false)
   const [isReady, setIsReady] = useState(false)
   const [isProgressLoaded, setIsProgressLoaded] = useState(false)
@@ -310,6 +357,10 @@ export function PracticeMode({
   const userIdRef = useRef(userId)
   const userUidRef = useRef(user?.uid)
   const examIdRef = useRef(examId)
+  const [shardLoader, setShardLoader] =
+    useState<ExamShardLoader<PracticeQuestion> | null>(null)
+  const loadedExamIdRef = useRef<string | null>(null)
+  const initialIndexRef = useRef(initialQuestionIndex ?? 0)
 
   // Filter questions for "My Mistakes" mode
   const [mistakeQuestions, setMistakeQuestions] = useState<
@@ -346,6 +397,17 @@ export function PracticeMode({
     })
   }, [currentQuestionIndex, navigate])
 
+  useEffect(() => {
+    const threshold = settings.consecutiveCorrect
+    if (reviewIndex.threshold === threshold) return
+    updateReviewIndex((index) => index.setThreshold(threshold), true)
+  }, [reviewIndex, settings.consecutiveCorrect, updateReviewIndex])
+
+  // Count and review only the questions this exam has now.
+  useEffect(() => {
+    updateReviewIndex((index) => index.restrict(questionById.keys()), true)
+  }, [questionById, updateReviewIndex])
+
   useEffect(() => {
     const wasMistakesMode = prevMistakesMode.current
     prevMistakesMode.current = settings.mistakesMode
@@ -357,67 +419,46 @@ export function PracticeMode({
 
       /* istanbul ignore if -- automatic graduation with firebase sync */
       if (userIdRef.current) {
-        const toGraduate: string[] = []
-        allQuestions.forEach((q) => {
-          const p = examProgressRef.current[q.id]
-          if (!p) return
-          const isMistakeFlag =
-            p.status === 'incorrect' || (p.timesWrong && p.timesWrong > 0)
-          const consec = p.consecutiveCorrect || 0
-          if (isMistakeFlag && consec >= settings.consecutiveCorrect) {
-            toGraduate.push(q.id)
-            ProgressService.saveAnswer(
-              userIdRef.current,
+        const graduated: ExamProgress = {}
+        reviewIndex.graduates().forEach((qId) => {
+          const p = examProgressRef.current[qId]
+          if (!p || !questionById.has(qId)) return
+          graduated[qId] = { ...p, status: 'correct', timesWrong: 0 }
+          ProgressService.saveAnswer(
+            userIdRef.current,
+            examIdRef.current,
+            qId,
+            'correct',
+            p.userSelection,
+            true,
+            { resetTimesWrong: true }
+          )
+          if (userUidRef.current) {
+            void RemoteProgress.saveAnswer(
+              userUidRef.current,
               examIdRef.current,
-              q.id,
+              qId,
               'correct',
               p.userSelection,
+              p,
               true,
               { resetTimesWrong: true }
             )
-            if (userUidRef.current) {
-              void RemoteProgress.saveAnswer(
-                userUidRef.current,
-                examIdRef.current,
-                q.id,
-                'correct',
-                p.userSelection,
-                p,
-                true,
-                { resetTimesWrong: true }
-              )
-            }
           }
         })
         /* istanbul ignore if -- graduation state update */
-        if (toGraduate.length > 0) {
-          setExamProgress((prev) => {
-            const next = { ...prev }
-            toGraduate.forEach((qId) => {
-              const prevEntry = next[qId] || {}
-              const consec = prevEntry.consecutiveCorrect || 0
-              next[qId] = {
-                ...prevEntry,
-                status: 'correct',
-                timesWrong: 0,
-                consecutiveCorrect: consec,
-              }
-            })
-            return next
-          })
+        if (Object.keys(graduated).length > 0) {
+          setExamProgress((prev) => ({ ...prev, ...graduated }))
+          updateReviewIndex((index) => index.set(graduated))
         }
       }
 
-      /* istanbul ignore next -- mistakes filter with multiple conditions */
-      const filtered = allQuestions.filter((q) => {
-        const p = examProgressRef.current[q.id]
-        if (!p) return false
-
-        if (p.status === 'incorrect' || (p.timesWrong && p.timesWrong > 0)) {
-          return (p.consecutiveCorrect || 0) < settings.consecutiveCorrect
-        }
-        return false
-      })
+      // Most urgent first: most often wrong, then fewest correct in a row,
+      // then longest since answered.
+      const filtered = reviewIndex
+        .ordered()
+        .map((qId) => questionById.get(qId))
+        .filter((q): q is PracticeQuestion => !!q)
       setMistakeQuestions(filtered)
 
       /* istanbul ignore if -- mode transition handling */
@@ -436,7 +477,7 @@ export function PracticeMode({
     }
     // Note: examProgress is intentionally omitted from deps and synced via ref at the start
     // to prevent the question list from shifting while user is practicing
-  }, [settings.mistakesMode, settings.consecutiveCorrect, allQuestions, isRemoteSynced, isProgressLoaded]) // eslint-disable-line react-hooks/exhaustive-deps
+  }, [settings.mistakesMode, reviewRevision, questionById, isRemoteSynced, isProgressLoaded]) // eslint-disable-line react-hooks/exhaustive-deps
 
   // Filter questions for "My Bookmarks" mode
   useEffect(() => {
@@ -473,6 +514,12 @@ export function PracticeMode({
     : settings.mistakesMode
       ? mistakeQuestions
       : allQuestions
+  // Outside Mistakes and Bookmarks mode the answer sheet covers the whole
+  // exam, so its counts come straight from the review index.
+  const answerCounts =
+    settings.mistakesMode || settings.bookmarksMode
+      ? undefined
+      : reviewCounts
 
   // Load progress for the whole exam
   useEffect(() => {
@@ -481,10 +528,11 @@ export function PracticeMode({
       // Only set if we have data or if it's the first load (to avoid overwriting with empty)
       if (Object.keys(progress).length > 0 || !isProgressLoaded) {
         setExamProgress(progress)
+        updateReviewIndex((index) => index.reset(progress), true)
       }
       setIsProgressLoaded(true)
     }
-  }, [userId, examId, isProgressLoaded])
+  }, [userId, examId, isProgressLoaded, updateReviewIndex])
 
   /* istanbul ignore next -- firebase subscription for authenticated users */
   useEffect(() => {
@@ -494,20 +542,27 @@ export function PracticeMode({
     }
 
     setIsRemoteSynced(false)
-    const unsub = RemoteProgress.subscribeExamProgress(
+    // Sync remote progress to the local store so that ProgressService.saveAnswer
+    // reads the correct consecutiveCorrect value when computing the next value.
+    // After hydration only the questions that changed are merged.
+    const apply = (remote: ExamProgress) => {
+      ProgressService.mergeRemoteExamProgress(user.uid, examId, remote)
+      setExamProgress((prev) => mergeProgress(prev, remote))
+      updateReviewIndex((index) => index.merge(remote))
+    }
+    const unsub = RemoteProgress.subscribeExamProgressChanges(
       user.uid,
       examId,
-      (p) => {
-        const remote = p || {}
-        // Sync remote progress to localStorage so that ProgressService.saveAnswer
-        // reads the correct consecutiveCorrect value when computing the next value
-        ProgressService.mergeRemoteExamProgress(user.uid, examId, remote)
-        setExamProgress((prev) => mergeProgress(prev, remote))
-        setIsRemoteSynced(true)
+      {
+        onHydrate: (remote) => {
+          apply(remote)
+          setIsRemoteSynced(true)
+        },
+        onChange: apply,
       }
     )
     return () => unsub()
-  }, [user?.uid, examId])
+  }, [user?.uid, examId, updateReviewIndex])
 
   useEffect(() => {
     if (!userId || !examId) return
@@ -608,99 +663,43 @@ export function PracticeMode({
     async function load() {
       setIsLoading(true)
       setLoadError(null)
-      setAllQuestions(fallbackQuestions)
-      setTitle(exam?.title ?? examId)
+      // Switching language keeps the current list on screen until the
+      // variant for the new language arrives.
+      if (loadedExamIdRef.current !== examId) {
+        loadedExamIdRef.current = examId
+        setAllQuestions(fallbackQuestions)
+        setTitle(exam?.title ?? examId)
+      }
 
       try {
-        const response = await fetch(`/data/${examId}.json`)
-        /* istanbul ignore if -- error response handling */
-        if (!response.ok) {
-          throw new Error(`HTTP ${response.status}`)
+        const shards = await openExamShards(
+          examId,
+          mapExamQuestion,
+          placeholderQuestion,
+          language
+        )
+        if (!cancelled) setShardLoader(shards)
+        /* istanbul ignore if -- sharded loading is enabled at build time */
+        if (shards) {
+          await shards.ensure(initialIndexRef.current)
+          if (!cancelled && shards.size > 0) {
+            setAllQuestions(shards.snapshot())
+            setTitle(examId)
+          }
+          return
         }
 
-        const data = (await response.json()) as ExamFile
-        const mapped = (data.questions ?? [])
-          .slice()
-          .sort((a, b) => a.questionNumber - b.questionNumber)
-          .map((q) => {
-            const options = (q.options ?? []).slice().sort((a, b) => {
-              return a.label.localeCompare(b.label)
-            })
-            const correctIndex = options.findIndex(
-              (o) => o.label === q.correctAnswer
-            )
-            const correctLabels = parseCorrectLabels(q.correctAnswer)
-            const correctAnswers = correctLabels
-              .map((label) => options.findIndex((o) => o.label === label))
-              .filter((idx) => idx >= 0)
-            const requiredSelections =
-              q.type === 'multiple' ? Math.max(correctLabels.length, 1) : 1
-
-            // Build explanations object for multi-language support
-            const explanations: { en?: string; zh?: string; ja?: string } = {}
-            const rawExplanation = (q.explanation ?? '').trim()
-
-            // Check if explanation contains Chinese characters - if so, it's the Chinese version
-            const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
-            /* istanbul ignore if -- depends on test data content */
-            if (hasChinese) {
-              explanations.zh = rawExplanation
-            } else if (rawExplanation) {
-              explanations.en = rawExplanation
-            }
-
-            // Check for explicit language-specific explanations in the data
-            const qAny = q as Record<string, unknown>
-            /* istanbul ignore if -- explanation presence depends on test data */
-            if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
-              explanations.en = (qAny.explanation_en as string).trim()
-            }
-            /* istanbul ignore if -- explanation presence depends on test data */
-            if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
-              explanations.zh = (qAny.explanation_zh as string).trim()
-            }
-            /* istanbul ignore if -- explanation presence depends on test data */
-            if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
-              explanations.ja = (qAny.explanation_ja as string).trim()
-            }
-            // Also support explanations object format
-            /* istanbul ignore if -- alternative format not used in current test data */
-            if (qAny.explanations && typeof qAny.explanations === 'object') {
-              const explObj = qAny.explanations as Record<string, string>
-              if (explObj.en) explanations.en = explObj.en.trim()
-              if (explObj.zh) explanations.zh = explObj.zh.trim()
-              if (explObj.ja) explanations.ja = explObj.ja.trim()
-            }
-
-            return {
-              id: q.id,
-              type: (q.type === 'multiple'
-                ? 'multiple'
-                : 'single') as PracticeQuestion['type'],
-              text: htmlToText(q.content),
-              contentHtml: q.content,
-              contents: readLocalizedContent((q as Record<string, unknown>).contents),
-              options: options.map((o) => {
-                const raw = o.content ?? ''
-                const text = htmlToText(raw)
-                const html = raw.includes('<') ? raw : undefined
-                return {
-                  text,
-                  html,
-                  contents: readLocalizedContent(
-                    (o as Record<string, unknown>).contents
-                  ),
-                }
-              }),
-              correctAnswers:
-                correctAnswers.length > 0
-                  ? correctAnswers
-                  : [Math.max(correctIndex, 0)],
-              requiredSelections,
-              explanation: rawExplanation,
-              explanations,
-            }
-          })
+        const data = await fetchExamData<ExamFile>(examId, language)
+        const mapped = timePhase(
+          'map',
+          examId,
+          () =>
+            (data.questions ?? [])
+              .slice()
+              .sort((a, b) => a.questionNumber - b.questionNumber)
+              .map(mapExamQuestion),
+          'practice'
+        )
 
         if (!cancelled && mapped.length > 0) {
           setAllQuestions(mapped)
@@ -719,9 +718,34 @@ export function PracticeMode({
     return () => {
       cancelled = true
     }
-  }, [exam, examId, fallbackQuestions])
+  }, [exam, examId, fallbackQuestions, language])
 
   const question = questions?.[currentQuestionIndex]
+  usePaintPhase(
+    examId,
+    'practice',
+    !isLoading && !!question && !question.pending
+  )
+
+  // In sharded mode, fetch the shard around the current question (and
+  // prefetch the next one), then refresh the list once new content arrives.
+  const questionId = question?.id
+  /* istanbul ignore next -- sharded loading is enabled at build time */
+  useEffect(() => {
+    const shards = shardLoader
+    if (!shards || !questionId) return
+    let cancelled = false
+    shards
+      .ensure(shards.indexOf(questionId))
+      .then((changed) => {
+        if (changed && !cancelled) setAllQuestions(shards.snapshot())
+      })
+      .catch(() => undefined)
+    return () => {
+      cancelled = true
+    }
+  }, [shardLoader, questionId])
+
   const canSubmit =
     !isSubmitted &&
     !!question &&
@@ -853,27 +877,27 @@ export function PracticeMode({
         [question.id]: correct ? 'correct' : 'incorrect',
       }))
     }
-    setExamProgress((prev) => {
-      const prevEntry = prev[question.id] || {}
-      const prevTimesWrong = prevEntry.timesWrong || 0
-      let nextTimesWrong = prevTimesWrong
-      if (!correct) {
-        nextTimesWrong = prevTimesWrong + 1
-      } else if (graduatedNow) {
-        nextTimesWrong = 0
-      }
-      return {
-        ...prev,
-        [question.id]: {
-          ...prevEntry,
-          status: persistedStatus,
-          lastAnswered: Date.now(),
-          userSelection: selectedAnswers,
-          consecutiveCorrect: correct ? newConsecutive : 0,
-          timesWrong: nextTimesWrong,
-        },
-      }
-    })
+    const prevTimesWrong = prevProgress?.timesWrong || 0
+    let nextTimesWrong = prevTimesWrong
+    if (!correct) {
+      nextTimesWrong = prevTimesWrong + 1
+    } else if (graduatedNow) {
+      nextTimesWrong = 0
+    }
+    const answered: QuestionProgress = {
+      status: persistedStatus,
+      lastAnswered: Date.now(),
+      userSelection: selectedAnswers,
+      consecutiveCorrect: correct ? newConsecutive : 0,
+      timesWrong: nextTimesWrong,
+    }
+    setExamProgress((prev) => ({
+      ...prev,
+      [question.id]: { ...prev[question.id], ...answered },
+    }))
+    updateReviewIndex((index) =>
+      index.set({ [question.id]: { ...prevProgress, ...answered } })
+    )
 
     if (graduatedNow) {
       toast.success(
@@ -971,6 +995,7 @@ export function PracticeMode({
       void RemoteProgress.clearExamProgress(user.uid, examId)
     }
     setExamProgress({})
+    updateReviewIndex((index) => index.reset({}), true)
     setIsSubmitted(false)
     setSelectedAnswers([])
     /* istanbul ignore if -- mistakes mode edge case */
@@ -980,7 +1005,7 @@ export function PracticeMode({
     setShowClearConfirm(false)
   }
 
-  if ((isLoading && !questions) || !isReady || authLoading) {
+  if ((isLoading && !questions) || !isReady || authLoading || question?.pending) {
     return (
       <>
         <Header fixed>
@@ -1093,12 +1118,15 @@ export function PracticeMode({
                   </Badge>
                   <div className='mt-2'>
                     {(() => {
+                      if (question.contentNodes) {
+                        return <ExamHtml nodes={question.contentNodes} />
+                      }
                       const content = getLocalizedText(
                         question.contentHtml ?? question.text,
                         question.contents,
                         language
                       )
-                      return hasHtml(content) ? renderExamHtml(content) : <p>{content}</p>
+                      return hasHtml(content) ? <ExamHtml html={content} /> : <p>{content}</p>
                     })()}
                   </div>
                 </CardTitle>
@@ -1174,13 +1202,14 @@ export function PracticeMode({
                             )}
                           >
                             {(() => {
+                              if (option.nodes) return <ExamHtml nodes={option.nodes} />
                               const content = getLocalizedText(
                                 option.html ?? option.text,
                                 option.contents,
                                 language
                               )
                               return hasHtml(content)
-                                ? renderExamHtml(content)
+                                ? <ExamHtml html={content} />
                                 : content
                             })()}
                           </Label>
@@ -1250,13 +1279,14 @@ export function PracticeMode({
                             )}
                           >
                             {(() => {
+                              if (option.nodes) return <ExamHtml nodes={option.nodes} />
                               const content = getLocalizedText(
                                 option.html ?? option.text,
                                 option.contents,
                                 language
                               )
                               return hasHtml(content)
-                                ? renderExamHtml(content)
+                                ? <ExamHtml html={content} />
                                 : content
                             })()}
                           </Label>
@@ -1309,7 +1339,10 @@ export function PracticeMode({
                         <div className='mt-3 border-t border-current/20 pt-3'>
                           <p className='mb-2 font-semibold'>{t('practice.explanation')}:</p>
                           <div className='prose prose-sm max-w-none dark:prose-invert prose-p:my-1 prose-ul:my-1 prose-li:my-0.5'>
-                            {renderExamHtml(localizedExplanation)}
+                            <ExamHtml
+                              nodes={question.explanationNodes}
+                              html={localizedExplanation}
+                            />
                           </div>
                         </div>
                       )
@@ -1404,6 +1437,7 @@ export function PracticeMode({
             settings={settings}
             onSettingsChange={handleSettingsChange}
             mistakesSessionStatus={mistakesSessionStatus}
+            counts={answerCounts}
           />
         </div>
       </div>
@@ -1417,6 +1451,7 @@ export function PracticeMode({
         onToggleBookmark={toggleBookmark}
         mistakesMode={settings.mistakesMode}
         mistakesSessionStatus={mistakesSessionStatus}
+        counts={answerCounts}
         settings={settings}
         onSettingsChange={handleSettingsChange}
       />
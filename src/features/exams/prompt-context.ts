@@ -0,0 +1,162 @@
+/**
+ * Precomputed AI tutor context per question.
+ *
+ * `scripts/build-prompt-context.py` publishes, per exam, a manifest of
+ * question ids at `/data/prompts/{examId}/manifest.json` and pages of
+ * contexts per language at `/data/prompts/{examId}/{language}/shard-NNN.json`,
+ * split the way the bank shards are. Each context holds a question's stem,
+ * labelled options, correct answer and a short explanation summary as plain
+ * text, with an estimated token count. Only the page holding the question is
+ * fetched, when a chat first needs it, and kept. A chat request never waits
+ * for it: `getLoadedPromptContext` returns a context only once its page has
+ * arrived, and until then the chat panel builds the context from the
+ * question it already has.
+ */
+export type PromptContext = {
+  text: string
+  /** Estimated, not counted by a tokenizer. */
+  tokens: number
+}
+
+type PromptContextShard = {
+  version: number
+  examId: string
+  language: string
+  questions: Record<string, PromptContext>
+}
+
+type PromptContextManifest = {
+  version: number
+  examId: string
+  shardSize: number
+  ids: string[]
+}
+
+/** A fetch in flight, and its result once it has settled. */
+type Cached<T> = { promise: Promise<T>; value?: T }
+
+function isPromptContextShard(value: unknown): value is PromptContextShard {
+  if (!value || typeof value !== 'object') return false
+  const v = value as Partial<PromptContextShard>
+  return v.version === 1 && !!v.questions && typeof v.questions === 'object'
+}
+
+function isPromptContextManifest(
+  value: unknown
+): value is PromptContextManifest {
+  if (!value || typeof value !== 'object') return false
+  const v = value as Partial<PromptContextManifest>
+  return (
+    v.version === 1 &&
+    typeof v.shardSize === 'number' &&
+    v.shardSize > 0 &&
+    Array.isArray(v.ids)
+  )
+}
+
+/** examId -> question id -> shard number. */
+const manifests = new Map<string, Cached<Map<string, number> | null>>()
+/** `${examId}/${language}/${shard}` -> shard. */
+const shards = new Map<string, Cached<PromptContextShard | null>>()
+
+async function fetchJson(url: string): Promise<unknown> {
+  try {
+    const res = await fetch(url)
+    if (!res.ok) return null
+    return await res.json()
+  } catch {
+    return null
+  }
+}
+
+function cached<T>(
+  cache: Map<string, Cached<T>>,
+  key: string,
+  load: () => Promise<T>
+) {
+  let entry = cache.get(key)
+  if (!entry) {
+    const created: Cached<T> = {
+      promise: load().then((value) => {
+        created.value = value
+        return value
+      }),
+    }
+    entry = created
+    cache.set(key, entry)
+  }
+  return entry.promise
+}
+
+function loadManifest(examId: string) {
+  return cached(manifests, examId, async () => {
+    const manifest = await fetchJson(`/data/prompts/${examId}/manifest.json`)
+    if (!isPromptContextManifest(manifest)) return null
+    const { ids, shardSize } = manifest
+    return new Map(ids.map((id, i) => [id, Math.floor(i / shardSize)]))
+  })
+}
+
+function loadShard(examId: string, language: string, shard: number) {
+  const name = `shard-${String(shard).padStart(3, '0')}.json`
+  return cached(shards, `${examId}/${language}/${shard}`, async () => {
+    const file = await fetchJson(`/data/prompts/${examId}/${language}/${name}`)
+    return isPromptContextShard(file) ? file : null
+  })
+}
+
+async function loadContext(
+  examId: string,
+  questionId: string,
+  language: string
+) {
+  const shard = (await loadManifest(examId))?.get(questionId)
+  if (shard === undefined) return null
+  const file = await loadShard(examId, language, shard)
+  return file?.questions[questionId] ?? null
+}
+
+/** The context if its page has been fetched; undefined while it hasn't. */
+function loadedContext(examId: string, questionId: string, language: string) {
+  const manifest = manifests.get(examId)
+  if (!manifest || manifest.value === undefined) return undefined
+  const shard = manifest.value?.get(questionId)
+  if (shard === undefined) return null
+  const file = shards.get(`${examId}/${language}/${shard}`)
+  if (!file || file.value === undefined) return undefined
+  return file.value?.questions[questionId] ?? null
+}
+
+/**
+ * The context for a question in `language`, falling back to English; null if
+ * none is published for it. Fetches the page holding it if needed.
+ */
+export async function loadPromptContext(
+  examId: string,
+  questionId: string,
+  language: string
+): Promise<PromptContext | null> {
+  const context = await loadContext(examId, questionId, language)
+  if (context || language === 'en') return context
+  return loadContext(examId, questionId, 'en')
+}
+
+/**
+ * The context `loadPromptContext` would return, if everything it needs has
+ * already been fetched; null otherwise. Never fetches.
+ */
+export function getLoadedPromptContext(
+  examId: string,
+  questionId: string,
+  language: string
+): PromptContext | null {
+  const context = loadedContext(examId, questionId, language)
+  if (context || language === 'en') return context ?? null
+  return loadedContext(examId, questionId, 'en') ?? null
+}
+
+/** Forget loaded contexts (used by tests). */
+export function clearPromptContextCache() {
+  manifests.clear()
+  shards.clear()
+}
@@ -0,0 +1,212 @@
+/**
+ * Per-exam index of questions to review in Mistakes mode.
+ *
+ * A question is a mistake when it was answered incorrectly or has been wrong
+ * before (`timesWrong > 0`); it stays due until `consecutiveCorrect` reaches
+ * the graduation threshold, after which it is a graduate waiting to be reset.
+ * Due questions sit in a binary heap ordered by urgency (most often wrong,
+ * then fewest correct in a row, then longest since answered), with each
+ * question's heap position tracked so an answer is applied in O(log n). The
+ * most urgent question and the correct/incorrect/due counts are O(1).
+ *
+ * The index is one mutable object per exam session. Progress for questions
+ * outside the exam's current question list is kept but neither counted nor
+ * reviewed, so stale entries for removed questions don't skew the counts.
+ */
+import type {
+  ExamProgress,
+  QuestionProgress,
+} from '@/services/progress-service'
+
+export type ReviewCounts = {
+  correct: number
+  incorrect: number
+  /** Mistakes not yet graduated. */
+  due: number
+}
+
+export type ReviewIndex = {
+  readonly threshold: number
+  /** Rank every question again against a new graduation threshold. */
+  setThreshold: (threshold: number) => void
+  /** Count and review only these questions. */
+  restrict: (questionIds: Iterable<string>) => void
+  /** Replace all progress. */
+  reset: (progress: ExamProgress) => void
+  /** Apply these questions' progress as given. */
+  set: (changes: ExamProgress) => void
+  /** Apply remote entries answered later than the local ones. */
+  merge: (remote: ExamProgress) => void
+  isDue: (questionId: string) => boolean
+  /** The question most in need of review. */
+  peek: () => string | undefined
+  /** Due questions, most urgent first. */
+  ordered: () => string[]
+  /** Mistakes that reached the threshold but are still flagged. */
+  graduates: () => string[]
+  counts: () => ReviewCounts
+}
+
+type Entry = {
+  id: string
+  timesWrong: number
+  consecutiveCorrect: number
+  lastAnswered: number
+}
+
+export function isMistake(p: QuestionProgress | undefined) {
+  return !!p && (p.status === 'incorrect' || (p.timesWrong ?? 0) > 0)
+}
+
+/** True when `a` should be reviewed before `b`. */
+function before(a: Entry, b: Entry) {
+  if (a.timesWrong !== b.timesWrong) return a.timesWrong > b.timesWrong
+  if (a.consecutiveCorrect !== b.consecutiveCorrect) {
+    return a.consecutiveCorrect < b.consecutiveCorrect
+  }
+  return a.lastAnswered < b.lastAnswered
+}
+
+export function createReviewIndex(
+  progress: ExamProgress,
+  threshold: number,
+  questionIds?: Iterable<string>
+): ReviewIndex {
+  const known = new Map<string, QuestionProgress>()
+  let scope = questionIds ? new Set(questionIds) : null
+  const heap: Entry[] = []
+  const position = new Map<string, number>()
+  const graduated = new Set<string>()
+  let correct = 0
+  let incorrect = 0
+
+  function place(entry: Entry, i: number) {
+    heap[i] = entry
+    position.set(entry.id, i)
+  }
+
+  function siftUp(i: number) {
+    const entry = heap[i]
+    while (i > 0) {
+      const parent = (i - 1) >> 1
+      if (!before(entry, heap[parent])) break
+      place(heap[parent], i)
+      i = parent
+    }
+    place(entry, i)
+  }
+
+  function siftDown(i: number) {
+    const entry = heap[i]
+    for (;;) {
+      let child = 2 * i + 1
+      if (child >= heap.length) break
+      if (child + 1 < heap.length && before(heap[child + 1], heap[child])) {
+        child++
+      }
+      if (!before(heap[child], entry)) break
+      place(heap[child], i)
+      i = child
+    }
+    place(entry, i)
+  }
+
+  function removeDue(id: string) {
+    const i = position.get(id)
+    if (i === undefined) return
+    position.delete(id)
+    const last = heap.pop() as Entry
+    if (i === heap.length) return
+    place(last, i)
+    siftUp(i)
+    siftDown(position.get(last.id) as number)
+  }
+
+  function apply(id: string, p: QuestionProgress | undefined) {
+    const old = known.get(id)
+    if (p) known.set(id, p)
+    else known.delete(id)
+    if (scope && !scope.has(id)) return
+    if (old?.status === 'correct') correct--
+    if (old?.status === 'incorrect') incorrect--
+    if (p?.status === 'correct') correct++
+    if (p?.status === 'incorrect') incorrect++
+
+    graduated.delete(id)
+    if (!isMistake(p)) {
+      removeDue(id)
+      return
+    }
+    const entry: Entry = {
+      id,
+      timesWrong: p?.timesWrong ?? 0,
+      consecutiveCorrect: p?.consecutiveCorrect ?? 0,
+      lastAnswered: p?.lastAnswered ?? 0,
+    }
+    if (entry.consecutiveCorrect >= threshold) {
+      removeDue(id)
+      graduated.add(id)
+      return
+    }
+    const i = position.get(id)
+    if (i === undefined) {
+      heap.push(entry)
+      siftUp(heap.length - 1)
+    } else {
+      place(entry, i)
+      siftUp(i)
+      siftDown(position.get(id) as number)
+    }
+  }
+
+  function rebuild(progress: Iterable<[string, QuestionProgress]>) {
+    known.clear()
+    heap.length = 0
+    position.clear()
+    graduated.clear()
+    correct = 0
+    incorrect = 0
+    for (const [id, p] of progress) apply(id, p)
+  }
+
+  rebuild(Object.entries(progress))
+
+  return {
+    get threshold() {
+      return threshold
+    },
+    setThreshold(next) {
+      if (next === threshold) return
+      threshold = next
+      rebuild(Array.from(known))
+    },
+    restrict(questionIds) {
+      scope = new Set(questionIds)
+      rebuild(Array.from(known))
+    },
+    reset(progress) {
+      rebuild(Object.entries(progress))
+    },
+    set(changes) {
+      for (const [id, p] of Object.entries(changes)) apply(id, p)
+    },
+    merge(remote) {
+      for (const [id, p] of Object.entries(remote)) {
+        const local = known.get(id)
+        if (!local || (p.lastAnswered || 0) > (local.lastAnswered || 0)) {
+          apply(id, p)
+        }
+      }
+    },
+    isDue: (id) => position.has(id),
+    peek: () => heap[0]?.id,
+    ordered() {
+      return heap
+        .slice()
+        .sort((a, b) => (before(a, b) ? -1 : before(b, a) ? 1 : 0))
+        .map((entry) => entry.id)
+    },
+    graduates: () => Array.from(graduated),
+    counts: () => ({ correct, incorrect, due: heap.length }),
+  }
+}
@@ -1,4 +1,4 @@
-import { useEffect, useState, type ReactNode } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import { Link } from '@tanstack/react-router'
 import * as RemoteProgress from '@/services/firebase-progress'
 import { ProgressService } from '@/services/progress-service'
@@ -10,7 +10,10 @@ import {
   Bookmark,
 } from 'lucide-react'
 import { toast } from 'sonner'
+import { timePhase } from '@/lib/perf'
 import { cn } from '@/lib/utils'
+import { usePaintPhase } from '@/hooks/use-paint-phase'
+import { useRemoteBookmarks } from '@/hooks/use-remote-bookmarks'
 import { useAuth } from '@/context/auth-ctx'
 import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
@@ -30,13 +33,21 @@ import {
   getLocalizedExplanation,
   getLocalizedText,
 } from '@/context/language-provider'
+import { htmlNodesToText, type HtmlNode } from './html-nodes'
 import {
   readLocalizedContent,
   type LocalizedContent,
 } from './localized-content'
 import { StudyMobileBar } from './components/study-mobile-bar'
 import { StudySidebar, type StudySettings } from './components/study-sidebar'
+import { ExamHtml } from './components/exam-html'
 import { mockExams } from './data/mock-exams'
+import { fetchExamData } from './exam-data'
+import {
+  openExamShards,
+  type ExamShardLoader,
+  type ShardManifestEntry,
+} from './exam-shards'
 
 interface StudyModeProps {
   examId: string
@@ -44,7 +55,8 @@ interface StudyModeProps {
 
 type ExamOption = {
   label: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
 }
 
@@ -52,11 +64,13 @@ type ExamQuestion = {
   id: string
   questionNumber: number
   type: string
-  content: string
+  content?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
   options: ExamOption[]
   correctAnswer: string
   explanation?: string
+  explanationNodes?: HtmlNode[]
 }
 
 type ExamFile = {
@@ -68,10 +82,12 @@ type StudyQuestion = {
   type: 'single' | 'multiple'
   text: string
   contentHtml?: string
+  contentNodes?: HtmlNode[]
   contents?: LocalizedContent
   options: {
     text: string
     html?: string
+    nodes?: HtmlNode[]
     contents?: LocalizedContent
   }[]
   correctAnswers: number[]
@@ -81,6 +97,9 @@ type StudyQuestion = {
     zh?: string
     ja?: string
   }
+  explanationNodes?: HtmlNode[]
+  // Set on shard placeholders whose content has not been fetched yet.
+  pending?: boolean
 }
 
 function formatQuestionTypeWithT(type: string, t: (key: string) => string) {
@@ -94,114 +113,106 @@ function htmlToText(html: string) {
   return (doc.body.textContent ?? '').trim()
 }
 
-function resolveAssetUrl(src: string) {
-  const trimmed = (src ?? '').trim()
-  if (!trimmed) return trimmed
-  if (/^https?:\/\//i.test(trimmed)) return trimmed
-  if (trimmed.startsWith('/')) return trimmed
-  if (trimmed.startsWith('images/')) return `/data/${trimmed}`
-  return `/data/${trimmed}`
-}
-
 function parseCorrectLabels(input: string) {
   const matches = (input ?? '').toUpperCase().match(/[A-Z]/g) ?? []
   return Array.from(new Set(matches))
 }
 
 
-function renderExamHtml(html: string) {
-  if (typeof window === 'undefined') return <span>{html}</span>
-
-  const doc = new DOMParser().parseFromString(html, 'text/html')
-  const nodes = Array.from(doc.body.childNodes)
-
-  const renderNode = (
-    node: ChildNode,
-    key: string | number,
-    parentTag?: string
-  ): ReactNode => {
-    if (node.nodeType === Node.TEXT_NODE) {
-      const text = (node.textContent ?? '').trim()
-      if (!text) return null
-      if (parentTag === 'p' || parentTag === 'li') {
-        return text
-      }
-      return (
-        <span key={key} className='leading-relaxed'>
-          {text}
-        </span>
-      )
-    }
-
-    if (node.nodeType !== Node.ELEMENT_NODE) return null
-
-    const el = node as Element
-    const tag = el.tagName.toLowerCase()
-    const children = Array.from(el.childNodes).map((child, index) =>
-      renderNode(child, `${key}-${index}`, tag)
-    )
-
-    if (tag === 'p') {
-      return (
-        <p key={key} className='leading-relaxed'>
-          {children}
-        </p>
-      )
-    }
-
-    if (tag === 'br') return <br key={key} />
-
-    if (tag === 'strong') return <strong key={key}>{children}</strong>
-    if (tag === 'em') return <em key={key}>{children}</em>
-    if (tag === 'code') return <code key={key}>{children}</code>
+function hasHtml(value: string) {
+  return value.includes('<')
+}
 
-    if (tag === 'ul')
-      return (
-        <ul key={key} className='list-disc pl-6'>
-          {children}
-        </ul>
-      )
-    if (tag === 'ol')
-      return (
-        <ol key={key} className='list-decimal pl-6'>
-          {children}
-        </ol>
-      )
-    if (tag === 'li') return <li key={key}>{children}</li>
-
-    if (tag === 'img') {
-      const src = resolveAssetUrl(el.getAttribute('src') ?? '')
-      const alt = el.getAttribute('alt') ?? ''
-      return (
-        <img
-          key={key}
-          src={src}
-          alt={alt}
-          loading='lazy'
-          className='max-w-full rounded-md border'
-          onError={(e) => {
-            e.currentTarget.style.display = 'none'
-          }}
-        />
-      )
-    }
+function mapExamQuestion(q: ExamQuestion): StudyQuestion {
+  const options = (q.options ?? []).slice().sort((a, b) => {
+    return a.label.localeCompare(b.label)
+  })
+  const correctIndex = options.findIndex(
+    (o) => o.label === q.correctAnswer
+  )
+  const correctLabels = parseCorrectLabels(q.correctAnswer)
+  const correctAnswers = correctLabels
+    .map((label) => options.findIndex((o) => o.label === label))
+    .filter((idx) => idx >= 0)
+
+  // Build explanations object for multi-language support
+  const explanations: { en?: string; zh?: string; ja?: string } = {}
+  const rawExplanation = (
+    q.explanationNodes
+      ? htmlNodesToText(q.explanationNodes)
+      : (q.explanation ?? '')
+  ).trim()
+
+  // Check if explanation contains Chinese characters - if so, it's the Chinese version
+  const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
+  if (hasChinese) {
+    explanations.zh = rawExplanation
+  } else if (rawExplanation) {
+    explanations.en = rawExplanation
+  }
 
-    return (
-      <span key={key} className='whitespace-pre-wrap'>
-        {children}
-      </span>
-    )
+  // Check for explicit language-specific explanations in the data
+  const qAny = q as Record<string, unknown>
+  if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
+    explanations.en = (qAny.explanation_en as string).trim()
+  }
+  if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
+    explanations.zh = (qAny.explanation_zh as string).trim()
+  }
+  if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
+    explanations.ja = (qAny.explanation_ja as string).trim()
+  }
+  // Also support explanations object format
+  if (qAny.explanations && typeof qAny.explanations === 'object') {
+    const explObj = qAny.explanations as Record<string, string>
+    if (explObj.en) explanations.en = explObj.en.trim()
+    if (explObj.zh) explanations.zh = explObj.zh.trim()
+    if (explObj.ja) explanations.ja = explObj.ja.trim()
   }
 
-  return (
-    <div className='space-y-3'>
-      {nodes.map((n, i) => renderNode(n, i, 'body'))}
-    </div>
-  )
+  return {
+    id: q.id,
+    type: (q.type === 'multiple'
+      ? 'multiple'
+      : 'single') as StudyQuestion['type'],
+    text: q.contentNodes
+      ? htmlNodesToText(q.contentNodes)
+      : htmlToText(q.content ?? ''),
+    contentHtml: q.contentNodes ? undefined : q.content,
+    contentNodes: q.contentNodes,
+    contents: readLocalizedContent((q as Record<string, unknown>).contents),
+    options: options.map((o) => {
+      const raw = o.content ?? ''
+      return {
+        text: o.contentNodes
+          ? htmlNodesToText(o.contentNodes)
+          : htmlToText(raw),
+        html: !o.contentNodes && raw.includes('<') ? raw : undefined,
+        nodes: o.contentNodes,
+        contents: readLocalizedContent(
+          (o as Record<string, unknown>).contents
+        ),
+      }
+    }),
+    correctAnswers:
+      correctAnswers.length > 0
+        ? correctAnswers
+        : [Math.max(correctIndex, 0)],
+    explanation: rawExplanation,
+    explanations,
+    explanationNodes: q.explanationNodes,
+  }
 }
 
-function hasHtml(value: string) {
-  return value.includes('<')
+function placeholderQuestion(entry: ShardManifestEntry): StudyQuestion {
+  return {
+    id: entry.id,
+    type: entry.type === 'multiple' ? 'multiple' : 'single',
+    text: '',
+    options: [],
+    correctAnswers: [],
+    pending: true,
+  }
 }
 
 export function StudyMode({ examId }: StudyModeProps) {
@@ -227,6 +238,9 @@ export function StudyMode({ examId }: StudyModeProps) {
   const [settings, setSettings] = useState<StudySettings>({
     fontSize: 'normal',
   })
+  const [shardLoader, setShardLoader] =
+    useState<ExamShardLoader<StudyQuestion> | null>(null)
+  const loadedExamIdRef = useRef<string | null>(null)
 
   useEffect(() => {
     if (questions && questions[currentQuestionIndex] && userId) {
@@ -236,109 +250,55 @@ export function StudyMode({ examId }: StudyModeProps) {
     }
   }, [questions, currentQuestionIndex, userId, examId])
 
+  // Once cloud progress has arrived, its bookmarks win over local ones.
+  const remoteBookmarks = useRemoteBookmarks(user?.uid, examId)
   useEffect(() => {
-    if (!user?.uid) return
-    const unsub = RemoteProgress.subscribeExamProgress(
-      user.uid,
-      examId,
-      (exam) => {
-        const qId = questions?.[currentQuestionIndex]?.id
-        if (qId) {
-          setIsBookmarked(exam[qId]?.bookmarked || false)
-        }
-      }
-    )
-    return () => unsub()
-  }, [user?.uid, examId, questions, currentQuestionIndex])
+    const qId = questions?.[currentQuestionIndex]?.id
+    if (remoteBookmarks && qId) setIsBookmarked(remoteBookmarks.has(qId))
+  }, [remoteBookmarks, questions, currentQuestionIndex])
 
   useEffect(() => {
     let cancelled = false
 
     async function load() {
       setIsLoading(true)
-      setQuestions(fallbackQuestions)
-      setTitle(exam?.title ?? examId)
-      setCurrentQuestionIndex(0)
+      // Switching language keeps the current list and position until the
+      // variant for the new language arrives.
+      if (loadedExamIdRef.current !== examId) {
+        loadedExamIdRef.current = examId
+        setQuestions(fallbackQuestions)
+        setTitle(exam?.title ?? examId)
+        setCurrentQuestionIndex(0)
+      }
 
       try {
-        const response = await fetch(`/data/${examId}.json`)
-        if (!response.ok) {
-          throw new Error(`HTTP ${response.status}`)
+        const shards = await openExamShards(
+          examId,
+          mapExamQuestion,
+          placeholderQuestion,
+          language
+        )
+        if (!cancelled) setShardLoader(shards)
+        if (shards) {
+          await shards.ensure(0)
+          if (!cancelled && shards.size > 0) {
+            setQuestions(shards.snapshot())
+            setTitle(examId)
+          }
+          return
         }
 
-        const data = (await response.json()) as ExamFile
-        const mapped = (data.questions ?? [])
-          .slice()
-          .sort((a, b) => a.questionNumber - b.questionNumber)
-          .map((q) => {
-            const options = (q.options ?? []).slice().sort((a, b) => {
-              return a.label.localeCompare(b.label)
-            })
-            const correctIndex = options.findIndex(
-              (o) => o.label === q.correctAnswer
-            )
-            const correctLabels = parseCorrectLabels(q.correctAnswer)
-            const correctAnswers = correctLabels
-              .map((label) => options.findIndex((o) => o.label === label))
-              .filter((idx) => idx >= 0)
-
-            // Build explanations object for multi-language support
-            const explanations: { en?: string; zh?: string; ja?: string } = {}
-            const rawExplanation = (q.explanation ?? '').trim()
-
-            // Check if explanation contains Chinese characters - if so, it's the Chinese version
-            const hasChinese = /[\u4e00-\u9fff]/.test(rawExplanation)
-            if (hasChinese) {
-              explanations.zh = rawExplanation
-            } else if (rawExplanation) {
-              explanations.en = rawExplanation
-            }
-
-            // Check for explicit language-specific explanations in the data
-            const qAny = q as Record<string, unknown>
-            if (qAny.explanation_en && typeof qAny.explanation_en === 'string') {
-              explanations.en = (qAny.explanation_en as string).trim()
-            }
-            if (qAny.explanation_zh && typeof qAny.explanation_zh === 'string') {
-              explanations.zh = (qAny.explanation_zh as string).trim()
-            }
-            if (qAny.explanation_ja && typeof qAny.explanation_ja === 'string') {
-              explanations.ja = (qAny.explanation_ja as string).trim()
-            }
-            // Also support explanations object format
-            if (qAny.explanations && typeof qAny.explanations === 'object') {
-              const explObj = qAny.explanations as Record<string, string>
-              if (explObj.en) explanations.en = explObj.en.trim()
-              if (explObj.zh) explanations.zh = explObj.zh.trim()
-              if (explObj.ja) explanations.ja = explObj.ja.trim()
-            }
-
-            return {
-              id: q.id,
-              type: (q.type === 'multiple'
-                ? 'multiple'
-                : 'single') as StudyQuestion['type'],
-              text: htmlToText(q.content),
-              contentHtml: q.content,
-              contents: readLocalizedContent((q as Record<string, unknown>).contents),
-              options: options.map((o) => {
-                const raw = o.content ?? ''
-                return {
-                  text: htmlToText(raw),
-                  html: raw.includes('<') ? raw : undefined,
-                  contents: readLocalizedContent(
-                    (o as Record<string, unknown>).contents
-                  ),
-                }
-              }),
-              correctAnswers:
-                correctAnswers.length > 0
-                  ? correctAnswers
-                  : [Math.max(correctIndex, 0)],
-              explanation: rawExplanation,
-              explanations,
-            }
-          })
+        const data = await fetchExamData<ExamFile>(examId, language)
+        const mapped = timePhase(
+          'map',
+          examId,
+          () =>
+            (data.questions ?? [])
+              .slice()
+              .sort((a, b) => a.questionNumber - b.questionNumber)
+              .map(mapExamQuestion),
+          'study'
+        )
 
         if (!cancelled && mapped.length > 0) {
           setQuestions(mapped)
@@ -357,9 +317,34 @@ export function StudyMode({ examId }: StudyModeProps) {
     return () => {
       cancelled = true
     }
-  }, [exam, examId, fallbackQuestions])
+  }, [exam, examId, fallbackQuestions, language])
 
-  if (isLoading && !questions) {
+  // In sharded mode, fetch the shard around the current question (and
+  // prefetch the next one), then refresh the list once new content arrives.
+  const currentQuestionId = questions?.[currentQuestionIndex]?.id
+  useEffect(() => {
+    const shards = shardLoader
+    if (!shards || !currentQuestionId) return
+    let cancelled = false
+    shards
+      .ensure(shards.indexOf(currentQuestionId))
+      .then((changed) => {
+        if (changed && !cancelled) setQuestions(shards.snapshot())
+      })
+      .catch(() => undefined)
+    return () => {
+      cancelled = true
+    }
+  }, [shardLoader, currentQuestionId])
+
+  const currentQuestion = questions?.[currentQuestionIndex]
+  usePaintPhase(
+    examId,
+    'study',
+    !isLoading && !!currentQuestion && !currentQuestion.pending
+  )
+
+  if ((isLoading && !questions) || questions?.[currentQuestionIndex]?.pending) {
     return (
       <>
         <Header>
@@ -494,12 +479,15 @@ export function StudyMode({ examId }: StudyModeProps) {
                   </Badge>
                   <div className='mt-2'>
                     {(() => {
+                      if (question.contentNodes) {
+                        return <ExamHtml nodes={question.contentNodes} />
+                      }
                       const content = getLocalizedText(
                         question.contentHtml ?? question.text,
                         question.contents,
                         language
                       )
-                      return hasHtml(content) ? renderExamHtml(content) : <p>{content}</p>
+                      return hasHtml(content) ? <ExamHtml html={content} /> : <p>{content}</p>
                     })()}
                   </div>
                 </CardTitle>
@@ -547,13 +535,14 @@ export function StudyMode({ examId }: StudyModeProps) {
                           }
                         >
                           {(() => {
+                            if (option.nodes) return <ExamHtml nodes={option.nodes} />
                             const content = getLocalizedText(
                               option.html ?? option.text,
                               option.contents,
                               language
                             )
                             return hasHtml(content)
-                              ? renderExamHtml(content)
+                              ? <ExamHtml html={content} />
                               : content
                           })()}
                         </span>
@@ -570,9 +559,14 @@ export function StudyMode({ examId }: StudyModeProps) {
                   <div className='prose prose-sm max-w-none text-muted-foreground dark:prose-invert prose-p:my-1 prose-ul:my-1 prose-li:my-0.5 prose-strong:text-blue-700 dark:prose-strong:text-blue-300'>
                     {(() => {
                       const localizedExplanation = getLocalizedExplanation(question.explanations, language)
-                      return localizedExplanation
-                        ? renderExamHtml(localizedExplanation)
-                        : 'No explanation provided.'
+                      return localizedExplanation ? (
+                        <ExamHtml
+                          nodes={question.explanationNodes}
+                          html={localizedExplanation}
+                        />
+                      ) : (
+                        'No explanation provided.'
+                      )
                     })()}
                   </div>
                 </div>
@@ -0,0 +1,117 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+import {
+  clearSearchIndexCache,
+  loadSearchIndex,
+  searchQuestions,
+  tokenize,
+} from '../question-search'
+
+const mockFetch = vi.fn()
+vi.stubGlobal('fetch', mockFetch)
+
+// Docs: 0 "S3 Object Lock", 1 "S3 lifecycle", 2 "对象锁定"
+const indexFile = {
+  version: 1,
+  examId: 'EX',
+  language: 'en',
+  docs: {
+    questionNumber: [1, 2, 5],
+    snippet: ['S3 Object Lock', 'S3 lifecycle', '对象锁定'],
+  },
+  terms: {
+    s3: [0, 1],
+    object: [0],
+    lock: [0],
+    lifecycle: [1],
+    对象: [2],
+    象锁: [2],
+    锁定: [2],
+  },
+}
+
+beforeEach(() => {
+  clearSearchIndexCache()
+  mockFetch.mockReset()
+  mockFetch.mockResolvedValue({ ok: true, json: async () => indexFile })
+})
+
+describe('tokenize', () => {
+  it('lowercases words and drops stop words', () => {
+    expect(tokenize('The S3 Object-Lock question')).toEqual([
+      's3',
+      'object',
+      'lock',
+      'question',
+    ])
+  })
+
+  it('splits CJK runs into bigrams', () => {
+    expect(tokenize('对象锁定 S3')).toEqual(['对象', '象锁', '锁定', 's3'])
+    expect(tokenize('锁')).toEqual(['锁'])
+  })
+  // Shared with scripts/tests/test_search_index.py; both tokenizers must
+  // produce exactly these terms.
+  it.each([
+    ['The S3 Object-Lock question', ['s3', 'object', 'lock', 'question']],
+    ['对象锁定 S3', ['对象', '象锁', '锁定', 's3']],
+    ['锁', ['锁']],
+    ['S3バケットのACL', ['s3', 'バケ', 'ケッ', 'ット', 'トの', 'acl']],
+    [
+      'EC2インスタンス（東京）',
+      ['ec2', 'イン', 'ンス', 'スタ', 'タン', 'ンス', '東京'],
+    ],
+    ['Amazon RDS for MySQL 8.0', ['amazon', 'rds', 'mysql', '8', '0']],
+    ['Ünïcode café', ['n', 'code', 'caf']],
+  ])('matches the Python tokenizer on %s', (text, tokens) => {
+    expect(tokenize(text)).toEqual(tokens)
+  })
+})
+
+describe('searchQuestions', () => {
+  it('requires every term and matches the last one as a prefix', async () => {
+    const index = (await loadSearchIndex('EX', 'en'))!
+    const numbers = (query: string) =>
+      searchQuestions(index, query).map((h) => h.questionNumber)
+    expect(numbers('S3 obj')).toEqual([1])
+    expect(numbers('s3')).toEqual([1, 2])
+    expect(searchQuestions(index, 'obj ')).toEqual([])
+    expect(searchQuestions(index, 'the')).toEqual([])
+  })
+
+  it('finds CJK text from a partial phrase', async () => {
+    const index = (await loadSearchIndex('EX', 'zh'))!
+    const [hit] = searchQuestions(index, '象锁')
+    expect(hit).toEqual({
+      examId: 'EX',
+      index: 2,
+      questionNumber: 5,
+      snippet: '对象锁定',
+    })
+    expect(searchQuestions(index, '锁').map((h) => h.index)).toEqual([2])
+  })
+})
+
+describe('loadSearchIndex', () => {
+  it('fetches each index once', async () => {
+    await loadSearchIndex('EX', 'ja')
+    await loadSearchIndex('EX', 'ja')
+    expect(mockFetch).toHaveBeenCalledTimes(1)
+    expect(mockFetch).toHaveBeenCalledWith('/data/search/EX.ja.json')
+  })
+
+  it('falls back to English when the language has no index', async () => {
+    mockFetch.mockResolvedValueOnce({ ok: false, status: 404 })
+    expect(await loadSearchIndex('EX', 'ja')).not.toBeNull()
+    expect(mockFetch).toHaveBeenLastCalledWith('/data/search/EX.en.json')
+  })
+
+  it('returns null when nothing is published', async () => {
+    mockFetch.mockResolvedValue({
+      ok: true,
+      json: async () => {
+        throw new SyntaxError('Unexpected token <')
+      },
+    })
+    expect(await loadSearchIndex('EX', 'en')).toBeNull()
+  })
+})
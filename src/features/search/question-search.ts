@@ -0,0 +1,192 @@
+/**
+ * Full-text search over exam questions.
+ *
+ * `scripts/build-search-index.py` publishes one inverted index per exam and
+ * language at `/data/search/{examId}.{language}.json`. Indexes are fetched on
+ * first use and cached; a query is answered from the posting lists alone,
+ * without the bank. `tokenize` mirrors `scripts/qbank/search_index.py`:
+ * lowercase words for Latin text and character bigrams for CJK runs.
+ */
+import type { Language } from '@/context/language-provider'
+
+type SearchIndexFile = {
+  version: number
+  examId: string
+  language: string
+  docs: { questionNumber: number[]; snippet: string[] }
+  terms: Record<string, number[]>
+}
+
+export type QuestionSearchIndex = {
+  examId: string
+  questionNumber: number[]
+  snippet: string[]
+  postings: Map<string, number[]>
+  /** Terms in code-unit order, for prefix lookups. */
+  sortedTerms: string[]
+}
+
+export type QuestionSearchHit = {
+  examId: string
+  /** Position in the exam's question list (0-based). */
+  index: number
+  questionNumber: number
+  snippet: string
+}
+
+const CJK = '぀-ヿ㐀-䶿一-鿿豈-﫿'
+const TOKEN = new RegExp(`[${CJK}]+|[a-z0-9]+`, 'g')
+const CJK_RUN = new RegExp(`^[${CJK}]`)
+const STOP_WORDS = new Set(
+  'a an and are as at be by for from how in is it of on or that the this to which with will'.split(
+    ' '
+  )
+)
+// Cap on terms expanded from one prefix, so a single letter stays cheap.
+const MAX_PREFIX_TERMS = 64
+
+export function tokenize(text: string): string[] {
+  const tokens: string[] = []
+  for (const run of text.toLowerCase().match(TOKEN) ?? []) {
+    if (CJK_RUN.test(run)) {
+      if (run.length === 1) tokens.push(run)
+      for (let i = 0; i + 1 < run.length; i++) tokens.push(run.slice(i, i + 2))
+    } else if (!STOP_WORDS.has(run)) {
+      tokens.push(run)
+    }
+  }
+  return tokens
+}
+
+function decodeIndex(file: SearchIndexFile): QuestionSearchIndex {
+  const postings = new Map<string, number[]>()
+  for (const [term, gaps] of Object.entries(file.terms)) {
+    const docs = new Array<number>(gaps.length)
+    let doc = 0
+    gaps.forEach((gap, i) => {
+      doc += gap
+      docs[i] = doc
+    })
+    postings.set(term, docs)
+  }
+  return {
+    examId: file.examId,
+    questionNumber: file.docs.questionNumber,
+    snippet: file.docs.snippet,
+    postings,
+    sortedTerms: Array.from(postings.keys()).sort(),
+  }
+}
+
+function prefixPostings(index: QuestionSearchIndex, prefix: string) {
+  const terms = index.sortedTerms
+  let lo = 0
+  let hi = terms.length
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (terms[mid] < prefix) lo = mid + 1
+    else hi = mid
+  }
+  const docs = new Set<number>()
+  for (
+    let i = lo, n = 0;
+    i < terms.length && terms[i].startsWith(prefix) && n < MAX_PREFIX_TERMS;
+    i++, n++
+  ) {
+    for (const doc of index.postings.get(terms[i])!) docs.add(doc)
+  }
+  return docs
+}
+
+/**
+ * Questions containing every query term. The last term also matches as a
+ * prefix so results appear while typing. Hits are in question order.
+ */
+export function searchQuestions(
+  index: QuestionSearchIndex,
+  query: string,
+  limit = 20
+): QuestionSearchHit[] {
+  const tokens = tokenize(query)
+  if (tokens.length === 0) return []
+  // A trailing space means the last word is complete.
+  const prefixLast = !/\s$/.test(query)
+
+  let matches: Set<number> | null = null
+  for (const [i, token] of tokens.entries()) {
+    const docs: Set<number> =
+      i === tokens.length - 1 && prefixLast
+        ? prefixPostings(index, token)
+        : new Set(index.postings.get(token) ?? [])
+    matches = matches ? new Set([...matches].filter((d) => docs.has(d))) : docs
+    if (matches.size === 0) return []
+  }
+
+  return Array.from(matches ?? [])
+    .sort((a, b) => a - b)
+    .slice(0, limit)
+    .map((doc) => ({
+      examId: index.examId,
+      index: doc,
+      questionNumber: index.questionNumber[doc],
+      snippet: index.snippet[doc],
+    }))
+}
+
+function isSearchIndexFile(value: unknown): value is SearchIndexFile {
+  if (!value || typeof value !== 'object') return false
+  const v = value as Partial<SearchIndexFile>
+  return v.version === 1 && !!v.docs && !!v.terms
+}
+
+const cache = new Map<string, Promise<QuestionSearchIndex | null>>()
+let examIds: Promise<string[]> | null = null
+
+/** Ids of the published exams, read once from index.json. */
+export function loadSearchableExamIds(): Promise<string[]> {
+  examIds ??= (async () => {
+    try {
+      const res = await fetch('/data/index.json')
+      if (!res.ok) return []
+      const idx = (await res.json()) as { exams?: { id?: string }[] }
+      return (idx.exams ?? []).flatMap((e) => (e.id ? [e.id] : []))
+    } catch {
+      return []
+    }
+  })()
+  return examIds
+}
+
+async function fetchIndex(examId: string, language: string) {
+  try {
+    const res = await fetch(`/data/search/${examId}.${language}.json`)
+    if (!res.ok) return null
+    const file: unknown = await res.json()
+    return isSearchIndexFile(file) ? decodeIndex(file) : null
+  } catch {
+    return null
+  }
+}
+
+/** The index for an exam in `language`, falling back to English; null if none is published. */
+export function loadSearchIndex(
+  examId: string,
+  language: Language
+): Promise<QuestionSearchIndex | null> {
+  const key = `${examId}.${language}`
+  let pending = cache.get(key)
+  if (!pending) {
+    pending = fetchIndex(examId, language).then(
+      (index) =>
+        index ?? (language === 'en' ? null : fetchIndex(examId, 'en'))
+    )
+    cache.set(key, pending)
+  }
+  return pending
+}
+
+/** Forget loaded indexes (used by tests). */
+export function clearSearchIndexCache() {
+  cache.clear()
+  examIds = null
+}
@@ -0,0 +1,49 @@
+import { useEffect, useMemo, useState } from 'react'
+import { useLanguage } from '@/context/language-provider'
+import {
+  loadSearchableExamIds,
+  loadSearchIndex,
+  searchQuestions,
+  type QuestionSearchHit,
+  type QuestionSearchIndex,
+} from './question-search'
+
+const MIN_QUERY_LENGTH = 2
+const HITS_PER_EXAM = 8
+
+/**
+ * Search every published exam for `query` in the UI language. Indexes are
+ * only fetched once a query is long enough, then reused for later queries.
+ */
+export function useQuestionSearch(query: string): QuestionSearchHit[] {
+  const { language } = useLanguage()
+  const [indexes, setIndexes] = useState<QuestionSearchIndex[]>([])
+  const active = query.trim().length >= MIN_QUERY_LENGTH
+
+  useEffect(() => {
+    if (!active) return
+    let cancelled = false
+    void (async () => {
+      const ids = await loadSearchableExamIds()
+      const loaded = await Promise.all(
+        ids.map((id) => loadSearchIndex(id, language))
+      )
+      if (!cancelled) {
+        setIndexes(loaded.filter((i): i is QuestionSearchIndex => i !== null))
+      }
+    })()
+    return () => {
+      cancelled = true
+    }
+  }, [active, language])
+
+  return useMemo(
+    () =>
+      active
+        ? indexes.flatMap((index) =>
+            searchQuestions(index, query, HITS_PER_EXAM)
+          )
+        : [],
+    [active, indexes, query]
+  )
+}
@@ -23,6 +23,9 @@ describe('useExams', () => {
         description: 'A real exam',
         questionCount: 50,
         updatedAt: '2026-04-25',
+        bytes: 271133,
+        contentHash: '9c6b23ba51fc7c08',
+        variantBytes: { ja: 198004 },
       },
       {
         id: 'real-exam-2',
@@ -65,6 +68,10 @@ describe('useExams', () => {
     expect(result.current.exams).toHaveLength(3)
     expect(result.current.exams[0].id).toBe('real-exam-1')
     expect(result.current.exams[0].lastUpdated).toBe('2026-04-25')
+    expect(result.current.exams[0].sizeBytes).toBe(271133)
+    expect(result.current.exams[0].variantBytes).toEqual({ ja: 198004 })
+    expect(result.current.exams[1].sizeBytes).toBeUndefined()
+    expect(result.current.exams[1].variantBytes).toBeUndefined()
     expect(result.current.exams[1].id).toBe('real-exam-2')
     expect(result.current.exams[2].id).toBe('mock-exam-1')
   })
@@ -0,0 +1,73 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+import { renderHook, act } from '@testing-library/react'
+import type { QuestionProgress } from '@/services/progress-service'
+import {
+  subscribeExamProgressChanges,
+  type ExamProgressHandlers,
+} from '@/services/firebase-progress'
+import { useRemoteBookmarks } from '../use-remote-bookmarks'
+
+const unsubscribe = vi.hoisted(() => vi.fn())
+vi.mock('@/services/firebase-progress', () => ({
+  subscribeExamProgressChanges: vi.fn(() => unsubscribe),
+}))
+
+const handlers = () =>
+  vi.mocked(subscribeExamProgressChanges).mock.calls.at(-1)![2] as
+    ExamProgressHandlers
+
+const answered = (bookmarked?: boolean): QuestionProgress => ({
+  status: 'correct',
+  lastAnswered: 1,
+  bookmarked,
+})
+
+beforeEach(() => {
+  vi.mocked(subscribeExamProgressChanges).mockClear()
+  unsubscribe.mockClear()
+})
+
+describe('useRemoteBookmarks', () => {
+  it('does not subscribe while signed out', () => {
+    const { result } = renderHook(() => useRemoteBookmarks(undefined, 'e1'))
+    expect(result.current).toBeNull()
+    expect(subscribeExamProgressChanges).not.toHaveBeenCalled()
+  })
+
+  it('returns the bookmarked questions once cloud progress arrives', () => {
+    const { result } = renderHook(() => useRemoteBookmarks('u1', 'e1'))
+    expect(result.current).toBeNull()
+
+    act(() => handlers().onHydrate({ q1: answered(true), q2: answered() }))
+    expect(Array.from(result.current!)).toEqual(['q1'])
+  })
+
+  it('keeps the same set when a change leaves bookmarks alone', () => {
+    const { result } = renderHook(() => useRemoteBookmarks('u1', 'e1'))
+    act(() => handlers().onHydrate({ q1: answered(true) }))
+    const hydrated = result.current
+
+    act(() => handlers().onChange({ q2: answered(false) }, []))
+    expect(result.current).toBe(hydrated)
+
+    act(() => handlers().onChange({ q2: answered(true) }, ['q1']))
+    expect(Array.from(result.current!)).toEqual(['q2'])
+  })
+
+  it('subscribes once per user and exam', () => {
+    const { rerender } = renderHook(
+      ({ examId }) => useRemoteBookmarks('u1', examId),
+      { initialProps: { examId: 'e1' } }
+    )
+    rerender({ examId: 'e1' })
+    expect(subscribeExamProgressChanges).toHaveBeenCalledTimes(1)
+
+    rerender({ examId: 'e2' })
+    expect(unsubscribe).toHaveBeenCalledTimes(1)
+    expect(subscribeExamProgressChanges).toHaveBeenLastCalledWith(
+      'u1',
+      'e2',
+      expect.any(Object)
+    )
+  })
+})
@@ -8,6 +8,10 @@ export type Exam = {
   questionCount?: number
   lastStudied?: string
   lastUpdated?: string
+  /** Size of the full bank file, from index.json. */
+  sizeBytes?: number
+  /** Size of each published language variant, stamped at publish time. */
+  variantBytes?: Record<string, number>
 }
 
 type IndexFile = {
@@ -17,6 +21,8 @@ type IndexFile = {
     description?: string
     questionCount?: number
     updatedAt?: string
+    bytes?: number
+    variantBytes?: Record<string, number>
   }>
 }
 
@@ -55,6 +61,11 @@ export function useExams() {
                 ? entry.updatedAt.trim()
                 : undefined,
             lastStudied: undefined,
+            sizeBytes: typeof entry.bytes === 'number' ? entry.bytes : undefined,
+            variantBytes:
+              entry.variantBytes && typeof entry.variantBytes === 'object'
+                ? entry.variantBytes
+                : undefined,
           })
         }
       /* istanbul ignore next -- network error handling */
@@ -0,0 +1,32 @@
+import { useEffect, useRef } from 'react'
+import { perfNow, recordPhase, type PerfMode } from '@/lib/perf'
+
+/**
+ * Record the `paint` phase (see lib/perf.ts) once per exam: from when the
+ * page starts showing `examId` until the frame after `ready` first turns
+ * true, i.e. a question with its content is on screen.
+ */
+export function usePaintPhase(examId: string, mode: PerfMode, ready: boolean) {
+  const startRef = useRef(0)
+  const paintedRef = useRef<string | null>(null)
+
+  useEffect(() => {
+    startRef.current = perfNow()
+  }, [examId])
+
+  useEffect(() => {
+    if (!ready || paintedRef.current === examId) return
+    let timer: ReturnType<typeof setTimeout> | undefined
+    // The task after the next animation frame runs once that frame painted.
+    const frame = requestAnimationFrame(() => {
+      timer = setTimeout(() => {
+        paintedRef.current = examId
+        recordPhase('paint', examId, startRef.current, mode)
+      })
+    })
+    return () => {
+      cancelAnimationFrame(frame)
+      clearTimeout(timer)
+    }
+  }, [examId, mode, ready])
+}
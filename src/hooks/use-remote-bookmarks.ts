@@ -0,0 +1,51 @@
+import { useEffect, useState } from 'react'
+import { subscribeExamProgressChanges } from '@/services/firebase-progress'
+import type { ExamProgress } from '@/services/progress-service'
+
+function sameSet(a: ReadonlySet<string>, b: ReadonlySet<string>) {
+  return a.size === b.size && Array.from(a).every((id) => b.has(id))
+}
+
+/**
+ * The questions of `examId` bookmarked in the signed-in user's cloud
+ * progress, or null until it has arrived (and when signed out). Subscribes
+ * once per user and exam, question by question, and only produces a new set
+ * when a bookmark actually changes, so answers synced from another device
+ * don't re-render the page.
+ */
+export function useRemoteBookmarks(
+  userId: string | undefined,
+  examId: string
+): ReadonlySet<string> | null {
+  const [bookmarks, setBookmarks] = useState<ReadonlySet<string> | null>(null)
+
+  useEffect(() => {
+    setBookmarks(null)
+    if (!userId) return
+    let current = new Set<string>()
+    const publish = (next: Set<string>) => {
+      if (sameSet(current, next)) return
+      current = next
+      setBookmarks(next)
+    }
+    return subscribeExamProgressChanges(userId, examId, {
+      onHydrate(progress: ExamProgress) {
+        current = new Set(
+          Object.keys(progress).filter((qId) => progress[qId]?.bookmarked)
+        )
+        setBookmarks(current)
+      },
+      onChange(changes, removed) {
+        const next = new Set(current)
+        Object.entries(changes).forEach(([qId, p]) => {
+          if (p?.bookmarked) next.add(qId)
+          else next.delete(qId)
+        })
+        removed.forEach((qId) => next.delete(qId))
+        publish(next)
+      },
+    })
+  }, [userId, examId])
+
+  return bookmarks
+}
@@ -0,0 +1,127 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest'
+import { createPerfReporter, recordPhase, timePhase } from '../perf'
+
+const measurement = (ms: number) => ({
+  examId: 'SAA-C03',
+  phase: 'fetch' as const,
+  ms,
+  at: 0,
+})
+
+describe('createPerfReporter', () => {
+  beforeEach(() => {
+    vi.useFakeTimers()
+  })
+
+  afterEach(() => {
+    vi.useRealTimers()
+  })
+
+  it('sends a full batch at once', () => {
+    const send = vi.fn()
+    const reporter = createPerfReporter({
+      endpoint: '/perf',
+      send,
+      batchSize: 2,
+    })
+    reporter.add(measurement(1))
+    expect(send).not.toHaveBeenCalled()
+    reporter.add(measurement(2))
+    expect(send).toHaveBeenCalledTimes(1)
+    const [endpoint, body] = send.mock.calls[0]
+    expect(endpoint).toBe('/perf')
+    expect(JSON.parse(body)).toEqual({
+      version: 1,
+      measurements: [measurement(1), measurement(2)],
+    })
+  })
+
+  it('sends a partial batch after the flush delay', () => {
+    const send = vi.fn()
+    const reporter = createPerfReporter({
+      endpoint: '/perf',
+      send,
+      flushDelayMs: 1000,
+    })
+    reporter.add(measurement(1))
+    vi.advanceTimersByTime(999)
+    expect(send).not.toHaveBeenCalled()
+    vi.advanceTimersByTime(1)
+    expect(send).toHaveBeenCalledTimes(1)
+    expect(JSON.parse(send.mock.calls[0][1]).measurements).toHaveLength(1)
+  })
+
+  it('flushes when the page is hidden and skips empty batches', () => {
+    const send = vi.fn()
+    const reporter = createPerfReporter({ endpoint: '/perf', send })
+    reporter.flush()
+    expect(send).not.toHaveBeenCalled()
+    reporter.add(measurement(1))
+    window.dispatchEvent(new Event('pagehide'))
+    expect(send).toHaveBeenCalledTimes(1)
+    vi.runAllTimers()
+    expect(send).toHaveBeenCalledTimes(1)
+  })
+
+  it('drops a batch whose send throws', () => {
+    const send = vi.fn(() => {
+      throw new Error('offline')
+    })
+    const reporter = createPerfReporter({ endpoint: '/perf', send })
+    reporter.add(measurement(1))
+    expect(() => reporter.flush()).not.toThrow()
+    reporter.flush()
+    expect(send).toHaveBeenCalledTimes(1)
+  })
+})
+
+describe('recordPhase', () => {
+  afterEach(() => {
+    vi.restoreAllMocks()
+  })
+
+  it('adds a User Timing measure with the exam as detail', () => {
+    const measure = vi.spyOn(performance, 'measure')
+    const start = performance.now()
+    recordPhase('save-local', 'SAA-C03', start, 'practice')
+    expect(measure).toHaveBeenCalledWith(
+      'exam:save-local',
+      expect.objectContaining({
+        start,
+        detail: { examId: 'SAA-C03', mode: 'practice' },
+      })
+    )
+  })
+
+  it('ignores browsers without User Timing', () => {
+    vi.spyOn(performance, 'measure').mockImplementation(() => {
+      throw new TypeError('unsupported')
+    })
+    expect(() => recordPhase('paint', 'SAA-C03', 0)).not.toThrow()
+  })
+})
+
+describe('timePhase', () => {
+  afterEach(() => {
+    vi.restoreAllMocks()
+  })
+
+  it('returns the result and records the phase', () => {
+    const measure = vi.spyOn(performance, 'measure')
+    expect(timePhase('map', 'SAA-C03', () => 42, 'study')).toBe(42)
+    expect(measure).toHaveBeenCalledWith(
+      'exam:map',
+      expect.objectContaining({ detail: { examId: 'SAA-C03', mode: 'study' } })
+    )
+  })
+
+  it('records the phase when the work throws', () => {
+    const measure = vi.spyOn(performance, 'measure')
+    expect(() =>
+      timePhase('map', 'SAA-C03', () => {
+        throw new Error('bad bank')
+      })
+    ).toThrow('bad bank')
+    expect(measure).toHaveBeenCalledWith('exam:map', expect.anything())
+  })
+})
@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, afterEach } from 'vitest'
-import { cn, sleep, getPageNumbers } from '../utils'
+import { cn, sleep, formatBytes, getPageNumbers } from '../utils'
 
 describe('utils', () => {
   describe('cn', () => {
@@ -110,4 +110,12 @@ describe('utils', () => {
       expect(getPageNumbers(50, 100)).toEqual([1, '...', 49, 50, 51, '...', 100])
     })
   })
+
+  describe('formatBytes', () => {
+    it('should pick a unit by magnitude', () => {
+      expect(formatBytes(512)).toBe('512 B')
+      expect(formatBytes(271133)).toBe('265 KB')
+      expect(formatBytes(3918262)).toBe('3.7 MB')
+    })
+  })
 })
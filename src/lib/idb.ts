@@ -0,0 +1,74 @@
+/**
+ * Promise helpers over IndexedDB and the app's database.
+ *
+ * Every store lives in one database; `upgrade` creates the stores added by
+ * each schema version, so a new store means bumping DB_VERSION and adding a
+ * step. Callers must handle `openAppDatabase()` resolving to null: IndexedDB
+ * is missing in some private-browsing modes and in tests.
+ */
+
+const DB_NAME = 'examtopics'
+const DB_VERSION = 2
+
+export const PROGRESS_STORE = 'progress'
+export const CHAT_STORE = 'chats'
+export const CHAT_MESSAGE_STORE = 'chatMessages'
+
+function upgrade(db: IDBDatabase, oldVersion: number) {
+  if (oldVersion < 1) {
+    // One record per (userId, examId, questionId).
+    db.createObjectStore(PROGRESS_STORE, {
+      keyPath: ['userId', 'examId', 'questionId'],
+    })
+  }
+  if (oldVersion < 2) {
+    // One meta record per AI chat thread, one record per message.
+    db.createObjectStore(CHAT_STORE, {
+      keyPath: ['userId', 'examId', 'questionId'],
+    })
+    db.createObjectStore(CHAT_MESSAGE_STORE, {
+      keyPath: ['userId', 'examId', 'questionId', 'seq'],
+    })
+  }
+}
+
+export function requestResult<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+}
+
+export function transactionDone(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve()
+    tx.onerror = () => reject(tx.error)
+    tx.onabort = () => reject(tx.error ?? new Error('Transaction aborted'))
+  })
+}
+
+let opening: Promise<IDBDatabase | null> | null = null
+
+export function openAppDatabase(): Promise<IDBDatabase | null> {
+  opening ??= new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') {
+      resolve(null)
+      return
+    }
+    try {
+      const request = indexedDB.open(DB_NAME, DB_VERSION)
+      request.onupgradeneeded = (event) =>
+        upgrade(request.result, event.oldVersion)
+      request.onsuccess = () => {
+        // Let a newer tab upgrade the schema instead of being blocked by us.
+        request.result.onversionchange = () => request.result.close()
+        resolve(request.result)
+      }
+      request.onerror = () => resolve(null)
+      request.onblocked = () => resolve(null)
+    } catch {
+      resolve(null)
+    }
+  })
+  return opening
+}
@@ -0,0 +1,170 @@
+/**
+ * Performance marks for loading exams and answering questions.
+ *
+ * Each phase is recorded as a `performance.measure` named `exam:{phase}`
+ * with `{ examId, mode }` as its detail, so it shows up in the browser's
+ * performance panel:
+ *
+ *   fetch        request sent until the response headers arrive
+ *   parse        reading and parsing the JSON body (`res.json()`)
+ *   map          sorting and mapping bank questions for a page
+ *   paint        page mount until the first question is on screen
+ *   save-local   writing an answer to the local progress store
+ *   sync-remote  committing a batch of queued answer writes to Firebase; its
+ *                size is the bytes the batch wrote to the exam
+ *   sync-receive a progress subscription, from subscribing until it ends or
+ *                the page is hidden; its size is the bytes it received
+ *
+ * Reporting is opt-in twice over: the build sets `VITE_PERF_ENDPOINT`, and a
+ * user turns it on by opening any page with `?perf=1` (remembered; `?perf=0`
+ * turns it off). Measurements are then batched and POSTed to the endpoint,
+ * where `scripts/perf-collector.py` aggregates them.
+ */
+
+export type PerfPhase =
+  | 'fetch'
+  | 'parse'
+  | 'map'
+  | 'paint'
+  | 'save-local'
+  | 'sync-remote'
+  | 'sync-receive'
+
+export type PerfMode = 'practice' | 'study' | 'exam'
+
+export type PerfMeasurement = {
+  examId: string
+  phase: PerfPhase
+  mode?: PerfMode
+  ms: number
+  /** What the phase moved, for phases that say so (see above). */
+  size?: number
+  /** Epoch milliseconds when the phase ended. */
+  at: number
+}
+
+export type PerfReporterOptions = {
+  endpoint: string
+  /** Defaults to navigator.sendBeacon, falling back to a keepalive fetch. */
+  send?: (endpoint: string, body: string) => void
+  batchSize?: number
+  flushDelayMs?: number
+}
+
+export type PerfReporter = {
+  add: (measurement: PerfMeasurement) => void
+  flush: () => void
+}
+
+const OPT_IN_KEY = 'examtopics_perf_report'
+
+function sendBatch(endpoint: string, body: string) {
+  // text/plain keeps the request simple, so no CORS preflight is needed.
+  const blob = new Blob([body], { type: 'text/plain' })
+  if (navigator.sendBeacon?.(endpoint, blob)) return
+  void fetch(endpoint, { method: 'POST', body, keepalive: true }).catch(
+    () => undefined
+  )
+}
+
+export function createPerfReporter({
+  endpoint,
+  send = sendBatch,
+  batchSize = 20,
+  flushDelayMs = 10000,
+}: PerfReporterOptions): PerfReporter {
+  let queue: PerfMeasurement[] = []
+  let timer: ReturnType<typeof setTimeout> | undefined
+
+  function flush() {
+    clearTimeout(timer)
+    timer = undefined
+    if (queue.length === 0) return
+    const measurements = queue
+    queue = []
+    try {
+      send(endpoint, JSON.stringify({ version: 1, measurements }))
+    } catch {
+      // Reporting is best-effort; drop the batch.
+    }
+  }
+
+  if (typeof window !== 'undefined') {
+    window.addEventListener('pagehide', flush)
+    document.addEventListener('visibilitychange', () => {
+      if (document.visibilityState === 'hidden') flush()
+    })
+  }
+
+  return {
+    add(measurement) {
+      queue.push(measurement)
+      if (queue.length >= batchSize) flush()
+      else timer ??= setTimeout(flush, flushDelayMs)
+    },
+    flush,
+  }
+}
+
+function optedIn() {
+  try {
+    const param = new URLSearchParams(window.location.search).get('perf')
+    if (param === '1') localStorage.setItem(OPT_IN_KEY, '1')
+    if (param === '0') localStorage.removeItem(OPT_IN_KEY)
+    return localStorage.getItem(OPT_IN_KEY) === '1'
+  } catch {
+    return false
+  }
+}
+
+const endpoint = import.meta.env.VITE_PERF_ENDPOINT as string | undefined
+/* istanbul ignore next -- reporting is configured at build time */
+const reporter =
+  endpoint && typeof window !== 'undefined' && optedIn()
+    ? createPerfReporter({ endpoint })
+    : null
+
+export const perfNow = () => performance.now()
+
+/** Record `phase` as having run from `start` (a perfNow() value) until now. */
+export function recordPhase(
+  phase: PerfPhase,
+  examId: string,
+  start: number,
+  mode?: PerfMode,
+  size?: number
+) {
+  const end = perfNow()
+  try {
+    performance.measure(`exam:${phase}`, {
+      start,
+      end,
+      detail: size === undefined ? { examId, mode } : { examId, mode, size },
+    })
+  } catch {
+    // No User Timing support (or a start from another time origin).
+  }
+  reporter?.add({
+    examId,
+    phase,
+    mode,
+    ms: end - start,
+    size,
+    at: Date.now(),
+  })
+}
+
+/** Run `run` and record how long it took as `phase`. */
+export function timePhase<T>(
+  phase: PerfPhase,
+  examId: string,
+  run: () => T,
+  mode?: PerfMode
+): T {
+  const start = perfNow()
+  try {
+    return run()
+  } finally {
+    recordPhase(phase, examId, start, mode)
+  }
+}
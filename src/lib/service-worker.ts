@@ -0,0 +1,12 @@
+/**
+ * Register public/sw.js, the offline cache for exam data. Production only:
+ * in development it would serve stale data files across edits.
+ */
+export function registerServiceWorker() {
+  /* istanbul ignore next -- production builds only */
+  if (!import.meta.env.PROD || !('serviceWorker' in navigator)) return
+  /* istanbul ignore next -- production builds only */
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register('/sw.js').catch(() => undefined)
+  })
+}
@@ -10,6 +10,8 @@ import { RouterProvider, createRouter } from '@tanstack/react-router'
 import { toast } from 'sonner'
 import { useAuthStore } from '@/stores/auth-store'
 import { handleServerError } from '@/lib/handle-server-error'
+import { registerServiceWorker } from '@/lib/service-worker'
+import { initProgressStore } from '@/services/progress-service'
 import { DirectionProvider } from './context/direction-provider'
 import { FontProvider } from './context/font-provider'
 import { LanguageProvider } from './context/language-provider'
@@ -88,23 +90,28 @@ declare module '@tanstack/react-router' {
   }
 }
 
-// Render the app
+registerServiceWorker()
+
+// Render the app once progress has been moved to IndexedDB (or fell back to
+// localStorage), so the first synchronous read sees the right store.
 const rootElement = document.getElementById('root')!
 if (!rootElement.innerHTML) {
-  const root = ReactDOM.createRoot(rootElement)
-  root.render(
-    <StrictMode>
-      <QueryClientProvider client={queryClient}>
-        <ThemeProvider>
-          <FontProvider>
-            <DirectionProvider>
-              <LanguageProvider>
-                <RouterProvider router={router} />
-              </LanguageProvider>
-            </DirectionProvider>
-          </FontProvider>
-        </ThemeProvider>
-      </QueryClientProvider>
-    </StrictMode>
-  )
+  void initProgressStore().finally(() => {
+    const root = ReactDOM.createRoot(rootElement)
+    root.render(
+      <StrictMode>
+        <QueryClientProvider client={queryClient}>
+          <ThemeProvider>
+            <FontProvider>
+              <DirectionProvider>
+                <LanguageProvider>
+                  <RouterProvider router={router} />
+                </LanguageProvider>
+              </DirectionProvider>
+            </FontProvider>
+          </ThemeProvider>
+        </QueryClientProvider>
+      </StrictMode>
+    )
+  })
 }
@@ -1,4 +1,16 @@
-import { describe, it, expect, beforeEach } from 'vitest'
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+
+// Commits against the fake database below resolve, or reject when `fail` is
+// set on it.
+vi.mock('@/lib/idb', () => ({
+  CHAT_STORE: 'chats',
+  CHAT_MESSAGE_STORE: 'chatMessages',
+  openAppDatabase: async () => null,
+  requestResult: async (request: { result: unknown }) => request.result,
+  transactionDone: async (tx: { fail: boolean }) => {
+    if (tx.fail) throw new Error('QuotaExceededError')
+  },
+}))
 
 const store = new Map<string, string>()
 const localStorageMock: Storage = {
@@ -16,7 +28,7 @@ Object.defineProperty(globalThis, 'localStorage', {
   writable: true,
 })
 
-const { AiChatHistoryService } = await import('../ai-chat-history')
+const { createChatHistory } = await import('../ai-chat-history')
 
 const U = 'user-1'
 const E = 'exam-a'
@@ -25,92 +37,163 @@ const msgs = (tag: string) => [
   { id: 'u1', role: 'user' as const, content: `ask ${tag}` },
   { id: 'a1', role: 'assistant' as const, content: `answer ${tag}` },
 ]
+// Two single-character-tag threads fit, a third does not.
+const SMALL = 100
+
+// No IndexedDB in jsdom: history falls back to memory.
+const history = (maxBytes?: number) =>
+  createChatHistory(async () => null, maxBytes)
+
+const save = (
+  h: ReturnType<typeof history>,
+  questionId: string,
+  tag: string,
+  now: number
+) => msgs(tag).forEach((m) => h.append(U, E, questionId, m, now))
+
+const storeLegacy = () =>
+  store.set(
+    'examtopics_ai_chat',
+    JSON.stringify({
+      [U]: { [E]: { [Q]: { messages: msgs('old'), updatedAt: 5 } } },
+    })
+  )
+
+// An empty database whose transactions record puts.
+const fakeDb = (fail = false) => {
+  const db = {
+    fail,
+    puts: [] as unknown[],
+    handle: undefined as unknown as IDBDatabase,
+  }
+  db.handle = {
+    transaction: () => ({
+      fail: db.fail,
+      objectStore: () => ({
+        getAll: () => ({ result: [] }),
+        put: (value: unknown) => db.puts.push(value),
+        delete: () => undefined,
+      }),
+    }),
+  } as unknown as IDBDatabase
+  return db
+}
 
 beforeEach(() => {
   store.clear()
 })
 
-describe('AiChatHistoryService', () => {
-  it('returns an empty array when nothing is stored', () => {
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual([])
+describe('createChatHistory', () => {
+  it('returns an empty array when nothing is stored', async () => {
+    expect(await history().get(U, E, Q)).toEqual([])
   })
 
-  it('round-trips saved messages', () => {
-    AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual(msgs('x'))
+  it('round-trips appended messages in order', async () => {
+    const h = history()
+    save(h, Q, 'x', 1)
+    expect(await h.get(U, E, Q)).toEqual(msgs('x'))
   })
 
-  it('scopes storage by user, exam, and question', () => {
-    AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-    expect(AiChatHistoryService.get('other-user', E, Q)).toEqual([])
-    expect(AiChatHistoryService.get(U, 'other-exam', Q)).toEqual([])
-    expect(AiChatHistoryService.get(U, E, 'other-q')).toEqual([])
+  it('scopes storage by user, exam, and question', async () => {
+    const h = history()
+    save(h, Q, 'x', 1)
+    expect(await h.get('other-user', E, Q)).toEqual([])
+    expect(await h.get(U, 'other-exam', Q)).toEqual([])
+    expect(await h.get(U, E, 'other-q')).toEqual([])
   })
 
-  it('overwrites an existing thread on re-save', () => {
-    AiChatHistoryService.save(U, E, Q, msgs('one'), 1)
-    AiChatHistoryService.save(U, E, Q, msgs('two'), 2)
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual(msgs('two'))
+  it('replaces the last message while a reply streams in', async () => {
+    const h = history()
+    h.append(U, E, Q, { id: 'u1', role: 'user', content: 'ask' }, 1)
+    for (const content of ['a', 'an', 'ans']) {
+      h.append(U, E, Q, { id: 'a1', role: 'assistant', content }, 1)
+    }
+    expect(await h.get(U, E, Q)).toEqual([
+      { id: 'u1', role: 'user', content: 'ask' },
+      { id: 'a1', role: 'assistant', content: 'ans' },
+    ])
   })
 
-  it('treats an empty save as a clear', () => {
-    AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-    AiChatHistoryService.save(U, E, Q, [], 2)
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual([])
+  it('clear() removes a stored thread', async () => {
+    const h = history()
+    save(h, Q, 'x', 1)
+    await h.flush()
+    h.clear(U, E, Q)
+    expect(await h.get(U, E, Q)).toEqual([])
   })
 
-  it('clear() removes a stored thread', () => {
-    AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-    AiChatHistoryService.clear(U, E, Q)
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual([])
+  it('evicts least recently used threads over the byte budget', async () => {
+    const h = history(SMALL)
+    save(h, 'q-1', '1', 1)
+    save(h, 'q-2', '2', 2)
+    save(h, 'q-3', '3', 3)
+    expect(await h.get(U, E, 'q-1')).toEqual([])
+    expect(await h.get(U, E, 'q-2')).toEqual(msgs('2'))
+    expect(await h.get(U, E, 'q-3')).toEqual(msgs('3'))
   })
 
-  it('caps stored questions per user, evicting the least-recently-updated', () => {
-    for (let i = 1; i <= 51; i++) {
-      AiChatHistoryService.save(U, E, `q-${i}`, msgs(String(i)), i)
-    }
-    expect(AiChatHistoryService.get(U, E, 'q-1')).toEqual([]) // oldest evicted
-    expect(AiChatHistoryService.get(U, E, 'q-2')).toEqual(msgs('2'))
-    expect(AiChatHistoryService.get(U, E, 'q-51')).toEqual(msgs('51'))
+  it('counts reads as use when choosing what to evict', async () => {
+    const h = history(SMALL)
+    save(h, 'q-1', '1', 1)
+    save(h, 'q-2', '2', 2)
+    expect(await h.get(U, E, 'q-1')).toEqual(msgs('1')) // touch q-1
+    save(h, 'q-3', '3', Date.now() + 1)
+    expect(await h.get(U, E, 'q-2')).toEqual([])
+    expect(await h.get(U, E, 'q-1')).toEqual(msgs('1'))
   })
 
-  it('cap uses recency (updatedAt), not insertion order', () => {
-    for (let i = 1; i <= 50; i++) {
-      AiChatHistoryService.save(U, E, `q-${i}`, msgs(String(i)), i)
-    }
-    AiChatHistoryService.save(U, E, 'q-1', msgs('1-updated'), 100) // touch q-1
-    AiChatHistoryService.save(U, E, 'q-51', msgs('51'), 101) // evicts now-oldest q-2
-    expect(AiChatHistoryService.get(U, E, 'q-2')).toEqual([])
-    expect(AiChatHistoryService.get(U, E, 'q-1')).toEqual(msgs('1-updated'))
-    expect(AiChatHistoryService.get(U, E, 'q-51')).toEqual(msgs('51'))
+  it('never evicts the thread being written', async () => {
+    const h = history(10)
+    save(h, Q, 'x', 1)
+    expect(await h.get(U, E, Q)).toEqual(msgs('x'))
   })
 
-  it('caps across exams for the same user', () => {
-    for (let i = 1; i <= 51; i++) {
-      const exam = i % 2 === 0 ? 'exam-a' : 'exam-b'
-      AiChatHistoryService.save(U, exam, `q-${i}`, msgs(String(i)), i)
-    }
-    expect(AiChatHistoryService.get(U, 'exam-b', 'q-1')).toEqual([]) // global oldest
+  it('imports threads saved by the localStorage store', async () => {
+    storeLegacy()
+    const h = history()
+    expect(await h.get(U, E, Q)).toEqual(msgs('old'))
+    // Held in memory only, so the old store is kept for the next session.
+    expect(store.has('examtopics_ai_chat')).toBe(true)
   })
 
-  it('recovers from malformed stored JSON', () => {
-    store.set('examtopics_ai_chat', 'not json{')
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual([])
-    AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-    expect(AiChatHistoryService.get(U, E, Q)).toEqual(msgs('x'))
+  it('removes the legacy key once the import is committed', async () => {
+    storeLegacy()
+    const db = fakeDb()
+    const h = createChatHistory(async () => db.handle)
+    await h.flush()
+    expect(db.puts).toHaveLength(3)
+    expect(store.has('examtopics_ai_chat')).toBe(false)
   })
 
-  it('does not throw when persistence fails (e.g. over quota)', () => {
-    const original = localStorageMock.setItem
-    localStorageMock.setItem = () => {
-      throw new Error('QuotaExceededError')
-    }
-    try {
-      expect(() =>
-        AiChatHistoryService.save(U, E, Q, msgs('x'), 1)
-      ).not.toThrow()
-    } finally {
-      localStorageMock.setItem = original
-    }
+  it('keeps the legacy key when the import fails to commit', async () => {
+    storeLegacy()
+    const db = fakeDb(true)
+    const h = createChatHistory(async () => db.handle)
+    await h.flush()
+    expect(store.has('examtopics_ai_chat')).toBe(true)
+
+    // A later successful write does not carry the imported threads.
+    db.fail = false
+    h.append(U, E, 'q-2', msgs('new')[0], 6)
+    await h.flush()
+    expect(store.has('examtopics_ai_chat')).toBe(true)
+  })
+
+  it('keeps the legacy key when the database fails to open', async () => {
+    storeLegacy()
+    const h = createChatHistory(() =>
+      Promise.reject(new Error('InvalidStateError'))
+    )
+    expect(await h.get(U, E, Q)).toEqual(msgs('old'))
+    await h.flush()
+    expect(store.has('examtopics_ai_chat')).toBe(true)
+  })
+
+  it('ignores malformed legacy JSON', async () => {
+    store.set('examtopics_ai_chat', 'not json{')
+    const h = history()
+    expect(await h.get(U, E, Q)).toEqual([])
+    save(h, Q, 'x', 1)
+    expect(await h.get(U, E, Q)).toEqual(msgs('x'))
   })
 })
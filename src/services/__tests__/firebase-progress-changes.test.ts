@@ -0,0 +1,107 @@
+import { describe, it, expect, vi } from 'vitest'
+import { recordPhase } from '@/lib/perf'
+import { subscribeExamProgressChanges } from '../firebase-progress'
+
+const { on, emit } = vi.hoisted(() => {
+  type Snap = { key: string; val: () => unknown }
+  type Listener = (snap: Snap) => void
+  const listeners: Record<string, Listener[]> = {}
+  return {
+    on(event: string) {
+      return (_ref: unknown, listener: Listener) => {
+        ;(listeners[event] ??= []).push(listener)
+        return () => {
+          listeners[event] = listeners[event].filter((l) => l !== listener)
+        }
+      }
+    },
+    emit(event: string, key: string, value?: unknown) {
+      listeners[event]?.forEach((listener) =>
+        listener({ key, val: () => value })
+      )
+    },
+  }
+})
+
+vi.mock('@/lib/firebase', () => ({ db: {} }))
+vi.mock('@/lib/perf', () => ({ perfNow: () => 0, recordPhase: vi.fn() }))
+vi.mock('sonner', () => ({ toast: { error: vi.fn() } }))
+vi.mock('firebase/database', () => ({
+  ref: vi.fn(),
+  get: vi.fn(),
+  update: vi.fn().mockResolvedValue(undefined),
+  onChildAdded: on('added'),
+  onChildChanged: on('changed'),
+  onChildRemoved: on('removed'),
+  onValue: on('value'),
+}))
+
+describe('subscribeExamProgressChanges', () => {
+  it('hydrates once, then delivers per-question deltas', async () => {
+    const onHydrate = vi.fn()
+    const onChange = vi.fn()
+    const unsubscribe = subscribeExamProgressChanges('u1', 'e1', {
+      onHydrate,
+      onChange,
+    })
+
+    emit('added', 'q1', { status: 'correct', lastAnswered: 1 })
+    emit('added', 'q2', { status: 'incorrect', lastAnswered: 2 })
+    emit('value', 'e1')
+    expect(onHydrate).toHaveBeenCalledWith({
+      q1: { status: 'correct', lastAnswered: 1 },
+      q2: { status: 'incorrect', lastAnswered: 2 },
+    })
+    expect(onChange).not.toHaveBeenCalled()
+
+    emit('changed', 'q2', { status: 'correct', lastAnswered: 3 })
+    emit('added', 'q3', { status: 'skipped', lastAnswered: 4 })
+    emit('removed', 'q1')
+    await Promise.resolve()
+
+    expect(onChange).toHaveBeenCalledTimes(1)
+    expect(onChange).toHaveBeenCalledWith(
+      {
+        q2: { status: 'correct', lastAnswered: 3 },
+        q3: { status: 'skipped', lastAnswered: 4 },
+      },
+      ['q1']
+    )
+    expect(recordPhase).not.toHaveBeenCalled()
+
+    unsubscribe()
+    expect(recordPhase).toHaveBeenCalledTimes(1)
+    expect(recordPhase).toHaveBeenCalledWith(
+      'sync-receive',
+      'e1',
+      0,
+      undefined,
+      expect.any(Number)
+    )
+    expect(vi.mocked(recordPhase).mock.calls[0][4]).toBeGreaterThan(0)
+    emit('changed', 'q2', { status: 'incorrect', lastAnswered: 5 })
+    await Promise.resolve()
+    expect(onChange).toHaveBeenCalledTimes(1)
+  })
+
+  it('reports what it received when the page is hidden', () => {
+    vi.mocked(recordPhase).mockClear()
+    const unsubscribe = subscribeExamProgressChanges('u1', 'e2', {
+      onHydrate: vi.fn(),
+      onChange: vi.fn(),
+    })
+    emit('added', 'q1', { status: 'correct', lastAnswered: 1 })
+    emit('value', 'e2')
+
+    window.dispatchEvent(new Event('pagehide'))
+    expect(recordPhase).toHaveBeenCalledTimes(1)
+    expect(vi.mocked(recordPhase).mock.calls[0].slice(0, 2)).toEqual([
+      'sync-receive',
+      'e2',
+    ])
+
+    unsubscribe()
+    expect(recordPhase).toHaveBeenCalledTimes(2)
+    expect(vi.mocked(recordPhase).mock.calls[1][4]).toBe(0)
+  })
+})
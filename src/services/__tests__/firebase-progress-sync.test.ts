@@ -0,0 +1,149 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest'
+import { toast } from 'sonner'
+import { get, update } from 'firebase/database'
+import { recordPhase } from '@/lib/perf'
+import {
+  clearExamProgress,
+  flushSync,
+  mergeLocalIntoRemote,
+  saveAnswer,
+  setSyncUser,
+} from '../firebase-progress'
+
+vi.mock('@/lib/firebase', () => ({ db: {} }))
+vi.mock('@/lib/perf', () => ({ perfNow: () => 0, recordPhase: vi.fn() }))
+vi.mock('sonner', () => ({ toast: { error: vi.fn() } }))
+vi.mock('firebase/database', () => ({
+  ref: vi.fn(),
+  get: vi.fn(),
+  update: vi.fn().mockResolvedValue(undefined),
+  onChildAdded: vi.fn(),
+  onChildChanged: vi.fn(),
+  onChildRemoved: vi.fn(),
+  onValue: vi.fn(),
+}))
+
+/** Users whose subtree the nth update call wrote to. */
+const usersIn = (call: number) =>
+  new Set(
+    Object.keys(vi.mocked(update).mock.calls[call][1]).map(
+      (path) => path.split('/')[1]
+    )
+  )
+
+describe('progress sync per user', () => {
+  beforeEach(() => {
+    setSyncUser(null)
+    localStorage.clear()
+    vi.clearAllMocks()
+  })
+
+  it('only sends writes of the signed-in user', async () => {
+    setSyncUser('u1')
+    await saveAnswer('u1', 'e1', 'q1', 'correct')
+    await saveAnswer('u2', 'e1', 'q1', 'correct')
+    await flushSync()
+
+    expect(update).toHaveBeenCalledTimes(1)
+    expect(usersIn(0)).toEqual(new Set(['u1']))
+  })
+
+  it('keeps a signed-out user queue until they return', async () => {
+    vi.mocked(update).mockRejectedValueOnce(new Error('offline'))
+    setSyncUser('u1')
+    await saveAnswer('u1', 'e1', 'q1', 'incorrect')
+    await flushSync()
+    setSyncUser(null)
+
+    expect(localStorage.getItem('examtopics_sync_queue:u1')).not.toBeNull()
+    setSyncUser('u2')
+    await saveAnswer('u2', 'e1', 'q1', 'correct')
+    await flushSync()
+    expect(usersIn(1)).toEqual(new Set(['u2']))
+
+    setSyncUser('u1')
+    await flushSync()
+    expect(usersIn(2)).toEqual(new Set(['u1']))
+    expect(localStorage.getItem('examtopics_sync_queue:u1')).toBeNull()
+  })
+
+  it('drops a batch rejected by the security rules and says so', async () => {
+    vi.mocked(update).mockRejectedValueOnce(
+      Object.assign(new Error('PERMISSION_DENIED: Permission denied'), {
+        code: 'PERMISSION_DENIED',
+      })
+    )
+    setSyncUser('u1')
+    await saveAnswer('u1', 'e1', 'q1', 'correct')
+
+    await expect(flushSync()).resolves.toBe(false)
+    expect(toast.error).toHaveBeenCalledWith(
+      'Cloud sync rejected some progress updates'
+    )
+    expect(localStorage.getItem('examtopics_sync_queue:u1')).toBeNull()
+
+    await saveAnswer('u1', 'e1', 'q2', 'correct')
+    await expect(flushSync()).resolves.toBe(true)
+  })
+
+  it('shows one error per streak of transient failures', async () => {
+    vi.mocked(update)
+      .mockRejectedValueOnce(new Error('offline'))
+      .mockRejectedValueOnce(new Error('offline'))
+    setSyncUser('u1')
+    await saveAnswer('u1', 'e1', 'q1', 'correct')
+    await flushSync()
+    await flushSync()
+
+    expect(toast.error).toHaveBeenCalledTimes(1)
+    expect(toast.error).toHaveBeenCalledWith(
+      'Failed to sync progress to cloud; retrying'
+    )
+  })
+
+  it('records the bytes each commit wrote per exam', async () => {
+    setSyncUser('u1')
+    await saveAnswer('u1', 'e1', 'q1', 'correct')
+    await saveAnswer('u1', 'e2', 'q1', 'correct')
+    await flushSync()
+
+    const calls = vi.mocked(recordPhase).mock.calls
+    expect(calls.map(([phase, examId]) => [phase, examId])).toEqual([
+      ['sync-remote', 'e1'],
+      ['sync-remote', 'e2'],
+    ])
+    expect(calls[0][4]).toBeGreaterThan(0)
+  })
+
+  it('says a reset will follow only when it is queued', async () => {
+    vi.mocked(get).mockResolvedValue({
+      val: () => ({ q1: { status: 'correct' } }),
+    } as never)
+    vi.mocked(update).mockRejectedValueOnce(new Error('offline'))
+    setSyncUser('u1')
+    await clearExamProgress('u1', 'e1')
+    expect(toast.error).toHaveBeenLastCalledWith(
+      'Cloud progress will be cleared once back online'
+    )
+
+    setSyncUser(null)
+    await clearExamProgress('u1', 'e1')
+    expect(toast.error).toHaveBeenLastCalledWith(
+      'Cloud progress was not cleared'
+    )
+  })
+
+  it('leaves a merge for a signed-out user to their next sign-in', async () => {
+    const local = { e1: { q1: { status: 'correct' as const } } }
+    await mergeLocalIntoRemote('u1', local)
+    expect(update).not.toHaveBeenCalled()
+    expect(toast.error).not.toHaveBeenCalled()
+
+    vi.mocked(update).mockRejectedValueOnce(new Error('offline'))
+    setSyncUser('u1')
+    await mergeLocalIntoRemote('u1', local)
+    expect(toast.error).toHaveBeenLastCalledWith(
+      'Merged progress will be pushed once back online'
+    )
+  })
+})
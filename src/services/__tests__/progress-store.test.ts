@@ -0,0 +1,275 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest'
+import {
+  ProgressService,
+  flushProgress,
+  initProgressStore,
+} from '../progress-service'
+import { openProgressStore } from '../progress-store'
+
+type Row = Record<string, unknown> & {
+  userId: string
+  examId: string
+  questionId: string
+}
+
+// A minimal in-memory stand-in for the progress object store. Each readwrite
+// transaction is recorded and applied when `transactionDone` resolves.
+const idb = vi.hoisted(() => {
+  const state = {
+    enabled: false,
+    // Holds openAppDatabase back while pending.
+    opening: null as Promise<void> | null,
+    rows: new Map<string, Row>(),
+    transactions: [] as Array<Array<['put', Row] | ['delete', string[]]>>,
+    failures: 0,
+  }
+  const keyOf = (key: string[]) => key.join('/')
+  const db = {
+    transaction: () => {
+      const ops: Array<['put', Row] | ['delete', string[]]> = []
+      return {
+        ops,
+        objectStore: () => ({
+          getAll: () => ({ result: Array.from(state.rows.values()) }),
+          put: (row: Row) => ops.push(['put', row]),
+          delete: (key: string[]) => ops.push(['delete', key]),
+        }),
+      }
+    },
+  }
+  return {
+    state,
+    module: {
+      PROGRESS_STORE: 'progress',
+      openAppDatabase: async () => {
+        await state.opening
+        return state.enabled ? db : null
+      },
+      requestResult: async (request: { result: unknown }) => request.result,
+      transactionDone: async (tx: {
+        ops: Array<['put', Row] | ['delete', string[]]>
+      }) => {
+        if (state.failures > 0) {
+          state.failures--
+          throw new Error('QuotaExceededError')
+        }
+        state.transactions.push(tx.ops)
+        for (const op of tx.ops) {
+          if (op[0] === 'put') {
+            const { userId, examId, questionId } = op[1]
+            state.rows.set(keyOf([userId, examId, questionId]), op[1])
+          } else {
+            state.rows.delete(keyOf(op[1]))
+          }
+        }
+      },
+    },
+  }
+})
+
+vi.mock('@/lib/idb', () => idb.module)
+
+const row = (
+  questionId: string,
+  status: string,
+  lastAnswered: number
+): Row => ({ userId: 'u1', examId: 'e1', questionId, status, lastAnswered })
+
+describe('openProgressStore', () => {
+  beforeEach(() => {
+    idb.state.enabled = true
+    idb.state.rows.clear()
+    idb.state.transactions = []
+    idb.state.failures = 0
+  })
+
+  afterEach(() => {
+    vi.useRealTimers()
+    idb.state.enabled = false
+  })
+
+  it('loads stored records into the nested progress tree', async () => {
+    idb.state.rows.set('u1/e1/q1', row('q1', 'correct', 1))
+
+    const store = await openProgressStore(null)
+
+    expect(store!.data).toEqual({
+      u1: { e1: { q1: { status: 'correct', lastAnswered: 1 } } },
+    })
+    expect(idb.state.transactions).toHaveLength(0)
+  })
+
+  it('imports legacy progress, keeping the newer answer', async () => {
+    idb.state.rows.set('u1/e1/q1', row('q1', 'correct', 5))
+    idb.state.rows.set('u1/e1/q2', row('q2', 'incorrect', 1))
+
+    const store = await openProgressStore({
+      u1: {
+        e1: {
+          q1: { status: 'incorrect', lastAnswered: 2 },
+          q2: { status: 'correct', lastAnswered: 3 },
+          q3: { status: 'skipped', lastAnswered: 4 },
+        },
+      },
+    })
+
+    expect(store!.data.u1.e1).toEqual({
+      q1: { status: 'correct', lastAnswered: 5 },
+      q2: { status: 'correct', lastAnswered: 3 },
+      q3: { status: 'skipped', lastAnswered: 4 },
+    })
+    // Only the imported questions that won are written, in one transaction.
+    expect(idb.state.transactions).toHaveLength(1)
+    const written = idb.state.transactions[0].map(([, r]) => r as Row)
+    expect(written.map((r) => r.questionId)).toEqual(['q2', 'q3'])
+  })
+
+  it('debounces writes and coalesces repeated changes to one put', async () => {
+    vi.useFakeTimers()
+    const store = (await openProgressStore(null))!
+
+    for (const status of ['incorrect', 'correct', 'skipped'] as const) {
+      store.data.u1 = { e1: { q1: { status, lastAnswered: 1 } } }
+      store.markDirty('u1', 'e1', ['q1'])
+    }
+    await vi.advanceTimersByTimeAsync(299)
+    expect(idb.state.transactions).toHaveLength(0)
+
+    await vi.advanceTimersByTimeAsync(1)
+    expect(idb.state.transactions).toEqual([
+      [['put', row('q1', 'skipped', 1)]],
+    ])
+  })
+
+  it('deletes records removed from the tree', async () => {
+    idb.state.rows.set('u1/e1/q1', row('q1', 'correct', 1))
+    const store = (await openProgressStore(null))!
+
+    delete store.data.u1.e1.q1
+    store.markDirty('u1', 'e1', ['q1'])
+    await store.flush()
+
+    expect(idb.state.rows.size).toBe(0)
+    expect(idb.state.transactions).toEqual([
+      [['delete', ['u1', 'e1', 'q1']]],
+    ])
+  })
+
+  it('keeps failed writes pending for the next flush', async () => {
+    const store = (await openProgressStore(null))!
+    store.data.u1 = { e1: { q1: { status: 'correct', lastAnswered: 1 } } }
+    store.markDirty('u1', 'e1', ['q1'])
+
+    idb.state.failures = 1
+    await store.flush()
+    expect(idb.state.rows.size).toBe(0)
+
+    await store.flush()
+    expect(idb.state.rows.get('u1/e1/q1')).toEqual(row('q1', 'correct', 1))
+    await store.flush()
+    expect(idb.state.transactions).toHaveLength(1)
+  })
+
+  it('marks every question of a user when no exam is given', async () => {
+    const store = (await openProgressStore(null))!
+    store.data.u1 = {
+      e1: { q1: { status: 'correct' } },
+      e2: { q2: { status: 'incorrect' } },
+    }
+    store.markDirty('u1')
+    await store.flush()
+
+    expect(Array.from(idb.state.rows.keys()).sort()).toEqual([
+      'u1/e1/q1',
+      'u1/e2/q2',
+    ])
+  })
+})
+
+describe('initProgressStore', () => {
+  beforeEach(() => {
+    localStorage.clear()
+    idb.state.opening = null
+    idb.state.rows.clear()
+    idb.state.transactions = []
+    idb.state.failures = 0
+  })
+
+  afterEach(() => {
+    localStorage.clear()
+  })
+
+  it('keeps using localStorage when IndexedDB is unavailable', async () => {
+    idb.state.enabled = false
+    const data = { u1: { e1: { q1: { status: 'correct', lastAnswered: 1 } } } }
+    localStorage.setItem('examtopics_progress', JSON.stringify(data))
+
+    await expect(initProgressStore()).resolves.toBe(false)
+    await flushProgress()
+
+    expect(localStorage.getItem('examtopics_progress')).toBe(
+      JSON.stringify(data)
+    )
+    ProgressService.saveAnswer('u1', 'e1', 'q2', 'incorrect')
+    expect(
+      JSON.parse(localStorage.getItem('examtopics_progress')!).u1.e1.q2.status
+    ).toBe('incorrect')
+  })
+
+  it('switches to the store when it opens after the timeout', async () => {
+    // A fresh module: the service keeps the store it opened for its lifetime.
+    vi.resetModules()
+    const service = await import('../progress-service')
+    idb.state.enabled = true
+    idb.state.rows.set('u1/e1/q1', row('q1', 'correct', 5))
+    let open = () => {}
+    idb.state.opening = new Promise<void>((resolve) => (open = resolve))
+    const legacy = { q2: { status: 'incorrect', lastAnswered: 1 } }
+    localStorage.setItem(
+      'examtopics_progress',
+      JSON.stringify({ u1: { e1: legacy } })
+    )
+
+    await expect(service.initProgressStore(10)).resolves.toBe(false)
+    // A bookmark-only change leaves lastAnswered as it was imported.
+    service.ProgressService.toggleBookmark('u1', 'e1', 'q2')
+
+    open()
+    await vi.waitFor(() =>
+      expect(localStorage.getItem('examtopics_progress')).toBeNull()
+    )
+    expect(idb.state.rows.get('u1/e1/q2')).toEqual({
+      ...row('q2', 'incorrect', 1),
+      bookmarked: true,
+    })
+    expect(service.ProgressService.getExamProgress('u1', 'e1')).toEqual({
+      q1: { status: 'correct', lastAnswered: 5 },
+      q2: { status: 'incorrect', lastAnswered: 1, bookmarked: true },
+    })
+
+    service.ProgressService.toggleBookmark('u1', 'e1', 'q2')
+    expect(localStorage.getItem('examtopics_progress')).toBeNull()
+    await service.flushProgress()
+    expect(idb.state.rows.get('u1/e1/q2')).toMatchObject({ bookmarked: false })
+  })
+
+  // Runs last: the service keeps the store it opened for the module's lifetime.
+  it('migrates localStorage progress and removes the old key', async () => {
+    idb.state.enabled = true
+    const data = { u1: { e1: { q1: { status: 'correct', lastAnswered: 1 } } } }
+    localStorage.setItem('examtopics_progress', JSON.stringify(data))
+
+    await expect(initProgressStore()).resolves.toBe(true)
+
+    expect(localStorage.getItem('examtopics_progress')).toBeNull()
+    expect(idb.state.rows.get('u1/e1/q1')).toEqual(row('q1', 'correct', 1))
+    expect(ProgressService.getExamProgress('u1', 'e1')).toEqual(data.u1.e1)
+
+    ProgressService.saveAnswer('u1', 'e1', 'q2', 'incorrect')
+    expect(localStorage.getItem('examtopics_progress')).toBeNull()
+    await flushProgress()
+    expect(idb.state.rows.get('u1/e1/q2')).toMatchObject({
+      status: 'incorrect',
+    })
+  })
+})
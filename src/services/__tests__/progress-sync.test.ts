@@ -0,0 +1,214 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest'
+import { createSyncQueue, type SyncUpdates } from '../progress-sync'
+
+const stored = () => JSON.parse(localStorage.getItem('sync') ?? 'null')
+
+function memoryBackend() {
+  const data: SyncUpdates = {}
+  const commits: SyncUpdates[] = []
+  let failNext = 0
+  return {
+    data,
+    commits,
+    fail(times: number) {
+      failNext = times
+    },
+    commit: vi.fn(async (updates: SyncUpdates) => {
+      if (failNext > 0) {
+        failNext--
+        throw new Error('offline')
+      }
+      commits.push(updates)
+      Object.assign(data, updates)
+    }),
+  }
+}
+
+describe('createSyncQueue', () => {
+  beforeEach(() => {
+    vi.useFakeTimers()
+    localStorage.clear()
+  })
+
+  afterEach(() => {
+    vi.useRealTimers()
+    localStorage.clear()
+  })
+
+  it('coalesces writes into one multi-path update', async () => {
+    const backend = memoryBackend()
+    const queue = createSyncQueue({
+      commit: backend.commit,
+      storageKey: 'sync',
+      flushDelayMs: 100,
+    })
+
+    queue.enqueue({ 'p/u/e/q1/status': 'incorrect' })
+    queue.enqueue({
+      'p/u/e/q1/status': 'correct',
+      'p/u/e/q2/status': 'skipped',
+    })
+    expect(Object.keys(stored())).toHaveLength(2)
+    expect(backend.commit).not.toHaveBeenCalled()
+
+    await vi.advanceTimersByTimeAsync(100)
+
+    expect(backend.commits).toEqual([
+      { 'p/u/e/q1/status': 'correct', 'p/u/e/q2/status': 'skipped' },
+    ])
+    expect(stored()).toBeNull()
+  })
+
+  it('flushes as soon as the batch is full', async () => {
+    const backend = memoryBackend()
+    const queue = createSyncQueue({ commit: backend.commit, maxBatch: 2 })
+
+    queue.enqueue({ a: 1 })
+    queue.enqueue({ b: 2 })
+    await vi.advanceTimersByTimeAsync(0)
+
+    expect(backend.commits).toEqual([{ a: 1, b: 2 }])
+  })
+
+  it('retries failed flushes with backoff and keeps the queue', async () => {
+    const backend = memoryBackend()
+    backend.fail(2)
+    const onError = vi.fn()
+    const queue = createSyncQueue({
+      commit: backend.commit,
+      storageKey: 'sync',
+      flushDelayMs: 10,
+      retryBaseMs: 1000,
+      onError,
+    })
+
+    queue.enqueue({ a: 1 })
+    await vi.advanceTimersByTimeAsync(10)
+    expect(onError).toHaveBeenLastCalledWith(expect.any(Error), {
+      dropped: false,
+      retries: 1,
+    })
+    expect(stored()).toEqual({ a: 1 })
+
+    await vi.advanceTimersByTimeAsync(1000)
+    expect(onError).toHaveBeenLastCalledWith(expect.any(Error), {
+      dropped: false,
+      retries: 2,
+    })
+
+    await vi.advanceTimersByTimeAsync(2000)
+    expect(backend.data).toEqual({ a: 1 })
+    expect(stored()).toBeNull()
+  })
+
+  it('keeps writes made while a flush is in flight', async () => {
+    let release: () => void = () => {}
+    const commits: SyncUpdates[] = []
+    const queue = createSyncQueue({
+      commit: (updates) => {
+        commits.push(updates)
+        return new Promise<void>((resolve) => {
+          release = resolve
+        })
+      },
+      storageKey: 'sync',
+      flushDelayMs: 10,
+    })
+
+    queue.enqueue({ a: 1 })
+    const flushed = queue.flush()
+    queue.enqueue({ a: 2 })
+    release()
+    await flushed
+
+    expect(stored()).toEqual({ a: 2 })
+    await vi.advanceTimersByTimeAsync(10)
+    expect(commits).toEqual([{ a: 1 }, { a: 2 }])
+  })
+
+  it('drops a permanently failing batch instead of retrying it', async () => {
+    const commit = vi
+      .fn<(updates: SyncUpdates) => Promise<void>>()
+      .mockRejectedValueOnce(new Error('PERMISSION_DENIED'))
+      .mockResolvedValue(undefined)
+    const onError = vi.fn()
+    const queue = createSyncQueue({
+      commit,
+      storageKey: 'sync',
+      flushDelayMs: 10,
+      isPermanent: (error) => (error as Error).message === 'PERMISSION_DENIED',
+      onError,
+    })
+
+    queue.enqueue({ a: 1, b: 2 })
+    await expect(queue.flush()).resolves.toBe(false)
+
+    expect(onError).toHaveBeenCalledWith(expect.any(Error), {
+      dropped: true,
+      retries: 0,
+    })
+    expect(stored()).toBeNull()
+
+    // Later writes are not held back by the rejected batch.
+    queue.enqueue({ c: 3 })
+    await vi.advanceTimersByTimeAsync(10)
+    expect(commit).toHaveBeenLastCalledWith({ c: 3 })
+  })
+
+  it('reports transient failures with the retry count', async () => {
+    const backend = memoryBackend()
+    backend.fail(1)
+    const onError = vi.fn()
+    const queue = createSyncQueue({
+      commit: backend.commit,
+      storageKey: 'sync',
+      onError,
+    })
+
+    queue.enqueue({ a: 1 })
+    await queue.flush()
+
+    expect(onError).toHaveBeenCalledWith(expect.any(Error), {
+      dropped: false,
+      retries: 1,
+    })
+    expect(stored()).toEqual({ a: 1 })
+  })
+
+  it('stops flushing but keeps pending writes persisted', async () => {
+    const backend = memoryBackend()
+    const queue = createSyncQueue({
+      commit: backend.commit,
+      storageKey: 'sync',
+      flushDelayMs: 10,
+    })
+
+    queue.enqueue({ a: 1 })
+    queue.stop()
+    await vi.advanceTimersByTimeAsync(10)
+    await expect(queue.flush()).resolves.toBe(false)
+    window.dispatchEvent(new Event('online'))
+
+    expect(backend.commit).not.toHaveBeenCalled()
+    expect(stored()).toEqual({ a: 1 })
+  })
+
+  it('persists pending writes and sends them in a later session', async () => {
+    const offline = memoryBackend()
+    offline.fail(Infinity)
+    createSyncQueue({ commit: offline.commit, storageKey: 'sync' }).enqueue({
+      a: 1,
+    })
+    expect(stored()).toEqual({ a: 1 })
+
+    const backend = memoryBackend()
+    const queue = createSyncQueue({
+      commit: backend.commit,
+      storageKey: 'sync',
+    })
+    await queue.flush()
+
+    expect(backend.data).toEqual({ a: 1 })
+    expect(localStorage.getItem('sync')).toBeNull()
+  })
+})
@@ -1,102 +1,357 @@
+/**
+ * Per-question AI chat history.
+ *
+ * Each thread is a small meta record plus one record per message in
+ * IndexedDB (see lib/idb.ts). Adding a message, or growing the reply that is
+ * streaming in, rewrites that one message instead of re-serializing every
+ * chat, and writes are buffered and committed together in one transaction a
+ * moment later, so persisting while tokens arrive stays off the render path.
+ * Thread metas are held in memory; once the stored messages exceed MAX_BYTES
+ * the least recently used threads are evicted until they fit. Without
+ * IndexedDB, history lives in memory for the session.
+ *
+ * Threads from the old localStorage store are imported on open; its key is
+ * removed only once they have been committed to IndexedDB, and never while
+ * history is held in memory, so a failed write leaves them to import again.
+ */
+import {
+  CHAT_MESSAGE_STORE,
+  CHAT_STORE,
+  openAppDatabase,
+  requestResult,
+  transactionDone,
+} from '@/lib/idb'
+
 export interface StoredChatMessage {
   id: string
   role: 'user' | 'assistant'
   content: string
 }
 
-interface ChatEntry {
-  messages: StoredChatMessage[]
-  updatedAt: number
+interface ThreadMeta {
+  userId: string
+  examId: string
+  questionId: string
+  /** Last read or write; eviction drops the oldest first. */
+  usedAt: number
+  /** Approximate size of the thread's messages. */
+  bytes: number
+  count: number
+  tailId: string
+  tailBytes: number
 }
 
-// { [userId]: { [examId]: { [questionId]: ChatEntry } } }
-type AllChats = Record<string, Record<string, Record<string, ChatEntry>>>
+type MessageRecord = StoredChatMessage & {
+  userId: string
+  examId: string
+  questionId: string
+  seq: number
+}
 
-const STORAGE_KEY = 'examtopics_ai_chat'
-const MAX_QUESTIONS_PER_USER = 50
+type Batch = {
+  threads: ThreadMeta[]
+  messages: MessageRecord[]
+  removed: ThreadMeta[]
+}
 
-function readAll(): AllChats {
-  try {
-    const raw = localStorage.getItem(STORAGE_KEY)
-    return raw ? (JSON.parse(raw) as AllChats) : {}
-  } catch {
-    return {}
+type Backend = {
+  threads: () => Promise<ThreadMeta[]>
+  messages: (thread: ThreadMeta) => Promise<MessageRecord[]>
+  /** Removals are applied before puts. */
+  commit: (batch: Batch) => Promise<void>
+}
+
+export const MAX_BYTES = 4 * 1024 * 1024
+const LEGACY_KEY = 'examtopics_ai_chat'
+const FLUSH_DELAY_MS = 250
+const SEP = '\u0000'
+
+type ThreadId = Pick<ThreadMeta, 'userId' | 'examId' | 'questionId'>
+
+function keyOf({ userId, examId, questionId }: ThreadId) {
+  return [userId, examId, questionId].join(SEP)
+}
+
+function messageBytes(message: StoredChatMessage) {
+  return (message.id.length + message.content.length) * 2
+}
+
+function messageRange({ userId, examId, questionId }: ThreadId) {
+  return IDBKeyRange.bound(
+    [userId, examId, questionId, 0],
+    [userId, examId, questionId, Infinity]
+  )
+}
+
+function idbBackend(db: IDBDatabase): Backend {
+  return {
+    threads: () =>
+      requestResult(
+        db
+          .transaction(CHAT_STORE, 'readonly')
+          .objectStore(CHAT_STORE)
+          .getAll() as IDBRequest<ThreadMeta[]>
+      ),
+    messages: (thread) =>
+      requestResult(
+        db
+          .transaction(CHAT_MESSAGE_STORE, 'readonly')
+          .objectStore(CHAT_MESSAGE_STORE)
+          .getAll(messageRange(thread)) as IDBRequest<MessageRecord[]>
+      ),
+    async commit({ threads, messages, removed }) {
+      const tx = db.transaction([CHAT_STORE, CHAT_MESSAGE_STORE], 'readwrite')
+      const metaStore = tx.objectStore(CHAT_STORE)
+      const messageStore = tx.objectStore(CHAT_MESSAGE_STORE)
+      for (const thread of removed) {
+        metaStore.delete([thread.userId, thread.examId, thread.questionId])
+        messageStore.delete(messageRange(thread))
+      }
+      threads.forEach((thread) => metaStore.put(thread))
+      messages.forEach((message) => messageStore.put(message))
+      await transactionDone(tx)
+    },
+  }
+}
+
+function memoryBackend(): Backend {
+  const metas = new Map<string, ThreadMeta>()
+  const records = new Map<string, MessageRecord[]>()
+  return {
+    threads: async () => Array.from(metas.values()),
+    messages: async (thread) => (records.get(keyOf(thread)) ?? []).slice(),
+    async commit({ threads, messages, removed }) {
+      for (const thread of removed) {
+        metas.delete(keyOf(thread))
+        records.delete(keyOf(thread))
+      }
+      threads.forEach((thread) => metas.set(keyOf(thread), thread))
+      for (const message of messages) {
+        const list = records.get(keyOf(message)) ?? []
+        list[message.seq] = message
+        records.set(keyOf(message), list)
+      }
+    },
   }
 }
 
-function writeAll(data: AllChats) {
+type LegacyEntry = { messages: StoredChatMessage[]; updatedAt: number }
+
+// { [userId]: { [examId]: { [questionId]: LegacyEntry } } }
+type LegacyChats = Record<string, Record<string, Record<string, LegacyEntry>>>
+
+function readLegacy(): LegacyChats {
   try {
-    localStorage.setItem(STORAGE_KEY, JSON.stringify(data))
+    const raw = localStorage.getItem(LEGACY_KEY)
+    return raw ? (JSON.parse(raw) as LegacyChats) : {}
   } catch {
-    // Storage unavailable or over quota — chat history is best-effort.
+    return {}
   }
 }
 
-function removeEntry(
-  all: AllChats,
-  userId: string,
-  examId: string,
-  questionId: string
-): boolean {
-  const exam = all[userId]?.[examId]
-  if (!exam?.[questionId]) return false
-  delete exam[questionId]
-  if (Object.keys(exam).length === 0) delete all[userId][examId]
-  return true
-}
+export function createChatHistory(
+  openDatabase: () => Promise<IDBDatabase | null> = openAppDatabase,
+  maxBytes = MAX_BYTES
+) {
+  const threads = new Map<string, ThreadMeta>()
+  const dirtyThreads = new Map<string, ThreadMeta>()
+  const dirtyMessages = new Map<string, MessageRecord>()
+  const removed = new Map<string, ThreadMeta>()
+  let totalBytes = 0
+  let timer: ReturnType<typeof setTimeout> | undefined
+  let opening: Promise<Backend> | null = null
+  // Set once legacy threads are imported into an IndexedDB-backed history;
+  // the next flush commits them and then removes the localStorage key.
+  let legacyPending = false
 
-// Drop the least-recently-updated conversations so a single user never keeps
-// more than MAX_QUESTIONS_PER_USER stored threads.
-function enforceCap(user: Record<string, Record<string, ChatEntry>>) {
-  const entries: { examId: string; questionId: string; updatedAt: number }[] = []
-  for (const examId of Object.keys(user)) {
-    for (const questionId of Object.keys(user[examId])) {
-      entries.push({
-        examId,
-        questionId,
-        updatedAt: user[examId][questionId].updatedAt,
-      })
+  function schedule() {
+    if (timer === undefined) {
+      timer = setTimeout(() => void flush(), FLUSH_DELAY_MS)
     }
   }
-  if (entries.length <= MAX_QUESTIONS_PER_USER) return
-  entries.sort((a, b) => a.updatedAt - b.updatedAt)
-  for (const { examId, questionId } of entries.slice(
-    0,
-    entries.length - MAX_QUESTIONS_PER_USER
-  )) {
-    delete user[examId][questionId]
-    if (Object.keys(user[examId]).length === 0) delete user[examId]
+
+  function drop(key: string) {
+    const meta = threads.get(key)
+    if (!meta) return
+    threads.delete(key)
+    totalBytes -= meta.bytes
+    dirtyThreads.delete(key)
+    for (const id of Array.from(dirtyMessages.keys())) {
+      if (id.startsWith(key + SEP)) dirtyMessages.delete(id)
+    }
+    removed.set(key, meta)
+  }
+
+  function evict(keep: string) {
+    if (totalBytes <= maxBytes) return
+    const oldest = Array.from(threads.values())
+      .filter((meta) => keyOf(meta) !== keep)
+      .sort((a, b) => a.usedAt - b.usedAt)
+    for (const meta of oldest) {
+      if (totalBytes <= maxBytes) break
+      drop(keyOf(meta))
+    }
+  }
+
+  function apply(thread: ThreadId, message: StoredChatMessage, now: number) {
+    const key = keyOf(thread)
+    let meta = threads.get(key)
+    if (!meta) {
+      meta = {
+        ...thread,
+        usedAt: now,
+        bytes: 0,
+        count: 0,
+        tailId: '',
+        tailBytes: 0,
+      }
+      threads.set(key, meta)
+    }
+    const size = messageBytes(message)
+    let seq: number
+    if (meta.count > 0 && meta.tailId === message.id) {
+      // The reply that is streaming in: rewrite it in place.
+      seq = meta.count - 1
+      meta.bytes -= meta.tailBytes
+      totalBytes -= meta.tailBytes
+    } else {
+      seq = meta.count++
+    }
+    meta.bytes += size
+    totalBytes += size
+    meta.tailId = message.id
+    meta.tailBytes = size
+    meta.usedAt = now
+    dirtyThreads.set(key, meta)
+    dirtyMessages.set(key + SEP + seq, {
+      id: message.id,
+      role: message.role,
+      content: message.content,
+      ...thread,
+      seq,
+    })
+    evict(key)
+    schedule()
   }
-}
 
-export const AiChatHistoryService = {
-  get(userId: string, examId: string, questionId: string): StoredChatMessage[] {
-    return readAll()[userId]?.[examId]?.[questionId]?.messages ?? []
-  },
-
-  save(
-    userId: string,
-    examId: string,
-    questionId: string,
-    messages: StoredChatMessage[],
-    now: number
-  ) {
-    const all = readAll()
-    // An empty thread is treated as a clear — never persist empty conversations.
-    if (messages.length === 0) {
-      if (removeEntry(all, userId, examId, questionId)) writeAll(all)
+  function removeLegacy() {
+    try {
+      localStorage.removeItem(LEGACY_KEY)
+    } catch {
+      // Storage unavailable: nothing was imported either.
+    }
+  }
+
+  /** Apply threads from the localStorage store; true if there were any. */
+  function importLegacy() {
+    const legacy = readLegacy()
+    for (const [userId, exams] of Object.entries(legacy)) {
+      for (const [examId, questions] of Object.entries(exams ?? {})) {
+        for (const [questionId, entry] of Object.entries(questions ?? {})) {
+          for (const message of entry?.messages ?? []) {
+            const thread = { userId, examId, questionId }
+            apply(thread, message, entry.updatedAt || 0)
+          }
+        }
+      }
+    }
+    return Object.keys(legacy).length > 0
+  }
+
+  function open() {
+    opening ??= (async () => {
+      const db = await openDatabase().catch(() => null)
+      const backend = db ? idbBackend(db) : memoryBackend()
+      try {
+        for (const meta of await backend.threads()) {
+          threads.set(keyOf(meta), meta)
+          totalBytes += meta.bytes
+        }
+      } catch {
+        // Unreadable store: start from an empty history.
+      }
+      if (importLegacy() && db) legacyPending = true
+      if (typeof window !== 'undefined') {
+        window.addEventListener('pagehide', () => void flush())
+      }
+      return backend
+    })()
+    return opening
+  }
+
+  async function flush() {
+    clearTimeout(timer)
+    timer = undefined
+    const backend = await open()
+    // The first flush after an import carries every imported thread.
+    const committingLegacy = legacyPending
+    legacyPending = false
+    if (dirtyThreads.size + dirtyMessages.size + removed.size === 0) {
+      if (committingLegacy) removeLegacy()
       return
     }
-    if (!all[userId]) all[userId] = {}
-    const user = all[userId]
-    if (!user[examId]) user[examId] = {}
-    user[examId][questionId] = { messages, updatedAt: now }
-    enforceCap(user)
-    writeAll(all)
-  },
-
-  clear(userId: string, examId: string, questionId: string) {
-    const all = readAll()
-    if (removeEntry(all, userId, examId, questionId)) writeAll(all)
-  },
+    const batch: Batch = {
+      // Metas keep changing after this; commit a snapshot.
+      threads: Array.from(dirtyThreads.values(), (meta) => ({ ...meta })),
+      messages: Array.from(dirtyMessages.values()),
+      removed: Array.from(removed.values()),
+    }
+    dirtyThreads.clear()
+    dirtyMessages.clear()
+    removed.clear()
+    try {
+      await backend.commit(batch)
+      if (committingLegacy) removeLegacy()
+    } catch {
+      // Over quota or storage unavailable — chat history is best-effort.
+    }
+  }
+
+  return {
+    async get(
+      userId: string,
+      examId: string,
+      questionId: string
+    ): Promise<StoredChatMessage[]> {
+      const backend = await open()
+      await flush()
+      const key = keyOf({ userId, examId, questionId })
+      const meta = threads.get(key)
+      if (!meta) return []
+      meta.usedAt = Date.now()
+      dirtyThreads.set(key, meta)
+      schedule()
+      const records = await backend.messages(meta).catch(() => [])
+      return records
+        .sort((a, b) => a.seq - b.seq)
+        .map(({ id, role, content }) => ({ id, role, content }))
+    },
+
+    /**
+     * Add a message to the thread, or replace the last one if it has the same
+     * id (a reply still streaming in).
+     */
+    append(
+      userId: string,
+      examId: string,
+      questionId: string,
+      message: StoredChatMessage,
+      now: number
+    ) {
+      const thread = { userId, examId, questionId }
+      void open().then(() => apply(thread, message, now))
+    },
+
+    clear(userId: string, examId: string, questionId: string) {
+      void open().then(() => {
+        drop(keyOf({ userId, examId, questionId }))
+        schedule()
+      })
+    },
+
+    /** Write buffered changes now. */
+    flush,
+  }
 }
+
+export const AiChatHistoryService = createChatHistory()
@@ -1,6 +1,21 @@
-import { get, onValue, ref, update } from 'firebase/database'
+import {
+  get,
+  onChildAdded,
+  onChildChanged,
+  onChildRemoved,
+  onValue,
+  ref,
+  update,
+  type DataSnapshot,
+} from 'firebase/database'
 import { toast } from 'sonner'
 import { db } from '@/lib/firebase'
+import { perfNow, recordPhase } from '@/lib/perf'
+import {
+  createSyncQueue,
+  type SyncQueue,
+  type SyncUpdates,
+} from './progress-sync'
 import type {
   ExamProgress,
   ExamSettings,
@@ -12,17 +27,208 @@ import type {
 const BASE = 'examtopics_progress'
 const SETTINGS_PATH = '_settings'
 
-export function subscribeExamProgress(
+/**
+ * Bytes written to each exam in `updates`, whose paths start
+ * `BASE/userId/examId`, counting each path and its JSON value.
+ */
+function bytesByExam(updates: SyncUpdates) {
+  const exams = new Map<string, number>()
+  Object.entries(updates).forEach(([path, value]) => {
+    const examId = path.split('/')[2]
+    if (!examId || examId === SETTINGS_PATH) return
+    const bytes = path.length + JSON.stringify(value ?? null).length
+    exams.set(examId, (exams.get(examId) ?? 0) + bytes)
+  })
+  return exams
+}
+
+const SYNC_KEY = 'examtopics_sync_queue'
+
+/** Firebase rejects writes outside the signed-in user's subtree this way. */
+function isRulesRejection(error: unknown) {
+  const { code, message } = (error ?? {}) as {
+    code?: string
+    message?: string
+  }
+  return (
+    code === 'PERMISSION_DENIED' || /permission.denied/i.test(message ?? '')
+  )
+}
+
+/**
+ * Answer, bookmark and reset writes are batched through a sync queue (see
+ * progress-sync.ts) and sent as one multi-path update. Security rules only
+ * let a user write their own subtree, so there is one queue per user,
+ * persisted under `examtopics_sync_queue:{uid}`, and only the signed-in
+ * user's queue runs: writes for anyone else are dropped (their local progress
+ * is pushed again by mergeLocalIntoRemote at their next sign-in), and a
+ * signed-out user's pending writes wait under their key until they return.
+ * Each successful commit is recorded as the `sync-remote` phase of every exam
+ * it wrote to, sized by the bytes it wrote there.
+ */
+let sync: { userId: string; queue: SyncQueue } | null = null
+
+function createUserQueue(userId: string) {
+  return createSyncQueue({
+    commit: async (updates) => {
+      const start = perfNow()
+      await update(ref(db), updates)
+      bytesByExam(updates).forEach((bytes, examId) =>
+        recordPhase('sync-remote', examId, start, undefined, bytes)
+      )
+    },
+    storageKey: `${SYNC_KEY}:${userId}`,
+    isPermanent: isRulesRejection,
+    onError: (_error, { dropped, retries }) => {
+      if (dropped) toast.error('Cloud sync rejected some progress updates')
+      // Once per streak of failures; the queue keeps retrying quietly.
+      else if (retries === 1) {
+        toast.error('Failed to sync progress to cloud; retrying')
+      }
+    },
+  })
+}
+
+/** Run the sync queue of `userId` (null when signed out) and stop any other. */
+export function setSyncUser(userId: string | null) {
+  if (sync?.userId === userId) return
+  sync?.queue.stop()
+  sync = userId ? { userId, queue: createUserQueue(userId) } : null
+}
+
+/** Send the signed-in user's pending writes now (e.g. before signing out). */
+export function flushSync(): Promise<boolean> {
+  return sync ? sync.queue.flush() : Promise.resolve(true)
+}
+
+/** Queue `updates` for `userId`; false unless that user is signed in. */
+function enqueue(userId: string, updates: SyncUpdates) {
+  if (sync?.userId !== userId) return false
+  sync.queue.enqueue(updates)
+  return true
+}
+
+function fieldUpdates(path: string, fields: Record<string, unknown>) {
+  const updates: SyncUpdates = {}
+  Object.entries(fields).forEach(([k, v]) => {
+    updates[`${path}/${k}`] = v ?? null
+  })
+  return updates
+}
+
+export type ExamProgressHandlers = {
+  /** The exam's progress when the subscription starts, delivered once. */
+  onHydrate: (progress: ExamProgress) => void
+  /** Questions added or changed, and ids removed, since the last call. */
+  onChange: (changes: ExamProgress, removed: string[]) => void
+}
+
+/**
+ * Subscribe to one exam's progress question by question. Existing questions
+ * arrive once through `onHydrate`; after that only the questions that change
+ * are delivered, batched per microtask, so an answer costs one question's
+ * worth of data and merge work instead of the whole exam.
+ *
+ * What a subscription received (approximately: the length of the JSON it
+ * delivered) is recorded as the `sync-receive` phase when it ends, and when
+ * the page is hidden for the part received so far.
+ */
+export function subscribeExamProgressChanges(
   userId: string,
   examId: string,
-  onChange: (progress: ExamProgress) => void
+  { onHydrate, onChange }: ExamProgressHandlers
 ) {
   const r = ref(db, `${BASE}/${userId}/${examId}`)
-  const unsubscribe = onValue(r, (snap) => {
-    const val = snap.val() as ExamProgress | null
-    onChange(val || {})
-  })
-  return () => unsubscribe()
+  let initial: ExamProgress | null = {}
+  let changes: ExamProgress = {}
+  let removed: string[] = []
+  let scheduled = false
+  let receivedSince = perfNow()
+  let receivedBytes = 0
+
+  function reportReceived() {
+    recordPhase(
+      'sync-receive',
+      examId,
+      receivedSince,
+      undefined,
+      receivedBytes
+    )
+    receivedSince = perfNow()
+    receivedBytes = 0
+  }
+
+  function deliver() {
+    // Cleared by unsubscribing before the microtask ran.
+    if (!scheduled) return
+    scheduled = false
+    const batch = changes
+    const gone = removed
+    changes = {}
+    removed = []
+    onChange(batch, gone)
+  }
+
+  function schedule() {
+    if (scheduled) return
+    scheduled = true
+    queueMicrotask(deliver)
+  }
+
+  function put(snap: DataSnapshot) {
+    const qId = snap.key as string
+    const value = snap.val() as QuestionProgress
+    receivedBytes += JSON.stringify(value).length
+    if (initial) {
+      initial[qId] = value
+      return
+    }
+    changes[qId] = value
+    removed = removed.filter((id) => id !== qId)
+    schedule()
+  }
+
+  function remove(snap: DataSnapshot) {
+    const qId = snap.key as string
+    if (initial) {
+      delete initial[qId]
+      return
+    }
+    delete changes[qId]
+    removed.push(qId)
+    schedule()
+  }
+
+  const unsubscribes = [
+    onChildAdded(r, put),
+    onChildChanged(r, put),
+    onChildRemoved(r, remove),
+    // Value events fire after the child events for the same data, so this
+    // marks the end of the initial child_added burst; the snapshot itself is
+    // not read again.
+    onValue(
+      r,
+      () => {
+        const progress = initial ?? {}
+        initial = null
+        onHydrate(progress)
+      },
+      { onlyOnce: true }
+    ),
+  ]
+  if (typeof window !== 'undefined') {
+    window.addEventListener('pagehide', reportReceived)
+  }
+  return () => {
+    unsubscribes.forEach((unsubscribe) => unsubscribe())
+    if (typeof window !== 'undefined') {
+      window.removeEventListener('pagehide', reportReceived)
+    }
+    reportReceived()
+    scheduled = false
+    changes = {}
+    removed = []
+  }
 }
 
 export async function getUserProgress(userId: string): Promise<UserProgress> {
@@ -55,17 +261,16 @@ export async function saveAnswer(
     timesWrong = 0
   }
 
-  try {
-    await update(ref(db, `${BASE}/${userId}/${examId}/${questionId}`), {
+  enqueue(
+    userId,
+    fieldUpdates(`${BASE}/${userId}/${examId}/${questionId}`, {
       status,
       lastAnswered: now,
       userSelection: userSelection ?? prev?.userSelection ?? null,
       consecutiveCorrect,
       timesWrong,
     })
-  } catch {
-    toast.error('Failed to sync answer to cloud')
-  }
+  )
 }
 
 export async function toggleBookmark(
@@ -74,13 +279,12 @@ export async function toggleBookmark(
   questionId: string,
   newState: boolean
 ) {
-  try {
-    await update(ref(db, `${BASE}/${userId}/${examId}/${questionId}`), {
+  enqueue(
+    userId,
+    fieldUpdates(`${BASE}/${userId}/${examId}/${questionId}`, {
       bookmarked: newState,
     })
-  } catch {
-    toast.error('Failed to sync bookmark to cloud')
-  }
+  )
 }
 
 export async function clearExamProgress(userId: string, examId: string) {
@@ -96,12 +300,13 @@ export async function clearExamProgress(userId: string, examId: string) {
     updates[`${basePath}/userSelection`] = null
     // bookmarked preserved
   })
-  if (Object.keys(updates).length > 0) {
-    try {
-      await update(ref(db), updates)
-    } catch {
-      toast.error('Failed to clear cloud progress')
-    }
+  if (Object.keys(updates).length === 0) return
+  // Queued behind any pending answers so they cannot land after the reset.
+  if (!enqueue(userId, updates)) {
+    // Signed out meanwhile: the reset is not queued for later either.
+    toast.error('Cloud progress was not cleared')
+  } else if (!(await flushSync())) {
+    toast.error('Cloud progress will be cleared once back online')
   }
 }
 
@@ -109,20 +314,20 @@ export async function mergeLocalIntoRemote(
   userId: string,
   local: UserProgress
 ) {
-  const updates: Record<string, unknown> = {}
+  const updates: SyncUpdates = {}
   Object.entries(local).forEach(([examId, exam]) => {
     Object.entries(exam).forEach(([qId, q]) => {
-      const base = `${BASE}/${userId}/${examId}/${qId}`
-      Object.entries(q).forEach(([k, v]) => {
-        updates[`${base}/${k}`] = v ?? null
-      })
+      Object.assign(
+        updates,
+        fieldUpdates(`${BASE}/${userId}/${examId}/${qId}`, q)
+      )
     })
   })
-  if (Object.keys(updates).length > 0) {
-    try {
-      await update(ref(db), updates)
-    } catch {
-      toast.error('Failed to push merged progress to cloud')
+  // Not queued once the user has signed out; this merge runs again at their
+  // next sign-in.
+  if (Object.keys(updates).length > 0 && enqueue(userId, updates)) {
+    if (!(await flushSync())) {
+      toast.error('Merged progress will be pushed once back online')
     }
   }
 }
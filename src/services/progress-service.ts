@@ -1,3 +1,6 @@
+import { perfNow, recordPhase } from '@/lib/perf'
+import { openProgressStore, type ProgressStore } from './progress-store'
+
 export interface QuestionProgress {
   status?: 'correct' | 'incorrect' | 'skipped'
   bookmarked?: boolean
@@ -35,8 +38,80 @@ export interface AppSettings {
   [userId: string]: UserSettings
 }
 
+let store: ProgressStore | null = null
+
+function readLegacyProgress(): AppProgress | null {
+  try {
+    const data = localStorage.getItem(STORAGE_KEY)
+    return data ? JSON.parse(data) : null
+  } catch {
+    return null
+  }
+}
+
+/**
+ * Switch to an opened store. Questions written to localStorage since
+ * `legacy` was read are the newest copies, so they replace what the store
+ * holds (bookmark toggles and resets included, which the import's
+ * lastAnswered comparison would miss). The old key is removed once they are
+ * written.
+ */
+async function adoptStore(opened: ProgressStore, legacy: AppProgress | null) {
+  const current = readLegacyProgress() ?? {}
+  for (const [userId, exams] of Object.entries(current)) {
+    for (const [examId, questions] of Object.entries(exams ?? {})) {
+      const changed = Object.keys(questions ?? {}).filter(
+        (qId) =>
+          JSON.stringify(questions[qId]) !==
+          JSON.stringify(legacy?.[userId]?.[examId]?.[qId])
+      )
+      if (changed.length === 0) continue
+      const exam = ((opened.data[userId] ??= {})[examId] ??= {})
+      changed.forEach((qId) => (exam[qId] = questions[qId]))
+      opened.markDirty(userId, examId, changed)
+    }
+  }
+  store = opened
+  if (legacy || Object.keys(current).length > 0) {
+    if (await opened.flush()) localStorage.removeItem(STORAGE_KEY)
+  }
+}
+
+/**
+ * Move progress to IndexedDB (see progress-store.ts). The old localStorage
+ * key is imported once and removed after the import is written. Until the
+ * store opens, and wherever IndexedDB is unavailable, progress stays in
+ * localStorage. If opening takes longer than `timeoutMs` this resolves false
+ * and the session starts on localStorage, then switches to the store once it
+ * opens. Resolves true when IndexedDB is in use.
+ */
+export async function initProgressStore(timeoutMs = 2000): Promise<boolean> {
+  if (store) return true
+  const legacy = readLegacyProgress()
+  const opening = openProgressStore(legacy).catch(() => null)
+  let timer: ReturnType<typeof setTimeout> | undefined
+  const timeout = new Promise<'timeout'>((resolve) => {
+    timer = setTimeout(() => resolve('timeout'), timeoutMs)
+  })
+  const opened = await Promise.race([opening, timeout])
+  clearTimeout(timer)
+  if (opened === 'timeout') {
+    void opening.then((late) => late && !store && adoptStore(late, legacy))
+    return false
+  }
+  if (!opened) return false
+  await adoptStore(opened, legacy)
+  return true
+}
+
+/** Write pending IndexedDB changes now (e.g. before signing out). */
+export async function flushProgress(): Promise<void> {
+  await store?.flush()
+}
+
 export const ProgressService = {
   getAllProgress(): AppProgress {
+    if (store) return structuredClone(store.data)
     try {
       const data = localStorage.getItem(STORAGE_KEY)
       return data ? JSON.parse(data) : {}
@@ -46,11 +121,14 @@ export const ProgressService = {
   },
 
   getUserProgress(userId: string): UserProgress {
+    if (store) return structuredClone(store.data[userId] || {})
     const all = this.getAllProgress()
     return all[userId] || {}
   },
 
+  // Copies of the cached tree, so callers never share objects with it.
   getExamProgress(userId: string, examId: string): ExamProgress {
+    if (store) return structuredClone(store.data[userId]?.[examId] || {})
     const userProgress = this.getUserProgress(userId)
     return userProgress[examId] || {}
   },
@@ -83,7 +161,8 @@ export const ProgressService = {
     isCorrectAttempt?: boolean,
     options?: { resetTimesWrong?: boolean }
   ) {
-    const all = this.getAllProgress()
+    const start = perfNow()
+    const all = this._progress()
     if (!all[userId]) all[userId] = {}
     if (!all[userId][examId]) all[userId][examId] = {}
     if (!all[userId][examId][questionId]) all[userId][examId][questionId] = {}
@@ -112,7 +191,8 @@ export const ProgressService = {
       questionData.userSelection = userSelection
     }
 
-    this._saveToStorage(all)
+    this._commit(all, userId, examId, [questionId])
+    recordPhase('save-local', examId, start)
   },
 
   saveExamSettings(userId: string, examId: string, settings: ExamSettings) {
@@ -135,7 +215,7 @@ export const ProgressService = {
   },
 
   clearExamProgress(userId: string, examId: string) {
-    const all = this.getAllProgress()
+    const all = this._progress()
     if (all[userId] && all[userId][examId]) {
       // We might want to keep bookmarks?
       // User said "Clear Progress" to reset answer status.
@@ -152,12 +232,12 @@ export const ProgressService = {
         // Keep bookmarked
       })
 
-      this._saveToStorage(all)
+      this._commit(all, userId, examId)
     }
   },
 
   toggleBookmark(userId: string, examId: string, questionId: string) {
-    const all = this.getAllProgress()
+    const all = this._progress()
     if (!all[userId]) all[userId] = {}
     if (!all[userId][examId]) all[userId][examId] = {}
     if (!all[userId][examId][questionId]) all[userId][examId][questionId] = {}
@@ -165,11 +245,11 @@ export const ProgressService = {
     const current = all[userId][examId][questionId].bookmarked
     all[userId][examId][questionId].bookmarked = !current
 
-    this._saveToStorage(all)
+    this._commit(all, userId, examId, [questionId])
   },
 
   mergeProgress(sourceUserId: string, targetUserId: string) {
-    const all = this.getAllProgress()
+    const all = this._progress()
     const sourceData = all[sourceUserId]
     if (!sourceData) return
 
@@ -212,7 +292,23 @@ export const ProgressService = {
     // Optionally clear source data? Maybe keep it for safety.
     // delete all[sourceUserId]
 
-    this._saveToStorage(all)
+    this._commit(all, targetUserId)
+  },
+
+  /** The progress tree to mutate: the live cache, or a fresh parse of localStorage. */
+  _progress(): AppProgress {
+    return store ? store.data : this.getAllProgress()
+  },
+
+  /** Persist a mutation of `_progress()` that touched the given scope. */
+  _commit(
+    data: AppProgress,
+    userId: string,
+    examId?: string,
+    questionIds?: string[]
+  ) {
+    if (store) store.markDirty(userId, examId, questionIds)
+    else this._saveToStorage(data)
   },
 
   _saveToStorage(data: AppProgress) {
@@ -252,20 +348,22 @@ export const ProgressService = {
     examId: string,
     remote: ExamProgress
   ) {
-    const all = this.getAllProgress()
+    const all = this._progress()
     if (!all[userId]) all[userId] = {}
     if (!all[userId][examId]) all[userId][examId] = {}
 
     const local = all[userId][examId]
+    const changed: string[] = []
     Object.entries(remote).forEach(([qId, rVal]) => {
       const lVal = local[qId]
       // Keep the version with the most recent lastAnswered timestamp
       /* istanbul ignore next -- fallback for undefined timestamps */
       if (!lVal || (rVal.lastAnswered || 0) > (lVal.lastAnswered || 0)) {
         local[qId] = { ...local[qId], ...rVal }
+        changed.push(qId)
       }
     })
 
-    this._saveToStorage(all)
+    this._commit(all, userId, examId, changed)
   },
 }
@@ -0,0 +1,148 @@
+/**
+ * IndexedDB persistence for ProgressService.
+ *
+ * Progress is stored as one record per (userId, examId, questionId) and held
+ * in memory as the same nested shape ProgressService used to parse out of
+ * localStorage. Reads are served from memory; writes mark the touched
+ * questions dirty and a debounced flush puts only those records, so saving an
+ * answer costs the same however much history a user has. Several writes to
+ * one question before a flush are coalesced into a single put.
+ */
+import {
+  PROGRESS_STORE,
+  openAppDatabase,
+  requestResult,
+  transactionDone,
+} from '@/lib/idb'
+import type { AppProgress, QuestionProgress } from './progress-service'
+
+type ProgressRecord = QuestionProgress & {
+  userId: string
+  examId: string
+  questionId: string
+}
+
+export type ProgressStore = {
+  /** Live progress tree; mutate it, then call `markDirty`. */
+  data: AppProgress
+  /** Schedule writes for the given questions, or every question of the exam or user. */
+  markDirty: (userId: string, examId?: string, questionIds?: string[]) => void
+  /** Write pending changes now; false if they are still pending. */
+  flush: () => Promise<boolean>
+}
+
+const FLUSH_DELAY_MS = 300
+const SEP = '\u0000'
+
+function toRecord(
+  userId: string,
+  examId: string,
+  questionId: string,
+  value: QuestionProgress
+): ProgressRecord {
+  return { ...value, userId, examId, questionId }
+}
+
+/** Keep whichever side was answered last, as mergeRemoteExamProgress does. */
+function mergeInto(data: AppProgress, incoming: AppProgress) {
+  const touched: string[] = []
+  for (const [userId, exams] of Object.entries(incoming)) {
+    for (const [examId, questions] of Object.entries(exams ?? {})) {
+      for (const [questionId, value] of Object.entries(questions ?? {})) {
+        const exam = ((data[userId] ??= {})[examId] ??= {})
+        const current = exam[questionId]
+        if (
+          !current ||
+          (value.lastAnswered || 0) > (current.lastAnswered || 0)
+        ) {
+          exam[questionId] = { ...current, ...value }
+          touched.push([userId, examId, questionId].join(SEP))
+        }
+      }
+    }
+  }
+  return touched
+}
+
+/**
+ * Load all progress from IndexedDB, importing `legacy` (the old
+ * localStorage tree) first. Resolves null when IndexedDB is unavailable.
+ */
+export async function openProgressStore(
+  legacy: AppProgress | null
+): Promise<ProgressStore | null> {
+  const db = await openAppDatabase()
+  if (!db) return null
+
+  const records = await requestResult(
+    db
+      .transaction(PROGRESS_STORE, 'readonly')
+      .objectStore(PROGRESS_STORE)
+      .getAll() as IDBRequest<ProgressRecord[]>
+  )
+  const data: AppProgress = {}
+  for (const { userId, examId, questionId, ...value } of records) {
+    const exam = ((data[userId] ??= {})[examId] ??= {})
+    exam[questionId] = value
+  }
+
+  const dirty = new Set<string>()
+  let timer: ReturnType<typeof setTimeout> | undefined
+
+  async function write(keys: string[]) {
+    const tx = db.transaction(PROGRESS_STORE, 'readwrite')
+    const store = tx.objectStore(PROGRESS_STORE)
+    for (const key of keys) {
+      const [userId, examId, questionId] = key.split(SEP)
+      const value = data[userId]?.[examId]?.[questionId]
+      if (value) store.put(toRecord(userId, examId, questionId, value))
+      else store.delete([userId, examId, questionId])
+    }
+    await transactionDone(tx)
+  }
+
+  async function flush() {
+    clearTimeout(timer)
+    timer = undefined
+    if (dirty.size === 0) return true
+    const keys = Array.from(dirty)
+    dirty.clear()
+    try {
+      await write(keys)
+      return true
+    } catch {
+      // Keep the changes in memory and retry with the next write.
+      keys.forEach((key) => dirty.add(key))
+      return false
+    }
+  }
+
+  function markDirty(userId: string, examId?: string, questionIds?: string[]) {
+    const user = data[userId] ?? {}
+    const examIds = examId === undefined ? Object.keys(user) : [examId]
+    for (const id of examIds) {
+      for (const q of questionIds ?? Object.keys(user[id] ?? {})) {
+        dirty.add([userId, id, q].join(SEP))
+      }
+    }
+    if (dirty.size > 0 && timer === undefined) {
+      timer = setTimeout(() => void flush(), FLUSH_DELAY_MS)
+    }
+  }
+
+  if (legacy) {
+    const touched = mergeInto(data, legacy)
+    // Only forget the old copy once it is safely in IndexedDB.
+    if (touched.length > 0) await write(touched)
+  }
+
+  if (typeof window !== 'undefined') {
+    const flushNow = () => void flush()
+    window.addEventListener('pagehide', flushNow)
+    document.addEventListener('visibilitychange', () => {
+      if (document.visibilityState === 'hidden') flushNow()
+    })
+  }
+
+  return { data, markDirty, flush }
+}
@@ -0,0 +1,181 @@
+/**
+ * Write-ahead queue for Realtime Database updates.
+ *
+ * Writes are multi-path updates (`{ 'a/b/c': value }`). They are merged into
+ * a pending map, where a later write to the same path replaces the earlier
+ * one, persisted to localStorage so nothing is lost if the tab closes or the
+ * connection drops, and sent as a single `commit` once the flush delay
+ * passes or the batch fills up. Failed flushes are retried with exponential
+ * backoff and jitter; coming back online retries immediately. A failure that
+ * `isPermanent` recognizes (e.g. a security rules rejection) would fail again
+ * on every retry, and every write queued after it would fail with it, so that
+ * batch is dropped instead.
+ *
+ * The backend is just the `commit` function, so the queue can run against
+ * Firebase, the emulator or an in-memory stand-in in tests.
+ */
+
+export type SyncUpdates = Record<string, unknown>
+
+export type SyncQueueOptions = {
+  commit: (updates: SyncUpdates) => Promise<void>
+  /** localStorage key for the pending map; null keeps it in memory only. */
+  storageKey?: string | null
+  /** Wait this long after the first queued write before flushing. */
+  flushDelayMs?: number
+  /** Flush right away once this many paths are pending. */
+  maxBatch?: number
+  retryBaseMs?: number
+  retryMaxMs?: number
+  /** Whether a commit error can never succeed on retry. */
+  isPermanent?: (error: unknown) => boolean
+  /** Called after each failed commit; `dropped` if the batch was discarded. */
+  onError?: (
+    error: unknown,
+    info: { dropped: boolean; retries: number }
+  ) => void
+}
+
+export type SyncQueue = {
+  enqueue: (updates: SyncUpdates) => void
+  /** Send everything pending now; resolves false if the commit failed. */
+  flush: () => Promise<boolean>
+  /** Stop flushing; pending writes stay persisted for a later queue. */
+  stop: () => void
+}
+
+function readPending(key: string | null): Map<string, unknown> {
+  if (!key) return new Map()
+  try {
+    const raw = localStorage.getItem(key)
+    return new Map(raw ? Object.entries(JSON.parse(raw) as SyncUpdates) : [])
+  } catch {
+    return new Map()
+  }
+}
+
+export function createSyncQueue({
+  commit,
+  storageKey = null,
+  flushDelayMs = 2000,
+  maxBatch = 100,
+  retryBaseMs = 1000,
+  retryMaxMs = 60_000,
+  isPermanent = () => false,
+  onError,
+}: SyncQueueOptions): SyncQueue {
+  const pending = readPending(storageKey)
+  // Bumped on every write to a path, so a flush only drops the values it sent.
+  const versions = new Map<string, number>()
+  let timer: ReturnType<typeof setTimeout> | undefined
+  let inFlight: Promise<boolean> | null = null
+  // Consecutive failures since the last successful flush.
+  let retries = 0
+  let stopped = false
+
+  function persist() {
+    if (!storageKey) return
+    try {
+      if (pending.size === 0) localStorage.removeItem(storageKey)
+      else
+        localStorage.setItem(
+          storageKey,
+          JSON.stringify(Object.fromEntries(pending))
+        )
+    } catch {
+      // Over quota: the queue still lives in memory for this session.
+    }
+  }
+
+  function schedule(delay: number) {
+    if (stopped || timer !== undefined || pending.size === 0) return
+    timer = setTimeout(() => {
+      timer = undefined
+      void flush()
+    }, delay)
+  }
+
+  function backoff() {
+    const delay = Math.min(retryMaxMs, retryBaseMs * 2 ** (retries - 1))
+    return delay / 2 + (Math.random() * delay) / 2
+  }
+
+  /** Forget the sent values of paths that were not written again since. */
+  function settle(sent: Map<string, number>) {
+    sent.forEach((version, path) => {
+      if ((versions.get(path) ?? 0) === version) {
+        pending.delete(path)
+        versions.delete(path)
+      }
+    })
+    persist()
+  }
+
+  async function send(): Promise<boolean> {
+    const batch = Object.fromEntries(pending)
+    const sent = new Map(
+      Array.from(pending.keys(), (path) => [path, versions.get(path) ?? 0])
+    )
+    try {
+      await commit(batch)
+    } catch (error) {
+      const permanent = isPermanent(error)
+      if (permanent) settle(sent)
+      else retries++
+      onError?.(error, { dropped: permanent, retries })
+      schedule(permanent ? flushDelayMs : backoff())
+      return false
+    }
+    retries = 0
+    settle(sent)
+    // Writes queued while this batch was in flight.
+    schedule(pending.size >= maxBatch ? 0 : flushDelayMs)
+    return true
+  }
+
+  function flush(): Promise<boolean> {
+    clearTimeout(timer)
+    timer = undefined
+    if (stopped) return Promise.resolve(pending.size === 0)
+    if (inFlight) return inFlight
+    if (pending.size === 0) return Promise.resolve(true)
+    inFlight = send().finally(() => {
+      inFlight = null
+    })
+    return inFlight
+  }
+
+  function enqueue(updates: SyncUpdates) {
+    for (const [path, value] of Object.entries(updates)) {
+      pending.set(path, value ?? null)
+      versions.set(path, (versions.get(path) ?? 0) + 1)
+    }
+    persist()
+    if (inFlight) return
+    if (pending.size >= maxBatch) void flush()
+    // Waiting out a backoff keeps its timer; otherwise start the delay.
+    else schedule(retries > 0 ? backoff() : flushDelayMs)
+  }
+
+  const flushNow = () => void flush()
+  if (typeof window !== 'undefined') {
+    window.addEventListener('online', flushNow)
+    window.addEventListener('pagehide', flushNow)
+  }
+  // Writes left over from an earlier session.
+  schedule(flushDelayMs)
+
+  return {
+    enqueue,
+    flush,
+    stop() {
+      stopped = true
+      clearTimeout(timer)
+      timer = undefined
+      if (typeof window !== 'undefined') {
+        window.removeEventListener('online', flushNow)
+        window.removeEventListener('pagehide', flushNow)
+      }
+    },
+  }
+}